@@ -1,9 +1,11 @@
 """
 카드 관련 API 라우터
 """
-from fastapi import APIRouter, HTTPException, Depends, File, UploadFile
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import Optional
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.card import (
     CardGenerationRequestSchema,
@@ -11,21 +13,58 @@ from app.schemas.card import (
     CardSaveRequestSchema,
     CardSaveResponseSchema,
     CardListResponseSchema,
+    CardSearchResponseSchema,
+    CardFacetsResponseSchema,
+    CardFacetValueSchema,
     CardResponseSchema,
     CardDeleteResponseSchema,
+    CardBulkDeleteRequestSchema,
+    CardBulkDeleteResponseSchema,
+    FileReclaimStatsResponseSchema,
+    FileRelocationStatsResponseSchema,
     CardGeneratedImageUploadResponseSchema,
     CardGeneratedImageDeleteResponseSchema,
     CardGeneratedImageListResponseSchema,
+    ImageMetadataSchema,
 )
+from app.core.config import settings
 from app.services.card_service import CardService
-from app.database.database import get_db
-from app.database.models import Card, CardGeneratedImage
-from app.utils.file_utils import save_uploaded_file, get_file_path_from_url, delete_file
+from app.services.card_transfer_service import CardTransferService, TRANSFER_MEDIA_TYPES
+from app.database.database import get_async_db, get_async_read_db
+from app.database.models import CardGeneratedImage, ImageMetadata
+from app.utils.file_utils import store_uploaded_file
+from app.utils.blob_store import is_blob_url
+from app.services.blob_service import BlobService
+from app.services.file_reclaimer import FileReclaimer, file_reclaimer
+from app.services.image_metadata_service import ImageMetadataService
+from app.services.write_queue import write_queue
+from app.services.file_relocator import file_relocator
+from app.services.response_cache import CachedResponse, response_cache
+from app.utils.file_response import etag_matches
 
 router = APIRouter(prefix="/cards", tags=["cards"])
 
 card_service = CardService()
 
+# 캐시된 조회 응답 정책 (브라우저는 매번 ETag로 재검증)
+_CACHED_RESPONSE_CACHE_CONTROL = "no-cache"
+
+
+def _not_modified_response(request: Request, version: int) -> Optional[Response]:
+    """If-None-Match가 현재 데이터 버전의 ETag와 일치하면 본문 없는 304 응답, 아니면 None"""
+    etag = response_cache.etag(version)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None or not etag_matches(if_none_match, etag):
+        return None
+    response_cache.record_not_modified()
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _CACHED_RESPONSE_CACHE_CONTROL})
+
+
+def _cached_json_response(entry: CachedResponse) -> Response:
+    """캐시된 JSON 응답 반환 (ETag 포함)"""
+    headers = {"ETag": entry.etag, "Cache-Control": _CACHED_RESPONSE_CACHE_CONTROL}
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
 
 @router.post("/generate", response_model=CardGenerationResponseSchema)
 async def generate_card(request: CardGenerationRequestSchema):
@@ -63,7 +102,7 @@ async def generate_card(request: CardGenerationRequestSchema):
 
 
 @router.post("/save", response_model=CardSaveResponseSchema)
-async def save_card(request: CardSaveRequestSchema, db: Session = Depends(get_db)):
+async def save_card(request: CardSaveRequestSchema, db: AsyncSession = Depends(get_async_db)):
     """
     카드 정보를 데이터베이스에 저장합니다.
     
@@ -72,6 +111,9 @@ async def save_card(request: CardSaveRequestSchema, db: Session = Depends(get_db
     - **backgroundImageUrl**: 배경 이미지 URL (선택)
     - **generatedPrompt**: 생성된 프롬프트 (선택)
     - **generatedImageUrl**: 생성된 이미지 URL (선택)
+    
+    업로드 이미지는 전달한 URL 그대로 저장되고, 카드 디렉토리로의 이동과 URL 갱신은
+    백그라운드 재배치기가 처리합니다. (진행 상황: GET /cards/relocation/stats)
     """
     try:
         # 카드 데이터 검증
@@ -80,7 +122,7 @@ async def save_card(request: CardSaveRequestSchema, db: Session = Depends(get_db
             raise HTTPException(status_code=400, detail=error_message)
         
         # 카드 저장
-        card = card_service.save_card(db, request)
+        card = await card_service.save_card(db, request)
         
         return CardSaveResponseSchema(
             success=True,
@@ -97,121 +139,391 @@ async def save_card(request: CardSaveRequestSchema, db: Session = Depends(get_db
         )
 
 
+def _to_image_metadata(
+    urls: list[Optional[str]],
+    metadata_by_url: dict[str, ImageMetadata],
+) -> dict[str, ImageMetadataSchema]:
+    """URL 목록 중 메타데이터가 있는 이미지만 응답 스키마로 변환"""
+    result = {}
+    for url in urls:
+        row = metadata_by_url.get(url) if url else None
+        if row is not None and url not in result:
+            result[url] = ImageMetadataSchema(
+                width=row.width,
+                height=row.height,
+                format=row.format,
+                bytes=row.bytes,
+                sha256=row.sha256,
+                placeholder=row.placeholder,
+                dominantColor=row.dominant_color,
+            )
+    return result
+
+
+def _card_image_urls(card, latest_gen_by_card: dict[int, str]) -> list[Optional[str]]:
+    """카드 응답에 노출되는 이미지 URL (캐릭터, 배경, 최신 합성이미지, 초안)"""
+    return [
+        card.character_image_url,
+        card.background_image_url,
+        latest_gen_by_card.get(card.card_sn),
+        card.generated_image_url,
+    ]
+
+
+def _to_card_response(
+    card,
+    latest_gen_by_card: dict[int, str],
+    metadata_by_url: dict[str, ImageMetadata],
+) -> CardResponseSchema:
+    """카드 모델을 목록/검색 응답 스키마로 변환"""
+    # 최초 저장된 생성 이미지(초안)
+    draft_url = card.generated_image_url
+    # 합성이미지 중 가장 최신 1장을 generatedImageUrl 로 노출(없으면 초안 사용)
+    gen_url = latest_gen_by_card.get(card.card_sn) or draft_url
+    return CardResponseSchema(
+        cardSn=card.card_sn,
+        cardNumber=card.card_number,
+        cardName=card.card_name,
+        type=card.type,
+        attribute=card.attribute,
+        rarity=card.rarity,
+        attack=card.attack or "0",
+        health=card.health or "0",
+        skill1Name=card.skill1_name,
+        skill1Description=card.skill1_description,
+        skill2Name=card.skill2_name,
+        skill2Description=card.skill2_description,
+        flavorText=card.flavor_text,
+        series=card.series,
+        characterImageUrl=card.character_image_url,
+        backgroundImageUrl=card.background_image_url,
+        generatedPrompt=card.generated_prompt,
+        generatedImageUrl=gen_url,
+        draftImageUrl=draft_url,
+        imageMetadata=_to_image_metadata(_card_image_urls(card, latest_gen_by_card), metadata_by_url),
+        createdAt=card.created_at.isoformat() if card.created_at else "",
+        updatedAt=card.updated_at.isoformat() if card.updated_at else "",
+    )
+
+
 @router.get("/list", response_model=CardListResponseSchema)
 async def get_cards(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    card_type: Optional[str] = Query(None, alias="type", description="카드 타입 필터"),
+    attribute: Optional[str] = Query(None, description="카드 속성 필터"),
+    rarity: Optional[str] = Query(None, description="카드 등급 필터"),
+    series: Optional[str] = Query(None, description="시리즈 필터"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     카드 목록을 조회합니다.
     
-    - **skip**: 건너뛸 개수 (페이지네이션)
+    - **skip**: 건너뛸 개수 (오프셋 페이지네이션, 하위 호환)
     - **limit**: 가져올 최대 개수 (기본값: 100)
+    - **cursor**: 이전 응답의 nextCursor (지정 시 skip 무시, 깊은 페이지도 일정한 비용)
+    - **type**, **attribute**, **rarity**, **series**: 값이 일치하는 카드만 조회 (여러 개 지정 시 모두 일치)
+    
+    카드마다 imageMetadata에 이미지 URL별 크기·형식·미리보기(LQIP)를 함께 반환합니다.
+    응답은 데이터 버전이 바뀔 때까지 캐시되며, If-None-Match가 현재 버전의 ETag와 일치하면 목록 조회 없이 304를 반환합니다.
     """
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit은 1 이상이어야 합니다.")
+    
+    # 목록 쿼리 전 데이터 버전 (ETag 비교, 캐시 항목 검증)
+    version = await response_cache.current_version(db)
+    not_modified = _not_modified_response(request, version)
+    if not_modified is not None:
+        return not_modified
+    
+    cache_key = ("list", skip, limit, cursor, card_type, attribute, rarity, series)
+    cached = response_cache.get(cache_key, version)
+    if cached is not None:
+        return _cached_json_response(cached)
+    
     try:
-        cards, total = card_service.get_all_cards(db, skip=skip, limit=limit)
+        filters = {"type": card_type, "attribute": attribute, "rarity": rarity, "series": series}
+        cards, total, next_cursor = await card_service.get_all_cards(
+            db, skip=skip, limit=limit, cursor=cursor, filters=filters
+        )
 
         # 카드별 최신 합성이미지 URL (합성 테이블 우선, 없으면 Card.generated_image_url)
-        gen_rows = (
-            db.query(CardGeneratedImage)
-            .order_by(desc(CardGeneratedImage.created_at))
-            .all()
+        latest_gen_by_card = await card_service.get_latest_generated_images(
+            db, [card.card_sn for card in cards]
+        )
+
+        # 이미지 메타데이터 (크기·미리보기, URL 기본 키 조회 1회)
+        metadata_by_url = await ImageMetadataService.get_many(
+            db, (url for card in cards for url in _card_image_urls(card, latest_gen_by_card))
         )
-        # 카드별 최신 합성이미지 (가장 최근 1장)
-        latest_gen_by_card: dict[int, str] = {}
-        for row in gen_rows:
-            if row.card_sn not in latest_gen_by_card:
-                latest_gen_by_card[row.card_sn] = row.image_url
 
         # 카드 모델을 응답 스키마로 변환
-        card_list = []
-        for card in cards:
-            # 최초 저장된 생성 이미지(초안)
-            draft_url = card.generated_image_url
-            # 합성이미지 중 가장 최신 1장을 generatedImageUrl 로 노출(없으면 초안 사용)
-            gen_url = latest_gen_by_card.get(card.card_sn) or draft_url
-            card_list.append(CardResponseSchema(
-                cardSn=card.card_sn,
-                cardNumber=card.card_number,
-                cardName=card.card_name,
-                type=card.type,
-                attribute=card.attribute,
-                rarity=card.rarity,
-                attack=card.attack or "0",
-                health=card.health or "0",
-                skill1Name=card.skill1_name,
-                skill1Description=card.skill1_description,
-                skill2Name=card.skill2_name,
-                skill2Description=card.skill2_description,
-                flavorText=card.flavor_text,
-                series=card.series,
-                characterImageUrl=card.character_image_url,
-                backgroundImageUrl=card.background_image_url,
-                generatedPrompt=card.generated_prompt,
-                generatedImageUrl=gen_url,
-                draftImageUrl=draft_url,
-                createdAt=card.created_at.isoformat() if card.created_at else "",
-                updatedAt=card.updated_at.isoformat() if card.updated_at else "",
-            ))
+        card_list = [_to_card_response(card, latest_gen_by_card, metadata_by_url) for card in cards]
         
-        return CardListResponseSchema(
+        body = CardListResponseSchema(
             success=True,
             total=total,
-            cards=card_list
-        )
+            cards=card_list,
+            nextCursor=next_cursor,
+        ).model_dump_json().encode("utf-8")
     
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"카드 목록 조회 중 오류가 발생했습니다: {str(e)}"
         )
+    
+    return _cached_json_response(response_cache.put(cache_key, version, body))
+
+
+@router.get("/export")
+async def export_cards(
+    format: str = Query("ndjson", description="내보내기 형식 (ndjson, csv)"),
+    card_type: Optional[str] = Query(None, alias="type", description="카드 타입 필터"),
+    attribute: Optional[str] = Query(None, description="카드 속성 필터"),
+    rarity: Optional[str] = Query(None, description="카드 등급 필터"),
+    series: Optional[str] = Query(None, description="시리즈 필터"),
+):
+    """
+    카드를 NDJSON 또는 CSV로 내보냅니다. (card_sn 오름차순, 스트리밍)
+    
+    - **format**: ndjson(한 줄에 카드 1개 JSON) 또는 csv(헤더 포함, UTF-8 BOM)
+    - **type**, **attribute**, **rarity**, **series**: /cards/list와 같은 필터
+    
+    서버 측 커서로 일정 행 수씩 읽어 바로 전송하므로 카드 수와 무관하게 메모리 사용량이 일정합니다.
+    """
+    try:
+        fmt = CardTransferService.validate_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    filters = {"type": card_type, "attribute": attribute, "rarity": rarity, "series": series}
+    return StreamingResponse(
+        CardTransferService.export_cards(fmt, filters),
+        media_type=TRANSFER_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="cards.{fmt}"'},
+    )
+
+
+@router.post("/import")
+async def import_cards(
+    request: Request,
+    format: str = Query("ndjson", description="가져오기 형식 (ndjson, csv)"),
+    batchSize: Optional[int] = Query(None, ge=1, le=50000, description="트랜잭션 1회에 INSERT할 카드 수"),
+):
+    """
+    요청 본문(NDJSON 또는 CSV)의 카드를 일괄 등록합니다.
+    
+    - **format**: ndjson 또는 csv (필드는 /cards/export와 동일, cardSn은 무시되고 새로 발급)
+    - **batchSize**: 트랜잭션 1회에 INSERT할 카드 수 (기본: CARD_IMPORT_BATCH_SIZE)
+    
+    응답은 NDJSON 진행 이벤트 스트림입니다 (배치마다 progress, 마지막에 done 또는 error).
+    유효하지 않은 행은 건너뛰고 done 이벤트의 errors에 줄 번호와 함께 보고합니다.
+    이미지 파일은 이동하지 않고 URL을 그대로 저장합니다.
+    """
+    try:
+        fmt = CardTransferService.validate_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # 진행 이벤트를 보내기 전에 본문을 모두 받아 둠 (응답 스트리밍 중 요청 본문 수신과 충돌 방지)
+    path = await CardTransferService.spool_request(request)
+    return StreamingResponse(
+        CardTransferService.import_cards(path, fmt, batchSize),
+        media_type=TRANSFER_MEDIA_TYPES["ndjson"],
+    )
+
+
+@router.post("/bulk-delete", response_model=CardBulkDeleteResponseSchema)
+async def bulk_delete_cards(request: CardBulkDeleteRequestSchema, db: AsyncSession = Depends(get_async_db)):
+    """
+    여러 카드를 한 트랜잭션으로 삭제합니다.
+    
+    - **cardSns**: 삭제할 카드 일련번호 목록 (지정 시 필터 무시)
+    - **type**, **attribute**, **rarity**, **series**: cardSns 대신 /cards/list와 같은 필터로 삭제
+    - **limit**: 필터로 삭제할 최대 카드 수 (card_sn 오름차순, 더 남았으면 hasMore=true)
+    
+    이미지 파일은 회수 대기열에 넣고 즉시 응답하며, 백그라운드 회수기가 물리 삭제합니다.
+    (진행 상황: GET /cards/reclaim/stats)
+    """
+    max_cards = max(1, settings.CARD_BULK_DELETE_MAX)
+    if request.cardSns is not None and len(request.cardSns) > max_cards:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {max_cards}개까지 삭제할 수 있습니다.")
+    
+    filters = {
+        "type": request.type,
+        "attribute": request.attribute,
+        "rarity": request.rarity,
+        "series": request.series,
+    }
+    try:
+        deleted, queued, has_more = await card_service.delete_cards(
+            db,
+            card_sns=request.cardSns,
+            filters=filters,
+            limit=min(request.limit or max_cards, max_cards),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"카드 일괄 삭제 중 오류가 발생했습니다: {str(e)}"
+        )
+    
+    return CardBulkDeleteResponseSchema(
+        success=True,
+        message=f"카드 {len(deleted)}개가 삭제되었습니다.",
+        deleted=len(deleted),
+        cardSns=deleted,
+        queuedFiles=queued,
+        hasMore=has_more,
+    )
+
+
+@router.get("/reclaim/stats", response_model=FileReclaimStatsResponseSchema)
+async def get_reclaim_stats():
+    """
+    카드 삭제 후 이미지 파일을 지우는 백그라운드 회수기 지표를 조회합니다.
+    
+    - **pending**: 회수 대기 중인 파일 수, **failed**: 재시도를 모두 실패한 파일 수
+    - **reclaimed**, **reclaimedBytes**: 서버 시작 이후 삭제한 파일 수와 크기
+    """
+    try:
+        return FileReclaimStatsResponseSchema(success=True, **(await file_reclaimer.stats()))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"회수 지표 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+@router.get("/relocation/stats", response_model=FileRelocationStatsResponseSchema)
+async def get_relocation_stats():
+    """
+    카드 저장 후 이미지 파일을 카드 디렉토리로 옮기는 백그라운드 재배치기 지표를 조회합니다.
+    
+    - **pending**: 이동 대기 중인 파일 수, **failed**: 재시도를 모두 실패한 파일 수
+    - **moved**: 서버 시작 이후 이동하여 카드 URL을 갱신한 파일 수
+    """
+    try:
+        return FileRelocationStatsResponseSchema(success=True, **(await file_relocator.stats()))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"재배치 지표 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+@router.get("/facets", response_model=CardFacetsResponseSchema)
+async def get_card_facets(db: AsyncSession = Depends(get_async_read_db)):
+    """
+    타입, 속성, 등급, 시리즈별 카드 수를 조회합니다. (/cards/list 필터 값 목록)
+    
+    카드 저장/삭제 시 트리거로 갱신되는 패싯 카운트 테이블에서 읽으므로 카드 수와 무관하게 일정한 비용입니다.
+    """
+    try:
+        facets = await card_service.get_facets(db)
+        return CardFacetsResponseSchema(
+            success=True,
+            facets={
+                facet: [CardFacetValueSchema(value=value, count=count) for value, count in values]
+                for facet, values in facets.items()
+            },
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"카드 패싯 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+@router.get("/search", response_model=CardSearchResponseSchema)
+async def search_cards(
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    카드명, 스킬명/설명, 플레이버 텍스트, 시리즈에서 카드를 전문 검색합니다.
+    
+    - **q**: 검색어 (공백으로 구분한 단어를 모두 포함하는 카드, 단어마다 접두어 일치)
+    - **limit**: 가져올 최대 개수 (기본값: 20)
+    - **cursor**: 이전 응답의 nextCursor
+    
+    결과는 관련도순(bm25, 카드명 일치에 가장 높은 가중치)으로 정렬됩니다.
+    total은 첫 페이지(cursor 없음)에서만 계산합니다.
+    """
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit은 1 이상이어야 합니다.")
+    
+    try:
+        cards, total, next_cursor = await card_service.search_cards(db, q, limit=limit, cursor=cursor)
+        latest_gen_by_card = await card_service.get_latest_generated_images(
+            db, [card.card_sn for card in cards]
+        )
+        metadata_by_url = await ImageMetadataService.get_many(
+            db, (url for card in cards for url in _card_image_urls(card, latest_gen_by_card))
+        )
+        return CardSearchResponseSchema(
+            success=True,
+            query=q,
+            total=total,
+            cards=[_to_card_response(card, latest_gen_by_card, metadata_by_url) for card in cards],
+            nextCursor=next_cursor,
+        )
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"카드 검색 중 오류가 발생했습니다: {str(e)}"
+        )
 
 
 @router.post("/{card_sn}/generated-image", response_model=CardGeneratedImageUploadResponseSchema)
 async def upload_card_generated_image(
     card_sn: int,
     file: UploadFile = File(..., description="합성이미지 파일"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     해당 카드에 AI 합성이미지 파일을 업로드하고 합성카드 테이블에 연계합니다.
     파일은 해당 카드의 기본 이미지 경로 하위에 gen/ 디렉토리를 생성하여 gen_ 접두어가 붙은 파일명으로 저장됩니다.
     (예: /data/upload/{series}/{card_number}/gen/gen_xxx.png)
+    블롭 저장소 사용 시(BLOB_STORE_ENABLED)에는 내용 해시 기반 블롭에 저장되고 참조 카운트가 증가합니다.
+    (예: /data/upload/blobs/ab/abxxxx.png)
     """
     try:
         # 카드 존재 여부 확인
-        card = db.query(Card).filter(Card.card_sn == card_sn).first()
+        card = await card_service.get_card(db, card_sn)
         if not card:
             raise HTTPException(
                 status_code=404,
                 detail=f"카드 일련번호 {card_sn}에 해당하는 카드를 찾을 수 없습니다."
             )
 
-        # 이 카드의 기본 이미지가 저장된 경로(/upload/{series}/{number})와 동일한 구조로 gen 디렉토리 생성
-        series_name = card.series or "default"
-        card_number = card.card_number or str(card.card_sn)
-
-        # card_number에서 # 제거 및 특수문자 처리 (CardService.save_card와 동일한 로직)
-        clean_number = card_number.replace("#", "").strip()
-        safe_series = "".join(c for c in series_name if c.isalnum() or c in (" ", "-", "_")).strip()
-        safe_series = safe_series.replace(" ", "_") if safe_series else "default"
-        safe_number = "".join(c for c in clean_number if c.isalnum() or c in ("-", "_")).strip() or str(card.card_sn)
-
+        # 이 카드의 기본 이미지가 저장된 경로(/upload/{series}/{number})와 동일한 구조로
         # upload/{series}/{number}/gen 디렉토리 하위에 저장
-        subdirectory = f"{safe_series}/{safe_number}/gen"
+        subdirectory = f"{card_service.get_card_storage_subdirectory(card)}/gen"
 
-        file_url, _ = await save_uploaded_file(
+        file_url, stored = await store_uploaded_file(
             file,
             subdirectory=subdirectory,
             filename_prefix="gen_",
         )
+        image_metadata = await ImageMetadataService.extract(file_url, stored)
 
-        # 합성카드 테이블에 연계 저장
-        record = CardGeneratedImage(card_sn=card_sn, image_url=file_url)
-        db.add(record)
-        db.commit()
-        db.refresh(record)
+        # 합성카드 테이블에 연계 저장 (쓰기 큐에서 다른 INSERT와 함께 그룹 커밋, 커밋 완료까지 대기)
+        # 이미지 메타데이터도 같은 트랜잭션에 저장되며, 커밋되면 쓰기 큐가 조회 응답 캐시 버전을 올림
+        await write_queue.add_generated_image(card_sn, file_url, image_metadata)
 
         return CardGeneratedImageUploadResponseSchema(
             success=True,
@@ -221,7 +533,7 @@ async def upload_card_generated_image(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"합성이미지 등록 중 오류가 발생했습니다: {str(e)}"
@@ -231,16 +543,17 @@ async def upload_card_generated_image(
 @router.delete("/{card_sn}/generated-image", response_model=CardGeneratedImageDeleteResponseSchema)
 async def delete_latest_card_generated_image(
     card_sn: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     해당 카드의 가장 최근 합성이미지를 1장 삭제합니다.
     - 카드별 최신 생성순(CardGeneratedImage.created_at DESC)으로 1장을 찾아
-      물리 파일과 DB 레코드를 함께 삭제합니다.
+      DB 레코드를 삭제하고 파일은 회수 대기열에 등록합니다 (커밋 후 백그라운드 회수기가 삭제).
+    - 블롭 이미지는 참조 카운트만 감소시키고, 0이 되었을 때만 회수 대기열에 등록합니다.
     """
     try:
         # 카드 존재 여부 확인
-        card = db.query(Card).filter(Card.card_sn == card_sn).first()
+        card = await card_service.get_card(db, card_sn)
         if not card:
             raise HTTPException(
                 status_code=404,
@@ -248,12 +561,12 @@ async def delete_latest_card_generated_image(
             )
 
         # 최신 합성이미지 1장 조회
-        latest_gen = (
-            db.query(CardGeneratedImage)
-            .filter(CardGeneratedImage.card_sn == card_sn)
-            .order_by(desc(CardGeneratedImage.created_at))
-            .first()
-        )
+        latest_gen = (await db.execute(
+            select(CardGeneratedImage)
+            .where(CardGeneratedImage.card_sn == card_sn)
+            .order_by(desc(CardGeneratedImage.created_at), desc(CardGeneratedImage.id))
+            .limit(1)
+        )).scalar_one_or_none()
 
         if not latest_gen:
             raise HTTPException(
@@ -261,19 +574,15 @@ async def delete_latest_card_generated_image(
                 detail="삭제할 합성이미지가 없습니다.",
             )
 
-        # 물리 파일 삭제 시도 (실패하더라도 계속 진행)
-        try:
-            file_path = get_file_path_from_url(latest_gen.image_url)
-            if file_path:
-                delete_file(file_path)
-        except Exception:
-            # 로그만 출력하고 계속 진행
-            import traceback
-            print("합성이미지 파일 삭제 중 오류:", traceback.format_exc())
-
-        # DB 레코드 삭제
-        db.delete(latest_gen)
-        db.commit()
+        # 블롭은 참조가 0이 된 것만, 일반 파일은 그대로 회수 대기열에 등록 (회수 직전에 다른 참조가 없는지 다시 확인)
+        if is_blob_url(latest_gen.image_url):
+            reclaim_urls = await db.run_sync(BlobService.release_many, [latest_gen.image_url])
+        else:
+            reclaim_urls = [latest_gen.image_url]
+        await db.run_sync(FileReclaimer.enqueue, reclaim_urls)
+        await db.delete(latest_gen)
+        await db.commit()
+        file_reclaimer.notify()
 
         return CardGeneratedImageDeleteResponseSchema(
             success=True,
@@ -282,7 +591,7 @@ async def delete_latest_card_generated_image(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"합성이미지 삭제 중 오류가 발생했습니다: {str(e)}",
@@ -292,34 +601,47 @@ async def delete_latest_card_generated_image(
 @router.get("/{card_sn}/generated-images", response_model=CardGeneratedImageListResponseSchema)
 async def list_card_generated_images(
     card_sn: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     해당 카드에 등록된 모든 합성이미지 URL 목록을 반환합니다.
-    등록 순서(created_at ASC)대로 정렬하여 반환합니다.
+    등록 순서(created_at ASC)대로 정렬하여 반환하며, imageMetadata에 URL별 크기·형식·미리보기를 함께 반환합니다.
+    응답은 /cards/list와 같은 방식으로 캐시되며 ETag 조건부 요청을 지원합니다.
     """
+    # 목록 쿼리 전 데이터 버전 (ETag 비교, 캐시 항목 검증)
+    version = await response_cache.current_version(db)
+    not_modified = _not_modified_response(request, version)
+    if not_modified is not None:
+        return not_modified
+    
+    cache_key = ("generated-images", card_sn)
+    cached = response_cache.get(cache_key, version)
+    if cached is not None:
+        return _cached_json_response(cached)
+    
     try:
         # 카드 존재 여부 확인
-        card = db.query(Card).filter(Card.card_sn == card_sn).first()
+        card = await card_service.get_card(db, card_sn)
         if not card:
             raise HTTPException(
                 status_code=404,
                 detail=f"카드 일련번호 {card_sn}에 해당하는 카드를 찾을 수 없습니다.",
             )
 
-        rows = (
-            db.query(CardGeneratedImage)
-            .filter(CardGeneratedImage.card_sn == card_sn)
-            .order_by(CardGeneratedImage.created_at.asc())
-            .all()
-        )
+        urls = (await db.execute(
+            select(CardGeneratedImage.image_url)
+            .where(CardGeneratedImage.card_sn == card_sn)
+            .order_by(CardGeneratedImage.created_at.asc(), CardGeneratedImage.id.asc())
+        )).scalars().all()
 
-        urls = [row.image_url for row in rows]
+        metadata_by_url = await ImageMetadataService.get_many(db, urls)
 
-        return CardGeneratedImageListResponseSchema(
+        body = CardGeneratedImageListResponseSchema(
             success=True,
             images=urls,
-        )
+            imageMetadata=_to_image_metadata(urls, metadata_by_url),
+        ).model_dump_json().encode("utf-8")
     except HTTPException:
         raise
     except Exception as e:
@@ -327,18 +649,22 @@ async def list_card_generated_images(
             status_code=500,
             detail=f"합성이미지 목록 조회 중 오류가 발생했습니다: {str(e)}",
         )
+    
+    return _cached_json_response(response_cache.put(cache_key, version, body))
 
 
 @router.delete("/{card_sn}", response_model=CardDeleteResponseSchema)
-async def delete_card(card_sn: int, db: Session = Depends(get_db)):
+async def delete_card(card_sn: int, db: AsyncSession = Depends(get_async_db)):
     """
     카드를 삭제합니다.
     
     - **card_sn**: 삭제할 카드의 일련번호
+    
+    이미지 파일은 응답 후 백그라운드 회수기가 삭제합니다.
     """
     try:
         # 카드 삭제
-        success = card_service.delete_card(db, card_sn)
+        success = await card_service.delete_card(db, card_sn)
         
         if not success:
             raise HTTPException(
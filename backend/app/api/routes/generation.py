@@ -0,0 +1,115 @@
+"""
+이미지 생성 작업 API 라우터
+"""
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.schemas.card import (
+    GenerationJobCreateSchema,
+    GenerationJobSubmitResponseSchema,
+    GenerationJobStatusResponseSchema,
+    GenerationStatsResponseSchema,
+)
+from app.database.database import get_async_read_db
+from app.services.card_service import CardService
+from app.services.generation_service import (
+    GenerationJob,
+    GenerationQueueFullError,
+    generation_manager,
+)
+
+router = APIRouter(prefix="/cards/generate", tags=["generation"])
+
+
+def _to_status_schema(job: GenerationJob) -> GenerationJobStatusResponseSchema:
+    """작업 객체를 상태 응답 스키마로 변환"""
+    return GenerationJobStatusResponseSchema(
+        success=True,
+        jobId=job.job_id,
+        cardSn=job.card_sn,
+        status=job.status,
+        backend=job.backend,
+        model=job.request.model,
+        attempts=job.attempts,
+        imageUrls=job.image_urls,
+        error=job.error,
+        createdAt=job.created_at.isoformat(),
+        startedAt=job.started_at.isoformat() if job.started_at else None,
+        finishedAt=job.finished_at.isoformat() if job.finished_at else None,
+        elapsedMs=job.elapsed_ms,
+    )
+
+
+@router.post("/jobs", response_model=GenerationJobSubmitResponseSchema, status_code=202)
+async def submit_generation_job(request: GenerationJobCreateSchema, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    이미지 생성 작업을 제출합니다. 작업 ID를 즉시 반환하고, 생성은 워커 풀에서 실행됩니다.
+    
+    - **cardSn**: 결과 이미지를 연결할 카드 일련번호
+    - **prompt**: 생성 프롬프트 (선택, 없으면 카드 정보로 자동 생성)
+    - **backend**: 생성 백엔드 (선택, fake 또는 qwen)
+    - **width**, **height**, **steps**, **seed**, **numImages**: 생성 파라미터 (선택)
+    
+    결과는 GET /cards/generate/jobs/{job_id} 로 조회합니다.
+    """
+    try:
+        job = await generation_manager.submit(db, request)
+        
+        return GenerationJobSubmitResponseSchema(
+            success=True,
+            message="이미지 생성 작업이 등록되었습니다.",
+            jobId=job.job_id,
+            status=job.status,
+        )
+    
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except GenerationQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"이미지 생성 작업 등록 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=GenerationJobStatusResponseSchema)
+async def get_generation_job(job_id: str, wait: float = 0):
+    """
+    이미지 생성 작업 상태와 결과를 조회합니다.
+    
+    - **job_id**: 작업 ID
+    - **wait**: 작업이 끝날 때까지 최대 대기할 시간(초, 롱 폴링, 기본값: 0 = 즉시 반환)
+    
+    성공 시 imageUrls에 생성된 이미지 URL이 포함되며, 카드의 합성이미지 목록에도 등록됩니다.
+    """
+    job = generation_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"작업 {job_id}를 찾을 수 없습니다.")
+    
+    timeout = min(max(wait, 0), settings.GENERATION_MAX_WAIT_SECONDS)
+    job = await generation_manager.wait(job, timeout)
+    return _to_status_schema(job)
+
+
+@router.get("/stats", response_model=GenerationStatsResponseSchema)
+async def get_generation_stats():
+    """
+    이미지 생성 작업 지표를 조회합니다.
+    
+    - **queued**: 대기열에 있는 작업 수
+    - **jobs**: 상태별 작업 수
+    - **batching**: 배치 지표 (batches, averageSize, fillRate, fullFlushes, timeoutFlushes, sizeHistogram)
+    - **promptCache**: 프롬프트 캐시 지표 (hits, misses, size, maxSize)
+    - **writeQueue**: 그룹 커밋 쓰기 큐 지표 (commits, writes, rows, averageGroupSize, averageWaitMs, groupSizeHistogram)
+    """
+    return GenerationStatsResponseSchema(
+        success=True,
+        promptCache=CardService.prompt_cache_stats(),
+        **generation_manager.stats(),
+    )
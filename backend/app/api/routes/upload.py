@@ -1,13 +1,32 @@
 """
 파일 업로드 관련 API 라우터
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 from typing import List, Optional
 from pathlib import Path
-from app.utils.file_utils import save_uploaded_file, get_file_path_from_url, delete_file
+from app.utils.blob_store import is_blob_url, parse_blob_url
+from app.utils.file_utils import (
+    StoredUpload,
+    build_file_url,
+    store_uploaded_file,
+    delete_file,
+    upload_path_resolver,
+)
 from app.core.config import settings
+from app.database.database import AsyncSessionLocal, get_async_db, get_async_read_db
+from app.database.models import ImageBlob, OrphanFile
+from app.services.file_reclaimer import FileReclaimer, file_reclaimer
+from app.services.image_metadata_service import ImageMetadataService
+from app.services.layout_migrator import layout_migrator
+from app.services.upload_normalizer import upload_normalizer
+from app.services.orphan_collector import orphan_collector
+from app.utils.pagination import decode_cursor, encode_cursor
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 router = APIRouter(prefix="/upload", tags=["upload"])
@@ -19,6 +38,7 @@ class UploadResponse(BaseModel):
     message: str
     file_url: Optional[str] = None
     filename: Optional[str] = None
+    original_url: Optional[str] = None
 
 
 class MultipleUploadResponse(BaseModel):
@@ -28,28 +48,101 @@ class MultipleUploadResponse(BaseModel):
     files: List[dict] = []
 
 
+class OrphanFileItem(BaseModel):
+    """고아 파일 항목"""
+    url: str
+    size: int
+    modifiedAt: str
+    passNo: int
+    quarantinePath: Optional[str] = None
+
+
+class OrphanListResponse(BaseModel):
+    """고아 파일 목록 응답 스키마"""
+    success: bool
+    files: List[OrphanFileItem] = []
+    nextCursor: Optional[str] = None
+
+
+class OrphanStatsResponse(BaseModel):
+    """고아 파일 수집기 상태 응답 스키마"""
+    success: bool
+    mode: str
+    running: bool
+    passNo: int
+    cursor: Optional[str] = None
+    scanned: int
+    orphans: int
+    orphanBytes: int
+    startedAt: Optional[str] = None
+    lastFinishedAt: Optional[str] = None
+    reported: int
+    quarantined: int
+    lastError: Optional[str] = None
+
+
+class LayoutMigrationStatsResponse(BaseModel):
+    """업로드 레이아웃 이전 상태 응답 스키마"""
+    success: bool
+    layout: str
+    running: bool
+    scanned: int
+    migrated: int
+    updatedReferences: int
+    failed: int
+    lastError: Optional[str] = None
+    startedAt: Optional[str] = None
+    finishedAt: Optional[str] = None
+
+
+class NormalizeStatsResponse(BaseModel):
+    """업로드 이미지 정규화 지표 응답 스키마"""
+    success: bool
+    enabled: bool
+    format: str
+    maxDimension: int
+    normalized: int
+    skipped: int
+    failed: int
+    bytesBefore: int
+    bytesAfter: int
+    lastError: Optional[str] = None
+
+
 @router.post("/single", response_model=UploadResponse)
 async def upload_single_file(
     file: UploadFile = File(...),
-    subdirectory: Optional[str] = None
+    subdirectory: Optional[str] = None,
+    normalize: Optional[bool] = Query(None, description="이미지 정규화 여부 (생략 시 UPLOAD_NORMALIZE_ENABLED)"),
+    keep_original: bool = Query(False, description="정규화 시 원본 파일 유지 (original_url로 반환)"),
 ):
     """
     단일 파일 업로드
     
     - **file**: 업로드할 파일
-    - **subdirectory**: 서브디렉토리 (선택, 예: "cards", "characters")
+    - **subdirectory**: 서브디렉토리 (선택, 예: "cards", "characters", 블롭 저장소·sharded 레이아웃 사용 시 무시)
+    - **normalize**: true이면 메타데이터 제거, 최대 크기 제한, WebP/PNG 재인코딩 후 저장 (생략 시 서버 기본값)
+    - **keep_original**: 정규화 시 원본을 삭제하지 않고 original_url로 함께 반환
     
     허용된 파일 형식: jpg, jpeg, png, gif, webp, svg
     최대 파일 크기: 10MB
+    
+    이미지 메타데이터(크기, 형식, 미리보기)는 저장 직후 추출되어 카드 목록 응답에 함께 반환됩니다.
     """
     try:
-        file_url, file_path = await save_uploaded_file(file, subdirectory)
+        file_url, stored = await store_uploaded_file(file, subdirectory)
+        original_url = None
+        if upload_normalizer.enabled(normalize):
+            result = await upload_normalizer.normalize(file_url, stored, subdirectory, keep_original)
+            file_url, stored, original_url = result.file_url, result.stored, result.original_url
+        await ImageMetadataService.ingest([(file_url, stored)])
         
         return UploadResponse(
             success=True,
             message="파일이 성공적으로 업로드되었습니다.",
             file_url=file_url,
-            filename=file_path.name
+            filename=stored.file_path.name,
+            original_url=original_url,
         )
     
     except HTTPException:
@@ -64,52 +157,98 @@ async def upload_single_file(
 @router.post("/multiple", response_model=MultipleUploadResponse)
 async def upload_multiple_files(
     files: List[UploadFile] = File(...),
-    subdirectory: Optional[str] = None
+    subdirectory: Optional[str] = None,
+    atomic: bool = False,
+    normalize: Optional[bool] = Query(None, description="이미지 정규화 여부 (생략 시 UPLOAD_NORMALIZE_ENABLED)"),
+    keep_original: bool = Query(False, description="정규화 시 원본 파일 유지 (original_url로 반환)"),
 ):
     """
     다중 파일 업로드
     
     - **files**: 업로드할 파일 목록
     - **subdirectory**: 서브디렉토리 (선택)
+    - **atomic**: true이면 전부 성공하거나 전부 실패 (하나라도 실패 시 이미 저장된 파일 삭제)
+    - **normalize**, **keep_original**: 단일 파일 업로드와 동일 (모든 파일이 저장된 뒤 정규화)
+    
+    파일은 최대 UPLOAD_MAX_CONCURRENCY개씩 동시에 저장되며,
+    결과(files)는 요청한 파일 순서대로 반환됩니다.
     
     허용된 파일 형식: jpg, jpeg, png, gif, webp, svg
     최대 파일 크기: 10MB (파일당)
     """
-    uploaded_files = []
-    errors = []
+    semaphore = asyncio.Semaphore(max(1, settings.UPLOAD_MAX_CONCURRENCY))
     
-    for file in files:
-        try:
-            file_url, file_path = await save_uploaded_file(file, subdirectory)
-            uploaded_files.append({
-                "filename": file.filename,
-                "saved_filename": file_path.name,
-                "file_url": file_url,
-                "success": True
-            })
-        except HTTPException as e:
-            errors.append({
-                "filename": file.filename,
-                "error": e.detail,
-                "success": False
-            })
-        except Exception as e:
-            errors.append({
-                "filename": file.filename,
-                "error": str(e),
-                "success": False
-            })
-    
-    if not uploaded_files and errors:
+    async def ingest(file: UploadFile) -> tuple[dict, Optional[StoredUpload]]:
+        async with semaphore:
+            try:
+                file_url, stored = await store_uploaded_file(file, subdirectory)
+                return {
+                    "filename": file.filename,
+                    "saved_filename": stored.file_path.name,
+                    "file_url": file_url,
+                    "success": True
+                }, stored
+            except HTTPException as e:
+                return {"filename": file.filename, "error": e.detail, "success": False}, None
+            except Exception as e:
+                return {"filename": file.filename, "error": str(e), "success": False}, None
+    
+    # 파일별 결과는 입력 순서 유지
+    outcomes = await asyncio.gather(*(ingest(file) for file in files))
+    results = [result for result, _ in outcomes]
+    errors = [result for result in results if not result["success"]]
+    uploaded_count = len(results) - len(errors)
+    
+    if atomic and errors:
+        # 이번 요청에서 새로 만든 파일만 삭제 (재사용된 기존 블롭은 유지)
+        # 새 블롭도 그 사이 같은 내용의 동시 업로드가 재사용했을 수 있으므로 바로 지우지 않고
+        # 회수 대기열로 보내 유예 기간(BLOB_RECLAIM_GRACE_SECONDS)과 재참조를 확인한 뒤 삭제
+        created = [(result["file_url"], stored) for result, stored in outcomes if stored and stored.created]
+        blob_urls = [file_url for file_url, _ in created if is_blob_url(file_url)]
+        created_paths = [stored.file_path for file_url, stored in created if not is_blob_url(file_url)]
+        await run_in_threadpool(lambda: [delete_file(path) for path in created_paths])
+        if blob_urls:
+            async with AsyncSessionLocal() as db:
+                await db.run_sync(FileReclaimer.enqueue, blob_urls)
+                await db.commit()
+            file_reclaimer.notify()
+        raise HTTPException(
+            status_code=400,
+            detail=f"{len(errors)}개 파일 업로드 실패로 전체 업로드가 취소되었습니다. {errors[0].get('error', '알 수 없는 오류')}"
+        )
+    
+    if not uploaded_count and errors:
         raise HTTPException(
             status_code=400,
             detail=f"모든 파일 업로드에 실패했습니다. {errors[0].get('error', '알 수 없는 오류')}"
         )
     
+    # 저장된 파일 정규화 (프로세스 풀 동시 실행 수 제한 내에서 병렬)
+    saved = [(result, stored) for result, stored in outcomes if stored is not None]
+    if upload_normalizer.enabled(normalize):
+        # 같은 내용의 파일은 같은 블롭 URL을 받으므로 URL별로 한 번만 정규화
+        unique = {}
+        for result, stored in saved:
+            unique.setdefault(result["file_url"], stored)
+        normalized_by_url = dict(zip(unique, await asyncio.gather(*(
+            upload_normalizer.normalize(file_url, stored, subdirectory, keep_original)
+            for file_url, stored in unique.items()
+        ))))
+        normalized = [normalized_by_url[result["file_url"]] for result, _ in saved]
+        for (result, _), outcome in zip(saved, normalized):
+            result["file_url"] = outcome.file_url
+            result["saved_filename"] = outcome.stored.file_path.name
+            if outcome.original_url:
+                result["original_url"] = outcome.original_url
+        saved = [(result, outcome.stored) for (result, _), outcome in zip(saved, normalized)]
+    
+    # 저장된 파일의 이미지 메타데이터를 한 번의 쓰기로 기록
+    await ImageMetadataService.ingest((result["file_url"], stored) for result, stored in saved)
+    
     return MultipleUploadResponse(
-        success=len(uploaded_files) > 0,
-        message=f"{len(uploaded_files)}개 파일이 업로드되었습니다." + (f" ({len(errors)}개 실패)" if errors else ""),
-        files=uploaded_files + errors
+        success=uploaded_count > 0,
+        message=f"{uploaded_count}개 파일이 업로드되었습니다." + (f" ({len(errors)}개 실패)" if errors else ""),
+        files=results
     )
 
 
@@ -121,14 +260,13 @@ async def get_file(file_path: str):
     - **file_path**: 파일 경로 (예: cards/image.jpg 또는 characters/char1.png)
     """
     try:
-        # 전체 경로 구성
-        full_path = settings.upload_path / file_path
-        
-        # 보안: 업로드 디렉토리 밖의 파일 접근 방지
-        if not str(full_path.resolve()).startswith(str(settings.upload_path.resolve())):
+        # 보안: 업로드 디렉토리 밖의 파일 접근 방지 (문자열 정규화 단계에서 거부)
+        relative_path = upload_path_resolver.normalize_relative(file_path)
+        if relative_path is None:
             raise HTTPException(status_code=403, detail="접근이 거부되었습니다.")
         
-        if not full_path.exists():
+        full_path = await run_in_threadpool(upload_path_resolver.resolve_relative, relative_path)
+        if full_path is None:
             raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
         
         return FileResponse(
@@ -147,24 +285,37 @@ async def get_file(file_path: str):
 
 
 @router.delete("/file/{file_path:path}")
-async def delete_uploaded_file(file_path: str):
+async def delete_uploaded_file(file_path: str, db: AsyncSession = Depends(get_async_db)):
     """
     업로드된 파일 삭제
     
     - **file_path**: 파일 경로 (예: cards/image.jpg)
+    
+    블롭(blobs/...)은 같은 내용을 올린 다른 업로드와 공유되므로 바로 지우지 않습니다.
+    카드가 참조 중이면 409를 반환하고, 참조가 없으면 파일 회수 대기열에 넣어
+    회수기가 재참조 여부와 업로드 유예 기간(BLOB_RECLAIM_GRACE_SECONDS)을 확인한 뒤 삭제합니다.
     """
     try:
-        # 전체 경로 구성
-        full_path = settings.upload_path / file_path
-        
-        # 보안: 업로드 디렉토리 밖의 파일 접근 방지
-        if not str(full_path.resolve()).startswith(str(settings.upload_path.resolve())):
+        # 보안: 업로드 디렉토리 밖의 파일 접근 방지 (문자열 정규화 단계에서 거부)
+        relative_path = upload_path_resolver.normalize_relative(file_path)
+        if relative_path is None:
             raise HTTPException(status_code=403, detail="접근이 거부되었습니다.")
         
-        if not full_path.exists():
+        full_path = await run_in_threadpool(upload_path_resolver.resolve_relative, relative_path)
+        if full_path is None:
             raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
         
-        success = delete_file(full_path)
+        file_url = build_file_url(full_path)
+        blob = parse_blob_url(file_url)
+        if blob:
+            if await db.get(ImageBlob, blob[0]) is not None:
+                raise HTTPException(status_code=409, detail="카드가 참조 중인 이미지는 삭제할 수 없습니다.")
+            await db.run_sync(FileReclaimer.enqueue, [file_url])
+            await db.commit()
+            file_reclaimer.notify()
+            return {"success": True, "message": "파일 삭제가 예약되었습니다."}
+        
+        success = await run_in_threadpool(delete_file, full_path)
         
         if success:
             return {"success": True, "message": "파일이 성공적으로 삭제되었습니다."}
@@ -178,3 +329,83 @@ async def delete_uploaded_file(file_path: str):
             status_code=500,
             detail=f"파일 삭제 중 오류가 발생했습니다: {str(e)}"
         )
+
+
+@router.get("/orphans", response_model=OrphanListResponse)
+async def list_orphan_files(
+    limit: int = Query(100, ge=1, le=1000, description="최대 항목 수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    고아 파일 수집기가 찾은 파일 목록 (URL 순)
+    
+    - **quarantinePath**: 격리된 경우 격리 디렉토리 기준 위치 (보고만 했으면 null)
+    """
+    stmt = select(OrphanFile).order_by(OrphanFile.url).limit(limit + 1)
+    if cursor:
+        try:
+            after = decode_cursor(cursor)["url"]
+        except (ValueError, KeyError):
+            raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+        stmt = stmt.where(OrphanFile.url > after)
+    
+    rows = (await db.execute(stmt)).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return OrphanListResponse(
+        success=True,
+        files=[
+            OrphanFileItem(
+                url=row.url,
+                size=row.size,
+                modifiedAt=row.modified_at.isoformat(),
+                passNo=row.pass_no,
+                quarantinePath=row.quarantine_path,
+            )
+            for row in rows
+        ],
+        nextCursor=encode_cursor({"url": rows[-1].url}) if has_more else None,
+    )
+
+
+@router.get("/orphans/stats", response_model=OrphanStatsResponse)
+async def get_orphan_stats():
+    """
+    고아 파일 수집기 상태 (진행 중인 회차의 위치·검사 수, 보고·격리 항목 수)
+    """
+    try:
+        return OrphanStatsResponse(success=True, **(await orphan_collector.stats()))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"고아 파일 수집기 상태 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+@router.post("/orphans/scan")
+async def start_orphan_scan():
+    """
+    회차 사이 대기 중인 고아 파일 수집기를 깨워 바로 검사를 시작합니다.
+    (회차가 진행 중이면 그대로 이어서 진행)
+    """
+    if not orphan_collector.running:
+        raise HTTPException(status_code=409, detail="고아 파일 수집기가 꺼져 있습니다 (ORPHAN_GC_MODE=off).")
+    orphan_collector.notify()
+    return {"success": True, "message": "고아 파일 검사를 시작합니다."}
+
+
+@router.get("/layout/stats", response_model=LayoutMigrationStatsResponse)
+async def get_layout_migration_stats():
+    """
+    업로드 레이아웃(UPLOAD_LAYOUT)과 legacy → sharded 백그라운드 이전 진행 상황 (서버 시작 이후 누적)
+    """
+    return LayoutMigrationStatsResponse(success=True, **layout_migrator.stats())
+
+
+@router.get("/normalize/stats", response_model=NormalizeStatsResponse)
+async def get_normalize_stats():
+    """
+    업로드 이미지 정규화 지표 (정규화 건수, 정규화 전후 크기 합계, 서버 시작 이후 누적)
+    """
+    return NormalizeStatsResponse(success=True, **upload_normalizer.stats())
@@ -60,17 +60,203 @@ class Settings(BaseSettings):
         db_file = self.database_path / self.DATABASE_NAME
         return f"sqlite:///{db_file}"
     
+    @property
+    def async_database_url(self) -> str:
+        """비동기 데이터베이스 URL (aiosqlite)"""
+        db_file = self.database_path / self.DATABASE_NAME
+        return f"sqlite+aiosqlite:///{db_file}"
+    
+    # 데이터베이스 연결 프로필 설정
+    DATABASE_PROFILE: str = Field(
+        default="production",
+        description="연결 프로필 (production: PRAGMA 적용 + 읽기/쓰기 풀 분리, default: SQLite 기본값)"
+    )
+    DATABASE_ECHO: bool = Field(default=False, description="SQL 쿼리 로그 출력")
+    DATABASE_READ_POOL_SIZE: int = Field(default=4, description="읽기 전용 연결 풀 크기 (production 프로필)")
+    DATABASE_WRITE_POOL_TIMEOUT: float = Field(default=30.0, description="쓰기 연결 대기 최대 시간 (초)")
+    SQLITE_JOURNAL_MODE: str = Field(default="WAL", description="journal_mode (WAL이면 쓰기 중에도 읽기 가능)")
+    SQLITE_SYNCHRONOUS: str = Field(default="NORMAL", description="synchronous (WAL에서는 NORMAL 권장)")
+    SQLITE_CACHE_SIZE: int = Field(default=-65536, description="cache_size (음수는 KiB 단위, -65536 = 64MB)")
+    SQLITE_MMAP_SIZE: int = Field(default=268435456, description="mmap_size (바이트, 0이면 사용 안 함)")
+    SQLITE_BUSY_TIMEOUT_MS: int = Field(default=5000, description="busy_timeout (잠금 대기 최대 시간, ms)")
+    SQLITE_TEMP_STORE: str = Field(default="MEMORY", description="temp_store (DEFAULT, FILE, MEMORY)")
+    
+    @field_validator("DATABASE_PROFILE")
+    @classmethod
+    def _validate_database_profile(cls, value: str) -> str:
+        value = value.lower()
+        if value not in ("production", "default"):
+            raise ValueError("DATABASE_PROFILE은 production 또는 default여야 합니다.")
+        return value
+    
+    @field_validator("UPLOAD_LAYOUT")
+    @classmethod
+    def _validate_upload_layout(cls, value: str) -> str:
+        value = value.lower()
+        if value not in ("legacy", "sharded"):
+            raise ValueError("UPLOAD_LAYOUT은 legacy 또는 sharded여야 합니다.")
+        return value
+    
+    @field_validator("UPLOAD_NORMALIZE_FORMAT")
+    @classmethod
+    def _validate_upload_normalize_format(cls, value: str) -> str:
+        value = value.lower()
+        if value not in ("webp", "png"):
+            raise ValueError("UPLOAD_NORMALIZE_FORMAT은 webp 또는 png여야 합니다.")
+        return value
+    
+    @field_validator("ORPHAN_GC_MODE")
+    @classmethod
+    def _validate_orphan_gc_mode(cls, value: str) -> str:
+        value = value.lower()
+        if value not in ("off", "report", "quarantine"):
+            raise ValueError("ORPHAN_GC_MODE는 off, report, quarantine 중 하나여야 합니다.")
+        return value
+    
+    @field_validator("SQLITE_JOURNAL_MODE", "SQLITE_SYNCHRONOUS", "SQLITE_TEMP_STORE")
+    @classmethod
+    def _validate_pragma_keyword(cls, value: str, info) -> str:
+        # PRAGMA 문에 그대로 삽입되므로 허용된 키워드만 통과
+        allowed = {
+            "SQLITE_JOURNAL_MODE": ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"),
+            "SQLITE_SYNCHRONOUS": ("OFF", "NORMAL", "FULL", "EXTRA"),
+            "SQLITE_TEMP_STORE": ("DEFAULT", "FILE", "MEMORY"),
+        }[info.field_name]
+        value = value.upper()
+        if value not in allowed:
+            raise ValueError(f"{info.field_name}은 {', '.join(allowed)} 중 하나여야 합니다.")
+        return value
+    
     # 파일 업로드 설정
     UPLOAD_DIR: str = Field(default="data/upload", description="업로드 디렉토리")
     MAX_UPLOAD_SIZE: int = Field(
         default=10485760,  # 10MB
         description="최대 업로드 파일 크기 (바이트)"
     )
+    UPLOAD_CHUNK_SIZE: int = Field(
+        default=1048576,  # 1MB
+        description="업로드 스트리밍 저장 시 청크 크기 (바이트)"
+    )
+    UPLOAD_MAX_CONCURRENCY: int = Field(
+        default=4,
+        description="다중 파일 업로드 시 동시에 저장할 최대 파일 수"
+    )
+    BLOB_STORE_ENABLED: bool = Field(
+        default=True,
+        description="업로드 이미지를 내용 해시(SHA-256) 기반 블롭 저장소에 중복 없이 저장"
+    )
+    BLOB_RECLAIM_GRACE_SECONDS: int = Field(
+        default=300,
+        description="참조가 0이 된 블롭이라도 최근 이 시간(초) 내에 업로드된 경우 회수하지 않음"
+    )
+    UPLOAD_LAYOUT: str = Field(
+        default="legacy",
+        description="블롭 외 업로드 파일 배치 방식 (legacy: 업로드 루트·서브디렉토리·카드 디렉토리, sharded: shards/ab/cd/<id>)"
+    )
+    UPLOAD_LAYOUT_MIGRATION_ENABLED: bool = Field(
+        default=True,
+        description="sharded 레이아웃일 때 기존(legacy) 파일을 백그라운드에서 샤드 디렉토리로 이전"
+    )
+    UPLOAD_LAYOUT_MIGRATION_BATCH_SIZE: int = Field(default=200, description="레이아웃 이전 시 한 번에 처리할 파일 수")
+    UPLOAD_LAYOUT_MIGRATION_DELAY_SECONDS: float = Field(default=0.2, description="레이아웃 이전 배치 사이 대기 시간 (초)")
+    UPLOAD_NORMALIZE_ENABLED: bool = Field(
+        default=False,
+        description="업로드 이미지 정규화 기본값 (메타데이터 제거, 크기 제한, 재인코딩, 요청의 normalize로 개별 지정 가능)"
+    )
+    UPLOAD_NORMALIZE_MAX_DIMENSION: int = Field(default=2048, description="정규화 시 최대 너비/높이 (px, 비율 유지)")
+    UPLOAD_NORMALIZE_FORMAT: str = Field(default="webp", description="정규화 출력 형식 (webp, png)")
+    UPLOAD_NORMALIZE_QUALITY: int = Field(default=85, description="정규화 WebP 품질 (1-100)")
+    UPLOAD_PATH_CACHE_SIZE: int = Field(
+        default=4096,
+        description="존재가 확인된 업로드 URL → 파일 경로 변환 결과 LRU 캐시 크기 (0이면 캐시하지 않음)"
+    )
     ALLOWED_EXTENSIONS: str = Field(
         default="jpg,jpeg,png,gif,webp,svg",
         description="허용된 파일 확장자 (쉼표로 구분)"
     )
     
+    # 프롬프트 생성 설정
+    PROMPT_CACHE_SIZE: int = Field(default=256, description="생성 프롬프트 LRU 캐시 크기")
+    
+    # 이미지 생성 작업 설정
+    GENERATION_BACKEND: str = Field(default="fake", description="기본 생성 백엔드 (fake, qwen)")
+    GENERATION_WORKERS: int = Field(default=8, description="생성 작업 워커 수 (배치를 채우려면 GENERATION_BATCH_MAX_SIZE 이상)")
+    GENERATION_QUEUE_SIZE: int = Field(default=100, description="생성 작업 대기열 최대 길이")
+    GENERATION_MAX_ATTEMPTS: int = Field(default=2, description="생성 작업 최대 시도 횟수 (재시도 포함)")
+    GENERATION_JOB_RETENTION: int = Field(default=1000, description="메모리에 보관할 작업 수")
+    GENERATION_MAX_WAIT_SECONDS: float = Field(default=30.0, description="작업 조회 롱 폴링 최대 대기 시간 (초)")
+    GENERATION_DEFAULT_WIDTH: int = Field(default=800, description="기본 생성 이미지 너비 (px, 카드 비율 5:7)")
+    GENERATION_DEFAULT_HEIGHT: int = Field(default=1120, description="기본 생성 이미지 높이 (px)")
+    GENERATION_DEFAULT_STEPS: int = Field(default=40, description="기본 추론 스텝 수")
+    GENERATION_BATCH_MAX_SIZE: int = Field(default=4, description="한 번에 실행할 최대 배치 크기 (1이면 배칭 안 함)")
+    GENERATION_BATCH_MAX_WAIT_MS: int = Field(default=50, description="배치를 채우기 위해 기다릴 최대 시간 (ms)")
+    GENERATION_FAKE_LATENCY_MS: int = Field(default=0, description="fake 백엔드 인위적 지연 (ms, 부하 테스트용)")
+    QWEN_MODEL_ID: str = Field(default="Qwen/Qwen-Image-Edit-2511", description="qwen 백엔드 모델 ID")
+    QWEN_DEVICE: str = Field(default="cuda", description="qwen 백엔드 실행 디바이스")
+    
+    # 카드 일괄 가져오기/내보내기 설정
+    CARD_IMPORT_BATCH_SIZE: int = Field(default=1000, description="가져오기 시 트랜잭션 1회에 INSERT할 카드 수")
+    CARD_IMPORT_MAX_SIZE: int = Field(default=536870912, description="가져오기 요청 본문 최대 크기 (바이트, 기본 512MB)")
+    CARD_IMPORT_MAX_ERRORS: int = Field(default=100, description="가져오기 결과에 포함할 최대 오류 행 수")
+    CARD_EXPORT_FETCH_SIZE: int = Field(default=1000, description="내보내기 시 한 번에 읽어올 행 수 (서버 측 커서)")
+    
+    # 그룹 커밋 쓰기 큐 설정 (합성이미지·생성 이력 INSERT)
+    WRITE_QUEUE_MAX_BATCH: int = Field(default=64, description="한 트랜잭션으로 커밋할 최대 write 호출 수")
+    WRITE_QUEUE_MAX_DELAY_MS: int = Field(default=5, description="그룹을 채우기 위해 기다릴 최대 시간 (ms)")
+    WRITE_QUEUE_SIZE: int = Field(default=1024, description="쓰기 큐 최대 길이 (가득 차면 호출자가 대기)")
+    
+    # 카드 조회 응답 캐시 설정 (/cards/list, /cards/{card_sn}/generated-images)
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=512, description="응답 캐시 최대 항목 수 (0이면 캐시하지 않음)")
+    RESPONSE_CACHE_MAX_BYTES: int = Field(default=33554432, description="응답 캐시 최대 총 용량 (바이트, 기본 32MB)")
+    RESPONSE_CACHE_TTL_SECONDS: int = Field(default=60, description="응답 캐시 유효 시간 (초)")
+    
+    # 파일 회수기 설정 (카드 삭제 후 이미지 파일 물리 삭제)
+    RECLAIM_BATCH_SIZE: int = Field(default=200, description="회수기가 한 번에 처리할 파일 수")
+    RECLAIM_INTERVAL_SECONDS: int = Field(default=30, description="회수 대기열 재확인 주기 (초, 재시도 예정 항목 처리)")
+    RECLAIM_MAX_ATTEMPTS: int = Field(default=5, description="파일 삭제 최대 시도 횟수 (초과 시 실패로 남김)")
+    RECLAIM_RETRY_BASE_SECONDS: int = Field(default=10, description="삭제 실패 시 재시도 대기 시간 (초, 시도마다 2배)")
+    # 파일 재배치기 설정 (카드 저장 후 업로드 이미지를 카드 디렉토리로 이동)
+    RELOCATION_BATCH_SIZE: int = Field(default=100, description="재배치기가 한 번에 처리할 파일 수")
+    RELOCATION_INTERVAL_SECONDS: int = Field(default=30, description="재배치 아웃박스 재확인 주기 (초, 재시도 예정 항목 처리)")
+    RELOCATION_MAX_ATTEMPTS: int = Field(default=5, description="파일 이동 최대 시도 횟수 (초과 시 실패로 남김)")
+    RELOCATION_RETRY_BASE_SECONDS: int = Field(default=10, description="이동 실패 시 재시도 대기 시간 (초, 시도마다 2배)")
+    CARD_BULK_DELETE_MAX: int = Field(default=10000, description="일괄 삭제 요청 1회에 삭제할 수 있는 최대 카드 수")
+    
+    # 고아 파일 수집기 설정 (업로드 디렉토리에서 어떤 카드도 참조하지 않는 파일 탐지)
+    ORPHAN_GC_MODE: str = Field(default="report", description="고아 파일 처리 방식 (off, report, quarantine)")
+    ORPHAN_GC_CHUNK_SIZE: int = Field(default=500, description="한 번에 검사할 파일 수 (청크마다 진행 위치 저장)")
+    ORPHAN_GC_CHUNK_DELAY_SECONDS: float = Field(default=0.5, description="청크 사이 대기 시간 (초, 디스크 I/O 분산)")
+    ORPHAN_GC_PASS_INTERVAL_SECONDS: int = Field(default=86400, description="전체 검사를 마친 뒤 다음 검사까지 대기 시간 (초)")
+    ORPHAN_GC_GRACE_SECONDS: int = Field(default=86400, description="최근 이 시간(초) 내에 생성·변경된 파일은 고아로 보지 않음")
+    ORPHAN_GC_QUARANTINE_DIR: str = Field(default="data/quarantine", description="quarantine 모드에서 고아 파일을 옮길 디렉토리")
+    
+    # 이미지 파생본(썸네일/리사이즈) 설정
+    DERIVATIVE_CACHE_DIR: str = Field(default="data/cache/derivatives", description="파생본 디스크 캐시 디렉토리")
+    DERIVATIVE_CACHE_MAX_BYTES: int = Field(
+        default=536870912,  # 512MB
+        description="파생본 캐시 최대 용량 (바이트, 초과 시 LRU 제거)"
+    )
+    DERIVATIVE_MAX_DIMENSION: int = Field(default=2048, description="파생본 최대 너비/높이 (px)")
+    DERIVATIVE_QUALITY: int = Field(default=80, description="파생본 WebP/JPEG 품질 (1-100)")
+    DERIVATIVE_WORKERS: int = Field(default=2, description="파생본 렌더링 프로세스 풀 크기")
+    DERIVATIVE_MAX_CONCURRENT_RENDERS: int = Field(default=4, description="동시 파생본 렌더링 최대 개수")
+    
+    # 이미지 메타데이터 설정 (업로드·합성이미지 등록 시 크기·형식·미리보기 추출)
+    IMAGE_METADATA_ENABLED: bool = Field(default=True, description="업로드·합성이미지 등록 시 이미지 메타데이터 추출 및 저장")
+    IMAGE_PLACEHOLDER_SIZE: int = Field(default=16, description="저해상도 미리보기(LQIP) 최대 너비/높이 (px, 0이면 만들지 않음)")
+    
+    @property
+    def derivative_cache_path(self) -> Path:
+        """파생본 캐시 디렉토리 경로 (Path 객체)"""
+        base_path = Path(__file__).parent.parent.parent
+        return base_path / self.DERIVATIVE_CACHE_DIR
+    
+    @property
+    def orphan_quarantine_path(self) -> Path:
+        """고아 파일 격리 디렉토리 경로 (Path 객체)"""
+        base_path = Path(__file__).parent.parent.parent
+        return base_path / self.ORPHAN_GC_QUARANTINE_DIR
+    
     @property
     def allowed_extensions_list(self) -> List[str]:
         """허용된 확장자 문자열을 리스트로 변환"""
@@ -1,16 +1,62 @@
 """
 데이터베이스 모듈
 """
-from app.database.database import Base, engine, SessionLocal, get_db, init_db, reset_db
-from app.database.models import Card, CardGenerationHistory
+from app.database.database import (
+    Base,
+    engine,
+    SessionLocal,
+    get_db,
+    async_engine,
+    AsyncSessionLocal,
+    get_async_db,
+    read_engine,
+    async_read_engine,
+    ReadSessionLocal,
+    AsyncReadSessionLocal,
+    get_async_read_db,
+    dispose_engines,
+    init_db,
+    reset_db,
+)
+from app.database.models import (
+    Card,
+    CardGenerationHistory,
+    CardGeneratedImage,
+    ImageBlob,
+    TableCounter,
+    CardFacetCount,
+    FileReclaimTask,
+    FileRelocationTask,
+    OrphanScanState,
+    OrphanFile,
+    ImageMetadata,
+)
 
 __all__ = [
     "Base",
     "engine",
     "SessionLocal",
     "get_db",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
+    "read_engine",
+    "async_read_engine",
+    "ReadSessionLocal",
+    "AsyncReadSessionLocal",
+    "get_async_read_db",
+    "dispose_engines",
     "init_db",
     "reset_db",
     "Card",
     "CardGenerationHistory",
+    "CardGeneratedImage",
+    "ImageBlob",
+    "TableCounter",
+    "CardFacetCount",
+    "FileReclaimTask",
+    "FileRelocationTask",
+    "OrphanScanState",
+    "OrphanFile",
+    "ImageMetadata",
 ]
@@ -1,7 +1,8 @@
 """
 데이터베이스 연결 및 세션 관리
 """
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -10,23 +11,120 @@ from pathlib import Path
 # 데이터베이스 디렉토리 생성
 settings.database_path.mkdir(parents=True, exist_ok=True)
 
-# SQLAlchemy 엔진 생성
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False},  # SQLite용 설정
-    echo=settings.DEBUG,  # 디버그 모드에서 SQL 쿼리 출력
+
+def _apply_sqlite_pragmas(dbapi_connection, read_only: bool) -> None:
+    """
+    새 연결에 production 프로필 PRAGMA 적용
+    
+    Args:
+        dbapi_connection: DBAPI 연결 (sqlite3 또는 aiosqlite 어댑터)
+        read_only: True이면 query_only로 쓰기 차단
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        if not read_only:
+            # journal_mode는 DB 파일에 저장되므로 쓰기 연결에서만 설정
+            cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA cache_size = {int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA temp_store = {settings.SQLITE_TEMP_STORE}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+    finally:
+        cursor.close()
+
+
+def _configure_engine(sync_engine, read_only: bool) -> None:
+    """production 프로필이면 연결 생성 시 PRAGMA를 적용하도록 이벤트 등록"""
+    if settings.DATABASE_PROFILE != "production":
+        return
+    
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _apply_sqlite_pragmas(dbapi_connection, read_only)
+
+
+def _pool_options(read_only: bool) -> dict:
+    """
+    연결 풀 옵션
+    
+    production 프로필에서 쓰기 풀은 연결 1개로 고정하여 쓰기를 직렬화하고
+    (SQLite는 동시에 한 writer만 허용하므로 잠금 경합 대신 풀에서 대기),
+    읽기 풀은 DATABASE_READ_POOL_SIZE개 연결을 유지합니다.
+    """
+    if settings.DATABASE_PROFILE != "production":
+        return {}
+    if read_only:
+        return {"pool_size": settings.DATABASE_READ_POOL_SIZE, "max_overflow": 0}
+    return {"pool_size": 1, "max_overflow": 0, "pool_timeout": settings.DATABASE_WRITE_POOL_TIMEOUT}
+
+
+def _create_sync_engine(read_only: bool):
+    sync_engine = create_engine(
+        settings.database_url,
+        connect_args={"check_same_thread": False},  # SQLite용 설정
+        echo=settings.DATABASE_ECHO,
+        **_pool_options(read_only),
+    )
+    _configure_engine(sync_engine, read_only)
+    return sync_engine
+
+
+def _create_async_engine(read_only: bool):
+    new_engine = create_async_engine(
+        settings.async_database_url,
+        echo=settings.DATABASE_ECHO,
+        **_pool_options(read_only),
+    )
+    _configure_engine(new_engine.sync_engine, read_only)
+    return new_engine
+
+
+# production 프로필 여부 (PRAGMA 적용 + 단일 쓰기 연결 + 읽기 풀 분리)
+_production = settings.DATABASE_PROFILE == "production"
+
+# 비동기 쓰기 엔진 (aiosqlite, async 라우트·백그라운드 작업용)
+# production 프로필에서는 연결 1개로 고정된 유일한 쓰기 엔진으로, 모든 쓰기가 이 연결을 거쳐 직렬화됩니다.
+async_engine = _create_async_engine(read_only=False)
+
+# 비동기 세션 팩토리 (커밋 후 속성 접근 시 지연 로딩이 일어나지 않도록 expire_on_commit=False)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
 )
 
+# 동기 엔진 (스레드풀 작업·관리 스크립트용)
+# production 프로필에서는 두 번째 writer가 생기지 않도록 query_only 읽기 풀로 만들고 동기 읽기 엔진과 공유합니다.
+engine = _create_sync_engine(read_only=_production)
+
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 읽기 전용 엔진 (production 프로필: query_only 연결 풀, WAL에서는 쓰기 중에도 읽기 가능)
+read_engine = engine
+async_read_engine = _create_async_engine(read_only=True) if _production else async_engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base 클래스 (모델 상속용)
 Base = declarative_base()
 
 
 def get_db():
     """
-    데이터베이스 세션 의존성 주입 함수
+    동기 데이터베이스 세션 의존성 주입 함수
+    
+    production 프로필에서는 읽기 전용(query_only)이며, 쓰기는 get_async_db의 단일 쓰기 연결을 사용합니다.
     
     Yields:
         Session: 데이터베이스 세션
@@ -38,37 +136,57 @@ def get_db():
         db.close()
 
 
-def init_db(force_recreate: bool = False):
+async def get_async_db():
     """
-    데이터베이스 테이블 초기화
-    모든 모델을 import한 후 호출해야 함
+    비동기 데이터베이스 세션 의존성 주입 함수
     
-    Args:
-        force_recreate: True이면 기존 테이블을 삭제하고 재생성
+    Yields:
+        AsyncSession: 비동기 데이터베이스 세션
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """
+    읽기 전용 비동기 데이터베이스 세션 의존성 주입 함수 (조회 전용 라우트용)
+    
+    Yields:
+        AsyncSession: 읽기 전용 연결 풀의 비동기 세션
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+async def dispose_engines():
+    """모든 엔진의 연결 풀 정리 (서버 종료 시 호출)"""
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+    engine.dispose()
+
+
+def init_db(force_recreate: bool = False):
     """
-    # 모든 모델을 import하여 Base.metadata에 등록
-    from app.database import models  # noqa: F401
+    데이터베이스 스키마를 최신 버전으로 맞춤 (서버 시작 시 호출)
     
-    # 기존 테이블 구조 확인
-    inspector = inspect(engine)
-    existing_tables = inspector.get_table_names()
+    스키마가 최신이면 버전 1행만 조회하고 끝나며, 뒤처진 경우 데이터를 유지한 채
+    다음 버전부터 순서대로 마이그레이션합니다 (app/database/migrations.py).
     
-    # cards 테이블이 있고 구조가 다른 경우 재생성
-    should_recreate = force_recreate
-    if 'cards' in existing_tables and not should_recreate:
-        columns = [col['name'] for col in inspector.get_columns('cards')]
-        # 기존 테이블에 'card_sn' 컬럼이 없으면 (구 스키마) 재생성 필요
-        if 'card_sn' not in columns:
-            print("⚠️  기존 테이블 구조가 변경되었습니다. 테이블을 재생성합니다...")
-            should_recreate = True
+    Args:
+        force_recreate: True이면 모든 테이블을 삭제하고 처음부터 생성 (⚠️ 모든 데이터 삭제)
+    """
+    from app.database import migrations
     
-    if should_recreate:
-        Base.metadata.drop_all(bind=engine, tables=[models.Card.__table__, models.CardGenerationHistory.__table__])
+    if force_recreate:
+        migrations.drop_all()
         print("🗑️  기존 테이블이 삭제되었습니다.")
     
-    # 테이블 생성 (기존 테이블이 있으면 무시)
-    Base.metadata.create_all(bind=engine)
-    print(f"✅ 데이터베이스 테이블이 초기화되었습니다: {settings.database_url}")
+    start_version, version = migrations.migrate()
+    if start_version == version:
+        print(f"✅ 데이터베이스 스키마가 최신입니다 (v{version}): {settings.database_url}")
+    else:
+        print(f"✅ 데이터베이스 스키마를 v{start_version}에서 v{version}으로 업그레이드했습니다: {settings.database_url}")
 
 
 def reset_db():
@@ -76,13 +194,4 @@ def reset_db():
     데이터베이스 테이블 삭제 후 재생성
     ⚠️ 주의: 모든 데이터가 삭제됩니다!
     """
-    # 모든 모델을 import하여 Base.metadata에 등록
-    from app.database import models  # noqa: F401
-    
-    # 모든 테이블 삭제
-    Base.metadata.drop_all(bind=engine)
-    print("🗑️  기존 테이블이 삭제되었습니다.")
-    
-    # 테이블 재생성
-    Base.metadata.create_all(bind=engine)
-    print(f"✅ 데이터베이스 테이블이 재생성되었습니다: {settings.database_url}")
+    init_db(force_recreate=True)
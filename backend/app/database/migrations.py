@@ -0,0 +1,503 @@
+"""
+버전 기반 스키마 마이그레이션
+
+데이터베이스의 schema_migrations 테이블에 적용된 버전을 기록하고,
+서버 시작 시 최신 버전 1행만 조회하여 최신이면 아무 작업도 하지 않습니다.
+뒤처진 경우 다음 버전부터 순서대로 적용하며, 각 마이그레이션은 하나의 트랜잭션(BEGIN IMMEDIATE)으로
+실행되어 실패하면 해당 버전 전체가 롤백됩니다. 여러 프로세스가 동시에 시작해도 쓰기 잠금 안에서
+버전을 다시 확인하므로 같은 마이그레이션이 두 번 적용되지 않습니다.
+
+스키마 변경 방법:
+- 모델(models.py)을 수정한 뒤 MIGRATIONS 끝에 새 버전을 추가합니다 (기존 마이그레이션은 수정하지 않음).
+- 트리거 DDL을 바꾸는 경우 새 마이그레이션에서 기존 트리거를 DROP한 뒤 다시 생성합니다.
+- 마이그레이션 DDL은 models.py를 손으로 옮긴 것이므로, schema_differences로 둘이 일치하는지 확인합니다
+  (tests/test_migrations.py).
+"""
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+from app.core.config import settings
+from app.database import models
+
+
+@dataclass(frozen=True)
+class Migration:
+    """스키마 마이그레이션 1단계"""
+    version: int
+    name: str
+    upgrade: Callable[[sqlite3.Connection], None]
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def _column_names(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _index_names(conn: sqlite3.Connection, table: str) -> list[str]:
+    """테이블에 CREATE INDEX로 만든 인덱스 이름 (기본 키·UNIQUE 자동 인덱스 제외)"""
+    return [
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (table,),
+        )
+    ]
+
+
+def _drop_legacy_card_indexes(conn: sqlite3.Connection) -> None:
+    """
+    cards_legacy로 이름이 바뀐 테이블에 딸려간 인덱스 삭제
+
+    RENAME은 인덱스 이름을 바꾸지 않으므로 ix_cards_card_name 등이 cards_legacy에 남아,
+    새 cards 테이블의 CREATE INDEX IF NOT EXISTS가 아무 일도 하지 않게 됩니다.
+    """
+    for name in _index_names(conn, "cards_legacy"):
+        conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+def _baseline(conn: sqlite3.Connection) -> None:
+    """
+    v1: 기본 테이블 (cards, card_generation_history, card_generated_images, image_blobs)
+
+    마이그레이션 도입 이전에 create_all로 만들어진 데이터베이스는 그대로 채택합니다 (IF NOT EXISTS).
+    card_sn 컬럼이 없는 구 스키마의 cards 테이블은 삭제하지 않고 cards_legacy로 이름을 바꿔 보존합니다.
+    """
+    if _table_exists(conn, "cards") and "card_sn" not in _column_names(conn, "cards"):
+        print("⚠️  구 스키마의 cards 테이블을 cards_legacy로 보존하고 새 테이블을 생성합니다.")
+        conn.execute("ALTER TABLE cards RENAME TO cards_legacy")
+        _drop_legacy_card_indexes(conn)
+
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cards ("
+        "card_sn INTEGER NOT NULL, "
+        "card_name VARCHAR(100) NOT NULL, "
+        "card_number VARCHAR(50), "
+        "type VARCHAR(50) NOT NULL, "
+        "attribute VARCHAR(50) NOT NULL, "
+        "rarity VARCHAR(50) NOT NULL, "
+        "attack VARCHAR(10), "
+        "health VARCHAR(10), "
+        "skill1_name VARCHAR(100), "
+        "skill1_description TEXT, "
+        "skill2_name VARCHAR(100), "
+        "skill2_description TEXT, "
+        "flavor_text TEXT, "
+        "series VARCHAR(100), "
+        "character_image_url TEXT, "
+        "background_image_url TEXT, "
+        "generated_prompt TEXT, "
+        "generated_image_url TEXT, "
+        "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "PRIMARY KEY (card_sn))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_cards_card_name ON cards (card_name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_cards_card_sn ON cards (card_sn)")
+
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS card_generation_history ("
+        "id INTEGER NOT NULL, "
+        "card_sn INTEGER NOT NULL, "
+        "request_data JSON, "
+        "prompt TEXT, "
+        "image_url TEXT, "
+        "success INTEGER, "
+        "error_message TEXT, "
+        "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "PRIMARY KEY (id))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_card_generation_history_card_sn ON card_generation_history (card_sn)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_card_generation_history_id ON card_generation_history (id)")
+
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS card_generated_images ("
+        "id INTEGER NOT NULL, "
+        "card_sn INTEGER NOT NULL, "
+        "image_url TEXT NOT NULL, "
+        "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "PRIMARY KEY (id))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_card_generated_images_card_sn ON card_generated_images (card_sn)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_card_generated_images_id ON card_generated_images (id)")
+
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS image_blobs ("
+        "sha256 VARCHAR(64) NOT NULL, "
+        "extension VARCHAR(10) NOT NULL, "
+        "ref_count INTEGER NOT NULL, "
+        "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "PRIMARY KEY (sha256))"
+    )
+
+
+def _latest_generated_image_index(conn: sqlite3.Connection) -> None:
+    """v2: 카드별 최신 합성이미지 조회 인덱스"""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_card_generated_images_card_sn_created_at "
+        "ON card_generated_images (card_sn, created_at, id)"
+    )
+
+
+def _table_counters(conn: sqlite3.Connection) -> None:
+    """v3: 행 수 카운터 테이블 + 트리거, 현재 행 수로 초기화"""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS table_counters ("
+        "name VARCHAR(50) NOT NULL, "
+        "value INTEGER NOT NULL, "
+        "PRIMARY KEY (name))"
+    )
+    for table_name in models.COUNTED_TABLES:
+        for ddl in models.table_counter_triggers(table_name):
+            conn.execute(ddl)
+        conn.execute(
+            f"INSERT OR REPLACE INTO table_counters (name, value) SELECT ?, COUNT(*) FROM {table_name}",
+            (table_name,),
+        )
+
+
+def _card_facets(conn: sqlite3.Connection) -> None:
+    """v4: 목록 필터 인덱스, 패싯 카운트 테이블 + 트리거, 현재 카드 기준으로 초기화"""
+    for facet in models.CARD_FACETS:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS ix_cards_{facet}_card_sn ON cards ({facet}, card_sn)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS card_facet_counts ("
+        "facet VARCHAR(20) NOT NULL, "
+        "value VARCHAR(100) NOT NULL, "
+        "count INTEGER NOT NULL, "
+        "PRIMARY KEY (facet, value))"
+    )
+    for ddl in models.card_facet_triggers():
+        conn.execute(ddl)
+    conn.execute("DELETE FROM card_facet_counts")
+    for facet in models.CARD_FACETS:
+        conn.execute(
+            f"INSERT INTO card_facet_counts (facet, value, count) "
+            f"SELECT '{facet}', COALESCE({facet}, ''), COUNT(*) FROM cards GROUP BY COALESCE({facet}, '')"
+        )
+
+
+def _card_search(conn: sqlite3.Connection) -> None:
+    """v5: 카드 전문 검색(FTS5) 테이블 + 트리거, cards 내용으로 색인 구성"""
+    table = models.CARD_SEARCH_TABLE
+    for ddl in models.card_search_ddl():
+        conn.execute(ddl)
+    conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+
+def _file_reclaim_queue(conn: sqlite3.Connection) -> None:
+    """v6: 파일 회수 대기열 (카드 삭제 후 백그라운드 물리 삭제)"""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS file_reclaim_queue ("
+        "id INTEGER NOT NULL, "
+        "image_url TEXT NOT NULL, "
+        "attempts INTEGER NOT NULL, "
+        "next_attempt_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "last_error TEXT, "
+        "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "PRIMARY KEY (id))"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_file_reclaim_queue_next_attempt_at "
+        "ON file_reclaim_queue (next_attempt_at)"
+    )
+
+
+def _file_relocation_outbox(conn: sqlite3.Connection) -> None:
+    """v7: 카드 이미지 파일 재배치 아웃박스"""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS file_relocation_outbox ("
+        "id INTEGER NOT NULL, "
+        "card_sn INTEGER NOT NULL, "
+        "source_url TEXT NOT NULL, "
+        "target_dir TEXT NOT NULL, "
+        "attempts INTEGER NOT NULL, "
+        "next_attempt_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "last_error TEXT, "
+        "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "PRIMARY KEY (id))"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_file_relocation_outbox_next_attempt_at "
+        "ON file_relocation_outbox (next_attempt_at)"
+    )
+
+
+def _orphan_gc(conn: sqlite3.Connection) -> None:
+    """v8: 이미지 URL 인덱스, 고아 파일 수집기 진행 상태·보고서"""
+    for name, table, column in (
+        ("ix_cards_character_image_url", "cards", "character_image_url"),
+        ("ix_cards_background_image_url", "cards", "background_image_url"),
+        ("ix_cards_generated_image_url", "cards", "generated_image_url"),
+        ("ix_card_generated_images_image_url", "card_generated_images", "image_url"),
+    ):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS orphan_scan_state ("
+        "id INTEGER NOT NULL, "
+        "pass_no INTEGER NOT NULL, "
+        "cursor TEXT, "
+        "scanned INTEGER NOT NULL, "
+        "orphans INTEGER NOT NULL, "
+        "orphan_bytes INTEGER NOT NULL, "
+        "started_at DATETIME, "
+        "finished_at DATETIME, "
+        "PRIMARY KEY (id))"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS orphan_files ("
+        "url TEXT NOT NULL, "
+        "size INTEGER NOT NULL, "
+        "modified_at DATETIME NOT NULL, "
+        "pass_no INTEGER NOT NULL, "
+        "quarantine_path TEXT, "
+        "detected_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "PRIMARY KEY (url))"
+    )
+
+
+def _image_metadata(conn: sqlite3.Connection) -> None:
+    """v9: 이미지 메타데이터 (크기·형식·해시·미리보기)"""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS image_metadata ("
+        "url TEXT NOT NULL, "
+        "sha256 VARCHAR(64) NOT NULL, "
+        "format VARCHAR(10), "
+        "width INTEGER, "
+        "height INTEGER, "
+        "bytes INTEGER NOT NULL, "
+        "placeholder TEXT, "
+        "dominant_color VARCHAR(7), "
+        "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, "
+        "PRIMARY KEY (url))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_image_metadata_sha256 ON image_metadata (sha256)")
+
+
+def _data_version(conn: sqlite3.Connection) -> None:
+    """
+    v10: 카드 조회 응답 데이터 버전(ETag) 카운터 + 트리거
+
+    데이터베이스를 다시 만들어도 이전 ETag와 겹치지 않도록 현재 시각(ms)에서 시작합니다.
+    """
+    conn.execute(
+        "INSERT OR IGNORE INTO table_counters (name, value) "
+        "VALUES (?, CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER))",
+        (models.DATA_VERSION_COUNTER,),
+    )
+    for table_name in models.DATA_VERSION_TABLES:
+        for ddl in models.data_version_triggers(table_name):
+            conn.execute(ddl)
+
+
+def _legacy_card_indexes(conn: sqlite3.Connection) -> None:
+    """
+    v11: cards_legacy에 딸려간 cards 인덱스를 새 cards 테이블에 다시 생성
+
+    v1이 구 스키마 cards를 보존하면서 인덱스를 함께 옮긴 데이터베이스를 복구합니다.
+    """
+    if not _table_exists(conn, "cards_legacy"):
+        return
+    _drop_legacy_card_indexes(conn)
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_cards_card_name ON cards (card_name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_cards_card_sn ON cards (card_sn)")
+    for facet in models.CARD_FACETS:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS ix_cards_{facet}_card_sn ON cards ({facet}, card_sn)")
+    for name, column in (
+        ("ix_cards_character_image_url", "character_image_url"),
+        ("ix_cards_background_image_url", "background_image_url"),
+        ("ix_cards_generated_image_url", "generated_image_url"),
+    ):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON cards ({column})")
+
+
+def _card_facet_key_cleanup(conn: sqlite3.Connection) -> None:
+    """v12: 패싯 카운트 트리거를 감소시킨 키만 정리하도록 다시 생성 (0 이하 행 전체 스캔 제거)"""
+    for name in ("trg_cards_facet_insert", "trg_cards_facet_delete", "trg_cards_facet_update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for ddl in models.card_facet_triggers():
+        conn.execute(ddl)
+
+
+# 적용 순서대로의 마이그레이션 목록 (버전은 1부터 연속)
+MIGRATIONS: list[Migration] = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "latest_generated_image_index", _latest_generated_image_index),
+    Migration(3, "table_counters", _table_counters),
+    Migration(4, "card_facets", _card_facets),
+    Migration(5, "card_search", _card_search),
+    Migration(6, "file_reclaim_queue", _file_reclaim_queue),
+    Migration(7, "file_relocation_outbox", _file_relocation_outbox),
+    Migration(8, "orphan_gc", _orphan_gc),
+    Migration(9, "image_metadata", _image_metadata),
+    Migration(10, "data_version", _data_version),
+    Migration(11, "legacy_card_indexes", _legacy_card_indexes),
+    Migration(12, "card_facet_key_cleanup", _card_facet_key_cleanup),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def connect() -> sqlite3.Connection:
+    """
+    마이그레이션용 연결 (자동 커밋 모드, 트랜잭션은 BEGIN/COMMIT으로 직접 관리)
+
+    sqlite3 기본 모드는 DDL 앞에서 트랜잭션을 자동으로 열지 않으므로,
+    DDL까지 한 트랜잭션에 묶기 위해 isolation_level=None으로 엽니다.
+    """
+    conn = sqlite3.connect(
+        settings.database_path / settings.DATABASE_NAME,
+        isolation_level=None,
+        timeout=max(0, settings.SQLITE_BUSY_TIMEOUT_MS) / 1000,
+    )
+    conn.execute("PRAGMA foreign_keys = OFF")
+    return conn
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """
+    적용된 스키마 버전 (schema_migrations가 없으면 0)
+
+    버전이 기본 키이므로 MAX는 인덱스 끝 1행만 읽습니다.
+    """
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def migrate() -> tuple[int, int]:
+    """
+    최신 버전까지 마이그레이션 적용
+
+    Returns:
+        tuple[int, int]: (적용 전 버전, 적용 후 버전)
+
+    Raises:
+        RuntimeError: 데이터베이스가 이 코드보다 새 버전인 경우
+        Exception: 마이그레이션 실패 (해당 버전은 롤백됨)
+    """
+    conn = connect()
+    try:
+        start_version = current_version(conn)
+        if start_version == LATEST_VERSION:
+            return start_version, start_version
+        if start_version > LATEST_VERSION:
+            raise RuntimeError(
+                f"데이터베이스 스키마 버전({start_version})이 지원하는 최신 버전({LATEST_VERSION})보다 높습니다."
+            )
+
+        for migration in MIGRATIONS:
+            if migration.version <= start_version:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                    "version INTEGER NOT NULL PRIMARY KEY, "
+                    "name VARCHAR(100) NOT NULL, "
+                    "applied_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL)"
+                )
+                # 쓰기 잠금을 잡은 뒤 다시 확인 (다른 프로세스가 먼저 적용했을 수 있음)
+                if current_version(conn) >= migration.version:
+                    conn.execute("ROLLBACK")
+                    continue
+                migration.upgrade(conn)
+                conn.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                    (migration.version, migration.name),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            print(f"🔧 스키마 마이그레이션 적용: v{migration.version} {migration.name}")
+
+        return start_version, current_version(conn)
+    finally:
+        conn.close()
+
+
+def schema_differences(conn: sqlite3.Connection) -> list[str]:
+    """
+    마이그레이션으로 만든 스키마와 models.py(Base.metadata)의 차이
+
+    테이블별 컬럼(타입, NOT NULL, 기본 키)과 인덱스(이름, 컬럼 순서)를 비교합니다.
+    트리거, FTS5 가상 테이블처럼 모델에 없는 객체는 비교하지 않습니다.
+
+    Returns:
+        list[str]: 차이 설명 목록 (일치하면 빈 목록)
+    """
+    dialect = sqlite_dialect.dialect()
+    differences = []
+    for table in models.Base.metadata.sorted_tables:
+        if not _table_exists(conn, table.name):
+            differences.append(f"{table.name}: 테이블 없음")
+            continue
+
+        actual_columns = {
+            row[1]: (row[2].upper(), bool(row[3]), row[5] > 0)
+            for row in conn.execute(f"PRAGMA table_info({table.name})")
+        }
+        for column in table.columns:
+            expected = (column.type.compile(dialect=dialect).upper(), not column.nullable, column.primary_key)
+            actual = actual_columns.pop(column.name, None)
+            if actual is None:
+                differences.append(f"{table.name}.{column.name}: 컬럼 없음")
+            elif actual != expected:
+                differences.append(f"{table.name}.{column.name}: {actual} (모델: {expected})")
+        for name in actual_columns:
+            differences.append(f"{table.name}.{name}: 모델에 없는 컬럼")
+
+        actual_indexes = {
+            name: tuple(row[2] for row in conn.execute(f'PRAGMA index_info("{name}")'))
+            for name in _index_names(conn, table.name)
+        }
+        for index in table.indexes:
+            expected = tuple(column.name for column in index.columns)
+            actual = actual_indexes.pop(index.name, None)
+            if actual is None:
+                differences.append(f"{table.name}: 인덱스 {index.name} 없음")
+            elif actual != expected:
+                differences.append(f"{table.name}: 인덱스 {index.name} {actual} (모델: {expected})")
+        for name in actual_indexes:
+            differences.append(f"{table.name}: 모델에 없는 인덱스 {name}")
+    return differences
+
+
+def drop_all() -> None:
+    """
+    모든 테이블 삭제 (schema_migrations 포함, reset_db용)
+
+    FTS5 가상 테이블을 먼저 삭제하여 내부(shadow) 테이블이 함께 정리되도록 합니다.
+    """
+    conn = connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            virtual_tables = [
+                row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND sql LIKE 'CREATE VIRTUAL TABLE%'"
+                )
+            ]
+            for name in virtual_tables:
+                conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+            tables = [
+                row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+                )
+            ]
+            for name in tables:
+                conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
@@ -1,7 +1,7 @@
 """
 데이터베이스 모델 정의
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from app.database.database import Base
 
@@ -11,6 +11,17 @@ class Card(Base):
     카드 모델
     """
     __tablename__ = "cards"
+    __table_args__ = (
+        # 목록 필터 (필터 값 일치 + card_sn 역순 페이지네이션)
+        Index("ix_cards_type_card_sn", "type", "card_sn"),
+        Index("ix_cards_attribute_card_sn", "attribute", "card_sn"),
+        Index("ix_cards_rarity_card_sn", "rarity", "card_sn"),
+        Index("ix_cards_series_card_sn", "series", "card_sn"),
+        # 이미지 URL 참조 여부 확인 (파일 회수기, 고아 파일 수집기)
+        Index("ix_cards_character_image_url", "character_image_url"),
+        Index("ix_cards_background_image_url", "background_image_url"),
+        Index("ix_cards_generated_image_url", "generated_image_url"),
+    )
     
     # 기본 필드 (PK)
     card_sn = Column(Integer, primary_key=True, index=True, autoincrement=True, comment="카드 일련번호 (PK, 자동생성)")
@@ -98,6 +109,12 @@ class CardGeneratedImage(Base):
     카드 합성이미지 연계 테이블 (card_sn별 AI 생성 합성이미지 목록)
     """
     __tablename__ = "card_generated_images"
+    __table_args__ = (
+        # 카드별 최신 합성이미지 조회 (card_sn 일치 + created_at, id 역순 1건)
+        Index("ix_card_generated_images_card_sn_created_at", "card_sn", "created_at", "id"),
+        # 이미지 URL 참조 여부 확인 (파일 회수기, 고아 파일 수집기)
+        Index("ix_card_generated_images_image_url", "image_url"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     card_sn = Column(Integer, nullable=False, index=True, comment="카드 일련번호 (FK)")
@@ -111,3 +128,319 @@ class CardGeneratedImage(Base):
 
     def __repr__(self):
         return f"<CardGeneratedImage(id={self.id}, card_sn={self.card_sn})>"
+
+
+class ImageBlob(Base):
+    """
+    콘텐츠 주소 기반 이미지 블롭 테이블 (SHA-256별 참조 카운트)
+    """
+    __tablename__ = "image_blobs"
+
+    sha256 = Column(String(64), primary_key=True, comment="내용 해시 (SHA-256, 16진수)")
+    extension = Column(String(10), nullable=False, comment="저장 확장자")
+    ref_count = Column(Integer, nullable=False, default=0, comment="참조 카운트 (카드/합성이미지 URL 수)")
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="생성일시"
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        comment="수정일시"
+    )
+
+    def __repr__(self):
+        return f"<ImageBlob(sha256='{self.sha256}', ref_count={self.ref_count})>"
+
+
+class TableCounter(Base):
+    """
+    테이블 행 수 카운터 (SQLite 트리거로 유지, 목록 조회 시 COUNT(*) 대체)
+
+    name이 DATA_VERSION_COUNTER인 행은 행 수가 아니라 조회 응답 캐시의 데이터 버전입니다.
+    """
+    __tablename__ = "table_counters"
+
+    name = Column(String(50), primary_key=True, comment="테이블명 (또는 data_version)")
+    value = Column(Integer, nullable=False, default=0, comment="행 수 (또는 데이터 버전)")
+
+    def __repr__(self):
+        return f"<TableCounter(name='{self.name}', value={self.value})>"
+
+
+class CardFacetCount(Base):
+    """
+    카드 패싯(타입/속성/등급/시리즈) 값별 카드 수 (SQLite 트리거로 유지, 패싯 조회 시 GROUP BY 대체)
+    """
+    __tablename__ = "card_facet_counts"
+
+    facet = Column(String(20), primary_key=True, comment="패싯 (cards 컬럼명)")
+    value = Column(String(100), primary_key=True, comment="값 (NULL은 빈 문자열)")
+    count = Column(Integer, nullable=False, default=0, comment="카드 수")
+
+    def __repr__(self):
+        return f"<CardFacetCount(facet='{self.facet}', value='{self.value}', count={self.count})>"
+
+
+class FileReclaimTask(Base):
+    """
+    파일 회수 대기열 (카드 삭제와 같은 트랜잭션에서 기록, 백그라운드 회수기가 물리 삭제)
+    """
+    __tablename__ = "file_reclaim_queue"
+    __table_args__ = (
+        # 처리 시각이 된 항목 조회 (next_attempt_at 오름차순)
+        Index("ix_file_reclaim_queue_next_attempt_at", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    image_url = Column(Text, nullable=False, comment="삭제할 이미지 URL (블롭 URL이면 참조가 0이 된 블롭)")
+    attempts = Column(Integer, nullable=False, default=0, comment="삭제 시도 횟수")
+    next_attempt_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="다음 시도 예정일시"
+    )
+    last_error = Column(Text, nullable=True, comment="마지막 삭제 실패 메시지")
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="등록일시"
+    )
+
+    def __repr__(self):
+        return f"<FileReclaimTask(id={self.id}, attempts={self.attempts})>"
+
+
+class FileRelocationTask(Base):
+    """
+    카드 이미지 파일 재배치 아웃박스 (카드 저장과 같은 트랜잭션에서 기록, 백그라운드 재배치기가 이동 후 URL 갱신)
+    """
+    __tablename__ = "file_relocation_outbox"
+    __table_args__ = (
+        # 처리 시각이 된 항목 조회 (next_attempt_at 오름차순)
+        Index("ix_file_relocation_outbox_next_attempt_at", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    card_sn = Column(Integer, nullable=False, comment="카드 일련번호")
+    source_url = Column(Text, nullable=False, comment="이동할 이미지 URL (카드에 저장된 현재 URL)")
+    target_dir = Column(Text, nullable=False, comment="이동할 디렉토리 (업로드 디렉토리 기준 상대 경로)")
+    attempts = Column(Integer, nullable=False, default=0, comment="이동 시도 횟수")
+    next_attempt_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="다음 시도 예정일시"
+    )
+    last_error = Column(Text, nullable=True, comment="마지막 이동 실패 메시지")
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="등록일시"
+    )
+
+    def __repr__(self):
+        return f"<FileRelocationTask(id={self.id}, card_sn={self.card_sn}, attempts={self.attempts})>"
+
+
+# 행 수를 table_counters에 유지할 테이블
+COUNTED_TABLES = ("cards",)
+
+# card_facet_counts에 값별 카드 수를 유지할 cards 컬럼
+CARD_FACETS = ("type", "attribute", "rarity", "series")
+
+
+def table_counter_triggers(table_name: str) -> list[str]:
+    """
+    행 추가/삭제 시 table_counters를 같은 트랜잭션에서 갱신하는 트리거 DDL
+
+    Args:
+        table_name: 행 수를 유지할 테이블명 (COUNTED_TABLES)
+
+    Returns:
+        list[str]: CREATE TRIGGER 문 목록
+    """
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table_name}_count_insert AFTER INSERT ON {table_name} "
+        f"BEGIN UPDATE table_counters SET value = value + 1 WHERE name = '{table_name}'; END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table_name}_count_delete AFTER DELETE ON {table_name} "
+        f"BEGIN UPDATE table_counters SET value = value - 1 WHERE name = '{table_name}'; END",
+    ]
+
+
+# 카드 조회 응답의 데이터 버전을 유지하는 table_counters 행 (응답 캐시 ETag)
+DATA_VERSION_COUNTER = "data_version"
+
+# 행이 바뀌면 데이터 버전을 올릴 테이블 (카드 목록·합성이미지 목록 응답의 원본)
+DATA_VERSION_TABLES = ("cards", "card_generated_images")
+
+
+def data_version_triggers(table_name: str) -> list[str]:
+    """
+    행 추가/변경/삭제 시 table_counters의 데이터 버전을 같은 트랜잭션에서 올리는 트리거 DDL
+
+    Args:
+        table_name: 데이터 버전에 반영할 테이블명 (DATA_VERSION_TABLES)
+
+    Returns:
+        list[str]: CREATE TRIGGER 문 목록
+    """
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table_name}_data_version_{event.lower()} AFTER {event} ON {table_name} "
+        f"BEGIN UPDATE table_counters SET value = value + 1 WHERE name = '{DATA_VERSION_COUNTER}'; END"
+        for event in ("INSERT", "UPDATE", "DELETE")
+    ]
+
+
+def card_facet_triggers() -> list[str]:
+    """
+    카드 추가/삭제/패싯 컬럼 변경 시 card_facet_counts를 같은 트랜잭션에서 갱신하는 트리거 DDL
+
+    카드 수가 0이 된 값의 행은 삭제합니다 (감소시킨 키만 기본 키로 조회하여 삭제).
+
+    Returns:
+        list[str]: CREATE TRIGGER 문 목록
+    """
+    def increment(row: str) -> str:
+        return "".join(
+            f"INSERT INTO card_facet_counts (facet, value, count) VALUES ('{facet}', COALESCE({row}.{facet}, ''), 1) "
+            f"ON CONFLICT (facet, value) DO UPDATE SET count = count + 1; "
+            for facet in CARD_FACETS
+        )
+
+    def decrement(row: str) -> str:
+        return "".join(
+            f"UPDATE card_facet_counts SET count = count - 1 "
+            f"WHERE facet = '{facet}' AND value = COALESCE({row}.{facet}, ''); "
+            f"DELETE FROM card_facet_counts "
+            f"WHERE facet = '{facet}' AND value = COALESCE({row}.{facet}, '') AND count <= 0; "
+            for facet in CARD_FACETS
+        )
+
+    columns = ", ".join(CARD_FACETS)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_cards_facet_insert AFTER INSERT ON cards "
+        f"BEGIN {increment('new')}END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_cards_facet_delete AFTER DELETE ON cards "
+        f"BEGIN {decrement('old')}END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_cards_facet_update AFTER UPDATE OF {columns} ON cards "
+        f"BEGIN {decrement('old')}{increment('new')}END",
+    ]
+
+
+# 카드 전문 검색 (FTS5) 가상 테이블
+CARD_SEARCH_TABLE = "cards_fts"
+
+# 검색 대상 컬럼과 bm25 가중치 (카드명 > 스킬명 > 시리즈 > 설명/플레이버 텍스트)
+CARD_SEARCH_COLUMNS = (
+    "card_name",
+    "skill1_name",
+    "skill2_name",
+    "skill1_description",
+    "skill2_description",
+    "flavor_text",
+    "series",
+)
+CARD_SEARCH_WEIGHTS = (10.0, 4.0, 4.0, 1.0, 1.0, 1.0, 2.0)
+
+
+def card_search_ddl() -> list[str]:
+    """
+    카드 전문 검색 인덱스 DDL (cards를 content로 하는 외부 콘텐츠 FTS5 테이블 + 동기화 트리거)
+
+    - unicode61 토크나이저: 한글은 공백·구두점 기준 어절 단위로 색인 (조사는 접두어 검색으로 매칭)
+    - prefix 인덱스: 1~3글자 접두어 검색을 전체 용어 스캔 없이 처리
+    - 트리거: cards INSERT/UPDATE/DELETE와 같은 트랜잭션에서 색인 갱신
+
+    Returns:
+        list[str]: CREATE VIRTUAL TABLE / CREATE TRIGGER 문 목록
+    """
+    columns = ", ".join(CARD_SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in CARD_SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in CARD_SEARCH_COLUMNS)
+    table = CARD_SEARCH_TABLE
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({columns}, "
+        f"content='cards', content_rowid='card_sn', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON cards "
+        f"BEGIN INSERT INTO {table}(rowid, {columns}) VALUES (new.card_sn, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON cards "
+        f"BEGIN INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.card_sn, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_update AFTER UPDATE OF {columns} ON cards "
+        f"BEGIN INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.card_sn, {old_values}); "
+        f"INSERT INTO {table}(rowid, {columns}) VALUES (new.card_sn, {new_values}); END",
+    ]
+
+
+class OrphanScanState(Base):
+    """
+    고아 파일 수집기 진행 상태 (단일 행, 청크마다 갱신되어 서버 재시작 후 이어서 검사)
+    """
+    __tablename__ = "orphan_scan_state"
+
+    id = Column(Integer, primary_key=True, comment="항상 1")
+    pass_no = Column(Integer, nullable=False, default=1, comment="현재 검사 회차")
+    cursor = Column(Text, nullable=True, comment="마지막으로 검사한 파일 (업로드 디렉토리 기준 상대 경로, NULL이면 처음부터)")
+    scanned = Column(Integer, nullable=False, default=0, comment="현재 회차에서 검사한 파일 수")
+    orphans = Column(Integer, nullable=False, default=0, comment="현재 회차에서 찾은 고아 파일 수")
+    orphan_bytes = Column(Integer, nullable=False, default=0, comment="현재 회차에서 찾은 고아 파일 크기 합계")
+    started_at = Column(DateTime(timezone=True), nullable=True, comment="현재 회차 시작일시")
+    finished_at = Column(DateTime(timezone=True), nullable=True, comment="마지막 회차 완료일시")
+
+    def __repr__(self):
+        return f"<OrphanScanState(pass_no={self.pass_no}, cursor='{self.cursor}')>"
+
+
+class OrphanFile(Base):
+    """
+    고아 파일 보고서 (cards / card_generated_images / image_blobs 어디에서도 참조하지 않는 업로드 파일)
+    """
+    __tablename__ = "orphan_files"
+
+    url = Column(Text, primary_key=True, comment="파일 URL (/data/upload/...)")
+    size = Column(Integer, nullable=False, comment="파일 크기 (바이트)")
+    modified_at = Column(DateTime(timezone=True), nullable=False, comment="파일 최종 변경일시")
+    pass_no = Column(Integer, nullable=False, comment="마지막으로 고아로 확인된 검사 회차")
+    quarantine_path = Column(Text, nullable=True, comment="격리 위치 (격리 디렉토리 기준 상대 경로, 보고만 했으면 NULL)")
+    detected_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="발견일시"
+    )
+
+    def __repr__(self):
+        return f"<OrphanFile(url='{self.url}', pass_no={self.pass_no})>"
+
+
+class ImageMetadata(Base):
+    """
+    이미지 메타데이터 (업로드·합성이미지 등록 시 1회 추출, 목록 응답에 함께 반환)
+    """
+    __tablename__ = "image_metadata"
+
+    url = Column(Text, primary_key=True, comment="파일 URL (/data/upload/...)")
+    sha256 = Column(String(64), nullable=False, index=True, comment="내용 해시 (SHA-256, 16진수)")
+    format = Column(String(10), nullable=True, comment="이미지 형식 (png, jpeg, gif, webp, svg)")
+    width = Column(Integer, nullable=True, comment="너비 (px, EXIF 회전 반영, 판독 불가 시 NULL)")
+    height = Column(Integer, nullable=True, comment="높이 (px, EXIF 회전 반영, 판독 불가 시 NULL)")
+    bytes = Column(Integer, nullable=False, comment="파일 크기 (바이트)")
+    placeholder = Column(Text, nullable=True, comment="저해상도 미리보기 (LQIP, data URI)")
+    dominant_color = Column(String(7), nullable=True, comment="대표 색상 (#rrggbb)")
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="추출일시"
+    )
+
+    def __repr__(self):
+        return f"<ImageMetadata(url='{self.url}', width={self.width}, height={self.height})>"
@@ -64,6 +64,17 @@ class CardSaveResponseSchema(BaseModel):
     cardSn: Optional[int] = Field(None, description="저장된 카드 일련번호")
 
 
+class ImageMetadataSchema(BaseModel):
+    """이미지 메타데이터 스키마 (업로드·합성이미지 등록 시 추출)"""
+    width: Optional[int] = Field(None, description="너비 (px, EXIF 회전 반영, SVG 등 판독 불가 시 null)")
+    height: Optional[int] = Field(None, description="높이 (px, EXIF 회전 반영, SVG 등 판독 불가 시 null)")
+    format: Optional[str] = Field(None, description="이미지 형식 (png, jpeg, gif, webp, svg)")
+    bytes: int = Field(..., description="파일 크기 (바이트)")
+    sha256: str = Field(..., description="내용 해시 (SHA-256, 16진수)")
+    placeholder: Optional[str] = Field(None, description="저해상도 미리보기 (LQIP, data:image/webp;base64,...)")
+    dominantColor: Optional[str] = Field(None, description="대표 색상 (#rrggbb)")
+
+
 class CardResponseSchema(BaseModel):
     """카드 응답 스키마"""
     cardSn: int = Field(..., description="카드 일련번호 (자동생성)")
@@ -85,6 +96,10 @@ class CardResponseSchema(BaseModel):
     generatedPrompt: Optional[str] = Field(None, description="생성된 프롬프트")
     generatedImageUrl: Optional[str] = Field(None, description="생성된 이미지 URL")
     draftImageUrl: Optional[str] = Field(None, description="초안(최초 생성) 이미지 URL")
+    imageMetadata: dict[str, ImageMetadataSchema] = Field(
+        default_factory=dict,
+        description="이미지 URL → 메타데이터 (메타데이터가 기록된 이미지만)"
+    )
     createdAt: str = Field(..., description="생성일시")
     updatedAt: str = Field(..., description="수정일시")
 
@@ -92,8 +107,30 @@ class CardResponseSchema(BaseModel):
 class CardListResponseSchema(BaseModel):
     """카드 목록 응답 스키마"""
     success: bool = Field(..., description="성공 여부")
-    total: int = Field(..., description="전체 카드 개수")
+    total: Optional[int] = Field(None, description="전체 카드 개수")
     cards: list[CardResponseSchema] = Field(..., description="카드 목록")
+    nextCursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
+
+
+class CardFacetValueSchema(BaseModel):
+    """패싯 값별 카드 수 스키마"""
+    value: Optional[str] = Field(None, description="값 (값이 없는 카드는 null)")
+    count: int = Field(..., description="카드 수")
+
+
+class CardFacetsResponseSchema(BaseModel):
+    """카드 패싯 응답 스키마"""
+    success: bool = Field(..., description="성공 여부")
+    facets: dict[str, list[CardFacetValueSchema]] = Field(..., description="패싯(type, attribute, rarity, series) → 값별 카드 수 (많은 순)")
+
+
+class CardSearchResponseSchema(BaseModel):
+    """카드 검색 응답 스키마"""
+    success: bool = Field(..., description="성공 여부")
+    query: str = Field(..., description="검색어")
+    total: Optional[int] = Field(None, description="전체 일치 개수 (첫 페이지에서만 계산)")
+    cards: list[CardResponseSchema] = Field(..., description="검색 결과 (관련도순)")
+    nextCursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
 
 
 class CardDeleteResponseSchema(BaseModel):
@@ -102,6 +139,57 @@ class CardDeleteResponseSchema(BaseModel):
     message: str = Field(..., description="응답 메시지")
 
 
+class CardBulkDeleteRequestSchema(BaseModel):
+    """카드 일괄 삭제 요청 스키마 (cardSns 또는 필터 중 하나 이상 지정)"""
+    cardSns: Optional[list[int]] = Field(None, description="삭제할 카드 일련번호 목록 (지정 시 필터 무시, 최대 CARD_BULK_DELETE_MAX개)")
+    type: Optional[str] = Field(None, description="카드 타입 필터")
+    attribute: Optional[str] = Field(None, description="카드 속성 필터")
+    rarity: Optional[str] = Field(None, description="카드 등급 필터")
+    series: Optional[str] = Field(None, description="시리즈 필터")
+    limit: Optional[int] = Field(None, ge=1, description="필터로 삭제할 최대 카드 수 (기본·최대: CARD_BULK_DELETE_MAX)")
+
+
+class CardBulkDeleteResponseSchema(BaseModel):
+    """카드 일괄 삭제 응답 스키마"""
+    success: bool = Field(..., description="성공 여부")
+    message: str = Field(..., description="응답 메시지")
+    deleted: int = Field(..., description="삭제된 카드 수")
+    cardSns: list[int] = Field(default_factory=list, description="삭제된 카드 일련번호 목록")
+    queuedFiles: int = Field(..., description="백그라운드 회수 대기열에 넣은 이미지 파일 수")
+    hasMore: bool = Field(default=False, description="필터에 일치하는 카드가 더 남았는지 여부 (limit 초과)")
+
+
+class FileReclaimStatsResponseSchema(BaseModel):
+    """파일 회수기 지표 응답 스키마"""
+    success: bool = Field(..., description="성공 여부")
+    pending: int = Field(..., description="회수 대기 중인 파일 수 (재시도 예정 포함)")
+    failed: int = Field(..., description="최대 시도 횟수를 넘겨 실패로 남은 파일 수")
+    batches: int = Field(..., description="처리한 배치 수 (서버 시작 이후)")
+    reclaimed: int = Field(..., description="삭제한 파일 수 (서버 시작 이후)")
+    reclaimedBytes: int = Field(..., description="삭제한 파일 크기 합계 (바이트, 서버 시작 이후)")
+    skipped: int = Field(..., description="다른 카드가 참조 중이거나 이미 없어 건너뛴 파일 수")
+    deferred: int = Field(..., description="업로드 유예 기간 중이라 다시 예약한 블롭 수")
+    retried: int = Field(..., description="삭제 실패 후 재시도 예약 횟수")
+    gaveUp: int = Field(..., description="재시도를 중단한 파일 수 (서버 시작 이후)")
+    lastError: Optional[str] = Field(None, description="마지막 삭제 실패 메시지")
+    lastRunAt: Optional[str] = Field(None, description="마지막 회수 실행 시각 (UTC)")
+
+
+class FileRelocationStatsResponseSchema(BaseModel):
+    """파일 재배치기 지표 응답 스키마"""
+    success: bool = Field(..., description="성공 여부")
+    pending: int = Field(..., description="이동 대기 중인 파일 수 (재시도 예정 포함)")
+    failed: int = Field(..., description="최대 시도 횟수를 넘겨 실패로 남은 파일 수")
+    batches: int = Field(..., description="처리한 배치 수 (서버 시작 이후)")
+    moved: int = Field(..., description="이동 후 카드 URL을 갱신한 파일 수 (서버 시작 이후)")
+    skipped: int = Field(..., description="원본이 없거나 이미 카드 디렉토리에 있어 건너뛴 파일 수")
+    orphaned: int = Field(..., description="이동 중 카드가 삭제·변경되어 새 파일을 회수 대기열에 넣은 수")
+    retried: int = Field(..., description="이동 실패 후 재시도 예약 횟수")
+    gaveUp: int = Field(..., description="재시도를 중단한 파일 수 (서버 시작 이후)")
+    lastError: Optional[str] = Field(None, description="마지막 이동 실패 메시지")
+    lastRunAt: Optional[str] = Field(None, description="마지막 재배치 실행 시각 (UTC)")
+
+
 class CardGeneratedImageUploadResponseSchema(BaseModel):
     """카드 합성이미지 업로드 응답 스키마"""
     success: bool = Field(..., description="성공 여부")
@@ -119,6 +207,48 @@ class CardGeneratedImageListResponseSchema(BaseModel):
     """카드 합성이미지 목록 응답 스키마"""
     success: bool = Field(..., description="성공 여부")
     images: list[str] = Field(default_factory=list, description="합성이미지 URL 목록 (등록 순서)")
+    imageMetadata: dict[str, ImageMetadataSchema] = Field(
+        default_factory=dict,
+        description="합성이미지 URL → 메타데이터 (메타데이터가 기록된 이미지만)"
+    )
+
+
+class GenerationJobCreateSchema(BaseModel):
+    """이미지 생성 작업 제출 요청 스키마"""
+    cardSn: int = Field(..., description="생성 결과를 연결할 카드 일련번호")
+    prompt: Optional[str] = Field(None, description="생성 프롬프트 (없으면 카드 정보로 자동 생성)")
+    backend: Optional[str] = Field(None, description="생성 백엔드 (fake, qwen, 없으면 서버 기본값)")
+    model: Optional[str] = Field(None, description="모델명 (없으면 백엔드 기본값)")
+    width: Optional[int] = Field(None, ge=64, le=2048, description="이미지 너비 (px)")
+    height: Optional[int] = Field(None, ge=64, le=2048, description="이미지 높이 (px)")
+    steps: Optional[int] = Field(None, ge=1, le=200, description="추론 스텝 수")
+    seed: Optional[int] = Field(None, description="랜덤 시드 (같은 시드는 같은 결과)")
+    numImages: int = Field(default=1, ge=1, le=4, description="생성할 이미지 수")
+
+
+class GenerationJobSubmitResponseSchema(BaseModel):
+    """이미지 생성 작업 제출 응답 스키마"""
+    success: bool = Field(..., description="성공 여부")
+    message: str = Field(..., description="응답 메시지")
+    jobId: str = Field(..., description="작업 ID")
+    status: str = Field(..., description="작업 상태 (queued, running, succeeded, failed)")
+
+
+class GenerationJobStatusResponseSchema(BaseModel):
+    """이미지 생성 작업 상태 응답 스키마"""
+    success: bool = Field(..., description="성공 여부")
+    jobId: str = Field(..., description="작업 ID")
+    cardSn: int = Field(..., description="카드 일련번호")
+    status: str = Field(..., description="작업 상태 (queued, running, succeeded, failed)")
+    backend: str = Field(..., description="생성 백엔드")
+    model: str = Field(..., description="모델명")
+    attempts: int = Field(..., description="시도 횟수")
+    imageUrls: list[str] = Field(default_factory=list, description="생성된 이미지 URL 목록")
+    error: Optional[str] = Field(None, description="실패 시 에러 메시지")
+    createdAt: str = Field(..., description="제출일시")
+    startedAt: Optional[str] = Field(None, description="시작일시")
+    finishedAt: Optional[str] = Field(None, description="종료일시")
+    elapsedMs: Optional[int] = Field(None, description="마지막 시도 생성 소요 시간 (ms)")
 
 
 class RootResponseSchema(BaseModel):
@@ -126,3 +256,13 @@ class RootResponseSchema(BaseModel):
     message: str = Field(..., description="서버 메시지")
     version: str = Field(..., description="서버 버전")
     status: str = Field(default="running", description="서버 상태")
+
+
+class GenerationStatsResponseSchema(BaseModel):
+    """이미지 생성 작업 지표 응답 스키마"""
+    success: bool = Field(..., description="성공 여부")
+    queued: int = Field(..., description="대기열에 있는 작업 수")
+    jobs: dict[str, int] = Field(default_factory=dict, description="상태별 작업 수")
+    batching: dict = Field(default_factory=dict, description="배치 지표 (fillRate, averageSize, sizeHistogram 등)")
+    promptCache: dict = Field(default_factory=dict, description="프롬프트 캐시 지표 (hits, misses, size, maxSize)")
+    writeQueue: dict = Field(default_factory=dict, description="그룹 커밋 쓰기 큐 지표 (commits, averageGroupSize, averageWaitMs 등)")
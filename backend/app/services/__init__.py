@@ -2,5 +2,6 @@
 서비스 레이어 모듈
 """
 from app.services.card_service import CardService
+from app.services.blob_service import BlobService
 
-__all__ = ["CardService"]
+__all__ = ["CardService", "BlobService"]
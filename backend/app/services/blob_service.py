@@ -0,0 +1,115 @@
+"""
+이미지 블롭 참조 카운트 관리
+"""
+from typing import Iterable, Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.database.models import ImageBlob
+from app.utils.blob_store import parse_blob_url
+
+
+# IN 목록 1회당 최대 값 수 (SQLite 바인드 변수 한도 이내)
+_IN_CHUNK_SIZE = 500
+
+
+class BlobService:
+    """
+    블롭 참조 카운트 서비스
+
+    acquire / release_many는 호출자의 트랜잭션 안에서 실행되며 커밋하지 않습니다.
+    release_many가 반환한 URL은 같은 트랜잭션에서 파일 회수 대기열(FileReclaimer)에 넣습니다.
+    """
+
+    @staticmethod
+    def acquire(db: Session, url: Optional[str]) -> bool:
+        """
+        블롭 URL의 참조 카운트 1 증가 (행이 없으면 생성)
+
+        Args:
+            db: 데이터베이스 세션
+            url: 이미지 URL
+
+        Returns:
+            bool: 블롭 URL이어서 참조를 획득했으면 True
+        """
+        parsed = parse_blob_url(url)
+        if not parsed:
+            return False
+        sha256, extension = parsed
+
+        stmt = sqlite_insert(ImageBlob).values(sha256=sha256, extension=extension, ref_count=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ImageBlob.sha256],
+            set_={"ref_count": ImageBlob.ref_count + 1, "updated_at": func.now()},
+        )
+        db.execute(stmt)
+        return True
+
+    @staticmethod
+    def acquire_many(db: Session, urls: Iterable[Optional[str]]) -> int:
+        """
+        여러 URL의 참조 카운트를 한 번에 증가 (블롭별로 합산하여 UPSERT 1회, 일괄 가져오기용)
+
+        Args:
+            db: 데이터베이스 세션
+            urls: 이미지 URL 목록 (블롭 URL이 아닌 항목은 무시)
+
+        Returns:
+            int: 획득한 참조 수
+        """
+        counts: dict[tuple[str, str], int] = {}
+        for url in urls:
+            parsed = parse_blob_url(url)
+            if parsed:
+                counts[parsed] = counts.get(parsed, 0) + 1
+
+        for (sha256, extension), count in counts.items():
+            stmt = sqlite_insert(ImageBlob).values(sha256=sha256, extension=extension, ref_count=count)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ImageBlob.sha256],
+                set_={"ref_count": ImageBlob.ref_count + count, "updated_at": func.now()},
+            )
+            db.execute(stmt)
+        return sum(counts.values())
+
+    @staticmethod
+    def release_many(db: Session, urls: Iterable[Optional[str]]) -> list[str]:
+        """
+        여러 URL의 참조 카운트를 한 번에 감소 (블롭별로 합산하여 UPDATE 1회, 일괄 삭제용)
+
+        Args:
+            db: 데이터베이스 세션
+            urls: 이미지 URL 목록 (블롭 URL이 아닌 항목은 무시)
+
+        Returns:
+            list[str]: 참조가 0이 되어 회수 대상이 된 블롭 URL (블롭당 1개)
+        """
+        counts: dict[str, int] = {}
+        blob_urls: dict[str, str] = {}
+        for url in urls:
+            parsed = parse_blob_url(url)
+            if parsed:
+                counts[parsed[0]] = counts.get(parsed[0], 0) + 1
+                blob_urls.setdefault(parsed[0], url)
+        if not counts:
+            return []
+
+        for sha256, count in counts.items():
+            db.execute(
+                update(ImageBlob)
+                .where(ImageBlob.sha256 == sha256)
+                .values(ref_count=ImageBlob.ref_count - count)
+            )
+
+        released: list[str] = []
+        hashes = list(counts)
+        for start in range(0, len(hashes), _IN_CHUNK_SIZE):
+            chunk = hashes[start:start + _IN_CHUNK_SIZE]
+            released.extend(db.execute(
+                select(ImageBlob.sha256).where(ImageBlob.sha256.in_(chunk), ImageBlob.ref_count <= 0)
+            ).scalars().all())
+        for start in range(0, len(released), _IN_CHUNK_SIZE):
+            db.execute(delete(ImageBlob).where(ImageBlob.sha256.in_(released[start:start + _IN_CHUNK_SIZE])))
+        return [blob_urls[sha256] for sha256 in released]
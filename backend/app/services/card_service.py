@@ -1,10 +1,182 @@
 """
 카드 생성 관련 비즈니스 로직
 """
+import json
+import re
+from functools import lru_cache
+from app.core.config import settings
 from app.schemas.card import CardDataSchema, CardGenerationRequestSchema, CardSaveRequestSchema
 from app.database.models import Card
+from sqlalchemy import delete, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Dict
+from typing import Dict, Optional
+
+
+# 프롬프트 템플릿 (모듈 로드 시 한 번만 구성)
+_PROMPT_EMPTY_ROW = "│  │                                 │\n"
+_PROMPT_DIVIDER_ROW = "│  │  ─────────────────────────────  │\n"
+
+_PROMPT_LAYOUT_HEAD = (
+    "트레이딩 카드 게임 스타일의 카드 일러스트를 생성하세요.\n\n"
+    "=== 카드 레이아웃 (시각적 구조) ===\n\n"
+    "┌─────────────────────────────────────────┐\n"
+    "│  [배경 이미지 - Layer 2 (전체 영역)]     │\n"
+    "│  ┌─────────────────────────────────┐   │\n"
+    "│  │                                 │   │\n"
+)
+_PROMPT_HEADER_ROW = "│  │  ⭕{type}  {rarity}  {name}  {attribute}⭕ │\n"
+_PROMPT_CHARACTER_BLOCK = (
+    _PROMPT_DIVIDER_ROW
+    + _PROMPT_EMPTY_ROW
+    + "│  │    [메인 캐릭터 이미지 - Layer 1]  │\n"
+    + _PROMPT_EMPTY_ROW
+    + _PROMPT_DIVIDER_ROW
+)
+_PROMPT_SKILL_ROWS = "│  │  [스킬 {index}] {name}│\n│  │  • {description}│\n" + _PROMPT_EMPTY_ROW
+_PROMPT_FLAVOR_ROWS = "│  │  \"{flavor}\"│\n" + _PROMPT_EMPTY_ROW
+_PROMPT_TEXT_ROW = "│  │  {text}│\n"
+_PROMPT_LAYOUT_TAIL = (
+    "│  └─────────────────────────────────┘   │\n"
+    "└─────────────────────────────────────────┘\n"
+    "(모든 텍스트는 투명 배경 오버레이로 배경 위에 표시)\n\n"
+    "=== 카드 데이터 (구조화된 정보) ===\n\n"
+)
+_PROMPT_STYLE_GUIDE = (
+    "\n\n"
+    "=== 스타일 가이드 ===\n"
+    "- 트레이딩 카드 게임 스타일 (포켓몬카드, 원피스카드 등 참고)\n"
+    "- 모든 텍스트는 투명도가 높은 배경 위에 오버레이로 표시\n"
+    "- 배경 이미지가 카드 전체를 덮고, 그 위에 캐릭터와 텍스트가 배치됨\n"
+    "- 상세하고 전문적인 일러스트 품질\n"
+    "- 카드 비율: 5:7 (세로형, 400x560px 기준)\n"
+)
+
+
+# 검색어에서 추출할 단어 (유니코드 문자·숫자 연속, FTS5 unicode61 토크나이저와 같은 기준)
+_SEARCH_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+_SEARCH_MAX_TERMS = 16
+
+# 일괄 삭제 시 IN 목록 1회당 최대 card_sn 수 (SQLite 바인드 변수 한도 이내)
+_DELETE_CHUNK_SIZE = 500
+
+
+def build_search_match(query: str) -> str:
+    """
+    사용자 검색어를 FTS5 MATCH 식으로 변환
+    
+    단어마다 접두어 검색("단어"*)으로 만들고 모두 포함하는(AND) 카드만 찾습니다.
+    한글은 어절 단위로 색인되므로 "불꽃"으로 "불꽃의", "불꽃을" 등을 찾을 수 있습니다.
+    FTS5 연산자(AND, OR, NEAR, 따옴표 등)는 일반 단어로 취급합니다.
+    
+    Args:
+        query: 사용자 검색어
+        
+    Returns:
+        str: MATCH 식
+        
+    Raises:
+        ValueError: 검색할 단어가 없는 경우
+    """
+    terms = _SEARCH_TERM_PATTERN.findall(query or "")[:_SEARCH_MAX_TERMS]
+    if not terms:
+        raise ValueError("검색어를 입력하세요.")
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _truncate(value: Optional[str], length: int) -> str:
+    """length자까지 자르기 (None은 빈 문자열)"""
+    return (value or "")[:length]
+
+
+def _render_prompt(cache_key: tuple) -> str:
+    """
+    캐시 키(CardService.prompt_cache_key)로부터 프롬프트 렌더링
+    
+    조각을 리스트에 모아 한 번의 join으로 결합합니다.
+    """
+    fields, character_image_url, background_image_url = cache_key
+    card_data = dict(fields)
+    
+    type_str = card_data["type"] or "[타입]"
+    rarity_str = card_data["rarity"] or "[등급]"
+    card_name_str = card_data["cardName"] or "카드명"
+    attribute_str = card_data["attribute"] or "[속성]"
+    attack_str = card_data["attack"] or "0"
+    health_str = card_data["health"] or "0"
+    # 메타 정보 (card_number는 DB에서 자동 생성되므로 프롬프트에서는 제외)
+    series_str = card_data["series"] or "[시리즈]"
+    flavor_text = card_data["flavorText"]
+    
+    parts = [
+        _PROMPT_LAYOUT_HEAD,
+        _PROMPT_HEADER_ROW.format(type=type_str, rarity=rarity_str, name=card_name_str, attribute=attribute_str),
+        _PROMPT_CHARACTER_BLOCK,
+    ]
+    
+    # 스킬 영역
+    skills = []
+    for index in (1, 2):
+        name = card_data[f"skill{index}Name"]
+        if not (name and name.strip()):
+            continue
+        description = card_data[f"skill{index}Description"]
+        parts.append(_PROMPT_SKILL_ROWS.format(
+            index=index,
+            name=name[:12].ljust(20),
+            description=_truncate(description, 30).ljust(30),
+        ))
+        skills.append({"name": name, "description": description or ""})
+    parts.append(_PROMPT_DIVIDER_ROW)
+    
+    # 플레이버 텍스트
+    if flavor_text and flavor_text.strip():
+        parts.append(_PROMPT_FLAVOR_ROWS.format(flavor=flavor_text[:35].ljust(35)))
+    
+    # 공격력/체력, 메타 정보
+    parts.append(_PROMPT_TEXT_ROW.format(text=f"⚔️ {attack_str}  ❤️ {health_str}".ljust(35)))
+    parts.append(_PROMPT_EMPTY_ROW)
+    parts.append(_PROMPT_TEXT_ROW.format(text=series_str.ljust(35)))
+    parts.append(_PROMPT_LAYOUT_TAIL)
+    
+    # 구조화된 데이터 프롬프트
+    card_data_dict = {
+        "layout": {
+            "layer2": {
+                "type": "배경 이미지",
+                "description": "카드 전체를 덮는 배경 이미지",
+                "reference": background_image_url or "없음"
+            },
+            "layer1": {
+                "type": "메인 캐릭터 이미지",
+                "description": "배경 위 중앙에 배치되는 메인 캐릭터",
+                "reference": character_image_url or "없음"
+            }
+        },
+        "header": {
+            "type": type_str,
+            "rarity": rarity_str,
+            "cardName": card_name_str,
+            "attribute": attribute_str
+        },
+        "skills": skills,
+        "stats": {
+            "attack": attack_str,
+            "health": health_str
+        },
+        "description": flavor_text if flavor_text else None,
+        "meta": {
+            "series": series_str
+        }
+    }
+    parts.append(json.dumps(card_data_dict, ensure_ascii=False, indent=2))
+    parts.append(_PROMPT_STYLE_GUIDE)
+    
+    return "".join(parts)
+
+
+# 프롬프트 LRU 캐시 (관리 화면은 폼을 수정할 때마다 같은 카드로 반복 호출)
+_render_prompt_cached = lru_cache(maxsize=settings.PROMPT_CACHE_SIZE)(_render_prompt)
 
 
 class CardService:
@@ -40,346 +212,545 @@ class CardService:
         """
         카드 생성 프롬프트 생성
         
+        같은 카드 데이터·이미지 URL 조합의 프롬프트는 LRU 캐시(PROMPT_CACHE_SIZE)에서 반환합니다.
+        
         Args:
             request: 카드 생성 요청 데이터
             
         Returns:
             생성된 프롬프트 문자열
         """
-        card_data = request.cardData
+        return _render_prompt_cached(CardService.prompt_cache_key(request))
+    
+    @staticmethod
+    def prompt_cache_key(request: CardGenerationRequestSchema) -> tuple:
+        """
+        프롬프트 캐시 키 (카드 데이터 필드와 이미지 URL의 정규화된 튜플)
         
-        # 시각적 레이아웃 프롬프트 (ASCII 아트 형태)
-        prompt = "트레이딩 카드 게임 스타일의 카드 일러스트를 생성하세요.\n\n"
-        prompt += "=== 카드 레이아웃 (시각적 구조) ===\n\n"
-        prompt += "┌─────────────────────────────────────────┐\n"
-        prompt += "│  [배경 이미지 - Layer 2 (전체 영역)]     │\n"
-        prompt += "│  ┌─────────────────────────────────┐   │\n"
-        prompt += "│  │                                 │   │\n"
-        
-        # 상단 헤더
-        type_str = card_data.type if card_data.type else "[타입]"
-        rarity_str = card_data.rarity if card_data.rarity else "[등급]"
-        card_name_str = card_data.cardName if card_data.cardName else "카드명"
-        attribute_str = card_data.attribute if card_data.attribute else "[속성]"
-        
-        prompt += f"│  │  ⭕{type_str}  {rarity_str}  {card_name_str}  {attribute_str}⭕ │\n"
-        prompt += "│  │  ─────────────────────────────  │\n"
-        prompt += "│  │                                 │\n"
-        
-        # 메인 캐릭터 이미지
-        prompt += "│  │    [메인 캐릭터 이미지 - Layer 1]  │\n"
-        prompt += "│  │                                 │\n"
-        prompt += "│  │  ─────────────────────────────  │\n"
-        
-        # 스킬 영역
-        if card_data.skill1Name and card_data.skill1Name.strip():
-            skill1_name = card_data.skill1Name[:12] if len(card_data.skill1Name) > 12 else card_data.skill1Name
-            skill1_desc = card_data.skill1Description[:30] if card_data.skill1Description and len(card_data.skill1Description) > 30 else (card_data.skill1Description or "")
-            prompt += f"│  │  [스킬 1] {skill1_name.ljust(20)}│\n"
-            prompt += f"│  │  • {skill1_desc.ljust(30)}│\n"
-            prompt += "│  │                                 │\n"
-        
-        if card_data.skill2Name and card_data.skill2Name.strip():
-            skill2_name = card_data.skill2Name[:12] if len(card_data.skill2Name) > 12 else card_data.skill2Name
-            skill2_desc = card_data.skill2Description[:30] if card_data.skill2Description and len(card_data.skill2Description) > 30 else (card_data.skill2Description or "")
-            prompt += f"│  │  [스킬 2] {skill2_name.ljust(20)}│\n"
-            prompt += f"│  │  • {skill2_desc.ljust(30)}│\n"
-            prompt += "│  │                                 │\n"
-        
-        prompt += "│  │  ─────────────────────────────  │\n"
-        
-        # 플레이버 텍스트
-        if card_data.flavorText and card_data.flavorText.strip():
-            flavor_text = card_data.flavorText[:35] if len(card_data.flavorText) > 35 else card_data.flavorText
-            prompt += f"│  │  \"{flavor_text.ljust(35)}\"│\n"
-            prompt += "│  │                                 │\n"
-        
-        # 공격력/체력
-        attack_str = card_data.attack if card_data.attack else "0"
-        health_str = card_data.health if card_data.health else "0"
-        stats = f"⚔️ {attack_str}  ❤️ {health_str}"
-        prompt += f"│  │  {stats.ljust(35)}│\n"
-        prompt += "│  │                                 │\n"
-        
-        # 메타 정보 (card_number는 DB에서 자동 생성되므로 프롬프트에서는 제외)
-        series_str = card_data.series if card_data.series else "[시리즈]"
-        meta_info = series_str
-        prompt += f"│  │  {meta_info.ljust(35)}│\n"
-        prompt += "│  └─────────────────────────────────┘   │\n"
-        prompt += "└─────────────────────────────────────────┘\n"
-        prompt += "(모든 텍스트는 투명 배경 오버레이로 배경 위에 표시)\n\n"
-        
-        # 구조화된 데이터 프롬프트
-        prompt += "=== 카드 데이터 (구조화된 정보) ===\n\n"
-        
-        card_data_dict = {
-            "layout": {
-                "layer2": {
-                    "type": "배경 이미지",
-                    "description": "카드 전체를 덮는 배경 이미지",
-                    "reference": request.backgroundImageUrl or "없음"
-                },
-                "layer1": {
-                    "type": "메인 캐릭터 이미지",
-                    "description": "배경 위 중앙에 배치되는 메인 캐릭터",
-                    "reference": request.characterImageUrl or "없음"
-                }
-            },
-            "header": {
-                "type": type_str,
-                "rarity": rarity_str,
-                "cardName": card_name_str,
-                "attribute": attribute_str
-            },
-            "skills": [],
-            "stats": {
-                "attack": attack_str,
-                "health": health_str
-            },
-            "description": card_data.flavorText if card_data.flavorText else None,
-            "meta": {
-                "series": series_str
-            }
+        Args:
+            request: 카드 생성 요청 데이터
+            
+        Returns:
+            tuple: ((필드명, 값), ...), 캐릭터 이미지 URL, 배경 이미지 URL
+        """
+        return (
+            tuple(sorted(request.cardData.model_dump().items())),
+            request.characterImageUrl,
+            request.backgroundImageUrl,
+        )
+    
+    @staticmethod
+    def prompt_cache_stats() -> dict:
+        """프롬프트 캐시 지표 (적중/미스 수, 현재 크기, 최대 크기)"""
+        info = _render_prompt_cached.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxSize": info.maxsize,
         }
+    
+    @staticmethod
+    def build_generation_request(card: Card) -> CardGenerationRequestSchema:
+        """
+        저장된 카드로부터 프롬프트 생성 요청 데이터 구성
+        
+        Args:
+            card: 카드 객체
+            
+        Returns:
+            CardGenerationRequestSchema: generate_prompt에 전달할 요청 데이터
+        """
+        return CardGenerationRequestSchema(
+            cardData=CardDataSchema(
+                cardName=card.card_name,
+                type=card.type,
+                attribute=card.attribute,
+                rarity=card.rarity,
+                attack=card.attack or "0",
+                health=card.health or "0",
+                skill1Name=card.skill1_name or "",
+                skill1Description=card.skill1_description or "",
+                skill2Name=card.skill2_name or "",
+                skill2Description=card.skill2_description or "",
+                flavorText=card.flavor_text or "",
+                cardNumber=card.card_number or "",
+                series=card.series or "",
+            ),
+            characterImageUrl=card.character_image_url,
+            backgroundImageUrl=card.background_image_url,
+        )
+    
+    @staticmethod
+    def get_card_storage_subdirectory(card: Card) -> str:
+        """
+        카드 이미지가 저장될 업로드 하위 디렉토리 ({series}/{card_number})
+        
+        Args:
+            card: 카드 객체 (card_sn가 할당된 상태)
+            
+        Returns:
+            str: 업로드 디렉토리 기준 상대 경로 (예: "My_Series/001")
+        """
+        series_name = card.series or "default"
+        card_number = card.card_number or str(card.card_sn)
+        
+        # card_number에서 # 제거 및 특수문자 처리
+        clean_number = card_number.replace('#', '').strip()
+        
+        # 시리즈명과 번호로 디렉토리 경로 생성 (특수문자 제거)
+        safe_series = "".join(c for c in series_name if c.isalnum() or c in (' ', '-', '_')).strip()
+        safe_series = safe_series.replace(' ', '_') if safe_series else "default"
+        safe_number = "".join(c for c in clean_number if c.isalnum() or c in ('-', '_')).strip() or str(card.card_sn)
+        
+        return f"{safe_series}/{safe_number}"
+    
+    @staticmethod
+    def card_columns(
+        card_data: CardDataSchema,
+        character_image_url: Optional[str] = None,
+        background_image_url: Optional[str] = None,
+        generated_prompt: Optional[str] = None,
+        generated_image_url: Optional[str] = None,
+    ) -> dict:
+        """
+        카드 데이터를 cards 테이블 컬럼 값으로 변환 (빈 문자열은 NULL, 스탯 기본값 "0")
         
-        # 스킬 추가
-        if card_data.skill1Name and card_data.skill1Name.strip():
-            card_data_dict["skills"].append({
-                "name": card_data.skill1Name,
-                "description": card_data.skill1Description or ""
-            })
-        
-        if card_data.skill2Name and card_data.skill2Name.strip():
-            card_data_dict["skills"].append({
-                "name": card_data.skill2Name,
-                "description": card_data.skill2Description or ""
-            })
-        
-        import json
-        prompt += json.dumps(card_data_dict, ensure_ascii=False, indent=2)
-        prompt += "\n\n"
-        
-        # 스타일 가이드
-        prompt += "=== 스타일 가이드 ===\n"
-        prompt += "- 트레이딩 카드 게임 스타일 (포켓몬카드, 원피스카드 등 참고)\n"
-        prompt += "- 모든 텍스트는 투명도가 높은 배경 위에 오버레이로 표시\n"
-        prompt += "- 배경 이미지가 카드 전체를 덮고, 그 위에 캐릭터와 텍스트가 배치됨\n"
-        prompt += "- 상세하고 전문적인 일러스트 품질\n"
-        prompt += "- 카드 비율: 5:7 (세로형, 400x560px 기준)\n"
-        
-        return prompt
+        Returns:
+            dict: 컬럼명 → 값 (card_sn 제외)
+        """
+        return {
+            "card_name": card_data.cardName,
+            "card_number": card_data.cardNumber or None,
+            "type": card_data.type,
+            "attribute": card_data.attribute,
+            "rarity": card_data.rarity,
+            "attack": card_data.attack or "0",
+            "health": card_data.health or "0",
+            "skill1_name": card_data.skill1Name or None,
+            "skill1_description": card_data.skill1Description or None,
+            "skill2_name": card_data.skill2Name or None,
+            "skill2_description": card_data.skill2Description or None,
+            "flavor_text": card_data.flavorText or None,
+            "series": card_data.series or None,
+            "character_image_url": character_image_url or None,
+            "background_image_url": background_image_url or None,
+            "generated_prompt": generated_prompt or None,
+            "generated_image_url": generated_image_url or None,
+        }
     
     @staticmethod
-    def save_card(db: Session, request: CardSaveRequestSchema) -> Card:
+    async def save_card(db: AsyncSession, request: CardSaveRequestSchema) -> Card:
         """
         카드 정보를 데이터베이스에 저장
         
         Args:
-            db: 데이터베이스 세션
+            db: 비동기 데이터베이스 세션
             request: 카드 저장 요청 데이터
             
         Returns:
             Card: 저장된 카드 객체
         """
-        from pathlib import Path
-        from app.core.config import settings
-        from app.utils.file_utils import get_file_path_from_url
-        import shutil
+        from fastapi.concurrency import run_in_threadpool
+        from app.services.blob_service import BlobService
+        from app.services.file_relocator import FileRelocator, file_relocator
+        from app.utils.file_utils import current_file_url
         
         card_data = request.cardData
+        image_urls = [request.characterImageUrl, request.backgroundImageUrl, request.generatedImageUrl]
+        sharded = settings.UPLOAD_LAYOUT == "sharded"
+        
+        # sharded 레이아웃: 샤드 디렉토리로 이전된 예전 URL은 새 URL로 저장
+        if sharded:
+            image_urls = await run_in_threadpool(lambda: [current_file_url(url) for url in image_urls])
         
         # 카드 모델 생성 (card_sn는 DB에서 자동 생성되므로 설정하지 않음)
-        card = Card(
-            card_name=card_data.cardName,
-            card_number=card_data.cardNumber or None,
-            type=card_data.type,
-            attribute=card_data.attribute,
-            rarity=card_data.rarity,
-            attack=card_data.attack or "0",
-            health=card_data.health or "0",
-            skill1_name=card_data.skill1Name or None,
-            skill1_description=card_data.skill1Description or None,
-            skill2_name=card_data.skill2Name or None,
-            skill2_description=card_data.skill2Description or None,
-            flavor_text=card_data.flavorText or None,
-            series=card_data.series or None,
-            character_image_url=request.characterImageUrl or None,
-            background_image_url=request.backgroundImageUrl or None,
-            generated_prompt=request.generatedPrompt or None,
-            generated_image_url=request.generatedImageUrl or None,
-        )
+        card = Card(**CardService.card_columns(
+            card_data,
+            character_image_url=image_urls[0],
+            background_image_url=image_urls[1],
+            generated_prompt=request.generatedPrompt,
+            generated_image_url=image_urls[2],
+        ))
         
         # 데이터베이스에 저장 (card_sn를 얻기 위해)
         db.add(card)
-        db.flush()  # flush를 먼저 호출하여 ID 생성
+        await db.flush()  # flush를 먼저 호출하여 ID 생성
         
-        # 파일 재배치: upload/시리즈/번호/원본파일명.png 형식으로 이동
-        series_name = card_data.series or "default"
-        card_number = card.card_number or str(card.card_sn)
+        # 블롭 저장소 이미지는 이동하지 않고 참조만 추가 (동일 내용 공유)
+        relocate_urls = []
+        for image_url in image_urls:
+            if image_url and not await db.run_sync(BlobService.acquire, image_url):
+                relocate_urls.append(image_url)
+        
+        # legacy 레이아웃: 나머지 파일은 upload/시리즈/번호/원본파일명.png 로의 이동을 아웃박스에 기록
+        # (카드는 현재 URL로 바로 커밋하고, 재배치기가 파일을 옮긴 뒤 URL을 갱신)
+        # sharded 레이아웃에서는 업로드된 샤드 위치에 그대로 둠
+        relocations = 0
+        if not sharded:
+            relocations = await db.run_sync(
+                FileRelocator.enqueue,
+                card.card_sn,
+                CardService.get_card_storage_subdirectory(card),
+                relocate_urls,
+            )
+        
+        await db.commit()
+        if relocations:
+            file_relocator.notify()
+        await db.refresh(card)
         
-        # card_number에서 # 제거 및 특수문자 처리
-        clean_number = card_number.replace('#', '').strip()
+        return card
+    
+    @staticmethod
+    async def get_card(db: AsyncSession, card_sn: int) -> Optional[Card]:
+        """
+        카드 일련번호로 카드 조회
         
-        # 시리즈명과 번호로 디렉토리 경로 생성 (특수문자 제거)
-        safe_series = "".join(c for c in series_name if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_series = safe_series.replace(' ', '_') if safe_series else "default"
-        safe_number = "".join(c for c in clean_number if c.isalnum() or c in ('-', '_')).strip() or str(card.card_sn)
+        Args:
+            db: 비동기 데이터베이스 세션
+            card_sn: 카드 일련번호
+            
+        Returns:
+            Optional[Card]: 카드 객체, 없으면 None
+        """
+        return await db.get(Card, card_sn)
+    
+    @staticmethod
+    async def get_all_cards(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, str]] = None,
+    ):
+        """
+        모든 카드 목록 조회 (최신순)
         
-        target_dir = settings.upload_path / safe_series / safe_number
-        target_dir.mkdir(parents=True, exist_ok=True)
-        print(f"타겟 디렉토리 생성: {target_dir}")
-        
-        # 이미지 파일들을 새 경로로 이동
-        image_urls = [
-            (request.characterImageUrl, 'character_image_url'),
-            (request.backgroundImageUrl, 'background_image_url'),
-            (request.generatedImageUrl, 'generated_image_url'),
-        ]
-        
-        for image_url, field_name in image_urls:
-            if not image_url:
-                continue
-                
-            try:
-                # 기존 파일 경로 찾기
-                old_path = get_file_path_from_url(image_url)
-                if not old_path:
-                    print(f"파일 경로를 찾을 수 없음 ({field_name}): {image_url}")
-                    continue
-                if not old_path.exists():
-                    print(f"파일이 존재하지 않음 ({field_name}): {old_path}")
-                    continue
-                
-                print(f"파일 이동 시작 ({field_name}): {old_path} -> {target_dir}")
-                
-                # 원본 파일명 추출 (확장자 포함)
-                original_filename = old_path.name
-                
-                # 새 경로 생성
-                new_path = target_dir / original_filename
-                
-                # 파일이 이미 새 경로에 있으면 스킵 (같은 파일인지 확인)
-                try:
-                    if new_path.exists() and old_path.samefile(new_path):
-                        continue
-                except (OSError, ValueError):
-                    # samefile이 실패하면 다른 파일로 간주하고 계속 진행
-                    pass
-                
-                # 같은 파일명이 이미 존재하면 번호 추가
-                counter = 1
-                base_name = original_filename.rsplit('.', 1)[0] if '.' in original_filename else original_filename
-                extension = original_filename.rsplit('.', 1)[1] if '.' in original_filename else ''
-                
-                while new_path.exists():
-                    if extension:
-                        new_filename = f"{base_name}_{counter}.{extension}"
-                    else:
-                        new_filename = f"{base_name}_{counter}"
-                    new_path = target_dir / new_filename
-                    counter += 1
-                
-                # 파일 이동
-                if old_path != new_path:
-                    shutil.move(str(old_path), str(new_path))
-                    print(f"파일 이동 완료: {new_path}")
-                else:
-                    print(f"파일이 이미 올바른 위치에 있음: {new_path}")
-                
-                # 새 URL 경로 생성
-                relative_path = new_path.relative_to(settings.upload_path.parent)
-                new_url = f"/data/{relative_path.as_posix()}"
-                
-                # 카드 모델의 URL 업데이트
-                setattr(card, field_name, new_url)
-                print(f"URL 업데이트 완료 ({field_name}): {new_url}")
-                
-            except Exception as e:
-                # 파일 이동 실패해도 계속 진행
-                import traceback
-                print(f"파일 이동 실패 ({field_name}): {str(e)}")
-                print(traceback.format_exc())
-                continue
-        
-        db.commit()
-        db.refresh(card)
+        cursor가 있으면 card_sn 기준 keyset 페이지네이션으로 조회하며 skip은 무시합니다.
+        페이지 깊이와 무관하게 인덱스 범위 조회만 수행합니다.
+        filters는 (패싯 컬럼, card_sn) 복합 인덱스로 처리됩니다.
         
-        return card
+        Args:
+            db: 비동기 데이터베이스 세션
+            skip: 건너뛸 개수 (오프셋 페이지네이션, 하위 호환)
+            limit: 가져올 최대 개수
+            cursor: 이전 응답의 nextCursor (선택)
+            filters: 패싯 컬럼(type, attribute, rarity, series) → 일치할 값 (선택)
+            
+        Returns:
+            tuple: (카드 목록, 전체 개수, 다음 페이지 커서 또는 None)
+            
+        Raises:
+            ValueError: 잘못된 커서인 경우
+        """
+        from app.utils.pagination import encode_cursor, decode_cursor
+        
+        active_filters = {facet: value for facet, value in (filters or {}).items() if value is not None}
+        conditions = CardService.facet_conditions(active_filters)
+        stmt = select(Card).where(*conditions).order_by(Card.card_sn.desc())
+        if cursor:
+            last_sn = decode_cursor(cursor).get("sn")
+            if not isinstance(last_sn, int):
+                raise ValueError("잘못된 커서입니다.")
+            stmt = stmt.where(Card.card_sn < last_sn)
+        elif skip:
+            stmt = stmt.offset(skip)
+        
+        # 다음 페이지 존재 여부 확인을 위해 1건 더 조회
+        cards = list((await db.execute(stmt.limit(limit + 1))).scalars().all())
+        next_cursor = None
+        if len(cards) > limit:
+            cards = cards[:limit]
+            next_cursor = encode_cursor({"sn": cards[-1].card_sn}) if cards else None
+        
+        if not conditions:
+            total = await CardService.count_cards(db)
+        elif len(active_filters) == 1:
+            # 단일 필터는 패싯 카운트에서 조회
+            facet, value = next(iter(active_filters.items()))
+            total = await CardService.count_facet_value(db, facet, value)
+        else:
+            total = await db.scalar(select(func.count()).select_from(Card).where(*conditions))
+        
+        return cards, total, next_cursor
+    
+    @staticmethod
+    def facet_conditions(filters: Dict[str, str]) -> list:
+        """
+        패싯 필터를 WHERE 조건으로 변환
+        
+        card_facet_counts는 NULL을 빈 문자열로 집계하므로, 빈 문자열 필터는 NULL인 카드도 포함합니다
+        (값 비교를 그대로 두어 (패싯 컬럼, card_sn) 인덱스를 사용).
+        
+        Raises:
+            ValueError: 패싯이 아닌 컬럼인 경우
+        """
+        from app.database.models import CARD_FACETS
+        
+        conditions = []
+        for facet, value in filters.items():
+            if facet not in CARD_FACETS:
+                raise ValueError(f"필터할 수 없는 항목입니다: {facet}")
+            column = getattr(Card, facet)
+            conditions.append(or_(column == "", column.is_(None)) if value == "" else column == value)
+        return conditions
+    
+    @staticmethod
+    async def count_facet_value(db: AsyncSession, facet: str, value: str) -> int:
+        """
+        패싯 값별 카드 수 (트리거로 유지되는 card_facet_counts 조회)
+        
+        Args:
+            db: 비동기 데이터베이스 세션
+            facet: 패싯 컬럼명
+            value: 값
+            
+        Returns:
+            int: 해당 값을 가진 카드 수
+        """
+        from app.database.models import CardFacetCount
+        
+        row = await db.get(CardFacetCount, (facet, value))
+        return row.count if row is not None else 0
     
     @staticmethod
-    def get_all_cards(db: Session, skip: int = 0, limit: int = 100):
+    async def get_facets(db: AsyncSession) -> Dict[str, list[tuple[Optional[str], int]]]:
         """
-        모든 카드 목록 조회
+        패싯별 값과 카드 수 (card_facet_counts 조회, cards 테이블 GROUP BY 없음)
         
         Args:
-            db: 데이터베이스 세션
-            skip: 건너뛸 개수 (페이지네이션)
+            db: 비동기 데이터베이스 세션
+            
+        Returns:
+            Dict[str, list[tuple[Optional[str], int]]]: 패싯 → (값, 카드 수) 목록 (카드 수 내림차순, 빈 값은 None)
+        """
+        from app.database.models import CARD_FACETS, CardFacetCount
+        
+        facets: Dict[str, list[tuple[Optional[str], int]]] = {facet: [] for facet in CARD_FACETS}
+        result = await db.execute(
+            select(CardFacetCount.facet, CardFacetCount.value, CardFacetCount.count)
+            .where(CardFacetCount.count > 0)
+            .order_by(CardFacetCount.facet, CardFacetCount.count.desc(), CardFacetCount.value)
+        )
+        for facet, value, count in result.all():
+            if facet in facets:
+                facets[facet].append((value or None, count))
+        return facets
+    
+    @staticmethod
+    async def search_cards(db: AsyncSession, query: str, limit: int = 20, cursor: Optional[str] = None):
+        """
+        카드 전문 검색 (FTS5, bm25 관련도순)
+        
+        검색 인덱스에서 일치 항목과 점수를 구한 뒤 한 페이지의 카드만 기본 키로 조회하므로
+        cards 테이블을 스캔하지 않습니다. 페이지는 (점수, card_sn) 커서로 이어집니다.
+        
+        Args:
+            db: 비동기 데이터베이스 세션
+            query: 검색어
             limit: 가져올 최대 개수
+            cursor: 이전 응답의 nextCursor (선택)
             
         Returns:
-            tuple: (카드 목록, 전체 개수)
+            tuple: (카드 목록, 전체 일치 개수(첫 페이지만, 이후 None), 다음 페이지 커서 또는 None)
+            
+        Raises:
+            ValueError: 검색어가 비었거나 잘못된 커서인 경우
+        """
+        from app.database.models import CARD_SEARCH_TABLE, CARD_SEARCH_WEIGHTS
+        from app.utils.pagination import encode_cursor, decode_cursor
+        
+        match = build_search_match(query)
+        weights = ", ".join(str(weight) for weight in CARD_SEARCH_WEIGHTS)
+        params = {"match": match, "limit": limit + 1}
+        
+        # bm25는 관련도가 높을수록 작은 값 (오름차순 정렬)
+        after = ""
+        if cursor:
+            position = decode_cursor(cursor)
+            score, last_sn = position.get("score"), position.get("sn")
+            if not isinstance(score, (int, float)) or not isinstance(last_sn, int):
+                raise ValueError("잘못된 커서입니다.")
+            after = "WHERE (score, card_sn) > (:score, :sn)"
+            params.update(score=score, sn=last_sn)
+        
+        rows = (await db.execute(
+            text(
+                f"SELECT card_sn, score FROM ("
+                f"SELECT rowid AS card_sn, bm25({CARD_SEARCH_TABLE}, {weights}) AS score "
+                f"FROM {CARD_SEARCH_TABLE} WHERE {CARD_SEARCH_TABLE} MATCH :match"
+                f") {after} ORDER BY score, card_sn LIMIT :limit"
+            ),
+            params,
+        )).all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor({"score": rows[-1].score, "sn": rows[-1].card_sn})
+        
+        card_sns = [row.card_sn for row in rows]
+        cards_by_sn = {}
+        if card_sns:
+            result = await db.execute(select(Card).where(Card.card_sn.in_(card_sns)))
+            cards_by_sn = {card.card_sn: card for card in result.scalars().all()}
+        cards = [cards_by_sn[card_sn] for card_sn in card_sns if card_sn in cards_by_sn]
+        
+        total = None
+        if not cursor:
+            total = (await db.execute(
+                text(f"SELECT COUNT(*) FROM {CARD_SEARCH_TABLE} WHERE {CARD_SEARCH_TABLE} MATCH :match"),
+                {"match": match},
+            )).scalar_one()
+        
+        return cards, total, next_cursor
+    
+    @staticmethod
+    async def get_latest_generated_images(db: AsyncSession, card_sns: list[int]) -> dict[int, str]:
         """
-        from app.database.models import Card
+        카드별 최신 합성이미지 URL 조회 (주어진 카드만)
         
-        # 전체 개수 조회
-        total = db.query(Card).count()
+        카드마다 (card_sn, created_at, id) 인덱스를 역순으로 1건만 읽으므로
+        비용은 전체 합성이미지 수가 아니라 카드 수에만 비례합니다.
+        
+        Args:
+            db: 비동기 데이터베이스 세션
+            card_sns: 조회할 카드 일련번호 목록 (한 페이지)
+            
+        Returns:
+            dict[int, str]: card_sn → 최신 합성이미지 URL (합성이미지가 없는 카드는 제외)
+        """
+        from app.database.models import CardGeneratedImage
+        
+        if not card_sns:
+            return {}
+        
+        latest_url = (
+            select(CardGeneratedImage.image_url)
+            .where(CardGeneratedImage.card_sn == Card.card_sn)
+            .order_by(CardGeneratedImage.created_at.desc(), CardGeneratedImage.id.desc())
+            .limit(1)
+            .correlate(Card)
+            .scalar_subquery()
+        )
+        rows = (await db.execute(
+            select(Card.card_sn, latest_url).where(Card.card_sn.in_(card_sns))
+        )).all()
+        return {card_sn: url for card_sn, url in rows if url}
+    
+    @staticmethod
+    async def count_cards(db: AsyncSession) -> int:
+        """
+        전체 카드 개수 (트리거로 유지되는 table_counters 조회, 없으면 COUNT(*))
         
-        # 카드 목록 조회 (최신순)
-        cards = db.query(Card).order_by(Card.card_sn.desc()).offset(skip).limit(limit).all()
+        Args:
+            db: 비동기 데이터베이스 세션
+            
+        Returns:
+            int: 전체 카드 개수
+        """
+        from app.database.models import TableCounter
         
-        return cards, total
+        counter = await db.get(TableCounter, Card.__tablename__)
+        if counter is not None:
+            return counter.value
+        return await db.scalar(select(func.count()).select_from(Card))
     
     @staticmethod
-    def delete_card(db: Session, card_sn: int) -> bool:
+    async def delete_card(db: AsyncSession, card_sn: int) -> bool:
         """
-        카드 삭제 (연결된 이미지 파일·합성 테이블 행도 함께 삭제)
+        카드 삭제 (합성 테이블 행도 함께 삭제, 이미지 파일은 백그라운드 회수기가 삭제)
         
         Args:
-            db: 데이터베이스 세션
+            db: 비동기 데이터베이스 세션
             card_sn: 카드 일련번호
             
         Returns:
             bool: 삭제 성공 여부
         """
-        from app.database.models import Card, CardGeneratedImage
-        from app.utils.file_utils import get_file_path_from_url, delete_file
+        deleted, _, _ = await CardService.delete_cards(db, card_sns=[card_sn])
+        return bool(deleted)
+    
+    @staticmethod
+    async def delete_cards(
+        db: AsyncSession,
+        card_sns: Optional[list[int]] = None,
+        filters: Optional[Dict[str, str]] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[list[int], int, bool]:
+        """
+        카드 일괄 삭제 (한 트랜잭션)
         
-        # 카드 조회
-        card = db.query(Card).filter(Card.card_sn == card_sn).first()
+        카드·합성이미지 행 삭제, 블롭 참조 감소, 삭제할 파일의 회수 대기열 등록을 한 트랜잭션으로 커밋하고
+        물리 파일 삭제는 백그라운드 회수기(file_reclaimer)에 맡기므로 디스크 I/O를 기다리지 않습니다.
         
-        if not card:
-            return False
+        Args:
+            db: 비동기 데이터베이스 세션
+            card_sns: 삭제할 카드 일련번호 목록 (지정 시 filters 무시)
+            filters: 패싯 컬럼(type, attribute, rarity, series) → 일치할 값
+            limit: filters로 삭제할 최대 카드 수 (card_sn 오름차순, 기본: CARD_BULK_DELETE_MAX)
+            
+        Returns:
+            tuple: (삭제된 card_sn 목록, 회수 대기열에 넣은 파일 수, filters에 일치하는 카드가 더 남았는지 여부)
+            
+        Raises:
+            ValueError: card_sns와 filters가 모두 비어 있거나 패싯이 아닌 필터인 경우
+        """
+        from app.services.file_reclaimer import file_reclaimer
         
-        # 연결된 이미지 파일들 삭제 (character, background, generated)
-        image_urls = [
-            card.character_image_url,
-            card.background_image_url,
-            card.generated_image_url,
-        ]
+        active_filters = {facet: value for facet, value in (filters or {}).items() if value is not None}
+        if card_sns is None and not active_filters:
+            raise ValueError("삭제할 카드 일련번호 목록 또는 필터를 지정해야 합니다.")
+        conditions = CardService.facet_conditions(active_filters) if card_sns is None else []
+        limit = max(1, limit or settings.CARD_BULK_DELETE_MAX)
         
-        for image_url in image_urls:
-            if not image_url:
-                continue
-            try:
-                file_path = get_file_path_from_url(image_url)
-                if file_path and file_path.exists():
-                    delete_file(file_path)
-            except Exception as e:
-                print(f"파일 삭제 중 오류 발생 ({image_url}): {str(e)}")
-        
-        # 합성카드 테이블 연관 행 삭제 및 물리 파일 삭제
-        gen_images = db.query(CardGeneratedImage).filter(CardGeneratedImage.card_sn == card_sn).all()
-        for row in gen_images:
-            try:
-                file_path = get_file_path_from_url(row.image_url)
-                if file_path and file_path.exists():
-                    delete_file(file_path)
-            except Exception as e:
-                print(f"합성이미지 파일 삭제 중 오류 ({row.image_url}): {str(e)}")
-            db.delete(row)
-        
-        # 카드 삭제
-        db.delete(card)
-        db.commit()
-        
-        return True
+        deleted, queued, has_more = await db.run_sync(
+            CardService._delete_rows, card_sns, conditions, limit
+        )
+        await db.commit()
+        if queued:
+            file_reclaimer.notify()
+        return deleted, queued, has_more
+    
+    @staticmethod
+    def _delete_rows(db: Session, card_sns: Optional[list[int]], conditions: list, limit: int) -> tuple[list[int], int, bool]:
+        """삭제 대상 조회 → 블롭 참조 감소 → 회수 대기열 등록 → 행 삭제 (run_sync 안에서 실행, 커밋하지 않음)"""
+        from app.database.models import CardGeneratedImage
+        from app.services.blob_service import BlobService
+        from app.services.file_reclaimer import FileReclaimer
+        from app.utils.blob_store import is_blob_url
+        
+        columns = (Card.card_sn, Card.character_image_url, Card.background_image_url, Card.generated_image_url)
+        has_more = False
+        if card_sns is not None:
+            unique_sns = list(dict.fromkeys(card_sns))
+            rows = []
+            for start in range(0, len(unique_sns), _DELETE_CHUNK_SIZE):
+                chunk = unique_sns[start:start + _DELETE_CHUNK_SIZE]
+                rows.extend(db.execute(select(*columns).where(Card.card_sn.in_(chunk))).all())
+        else:
+            rows = db.execute(
+                select(*columns).where(*conditions).order_by(Card.card_sn).limit(limit + 1)
+            ).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+        
+        deleted = [row[0] for row in rows]
+        image_urls = [url for row in rows for url in row[1:] if url]
+        for start in range(0, len(deleted), _DELETE_CHUNK_SIZE):
+            chunk = deleted[start:start + _DELETE_CHUNK_SIZE]
+            image_urls.extend(db.execute(
+                select(CardGeneratedImage.image_url).where(CardGeneratedImage.card_sn.in_(chunk))
+            ).scalars().all())
+        
+        # 블롭은 참조가 0이 된 것만, 일반 파일은 전부 회수 대상 (회수 직전에 다른 참조가 없는지 다시 확인)
+        released_blobs = BlobService.release_many(db, image_urls)
+        file_urls = [url for url in image_urls if not is_blob_url(url)]
+        queued = FileReclaimer.enqueue(db, released_blobs + file_urls)
+        
+        for start in range(0, len(deleted), _DELETE_CHUNK_SIZE):
+            chunk = deleted[start:start + _DELETE_CHUNK_SIZE]
+            db.execute(delete(CardGeneratedImage).where(CardGeneratedImage.card_sn.in_(chunk)))
+            db.execute(delete(Card).where(Card.card_sn.in_(chunk)))
+        return deleted, queued, has_more
@@ -0,0 +1,335 @@
+"""
+카드 일괄 가져오기/내보내기 (NDJSON, CSV)
+
+- 내보내기: 서버 측 커서(yield_per)로 CARD_EXPORT_FETCH_SIZE행씩 읽어 바로 직렬화합니다.
+  전체 카드를 메모리에 올리지 않습니다.
+- 가져오기: 요청 본문을 임시 파일에 스트리밍한 뒤 레코드를 순차 파싱·검증(CardDataSchema)하고
+  CARD_IMPORT_BATCH_SIZE개씩 한 트랜잭션으로 INSERT합니다. 배치마다 진행 상황을 NDJSON으로 응답합니다.
+  /cards/save와 달리 이미지 파일은 이동하지 않고 URL을 그대로 저장하며, 블롭 URL은 참조 카운트만 증가합니다.
+"""
+import csv
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, Optional
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.database import AsyncReadSessionLocal, AsyncSessionLocal
+from app.database.models import Card
+from app.schemas.card import CardDataSchema
+from app.services.blob_service import BlobService
+from app.services.card_service import CardService
+
+
+# 가져오기/내보내기 필드 (CardDataSchema + 이미지/프롬프트 필드) → cards 컬럼
+TRANSFER_FIELDS = (
+    ("cardSn", "card_sn"),
+    ("cardNumber", "card_number"),
+    ("cardName", "card_name"),
+    ("type", "type"),
+    ("attribute", "attribute"),
+    ("rarity", "rarity"),
+    ("attack", "attack"),
+    ("health", "health"),
+    ("skill1Name", "skill1_name"),
+    ("skill1Description", "skill1_description"),
+    ("skill2Name", "skill2_name"),
+    ("skill2Description", "skill2_description"),
+    ("flavorText", "flavor_text"),
+    ("series", "series"),
+    ("characterImageUrl", "character_image_url"),
+    ("backgroundImageUrl", "background_image_url"),
+    ("generatedPrompt", "generated_prompt"),
+    ("generatedImageUrl", "generated_image_url"),
+)
+
+# 블롭 참조 카운트 대상 컬럼
+_IMAGE_COLUMNS = ("character_image_url", "background_image_url", "generated_image_url")
+
+# 이미지/프롬프트 필드 (CardDataSchema 밖의 선택 필드)
+_EXTRA_FIELDS = ("characterImageUrl", "backgroundImageUrl", "generatedPrompt", "generatedImageUrl")
+
+# CSV는 NULL을 빈 칸으로 내보내므로, 가져올 때 빈 칸을 NULL로 되돌리는 선택 필드 (필수 필드는 빈 값 그대로 검증)
+_CSV_NULLABLE_FIELDS = frozenset(
+    [field for field, info in CardDataSchema.model_fields.items() if not info.is_required()] + list(_EXTRA_FIELDS)
+)
+
+TRANSFER_FORMATS = ("ndjson", "csv")
+
+TRANSFER_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+class CardTransferService:
+    """카드 일괄 가져오기/내보내기 서비스"""
+
+    @staticmethod
+    def validate_format(fmt: str) -> str:
+        """
+        형식 이름 검증
+
+        Raises:
+            ValueError: 지원하지 않는 형식인 경우
+        """
+        fmt = (fmt or "").lower()
+        if fmt not in TRANSFER_FORMATS:
+            raise ValueError(f"지원하지 않는 형식입니다: {fmt} (사용 가능: {', '.join(TRANSFER_FORMATS)})")
+        return fmt
+
+    @staticmethod
+    async def export_cards(fmt: str, filters: Optional[Dict[str, str]] = None) -> AsyncIterator[bytes]:
+        """
+        카드 내보내기 스트림 (card_sn 오름차순)
+
+        Args:
+            fmt: ndjson 또는 csv (CSV는 엑셀 호환을 위해 UTF-8 BOM 포함)
+            filters: 패싯 필터 (/cards/list와 동일)
+
+        Yields:
+            bytes: CARD_EXPORT_FETCH_SIZE행 단위로 직렬화된 청크
+        """
+        active_filters = {facet: value for facet, value in (filters or {}).items() if value is not None}
+        columns = [getattr(Card, column) for _, column in TRANSFER_FIELDS]
+        field_names = [field for field, _ in TRANSFER_FIELDS]
+        fetch_size = max(1, settings.CARD_EXPORT_FETCH_SIZE)
+        stmt = (
+            select(*columns)
+            .where(*CardService.facet_conditions(active_filters))
+            .order_by(Card.card_sn)
+            .execution_options(yield_per=fetch_size)
+        )
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(field_names)
+            yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+
+        async with AsyncReadSessionLocal() as db:
+            result = await db.stream(stmt)
+            async for rows in result.partitions():
+                if fmt == "csv":
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer, lineterminator="\n")
+                    writer.writerows(rows)
+                    chunk = buffer.getvalue()
+                else:
+                    chunk = "".join(
+                        json.dumps(dict(zip(field_names, row)), ensure_ascii=False) + "\n" for row in rows
+                    )
+                yield chunk.encode("utf-8")
+
+    @staticmethod
+    async def spool_request(request: Request) -> Path:
+        """
+        요청 본문을 임시 파일에 스트리밍 저장 (메모리에 전체를 올리지 않음)
+
+        Returns:
+            Path: 임시 파일 경로 (호출자가 삭제)
+
+        Raises:
+            HTTPException: CARD_IMPORT_MAX_SIZE를 넘는 경우 (413)
+        """
+        max_size = settings.CARD_IMPORT_MAX_SIZE
+        chunk_size = max(1, settings.UPLOAD_CHUNK_SIZE)
+        fd, tmp_name = await run_in_threadpool(tempfile.mkstemp, prefix="card-import-", suffix=".part")
+        tmp_path = Path(tmp_name)
+        out = os.fdopen(fd, "wb")
+        try:
+            size = 0
+            pending = bytearray()
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"가져오기 데이터가 너무 큽니다. 최대 크기: {max_size / 1024 / 1024}MB",
+                    )
+                pending += chunk
+                # 작은 청크마다 스레드풀을 오가지 않도록 UPLOAD_CHUNK_SIZE만큼 모아서 기록
+                if len(pending) >= chunk_size:
+                    await run_in_threadpool(out.write, bytes(pending))
+                    pending.clear()
+            if pending:
+                await run_in_threadpool(out.write, bytes(pending))
+            await run_in_threadpool(out.close)
+        except BaseException:
+            out.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return tmp_path
+
+    @staticmethod
+    async def import_cards(path: Path, fmt: str, batch_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        임시 파일의 카드를 배치 단위로 가져오기 (진행 상황 NDJSON 스트림, 종료 시 파일 삭제)
+
+        이벤트:
+        - {"event": "progress", "processed", "imported", "failed", "batches"}: 배치 커밋마다
+        - {"event": "done", ..., "errors": [{"line", "error"}]}: 완료
+        - {"event": "error", ..., "detail"}: 중단 (이미 커밋된 배치는 유지)
+
+        Args:
+            path: spool_request로 저장한 임시 파일
+            fmt: ndjson 또는 csv
+            batch_size: 트랜잭션 1회에 INSERT할 카드 수 (없으면 CARD_IMPORT_BATCH_SIZE)
+        """
+        batch_size = max(1, batch_size or settings.CARD_IMPORT_BATCH_SIZE)
+        max_errors = max(0, settings.CARD_IMPORT_MAX_ERRORS)
+        stats = {"processed": 0, "imported": 0, "failed": 0, "batches": 0}
+        errors: list[dict] = []
+
+        def event(name: str, **extra) -> bytes:
+            return (json.dumps({"event": name, **stats, **extra}, ensure_ascii=False) + "\n").encode("utf-8")
+
+        try:
+            # 파싱·검증은 스레드풀에서 배치 단위로 진행 (이벤트 루프 비차단)
+            batches = CardTransferService._iter_batches(path, fmt, batch_size)
+            try:
+                while True:
+                    batch = await run_in_threadpool(next, batches, None)
+                    if batch is None:
+                        break
+                    rows, batch_errors, processed = batch
+                    stats["processed"] += processed
+                    stats["failed"] += len(batch_errors)
+                    errors.extend(batch_errors[:max(0, max_errors - len(errors))])
+                    if rows:
+                        await CardTransferService._insert_batch(rows)
+                        stats["imported"] += len(rows)
+                        stats["batches"] += 1
+                        yield event("progress")
+            finally:
+                await run_in_threadpool(batches.close)
+            yield event("done", errors=errors)
+        except Exception as e:
+            yield event("error", detail=f"{type(e).__name__}: {e}", errors=errors)
+        finally:
+            await run_in_threadpool(path.unlink, missing_ok=True)
+
+    @staticmethod
+    async def _insert_batch(rows: list[dict]) -> None:
+        """배치 INSERT + 블롭 참조 획득을 한 트랜잭션으로 커밋"""
+        async with AsyncSessionLocal() as db:
+            try:
+                await db.run_sync(CardTransferService._insert_rows, rows)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    @staticmethod
+    def _insert_rows(db: Session, rows: list[dict]) -> None:
+        db.execute(insert(Card), rows)
+        BlobService.acquire_many(db, (row[column] for row in rows for column in _IMAGE_COLUMNS))
+
+    @staticmethod
+    def _iter_batches(path: Path, fmt: str, batch_size: int) -> Iterator[tuple[list[dict], list[dict], int]]:
+        """
+        파일에서 레코드를 읽어 (유효한 행 목록, 오류 목록, 처리한 레코드 수)를 배치 단위로 생성
+        """
+        rows: list[dict] = []
+        errors: list[dict] = []
+        processed = 0
+        for line, record in CardTransferService._iter_records(path, fmt):
+            processed += 1
+            try:
+                rows.append(CardTransferService._to_row(record, fmt))
+            except ValueError as e:
+                errors.append({"line": line, "error": str(e)})
+            if len(rows) >= batch_size:
+                yield rows, errors, processed
+                rows, errors, processed = [], [], 0
+        if rows or errors or processed:
+            yield rows, errors, processed
+
+    @staticmethod
+    def _iter_records(path: Path, fmt: str) -> Iterator[tuple[int, object]]:
+        """
+        파일의 레코드를 (줄 번호, 레코드) 형태로 순차 생성
+
+        잘못된 JSON 줄은 ValueError 인스턴스를 레코드로 내보내 오류 행으로 집계합니다.
+        """
+        with open(path, "r", encoding="utf-8-sig", newline="") as source:
+            if fmt == "csv":
+                reader = csv.reader(source)
+                header = next(reader, None)
+                if header is None:
+                    return
+                header = [name.strip() for name in header]
+                for values in reader:
+                    if not any(values):
+                        continue
+                    if len(values) != len(header):
+                        yield reader.line_num, ValueError(
+                            f"열 개수가 헤더와 다릅니다 ({len(values)} != {len(header)})"
+                        )
+                        continue
+                    yield reader.line_num, dict(zip(header, values))
+                return
+
+            for line_number, line in enumerate(source, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, ValueError(f"JSON 형식 오류: {e.msg}")
+
+    @staticmethod
+    def _to_row(record: object, fmt: str = "ndjson") -> dict:
+        """
+        레코드 검증 후 cards INSERT 값으로 변환
+
+        CSV 레코드는 선택 필드의 빈 문자열을 검증 전에 None으로 바꿉니다 (내보낸 NULL 복원).
+
+        Raises:
+            ValueError: 레코드가 유효하지 않은 경우
+        """
+        if isinstance(record, ValueError):
+            raise record
+        if not isinstance(record, dict):
+            raise ValueError("레코드는 JSON 객체여야 합니다.")
+        if fmt == "csv":
+            record = {
+                field: None if value == "" and field in _CSV_NULLABLE_FIELDS else value
+                for field, value in record.items()
+            }
+
+        try:
+            card_data = CardDataSchema.model_validate(record)
+        except ValidationError as e:
+            raise ValueError(_validation_message(e))
+        is_valid, error_message = CardService.validate_card_data(card_data)
+        if not is_valid:
+            raise ValueError(error_message)
+
+        extras = {}
+        for field in _EXTRA_FIELDS:
+            value = record.get(field)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{field}: 문자열이어야 합니다.")
+            extras[field] = value
+
+        return CardService.card_columns(
+            card_data,
+            character_image_url=extras["characterImageUrl"],
+            background_image_url=extras["backgroundImageUrl"],
+            generated_prompt=extras["generatedPrompt"],
+            generated_image_url=extras["generatedImageUrl"],
+        )
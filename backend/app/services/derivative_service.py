@@ -0,0 +1,408 @@
+"""
+이미지 파생본(썸네일/리사이즈) 생성 엔진
+
+/data/{path}?w=256&fmt=webp 형식 요청을 처리합니다.
+- 리사이즈·재인코딩은 프로세스 풀에서 실행 (이벤트 루프·GIL 비차단)
+- 결과는 원본 식별자 + 파라미터 해시를 키로 디스크 캐시에 저장
+- 캐시는 총 용량(DERIVATIVE_CACHE_MAX_BYTES) 기준 LRU로 제거
+  (응답 중인 파생본은 고정되어 제거 대상에서 제외)
+- 동시 렌더링 수 제한, 같은 키의 동시 요청은 한 번만 렌더링
+"""
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.utils.blob_store import BLOB_DIRNAME
+
+
+T = TypeVar("T")
+
+# 출력 형식 → (Pillow 포맷명, 확장자, MIME 타입)
+DERIVATIVE_FORMATS = {
+    "webp": ("WEBP", "webp", "image/webp"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+    "png": ("PNG", "png", "image/png"),
+}
+
+# 요청 fmt 별칭
+_FORMAT_ALIASES = {"jpg": "jpeg"}
+
+# 파생본을 만들 수 있는 원본 확장자 (SVG는 래스터 원본이 아니므로 제외)
+_SOURCE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
+
+
+class UnreadableImageError(Exception):
+    """원본을 이미지로 디코딩할 수 없음 (status_code: 415 판독 불가 형식, 422 손상된 파일)"""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def render_derivative(
+    source: str,
+    target: str,
+    width: Optional[int],
+    height: Optional[int],
+    pil_format: str,
+    quality: int,
+) -> int:
+    """
+    원본 이미지를 주어진 상자 안에 맞게 축소하여 저장 (프로세스 풀 워커에서 실행)
+
+    원본보다 크게 확대하지 않으며, EXIF 회전 정보를 반영합니다.
+
+    Args:
+        source: 원본 파일 경로
+        target: 저장할 파일 경로
+        width: 최대 너비 (없으면 높이 기준)
+        height: 최대 높이 (없으면 너비 기준)
+        pil_format: Pillow 저장 포맷 (WEBP, JPEG, PNG)
+        quality: 손실 압축 품질 (1-100)
+
+    Returns:
+        int: 저장된 파일 크기 (바이트)
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        box = (width or image.width, height or image.height)
+        # JPEG는 디코딩 단계에서 축소하여 메모리/시간 절약 (EXIF 회전을 고려해 긴 변 기준)
+        image.draft("RGB", (max(box), max(box)))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(box, Image.Resampling.LANCZOS)
+
+        save_options: dict = {}
+        if pil_format == "JPEG":
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            save_options = {"quality": quality, "optimize": True, "progressive": True}
+        elif pil_format == "WEBP":
+            save_options = {"quality": quality, "method": 4}
+        elif pil_format == "PNG":
+            save_options = {"optimize": True}
+
+        image.save(target, format=pil_format, **save_options)
+
+    return os.path.getsize(target)
+
+
+class DerivativeEngine:
+    """이미지 파생본 생성 및 디스크 LRU 캐시"""
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # 캐시 키 → 파일 크기 (앞쪽일수록 오래 사용되지 않음)
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+        # 응답 중인 파생본 → 고정 횟수 (LRU 제거 대상에서 제외)
+        self._pins: dict[str, int] = {}
+        self._loaded = False
+
+    @property
+    def cache_dir(self) -> Path:
+        """파생본 캐시 디렉토리"""
+        return settings.derivative_cache_path
+
+    async def start(self) -> None:
+        """캐시 디렉토리 생성 및 기존 캐시 파일 색인 (서버 시작 시 호출)"""
+        await run_in_threadpool(self._load_index)
+
+    async def shutdown(self) -> None:
+        """프로세스 풀 종료 (서버 종료 시 호출)"""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await run_in_threadpool(executor.shutdown, wait=True, cancel_futures=True)
+
+    def _load_index(self) -> None:
+        """디스크의 기존 캐시 파일을 mtime 순으로 색인"""
+        if self._loaded:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.cache_dir.glob("*/*"):
+            if path.suffix == ".part":
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                stat_result = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat_result.st_mtime, path.name, stat_result.st_size))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._total_bytes += size
+        self._loaded = True
+        for path in self._pop_over_budget():
+            path.unlink(missing_ok=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # fork는 이벤트 루프·스레드·DB 연결을 가진 서버 프로세스를 그대로 복제하므로 사용하지 않음
+            # (forkserver가 없는 플랫폼은 spawn, 워커 함수는 모듈 경로로 전달되어 새로 import됨)
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.DERIVATIVE_WORKERS,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.DERIVATIVE_MAX_CONCURRENT_RENDERS)
+        return self._semaphore
+
+    @staticmethod
+    def normalize_format(fmt: Optional[str], source: Path) -> str:
+        """
+        출력 형식 결정 (지정하지 않으면 원본 형식 유지, GIF 등은 PNG)
+
+        Raises:
+            ValueError: 지원하지 않는 형식인 경우
+        """
+        if fmt:
+            fmt = _FORMAT_ALIASES.get(fmt.lower(), fmt.lower())
+            if fmt not in DERIVATIVE_FORMATS:
+                raise ValueError(f"지원하지 않는 출력 형식입니다: {fmt} (허용: webp, jpeg, png)")
+            return fmt
+        suffix = source.suffix.lower().lstrip(".")
+        suffix = _FORMAT_ALIASES.get(suffix, suffix)
+        return suffix if suffix in DERIVATIVE_FORMATS else "png"
+
+    @staticmethod
+    def source_id(source: Path, stat_result: os.stat_result) -> str:
+        """
+        원본 식별자 (블롭은 파일명의 내용 해시, 그 외는 경로 + stat 정보)
+
+        원본 내용이 바뀌면 식별자가 바뀌므로 캐시가 자동으로 무효화됩니다.
+        """
+        if source.parent.parent.name == BLOB_DIRNAME:
+            return f"sha256:{source.stem}"
+        return f"{source.as_posix()}:{stat_result.st_mtime_ns}:{stat_result.st_size}"
+
+    def cache_path(self, key: str, extension: str) -> Path:
+        """캐시 키로 캐시 파일 경로 생성"""
+        return self.cache_dir / key[:2] / f"{key}.{extension}"
+
+    async def get(
+        self,
+        source: Path,
+        stat_result: os.stat_result,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        fmt: Optional[str] = None,
+    ) -> tuple[Path, str, os.stat_result]:
+        """
+        파생본 조회 (캐시에 없거나 캐시 파일이 사라졌으면 렌더링)
+
+        반환된 파생본은 고정되어 LRU로 제거되지 않으므로,
+        응답을 마친 뒤 반드시 release()를 호출해야 합니다.
+
+        Args:
+            source: 원본 이미지 경로
+            stat_result: 원본 stat 결과
+            width: 최대 너비
+            height: 최대 높이
+            fmt: 출력 형식 (webp, jpeg, png)
+
+        Returns:
+            tuple[Path, str, os.stat_result]: (캐시된 파생본 경로, MIME 타입, 파생본 stat 결과)
+
+        Raises:
+            ValueError: 잘못된 파라미터이거나 파생본을 만들 수 없는 원본인 경우
+            UnreadableImageError: 원본을 이미지로 디코딩할 수 없는 경우
+        """
+        if source.suffix.lower() not in _SOURCE_EXTENSIONS:
+            raise ValueError("리사이즈를 지원하지 않는 이미지 형식입니다.")
+        max_dimension = settings.DERIVATIVE_MAX_DIMENSION
+        for value in (width, height):
+            if value is not None and not (1 <= value <= max_dimension):
+                raise ValueError(f"w, h는 1 ~ {max_dimension} 사이여야 합니다.")
+
+        fmt = self.normalize_format(fmt, source)
+        pil_format, extension, media_type = DERIVATIVE_FORMATS[fmt]
+        quality = settings.DERIVATIVE_QUALITY
+
+        key_source = f"{self.source_id(source, stat_result)}|w={width}|h={height}|{fmt}|q={quality}"
+        key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+        target = self.cache_path(key, extension)
+
+        if not self._loaded:
+            await self.start()
+
+        # 조회 시점부터 응답이 끝날 때까지 다른 요청의 LRU 제거로부터 보호
+        self._pins[target.name] = self._pins.get(target.name, 0) + 1
+        try:
+            target_stat = await self._stat_cached(target)
+            if target_stat is None:
+                await self._render_once(source, target, width, height, pil_format, quality)
+                target_stat = await run_in_threadpool(os.stat, target)
+        except BaseException:
+            self.release(target)
+            raise
+        return target, media_type, target_stat
+
+    def release(self, target: Path) -> None:
+        """get()으로 고정한 파생본 고정 해제 (응답 전송이 끝나거나 중단된 뒤 호출)"""
+        count = self._pins.get(target.name, 0) - 1
+        if count > 0:
+            self._pins[target.name] = count
+        else:
+            self._pins.pop(target.name, None)
+
+    async def _stat_cached(self, target: Path) -> Optional[os.stat_result]:
+        """
+        캐시 적중 확인 (색인에는 있지만 파일이 외부에서 지워졌으면 색인에서 빼고 미적중 처리)
+
+        Returns:
+            Optional[os.stat_result]: 캐시 파일 stat 결과 (미적중이면 None)
+        """
+        if target.name not in self._index:
+            return None
+        self._index.move_to_end(target.name)
+        try:
+            return await run_in_threadpool(os.stat, target)
+        except FileNotFoundError:
+            size = self._index.pop(target.name, None)
+            if size is not None:
+                self._total_bytes -= size
+            return None
+
+    async def _render_once(
+        self,
+        source: Path,
+        target: Path,
+        width: Optional[int],
+        height: Optional[int],
+        pil_format: str,
+        quality: int,
+    ) -> None:
+        """파생본 렌더링 (같은 파생본을 렌더링 중인 요청이 있으면 그 결과를 기다림)"""
+        inflight = self._inflight.get(target.name)
+        if inflight is not None:
+            await asyncio.shield(inflight)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[target.name] = future
+        try:
+            size = await self._render(source, target, width, height, pil_format, quality)
+            self._remember(target.name, size)
+            future.set_result(None)
+        except BaseException as e:
+            future.set_exception(e)
+            # 대기 중인 요청이 없으면 예외 미조회 경고 방지
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(target.name, None)
+
+        victims = self._pop_over_budget()
+        if victims:
+            await run_in_threadpool(self._unlink_all, victims)
+
+    async def _render(
+        self,
+        source: Path,
+        target: Path,
+        width: Optional[int],
+        height: Optional[int],
+        pil_format: str,
+        quality: int,
+    ) -> int:
+        """동시 렌더링 수를 제한하며 프로세스 풀에서 파생본 생성 후 원자적으로 배치"""
+        from PIL import Image, UnidentifiedImageError
+
+        await run_in_threadpool(target.parent.mkdir, parents=True, exist_ok=True)
+        fd, tmp_name = await run_in_threadpool(
+            tempfile.mkstemp, dir=target.parent, prefix=".render-", suffix=".part"
+        )
+        os.close(fd)
+        try:
+            try:
+                size = await self.run(render_derivative, str(source), tmp_name, width, height, pil_format, quality)
+            except UnidentifiedImageError:
+                raise UnreadableImageError("이미지로 판독할 수 없는 파일입니다.", status_code=415)
+            except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+                raise UnreadableImageError(f"손상되었거나 처리할 수 없는 이미지입니다: {e}", status_code=422)
+            await run_in_threadpool(os.replace, tmp_name, target)
+        except BaseException:
+            await run_in_threadpool(Path(tmp_name).unlink, missing_ok=True)
+            raise
+        return size
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        이미지 처리 함수를 프로세스 풀에서 실행 (파생본 렌더링과 동시 실행 수 제한 공유)
+
+        Args:
+            fn: 모듈 최상위 함수 (프로세스 간 전달 가능해야 함)
+            *args: 함수 인자 (경로는 문자열로 전달)
+
+        Returns:
+            함수 반환값
+        """
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    def _remember(self, name: str, size: int) -> None:
+        """캐시 색인에 파생본 등록"""
+        previous = self._index.pop(name, None)
+        if previous is not None:
+            self._total_bytes -= previous
+        self._index[name] = size
+        self._total_bytes += size
+
+    def _pop_over_budget(self) -> list[Path]:
+        """
+        캐시 총 용량이 한도를 넘으면 가장 오래 사용되지 않은 파생본부터 색인에서 제거
+
+        응답 중(고정)인 파생본은 건너뜁니다.
+
+        Returns:
+            list[Path]: 삭제할 캐시 파일 경로 목록
+        """
+        excess = self._total_bytes - settings.DERIVATIVE_CACHE_MAX_BYTES
+        names = []
+        for name, size in self._index.items():
+            if excess <= 0 or len(self._index) - len(names) <= 1:
+                break
+            if name in self._pins:
+                continue
+            names.append(name)
+            excess -= size
+
+        victims = []
+        for name in names:
+            self._total_bytes -= self._index.pop(name)
+            key, _, extension = name.partition(".")
+            victims.append(self.cache_path(key, extension))
+        return victims
+
+    @staticmethod
+    def _unlink_all(paths: list[Path]) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        """캐시 상태 (항목 수, 총 용량, 렌더링 중인 수, 응답 중인 수)"""
+        return {
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+            "inflight": len(self._inflight),
+            "pinned": len(self._pins),
+        }
+
+
+# 전역 파생본 엔진 인스턴스
+derivative_engine = DerivativeEngine()
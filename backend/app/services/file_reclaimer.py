@@ -0,0 +1,321 @@
+"""
+백그라운드 파일 회수기 (카드 삭제 후 이미지 파일 물리 삭제)
+
+카드 삭제 요청은 DB 행만 지우고, 삭제할 이미지 URL을 같은 트랜잭션에서 file_reclaim_queue에 기록합니다.
+회수기는 커밋 알림(notify) 또는 RECLAIM_INTERVAL_SECONDS 주기로 깨어나 대기열을 RECLAIM_BATCH_SIZE개씩
+처리합니다. 대기열이 DB에 있으므로 서버가 중간에 종료되어도 다음 시작 시 이어서 회수합니다.
+
+- 삭제 직전에 다시 확인하여, 그 사이 다른 카드가 참조하게 된 파일은 지우지 않습니다.
+  (블롭: image_blobs 행이 다시 생긴 경우, 일반 파일: cards / card_generated_images에 같은 URL이 남아 있는 경우)
+- BLOB_RECLAIM_GRACE_SECONDS 이내에 업로드(재사용)된 블롭은 유예 기간이 끝나는 시각으로 다시 예약합니다.
+- 삭제에 실패하면 RECLAIM_RETRY_BASE_SECONDS부터 2배씩 늘려 재시도하고,
+  RECLAIM_MAX_ATTEMPTS회 실패한 항목은 대기열에 실패로 남깁니다 (last_error 기록).
+"""
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, delete, func, insert, select, union_all, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.database import AsyncReadSessionLocal, AsyncSessionLocal
+from app.database.models import Card, CardGeneratedImage, FileReclaimTask, ImageBlob
+from app.services.image_metadata_service import ImageMetadataService
+from app.utils.blob_store import blob_path, parse_blob_url
+from app.utils.file_utils import get_file_path_from_url, upload_path_resolver
+
+
+@dataclass
+class _ReclaimerStats:
+    batches: int = 0
+    reclaimed: int = 0
+    reclaimed_bytes: int = 0
+    skipped: int = 0
+    deferred: int = 0
+    retried: int = 0
+    gave_up: int = 0
+    last_error: Optional[str] = None
+    last_run_at: Optional[float] = None
+
+
+class _Deferred(Exception):
+    """유예 기간이 남아 나중에 다시 확인해야 하는 항목"""
+
+    def __init__(self, seconds: float):
+        super().__init__(seconds)
+        self.seconds = seconds
+
+
+class FileReclaimer:
+    """file_reclaim_queue를 배치로 처리하는 백그라운드 회수기"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closing = False
+        self._stats = _ReclaimerStats()
+
+    async def start(self) -> None:
+        """회수기 태스크 시작 (서버 시작 시 호출, 이전 실행에서 남은 대기열부터 처리)"""
+        if self._task is not None:
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="file-reclaimer")
+
+    async def shutdown(self) -> None:
+        """진행 중인 배치를 마친 뒤 종료 (남은 항목은 다음 시작 시 처리)"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        self._wakeup = None
+
+    def notify(self) -> None:
+        """대기열에 항목이 추가되었음을 알림 (커밋 이후 호출)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @staticmethod
+    def enqueue(db: Session, urls: Iterable[Optional[str]]) -> int:
+        """
+        회수할 이미지 URL을 대기열에 추가 (호출자의 트랜잭션 안에서 실행, 커밋하지 않음)
+
+        Args:
+            db: 데이터베이스 세션
+            urls: 이미지 URL 목록 (빈 값과 중복은 제외)
+
+        Returns:
+            int: 추가된 항목 수
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if unique_urls:
+            db.execute(insert(FileReclaimTask), [{"image_url": url, "attempts": 0} for url in unique_urls])
+        return len(unique_urls)
+
+    async def drain(self) -> int:
+        """
+        처리 시각이 된 항목을 모두 처리
+
+        Returns:
+            int: 처리(삭제 또는 건너뜀)되어 대기열에서 제거된 항목 수
+        """
+        batch_size = max(1, settings.RECLAIM_BATCH_SIZE)
+        processed = 0
+        while not self._closing:
+            tasks, live_hashes, referenced_urls = await self._claim(batch_size)
+            if not tasks:
+                break
+            results = await run_in_threadpool(self._unlink_batch, tasks, live_hashes, referenced_urls)
+            processed += await self._record(tasks, results)
+            self._stats.batches += 1
+            if len(tasks) < batch_size:
+                break
+        self._stats.last_run_at = time.time()
+        return processed
+
+    async def _run(self) -> None:
+        interval = max(1, settings.RECLAIM_INTERVAL_SECONDS)
+        while not self._closing:
+            try:
+                await self.drain()
+            except Exception as e:
+                self._stats.last_error = f"{type(e).__name__}: {e}"
+                print(f"파일 회수 중 오류 발생: {self._stats.last_error}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim(self, batch_size: int) -> tuple[list[tuple[int, str, int]], set[str], set[str]]:
+        """처리 시각이 된 항목과, 그중 아직 참조 중인 블롭 해시·URL 조회"""
+        async with AsyncReadSessionLocal() as db:
+            tasks = [tuple(row) for row in (await db.execute(
+                select(FileReclaimTask.id, FileReclaimTask.image_url, FileReclaimTask.attempts)
+                .where(
+                    FileReclaimTask.attempts < max(1, settings.RECLAIM_MAX_ATTEMPTS),
+                    FileReclaimTask.next_attempt_at <= func.now(),
+                )
+                .order_by(FileReclaimTask.next_attempt_at, FileReclaimTask.id)
+                .limit(batch_size)
+            )).all()]
+            if not tasks:
+                return [], set(), set()
+
+            hashes, urls = [], []
+            for _, url, _ in tasks:
+                parsed = parse_blob_url(url)
+                if parsed:
+                    hashes.append(parsed[0])
+                else:
+                    urls.append(url)
+
+            live_hashes: set[str] = set()
+            if hashes:
+                live_hashes.update((await db.execute(
+                    select(ImageBlob.sha256).where(ImageBlob.sha256.in_(hashes))
+                )).scalars().all())
+
+            referenced_urls: set[str] = set()
+            if urls:
+                referenced_urls.update((await db.execute(union_all(
+                    select(Card.character_image_url.label("url")).where(Card.character_image_url.in_(urls)),
+                    select(Card.background_image_url).where(Card.background_image_url.in_(urls)),
+                    select(Card.generated_image_url).where(Card.generated_image_url.in_(urls)),
+                    select(CardGeneratedImage.image_url).where(CardGeneratedImage.image_url.in_(urls)),
+                ))).scalars().all())
+        return tasks, live_hashes, referenced_urls
+
+    @staticmethod
+    def _unlink_batch(
+        tasks: list[tuple[int, str, int]],
+        live_hashes: set[str],
+        referenced_urls: set[str],
+    ) -> list[tuple[Optional[int], Optional[str], Optional[float]]]:
+        """
+        파일 삭제 (블로킹, 스레드풀에서 실행)
+
+        Returns:
+            list: 항목별 (삭제한 바이트 수 또는 건너뛰면 None, 실패 시 에러 메시지, 유예로 미룰 초)
+        """
+        grace_deadline = time.time() - settings.BLOB_RECLAIM_GRACE_SECONDS
+        results = []
+        for _, url, _ in tasks:
+            try:
+                results.append((FileReclaimer._unlink(url, live_hashes, referenced_urls, grace_deadline), None, None))
+            except _Deferred as e:
+                results.append((None, None, e.seconds))
+            except OSError as e:
+                results.append((None, f"{type(e).__name__}: {e}", None))
+        return results
+
+    @staticmethod
+    def _unlink(url: str, live_hashes: set[str], referenced_urls: set[str], grace_deadline: float) -> Optional[int]:
+        """
+        파일 1개 삭제, 삭제한 바이트 수 반환 (참조 중이거나 이미 없으면 None)
+
+        Raises:
+            _Deferred: 유예 기간 안의 블롭인 경우 (남은 초)
+        """
+        parsed = parse_blob_url(url)
+        if parsed:
+            if parsed[0] in live_hashes:
+                return None
+            path = blob_path(*parsed)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                return None
+            # 최근 업로드(재사용)된 블롭은 아직 카드에 저장되지 않았을 수 있으므로 유예 후 다시 확인
+            # (image_blobs 행이 없으므로 대기열에서 빼면 다시 회수할 기회가 없음)
+            if stat.st_mtime > grace_deadline:
+                raise _Deferred(stat.st_mtime - grace_deadline)
+        else:
+            if url in referenced_urls:
+                return None
+            path = get_file_path_from_url(url)
+            if path is None:
+                return None
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                return None
+
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return None
+        finally:
+            upload_path_resolver.invalidate(path)
+        return stat.st_size
+
+    async def _record(
+        self,
+        tasks: list[tuple[int, str, int]],
+        results: list[tuple[Optional[int], Optional[str], Optional[float]]],
+    ) -> int:
+        """처리 결과 반영: 완료 항목은 삭제, 유예 항목은 유예가 끝나는 시각으로, 실패 항목은 재시도 예약"""
+        max_attempts = max(1, settings.RECLAIM_MAX_ATTEMPTS)
+        base_delay = max(1, settings.RECLAIM_RETRY_BASE_SECONDS)
+        done_ids, reclaimed_urls = [], []
+        async with AsyncSessionLocal() as db:
+            for (task_id, url, attempts), (size, error, deferred) in zip(tasks, results):
+                if deferred is not None:
+                    # 실패가 아니므로 시도 횟수는 늘리지 않음
+                    self._stats.deferred += 1
+                    await db.execute(
+                        update(FileReclaimTask)
+                        .where(FileReclaimTask.id == task_id)
+                        .values(next_attempt_at=func.datetime("now", f"+{max(1, math.ceil(deferred))} seconds"))
+                    )
+                    continue
+                if error is None:
+                    done_ids.append(task_id)
+                    if size is None:
+                        self._stats.skipped += 1
+                    else:
+                        self._stats.reclaimed += 1
+                        self._stats.reclaimed_bytes += size
+                        reclaimed_urls.append(url)
+                    continue
+
+                self._stats.last_error = f"{url}: {error}"
+                if attempts + 1 >= max_attempts:
+                    self._stats.gave_up += 1
+                    print(f"파일 회수 실패, 재시도 중단 ({url}): {error}")
+                else:
+                    self._stats.retried += 1
+                delay = base_delay * 2 ** attempts
+                await db.execute(
+                    update(FileReclaimTask)
+                    .where(FileReclaimTask.id == task_id)
+                    .values(
+                        attempts=FileReclaimTask.attempts + 1,
+                        next_attempt_at=func.datetime("now", f"+{delay} seconds"),
+                        last_error=error,
+                    )
+                )
+            if done_ids:
+                await db.execute(delete(FileReclaimTask).where(FileReclaimTask.id.in_(done_ids)))
+            if reclaimed_urls:
+                await db.run_sync(ImageMetadataService.forget, reclaimed_urls)
+            await db.commit()
+        return len(done_ids)
+
+    async def stats(self) -> dict:
+        """
+        회수 지표
+
+        - pending: 회수 대기 중인 항목 수 (재시도 예정 포함)
+        - failed: RECLAIM_MAX_ATTEMPTS회 실패하여 대기열에 남은 항목 수
+        - reclaimed / reclaimedBytes / skipped / deferred / retried: 서버 시작 이후 누적
+        """
+        max_attempts = max(1, settings.RECLAIM_MAX_ATTEMPTS)
+        state = case((FileReclaimTask.attempts >= max_attempts, "failed"), else_="pending").label("state")
+        async with AsyncReadSessionLocal() as db:
+            counts = dict((await db.execute(select(state, func.count()).group_by(state))).all())
+        return {
+            "pending": counts.get("pending", 0),
+            "failed": counts.get("failed", 0),
+            "batches": self._stats.batches,
+            "reclaimed": self._stats.reclaimed,
+            "reclaimedBytes": self._stats.reclaimed_bytes,
+            "skipped": self._stats.skipped,
+            "deferred": self._stats.deferred,
+            "retried": self._stats.retried,
+            "gaveUp": self._stats.gave_up,
+            "lastError": self._stats.last_error,
+            "lastRunAt": (
+                time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self._stats.last_run_at))
+                if self._stats.last_run_at else None
+            ),
+        }
+
+
+# 전역 파일 회수기 인스턴스
+file_reclaimer = FileReclaimer()
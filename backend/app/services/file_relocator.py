@@ -0,0 +1,319 @@
+"""
+백그라운드 파일 재배치기 (카드 저장 후 업로드 이미지를 카드 디렉토리로 이동)
+
+카드 저장 요청은 전달받은 URL 그대로 커밋하고, 이동할 이미지를 같은 트랜잭션에서
+file_relocation_outbox에 기록합니다. 재배치기는 커밋 알림(notify) 또는 RELOCATION_INTERVAL_SECONDS
+주기로 깨어나 아웃박스를 RELOCATION_BATCH_SIZE개씩 처리합니다.
+
+이동 순서 (카드 URL은 어느 시점에도 존재하는 파일을 가리킴):
+1. 대상 경로에 하드 링크 생성 (대상이 있으면 실패하므로 덮어쓰지 않고 _1, _2 … 이름으로 재시도)
+   하드 링크를 지원하지 않는 파일 시스템에서는 임시 파일로 복사한 뒤 이름을 바꿉니다.
+2. 카드 URL이 아직 원래 URL일 때만 새 URL로 갱신하고 아웃박스 행 삭제 (한 트랜잭션)
+3. 원래 파일은 파일 회수 대기열에 넣어 회수기가 삭제 (다른 카드가 참조 중이면 남김)
+
+서버가 어느 단계에서 중단되어도 아웃박스 행이 남아 있으므로 다음 시작 시 같은 순서로 이어서 처리하며,
+이미 만들어 둔 링크(같은 파일)는 그대로 재사용합니다.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.database import AsyncReadSessionLocal, AsyncSessionLocal
+from app.database.models import Card, FileRelocationTask
+from app.services.file_reclaimer import FileReclaimer, file_reclaimer
+from app.services.image_metadata_service import ImageMetadataService
+from app.utils.file_utils import build_file_url, get_file_path_from_url, link_or_copy, upload_path_resolver
+
+
+# 카드에서 재배치 대상이 되는 이미지 URL 컬럼
+_IMAGE_COLUMNS = (Card.character_image_url, Card.background_image_url, Card.generated_image_url)
+
+
+@dataclass
+class _RelocatorStats:
+    batches: int = 0
+    moved: int = 0
+    skipped: int = 0
+    orphaned: int = 0
+    retried: int = 0
+    gave_up: int = 0
+    last_error: Optional[str] = None
+    last_run_at: Optional[float] = None
+
+
+class FileRelocator:
+    """file_relocation_outbox를 배치로 처리하는 백그라운드 재배치기"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closing = False
+        self._stats = _RelocatorStats()
+
+    async def start(self) -> None:
+        """재배치기 태스크 시작 (서버 시작 시 호출, 이전 실행에서 남은 아웃박스부터 처리)"""
+        if self._task is not None:
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="file-relocator")
+
+    async def shutdown(self) -> None:
+        """진행 중인 배치를 마친 뒤 종료 (남은 항목은 다음 시작 시 처리)"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        self._wakeup = None
+
+    def notify(self) -> None:
+        """아웃박스에 항목이 추가되었음을 알림 (커밋 이후 호출)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @staticmethod
+    def enqueue(db: Session, card_sn: int, target_dir: str, urls: Iterable[Optional[str]]) -> int:
+        """
+        카드 이미지 이동을 아웃박스에 기록 (호출자의 트랜잭션 안에서 실행, 커밋하지 않음)
+
+        Args:
+            db: 데이터베이스 세션
+            card_sn: 카드 일련번호
+            target_dir: 이동할 디렉토리 (업로드 디렉토리 기준 상대 경로, 예: "My_Series/001")
+            urls: 이동할 이미지 URL 목록 (빈 값과 중복은 제외, 블롭 URL은 호출자가 제외)
+
+        Returns:
+            int: 기록된 항목 수
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if unique_urls:
+            db.execute(insert(FileRelocationTask), [
+                {"card_sn": card_sn, "source_url": url, "target_dir": target_dir, "attempts": 0}
+                for url in unique_urls
+            ])
+        return len(unique_urls)
+
+    async def drain(self) -> int:
+        """
+        처리 시각이 된 항목을 모두 처리
+
+        Returns:
+            int: 완료(이동 또는 건너뜀)되어 아웃박스에서 제거된 항목 수
+        """
+        batch_size = max(1, settings.RELOCATION_BATCH_SIZE)
+        processed = 0
+        while not self._closing:
+            tasks = await self._claim(batch_size)
+            if not tasks:
+                break
+            results = await run_in_threadpool(self._place_batch, tasks)
+            processed += await self._record(tasks, results)
+            self._stats.batches += 1
+            if len(tasks) < batch_size:
+                break
+        self._stats.last_run_at = time.time()
+        return processed
+
+    async def _run(self) -> None:
+        interval = max(1, settings.RELOCATION_INTERVAL_SECONDS)
+        while not self._closing:
+            try:
+                await self.drain()
+            except Exception as e:
+                self._stats.last_error = f"{type(e).__name__}: {e}"
+                print(f"파일 재배치 중 오류 발생: {self._stats.last_error}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim(self, batch_size: int) -> list[tuple[int, int, str, str, int]]:
+        """처리 시각이 된 항목 조회 (id, card_sn, source_url, target_dir, attempts)"""
+        async with AsyncReadSessionLocal() as db:
+            return [tuple(row) for row in (await db.execute(
+                select(
+                    FileRelocationTask.id,
+                    FileRelocationTask.card_sn,
+                    FileRelocationTask.source_url,
+                    FileRelocationTask.target_dir,
+                    FileRelocationTask.attempts,
+                )
+                .where(
+                    FileRelocationTask.attempts < max(1, settings.RELOCATION_MAX_ATTEMPTS),
+                    FileRelocationTask.next_attempt_at <= func.now(),
+                )
+                .order_by(FileRelocationTask.next_attempt_at, FileRelocationTask.id)
+                .limit(batch_size)
+            )).all()]
+
+    @staticmethod
+    def _place_batch(tasks: list[tuple[int, int, str, str, int]]) -> list[tuple[Optional[str], Optional[str]]]:
+        """
+        대상 경로에 파일 배치 (블로킹, 스레드풀에서 실행)
+
+        Returns:
+            list: 항목별 (새 URL 또는 이동할 필요가 없으면 None, 실패 시 에러 메시지)
+        """
+        results = []
+        for _, _, source_url, target_dir, _ in tasks:
+            try:
+                results.append((FileRelocator._place(source_url, target_dir), None))
+            except (OSError, ValueError) as e:
+                results.append((None, f"{type(e).__name__}: {e}"))
+        return results
+
+    @staticmethod
+    def _place(source_url: str, target_dir: str) -> Optional[str]:
+        """
+        원본을 남겨 둔 채 target_dir에 같은 내용의 파일을 만들고 새 URL 반환
+
+        Returns:
+            Optional[str]: 새 URL (원본이 없거나 이미 대상 디렉토리에 있으면 None)
+
+        Raises:
+            ValueError: 대상 디렉토리가 업로드 디렉토리 밖인 경우
+        """
+        source = get_file_path_from_url(source_url)
+        if source is None:
+            return None
+
+        relative_dir = upload_path_resolver.normalize_relative(target_dir)
+        if relative_dir is None:
+            raise ValueError(f"업로드 디렉토리 밖으로 이동할 수 없습니다: {target_dir}")
+        directory = upload_path_resolver.root / relative_dir
+        if source.parent == directory:
+            return None
+        directory.mkdir(parents=True, exist_ok=True)
+
+        stem, suffix = Path(source.name).stem, Path(source.name).suffix
+        target = directory / source.name
+        counter = 1
+        while True:
+            try:
+                link_or_copy(source, target)
+                break
+            except FileExistsError:
+                # 이전 시도에서 이미 만든 링크면 재사용, 다른 파일이면 번호를 붙여 다시 시도
+                if FileRelocator._same_file(source, target):
+                    break
+                target = directory / f"{stem}_{counter}{suffix}"
+                counter += 1
+        return build_file_url(target)
+
+    @staticmethod
+    def _same_file(source: Path, target: Path) -> bool:
+        try:
+            return source.samefile(target)
+        except OSError:
+            return False
+
+    async def _record(
+        self,
+        tasks: list[tuple[int, int, str, str, int]],
+        results: list[tuple[Optional[str], Optional[str]]],
+    ) -> int:
+        """
+        처리 결과 반영 (한 트랜잭션)
+
+        - 카드가 아직 원래 URL을 참조하면 새 URL로 갱신하고 원래 파일을 회수 대기열에 넣음
+        - 그 사이 카드가 삭제되었으면 새로 만든 파일을 회수 대기열에 넣음
+        - 실패 항목은 재시도 예약
+        """
+        max_attempts = max(1, settings.RELOCATION_MAX_ATTEMPTS)
+        base_delay = max(1, settings.RELOCATION_RETRY_BASE_SECONDS)
+        done_ids, reclaim_urls, moved_urls = [], [], []
+        async with AsyncSessionLocal() as db:
+            for (task_id, card_sn, source_url, _, attempts), (new_url, error) in zip(tasks, results):
+                if error is not None:
+                    self._stats.last_error = f"{source_url}: {error}"
+                    if attempts + 1 >= max_attempts:
+                        self._stats.gave_up += 1
+                        print(f"파일 재배치 실패, 재시도 중단 ({source_url}): {error}")
+                    else:
+                        self._stats.retried += 1
+                    await db.execute(
+                        update(FileRelocationTask)
+                        .where(FileRelocationTask.id == task_id)
+                        .values(
+                            attempts=FileRelocationTask.attempts + 1,
+                            next_attempt_at=func.datetime("now", f"+{base_delay * 2 ** attempts} seconds"),
+                            last_error=error,
+                        )
+                    )
+                    continue
+
+                done_ids.append(task_id)
+                if new_url is None:
+                    self._stats.skipped += 1
+                    continue
+
+                result = await db.execute(
+                    update(Card)
+                    .where(Card.card_sn == card_sn, or_(*(column == source_url for column in _IMAGE_COLUMNS)))
+                    .values({
+                        **{column: case((column == source_url, new_url), else_=column) for column in _IMAGE_COLUMNS},
+                        # 파일 위치 변경은 카드 수정으로 보지 않음
+                        Card.updated_at: Card.updated_at,
+                    })
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount:
+                    self._stats.moved += 1
+                    reclaim_urls.append(source_url)
+                    moved_urls.append((source_url, new_url))
+                else:
+                    self._stats.orphaned += 1
+                    reclaim_urls.append(new_url)
+
+            if done_ids:
+                await db.execute(delete(FileRelocationTask).where(FileRelocationTask.id.in_(done_ids)))
+            if reclaim_urls:
+                await db.run_sync(FileReclaimer.enqueue, reclaim_urls)
+            if moved_urls:
+                # 원래 URL 메타데이터는 원래 파일이 회수될 때 함께 삭제됨
+                await db.run_sync(ImageMetadataService.copy, moved_urls)
+            await db.commit()
+
+        if reclaim_urls:
+            file_reclaimer.notify()
+        return len(done_ids)
+
+    async def stats(self) -> dict:
+        """
+        재배치 지표
+
+        - pending: 이동 대기 중인 항목 수 (재시도 예정 포함)
+        - failed: RELOCATION_MAX_ATTEMPTS회 실패하여 아웃박스에 남은 항목 수
+        - moved / skipped / orphaned / retried: 서버 시작 이후 누적
+        """
+        max_attempts = max(1, settings.RELOCATION_MAX_ATTEMPTS)
+        state = case((FileRelocationTask.attempts >= max_attempts, "failed"), else_="pending").label("state")
+        async with AsyncReadSessionLocal() as db:
+            counts = dict((await db.execute(select(state, func.count()).group_by(state))).all())
+        return {
+            "pending": counts.get("pending", 0),
+            "failed": counts.get("failed", 0),
+            "batches": self._stats.batches,
+            "moved": self._stats.moved,
+            "skipped": self._stats.skipped,
+            "orphaned": self._stats.orphaned,
+            "retried": self._stats.retried,
+            "gaveUp": self._stats.gave_up,
+            "lastError": self._stats.last_error,
+            "lastRunAt": (
+                time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self._stats.last_run_at))
+                if self._stats.last_run_at else None
+            ),
+        }
+
+
+# 전역 파일 재배치기 인스턴스
+file_relocator = FileRelocator()
@@ -0,0 +1,254 @@
+"""
+이미지 생성 백엔드
+
+- fake: GPU/네트워크 없이 동작하는 결정적(deterministic) 로컬 백엔드 (개발·부하 테스트용)
+- qwen: diffusers QwenImageEditPlusPipeline 기반 이미지 편집 백엔드
+  (test/qwen/image_edit.ipynb와 동일한 파라미터, torch/diffusers 필요)
+
+백엔드의 generate / generate_batch는 블로킹 함수이며 스레드풀에서 호출됩니다.
+"""
+import hashlib
+import io
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class GenerationRequest:
+    """백엔드에 전달되는 생성 요청"""
+    prompt: str
+    model: str
+    width: int
+    height: int
+    steps: int
+    seed: Optional[int] = None
+    num_images: int = 1
+    # 편집 모델에 입력할 참조 이미지 파일 경로 (캐릭터, 배경 순)
+    reference_images: tuple[str, ...] = ()
+
+
+class GenerationBackend(ABC):
+    """이미지 생성 백엔드 기본 클래스 (generate는 하위 클래스가 구현)"""
+
+    name = "base"
+
+    def default_model(self) -> str:
+        """요청에 모델이 지정되지 않았을 때 사용할 모델명"""
+        return self.name
+
+    @abstractmethod
+    def generate(self, request: GenerationRequest) -> list[bytes]:
+        """
+        이미지 생성 (블로킹)
+
+        Args:
+            request: 생성 요청
+
+        Returns:
+            list[bytes]: PNG 이미지 바이트 목록 (num_images개)
+        """
+
+    def generate_batch(self, requests: list[GenerationRequest]) -> list[list[bytes]]:
+        """
+        호환 요청(같은 모델·크기·스텝 수) 배치 생성 (블로킹)
+
+        기본 구현은 요청을 하나씩 생성합니다. 한 번의 forward pass로 여러 프롬프트를
+        처리할 수 있는 백엔드는 재정의합니다.
+
+        Args:
+            requests: 생성 요청 목록
+
+        Returns:
+            list[list[bytes]]: 요청 순서대로의 PNG 이미지 바이트 목록
+        """
+        return [self.generate(request) for request in requests]
+
+
+class FakeGenerationBackend(GenerationBackend):
+    """
+    결정적 로컬 백엔드
+
+    같은 요청(프롬프트, 모델, 크기, 스텝, 시드)에는 항상 같은 이미지를 반환합니다.
+    GENERATION_FAKE_LATENCY_MS로 추론 지연을 흉내낼 수 있습니다.
+    """
+
+    name = "fake"
+
+    def default_model(self) -> str:
+        return "fake-v1"
+
+    def generate(self, request: GenerationRequest) -> list[bytes]:
+        return self.generate_batch([request])[0]
+
+    def generate_batch(self, requests: list[GenerationRequest]) -> list[list[bytes]]:
+        # 실제 파이프라인처럼 배치 전체에 지연을 한 번만 적용
+        if settings.GENERATION_FAKE_LATENCY_MS > 0:
+            time.sleep(settings.GENERATION_FAKE_LATENCY_MS / 1000)
+        return [
+            [self._render(request, index) for index in range(request.num_images)]
+            for request in requests
+        ]
+
+    @staticmethod
+    def _render(request: GenerationRequest, index: int) -> bytes:
+        from PIL import Image, ImageDraw
+
+        seed_material = (
+            f"{request.prompt}|{request.model}|{request.width}x{request.height}"
+            f"|{request.steps}|{request.seed}|{index}"
+        )
+        digest = hashlib.sha256(seed_material.encode("utf-8")).digest()
+
+        # 해시 바이트로 8x8 색상 격자를 그려 요청마다 다른 이미지 생성
+        image = Image.new("RGB", (request.width, request.height), tuple(digest[:3]))
+        draw = ImageDraw.Draw(image)
+        cell_w = max(1, request.width // 8)
+        cell_h = max(1, request.height // 8)
+        for cell in range(64):
+            offset = (cell * 3) % (len(digest) - 3)
+            if digest[offset] % 3:
+                continue
+            x, y = (cell % 8) * cell_w, (cell // 8) * cell_h
+            draw.rectangle((x, y, x + cell_w - 1, y + cell_h - 1), fill=tuple(digest[offset:offset + 3]))
+
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+
+class QwenImageEditBackend(GenerationBackend):
+    """
+    Qwen 이미지 편집 백엔드 (diffusers QwenImageEditPlusPipeline)
+
+    파이프라인은 모델별로 첫 요청 시 한 번만 로드하며, GPU 메모리 보호를 위해 추론은 직렬화합니다.
+    """
+
+    name = "qwen"
+
+    def __init__(self):
+        self._pipelines: dict = {}
+        self._lock = threading.Lock()
+
+    def default_model(self) -> str:
+        return settings.QWEN_MODEL_ID
+
+    def _load_pipeline(self, model: str):
+        if model not in self._pipelines:
+            try:
+                import torch
+                from diffusers import QwenImageEditPlusPipeline
+            except ImportError as e:
+                raise RuntimeError(
+                    "qwen 백엔드에는 torch, diffusers 패키지가 필요합니다."
+                ) from e
+            pipeline = QwenImageEditPlusPipeline.from_pretrained(model, torch_dtype=torch.bfloat16)
+            pipeline.to(settings.QWEN_DEVICE)
+            pipeline.set_progress_bar_config(disable=True)
+            self._pipelines[model] = pipeline
+        return self._pipelines[model]
+
+    def generate(self, request: GenerationRequest) -> list[bytes]:
+        return self.generate_batch([request])[0]
+
+    def generate_batch(self, requests: list[GenerationRequest]) -> list[list[bytes]]:
+        """
+        프롬프트 목록을 한 번의 파이프라인 호출로 생성
+
+        참조 이미지는 파이프라인 호출 단위로 공유되므로, 배치 안에서 참조 이미지와
+        요청당 이미지 수가 같은 요청끼리 묶어 호출합니다.
+        """
+        groups: dict[tuple, list[int]] = {}
+        for index, request in enumerate(requests):
+            groups.setdefault((request.reference_images, request.num_images), []).append(index)
+
+        results: list[list[bytes]] = [[] for _ in requests]
+        for (reference_images, num_images), indices in groups.items():
+            group = [requests[index] for index in indices]
+            images = self._run_pipeline(group, reference_images, num_images)
+            for position, index in enumerate(indices):
+                chunk = images[position * num_images:(position + 1) * num_images]
+                results[index] = [self._to_png(image) for image in chunk]
+        return results
+
+    def _run_pipeline(self, group: list[GenerationRequest], reference_images: tuple[str, ...], num_images: int) -> list:
+        import torch
+        from PIL import Image
+
+        first = group[0]
+        with self._lock:
+            pipeline = self._load_pipeline(first.model)
+            images = [Image.open(path).convert("RGB") for path in reference_images]
+            # 요청별 시드 유지 (프롬프트당 num_images개의 generator)
+            generators = []
+            for request in group:
+                for offset in range(num_images):
+                    generator = torch.Generator()
+                    if request.seed is not None:
+                        generator.manual_seed(request.seed + offset)
+                    else:
+                        generator.seed()
+                    generators.append(generator)
+            inputs = {
+                "image": images or None,
+                "prompt": [request.prompt for request in group],
+                "generator": generators,
+                "true_cfg_scale": 4.0,
+                "negative_prompt": [" "] * len(group),
+                "num_inference_steps": first.steps,
+                "guidance_scale": 1.0,
+                "num_images_per_prompt": num_images,
+                "width": first.width,
+                "height": first.height,
+            }
+            with torch.inference_mode():
+                output = pipeline(**inputs)
+        return output.images
+
+    @staticmethod
+    def _to_png(image) -> bytes:
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+
+# 백엔드 이름 → 클래스
+_BACKEND_CLASSES: dict[str, type[GenerationBackend]] = {
+    FakeGenerationBackend.name: FakeGenerationBackend,
+    QwenImageEditBackend.name: QwenImageEditBackend,
+}
+
+_backend_instances: dict[str, GenerationBackend] = {}
+_backend_lock = threading.Lock()
+
+
+def available_backends() -> list[str]:
+    """사용 가능한 백엔드 이름 목록"""
+    return sorted(_BACKEND_CLASSES)
+
+
+def get_backend(name: Optional[str] = None) -> GenerationBackend:
+    """
+    이름으로 백엔드 인스턴스 조회 (백엔드별 싱글톤)
+
+    Args:
+        name: 백엔드 이름 (없으면 GENERATION_BACKEND 설정값)
+
+    Returns:
+        GenerationBackend: 백엔드 인스턴스
+
+    Raises:
+        ValueError: 알 수 없는 백엔드 이름인 경우
+    """
+    name = name or settings.GENERATION_BACKEND
+    if name not in _BACKEND_CLASSES:
+        raise ValueError(
+            f"알 수 없는 생성 백엔드입니다: {name} (사용 가능: {', '.join(available_backends())})"
+        )
+    with _backend_lock:
+        if name not in _backend_instances:
+            _backend_instances[name] = _BACKEND_CLASSES[name]()
+        return _backend_instances[name]
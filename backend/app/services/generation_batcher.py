@@ -0,0 +1,152 @@
+"""
+이미지 생성 마이크로 배칭 스케줄러
+
+디퓨전 파이프라인은 한 번의 forward pass에 여러 프롬프트를 처리할 때 효율이 높습니다.
+호환되는 요청(같은 백엔드·모델·크기·스텝 수)을 최대 GENERATION_BATCH_MAX_SIZE개 또는
+GENERATION_BATCH_MAX_WAIT_MS 동안 모아 backend.generate_batch로 한 번에 실행하고,
+결과를 각 호출자에게 나누어 돌려줍니다.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.services.generation_backends import GenerationBackend, GenerationRequest
+
+
+# 배치 호환 키: (백엔드, 모델, 너비, 높이, 스텝 수)
+BatchKey = tuple[str, str, int, int, int]
+
+
+@dataclass
+class _PendingBatch:
+    """모으는 중인 배치"""
+    backend: GenerationBackend
+    requests: list[GenerationRequest] = field(default_factory=list)
+    futures: list[asyncio.Future] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class GenerationBatcher:
+    """호환 요청을 모아 배치로 실행하는 스케줄러"""
+
+    def __init__(self):
+        self._pending: dict[BatchKey, _PendingBatch] = {}
+        self._running: set[asyncio.Task] = set()
+        self._batches = 0
+        self._items = 0
+        self._full_flushes = 0
+        self._size_histogram: dict[int, int] = {}
+
+    @staticmethod
+    def batch_key(backend: GenerationBackend, request: GenerationRequest) -> BatchKey:
+        """요청의 배치 호환 키"""
+        return (backend.name, request.model, request.width, request.height, request.steps)
+
+    async def generate(self, backend: GenerationBackend, request: GenerationRequest) -> list[bytes]:
+        """
+        요청을 배치에 넣고 결과를 기다림
+
+        Args:
+            backend: 생성 백엔드
+            request: 생성 요청
+
+        Returns:
+            list[bytes]: 이 요청의 이미지 바이트 목록
+
+        Raises:
+            Exception: 배치 실행 중 발생한 예외 (배치의 모든 요청에 전달)
+        """
+        max_size = max(1, settings.GENERATION_BATCH_MAX_SIZE)
+        if max_size == 1:
+            self._record(1, full=True)
+            return await run_in_threadpool(backend.generate, request)
+
+        loop = asyncio.get_running_loop()
+        key = self.batch_key(backend, request)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(backend=backend)
+            self._pending[key] = batch
+            batch.timer = loop.call_later(
+                max(0, settings.GENERATION_BATCH_MAX_WAIT_MS) / 1000, self._flush, key
+            )
+
+        future = loop.create_future()
+        batch.requests.append(request)
+        batch.futures.append(future)
+        if len(batch.requests) >= max_size:
+            self._flush(key)
+
+        # 호출자가 취소되어도 배치의 다른 요청에는 영향을 주지 않음
+        return await asyncio.shield(future)
+
+    def _flush(self, key: BatchKey) -> None:
+        """대기 중인 배치를 실행 태스크로 넘김 (크기 도달 또는 대기 시간 만료 시)"""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        self._record(len(batch.requests), full=len(batch.requests) >= settings.GENERATION_BATCH_MAX_SIZE)
+
+        task = asyncio.get_running_loop().create_task(self._execute(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _execute(self, batch: _PendingBatch) -> None:
+        """배치 실행 후 결과를 각 요청의 future에 분배"""
+        try:
+            results = await run_in_threadpool(batch.backend.generate_batch, batch.requests)
+            if len(results) != len(batch.requests):
+                raise RuntimeError(
+                    f"배치 결과 수가 요청 수와 다릅니다: {len(results)} != {len(batch.requests)}"
+                )
+        except BaseException as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+                    # 취소된 호출자의 future는 조회되지 않으므로 미조회 경고 방지
+                    future.exception()
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for future, outputs in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(outputs)
+
+    def _record(self, size: int, full: bool) -> None:
+        self._batches += 1
+        self._items += size
+        self._full_flushes += int(full)
+        self._size_histogram[size] = self._size_histogram.get(size, 0) + 1
+
+    async def shutdown(self) -> None:
+        """대기 중인 배치를 즉시 실행하고 실행 중인 배치 완료까지 대기"""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """
+        배치 지표
+
+        - fillRate: 평균 배치 크기 / 최대 배치 크기 (1.0이면 항상 가득 찬 배치)
+        - fullFlushes / timeoutFlushes: 크기 도달로 실행된 배치 수 / 대기 시간 만료로 실행된 배치 수
+        """
+        max_size = max(1, settings.GENERATION_BATCH_MAX_SIZE)
+        average = self._items / self._batches if self._batches else 0.0
+        return {
+            "maxSize": max_size,
+            "maxWaitMs": settings.GENERATION_BATCH_MAX_WAIT_MS,
+            "batches": self._batches,
+            "items": self._items,
+            "averageSize": round(average, 3),
+            "fillRate": round(average / max_size, 3),
+            "fullFlushes": self._full_flushes,
+            "timeoutFlushes": self._batches - self._full_flushes,
+            "pending": sum(len(batch.requests) for batch in self._pending.values()),
+            "sizeHistogram": dict(sorted(self._size_histogram.items())),
+        }
@@ -0,0 +1,345 @@
+"""
+비동기 이미지 생성 작업 관리
+
+- 작업 제출 시 작업 ID를 즉시 반환하고, 워커 풀이 큐에서 꺼내 실행
+- 백엔드 호출은 GenerationBatcher를 거쳐 호환 요청끼리 배치로 실행
+- 시도마다 CardGenerationHistory에 결과·소요 시간·에러를 기록
+- 생성된 이미지는 저장 후 CardGeneratedImage로 카드에 연결
+  (이력·합성이미지 INSERT는 그룹 커밋 쓰기 큐를 거쳐 다른 작업의 INSERT와 함께 커밋)
+- 작업 상태는 메모리에 보관 (GENERATION_JOB_RETENTION개까지, 오래된 완료 작업부터 제거)
+"""
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.database.database import ReadSessionLocal
+from app.database.models import Card, CardGeneratedImage, CardGenerationHistory
+from app.schemas.card import GenerationJobCreateSchema
+from app.services.card_service import CardService
+from app.services.generation_batcher import GenerationBatcher
+from app.services.generation_backends import GenerationRequest, get_backend
+from app.services.image_metadata_service import ImageMetadataService
+from app.services.write_queue import write_queue
+from app.utils.file_utils import StoredUpload, get_file_path_from_url, store_image_bytes
+
+
+class JobStatus:
+    """작업 상태"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class GenerationQueueFullError(Exception):
+    """작업 큐가 가득 찬 경우"""
+
+
+class GenerationCardDeletedError(LookupError):
+    """생성 도중 카드가 삭제된 경우 (재시도하지 않음)"""
+
+
+@dataclass
+class GenerationJob:
+    """이미지 생성 작업"""
+    job_id: str
+    card_sn: int
+    backend: str
+    request: GenerationRequest
+    request_data: dict
+    status: str = JobStatus.QUEUED
+    attempts: int = 0
+    image_urls: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    elapsed_ms: Optional[int] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class GenerationJobManager:
+    """이미지 생성 작업 큐와 워커 풀"""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, GenerationJob]" = OrderedDict()
+        self.batcher = GenerationBatcher()
+
+    async def start(self) -> None:
+        """워커 풀 시작 (서버 시작 시 호출)"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=settings.GENERATION_QUEUE_SIZE)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"generation-worker-{index}")
+            for index in range(max(1, settings.GENERATION_WORKERS))
+        ]
+
+    async def shutdown(self) -> None:
+        """워커 풀 종료, 대기 중인 작업은 실패 처리 (서버 종료 시 호출)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self.batcher.shutdown()
+        for job in self._jobs.values():
+            if not job.finished:
+                self._finish(job, JobStatus.FAILED, error="서버 종료로 작업이 취소되었습니다.")
+
+    async def submit(self, db: AsyncSession, payload: GenerationJobCreateSchema) -> GenerationJob:
+        """
+        생성 작업 제출
+
+        Args:
+            db: 비동기 데이터베이스 세션 (카드 조회용)
+            payload: 작업 제출 요청
+
+        Returns:
+            GenerationJob: 큐에 등록된 작업
+
+        Raises:
+            LookupError: 카드가 없는 경우
+            ValueError: 알 수 없는 백엔드인 경우
+            GenerationQueueFullError: 큐가 가득 찬 경우
+        """
+        if self._queue is None:
+            raise RuntimeError("생성 작업 워커가 시작되지 않았습니다.")
+
+        card = await db.get(Card, payload.cardSn)
+        if not card:
+            raise LookupError(f"카드 일련번호 {payload.cardSn}에 해당하는 카드를 찾을 수 없습니다.")
+
+        backend = get_backend(payload.backend)
+        prompt = payload.prompt or CardService.generate_prompt(CardService.build_generation_request(card))
+
+        # 이미지 편집 모델 입력용 참조 이미지 (캐릭터, 배경)
+        reference_images = []
+        for url in (card.character_image_url, card.background_image_url):
+            path = await run_in_threadpool(get_file_path_from_url, url) if url else None
+            if path:
+                reference_images.append(str(path))
+
+        request = GenerationRequest(
+            prompt=prompt,
+            model=payload.model or backend.default_model(),
+            width=payload.width or settings.GENERATION_DEFAULT_WIDTH,
+            height=payload.height or settings.GENERATION_DEFAULT_HEIGHT,
+            steps=payload.steps or settings.GENERATION_DEFAULT_STEPS,
+            seed=payload.seed,
+            num_images=payload.numImages,
+            reference_images=tuple(reference_images),
+        )
+        job = GenerationJob(
+            job_id=uuid.uuid4().hex,
+            card_sn=card.card_sn,
+            backend=backend.name,
+            request=request,
+            request_data={
+                "backend": backend.name,
+                "model": request.model,
+                "width": request.width,
+                "height": request.height,
+                "steps": request.steps,
+                "seed": request.seed,
+                "numImages": request.num_images,
+            },
+        )
+
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise GenerationQueueFullError("생성 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.")
+
+        self._jobs[job.job_id] = job
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """작업 조회"""
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: GenerationJob, timeout: float) -> GenerationJob:
+        """
+        작업 완료까지 최대 timeout초 대기 (롱 폴링)
+
+        Args:
+            job: 대기할 작업
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            GenerationJob: 대기 후 작업 (완료되지 않았을 수 있음)
+        """
+        if timeout > 0 and not job.finished:
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def stats(self) -> dict:
+        """작업 상태별 개수, 큐 길이 및 배치 지표"""
+        counts: dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "jobs": counts,
+            "batching": self.batcher.stats(),
+            "writeQueue": write_queue.stats(),
+        }
+
+    def _prune(self) -> None:
+        """보관 한도를 넘으면 가장 오래된 완료 작업부터 제거"""
+        overflow = len(self._jobs) - settings.GENERATION_JOB_RETENTION
+        if overflow <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:overflow]:
+            del self._jobs[job_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                self._finish(job, JobStatus.FAILED, error="서버 종료로 작업이 취소되었습니다.")
+                raise
+            except Exception as e:
+                self._finish(job, JobStatus.FAILED, error=str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: GenerationJob) -> None:
+        """
+        작업 실행 (실패 시 GENERATION_MAX_ATTEMPTS까지 재시도)
+
+        - 백엔드 호출·파일 저장이 실패하면 생성부터 다시 시도
+        - 결과 저장 후 커밋이 실패하면 백엔드를 다시 호출하지 않고 저장한 결과로 커밋만 다시 시도
+        - 생성 도중 카드가 삭제되면 재시도하지 않고 실패 처리
+        """
+        backend = get_backend(job.backend)
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+
+        max_attempts = max(1, settings.GENERATION_MAX_ATTEMPTS)
+        stored: Optional[tuple[list[str], list[dict]]] = None
+        while job.attempts < max_attempts:
+            job.attempts += 1
+            try:
+                if stored is None:
+                    started = time.perf_counter()
+                    try:
+                        outputs = await self.batcher.generate(backend, job.request)
+                    finally:
+                        job.elapsed_ms = int((time.perf_counter() - started) * 1000)
+                    stored = await self._store_outputs(job, outputs)
+                urls, image_metadata = stored
+                await self._attach_outputs(job, urls, image_metadata)
+            except GenerationCardDeletedError as e:
+                error = f"{type(e).__name__}: {e}"
+                await self._record_failure(job, error)
+                self._finish(job, JobStatus.FAILED, error=error)
+                return
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                await self._record_failure(job, error)
+                if job.attempts >= max_attempts:
+                    self._finish(job, JobStatus.FAILED, error=error)
+                    return
+                continue
+
+            job.image_urls = urls
+            self._finish(job, JobStatus.SUCCEEDED)
+            return
+
+    def _finish(self, job: GenerationJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        job.done.set()
+
+    def _history_request_data(self, job: GenerationJob) -> dict:
+        return {
+            **job.request_data,
+            "jobId": job.job_id,
+            "attempt": job.attempts,
+            "elapsedMs": job.elapsed_ms,
+        }
+
+    async def _store_outputs(self, job: GenerationJob, outputs: list[bytes]) -> tuple[list[str], list[dict]]:
+        """
+        생성 결과 이미지 파일 저장과 메타데이터 추출
+
+        파일 저장은 스레드풀에서, 이미지 메타데이터 추출은 프로세스 풀에서 실행됩니다.
+
+        Returns:
+            tuple: (저장된 이미지 URL 목록, 이미지 메타데이터 행 값 목록)
+
+        Raises:
+            GenerationCardDeletedError: 카드가 삭제된 경우
+        """
+        stored_outputs = await run_in_threadpool(self._store_files, job, outputs)
+        image_metadata = await ImageMetadataService.extract_many(stored_outputs)
+        return [url for url, _ in stored_outputs], image_metadata
+
+    def _store_files(self, job: GenerationJob, outputs: list[bytes]) -> list[tuple[str, StoredUpload]]:
+        """생성 결과 이미지 파일 저장 (스레드풀에서 실행, 파일별 (URL, 저장 결과) 반환)"""
+        db = ReadSessionLocal()
+        try:
+            card = db.query(Card).filter(Card.card_sn == job.card_sn).first()
+            if not card:
+                raise GenerationCardDeletedError(f"카드 일련번호 {job.card_sn}에 해당하는 카드가 삭제되었습니다.")
+            subdirectory = f"{CardService.get_card_storage_subdirectory(card)}/gen"
+        finally:
+            db.close()
+
+        return [
+            store_image_bytes(data, subdirectory=subdirectory, filename_prefix="gen_")
+            for data in outputs
+        ]
+
+    async def _attach_outputs(self, job: GenerationJob, urls: list[str], image_metadata: list[dict]) -> None:
+        """
+        저장된 결과를 카드에 연결하고 성공 이력 기록
+
+        합성이미지·이력 INSERT와 메타데이터 UPSERT는 쓰기 큐에서 한 트랜잭션으로 커밋됩니다.
+        실패해도 저장된 파일은 그대로이므로 같은 인자로 다시 호출할 수 있습니다.
+        """
+        records = [CardGeneratedImage(card_sn=job.card_sn, image_url=url) for url in urls]
+        records.append(CardGenerationHistory(
+            card_sn=job.card_sn,
+            request_data=self._history_request_data(job),
+            prompt=job.request.prompt,
+            image_url=urls[0] if urls else None,
+            success=1,
+        ))
+        await write_queue.write(records, blob_urls=urls, image_metadata=image_metadata)
+
+    async def _record_failure(self, job: GenerationJob, error: str) -> None:
+        """실패한 시도 이력 기록"""
+        try:
+            await write_queue.write([CardGenerationHistory(
+                card_sn=job.card_sn,
+                request_data=self._history_request_data(job),
+                prompt=job.request.prompt,
+                success=0,
+                error_message=error,
+            )])
+        except Exception as e:
+            print(f"생성 이력 기록 실패 (job={job.job_id}): {str(e)}")
+
+
+# 전역 생성 작업 관리자 인스턴스
+generation_manager = GenerationJobManager()
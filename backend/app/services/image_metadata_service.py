@@ -0,0 +1,296 @@
+"""
+이미지 메타데이터 추출 및 저장
+
+업로드·합성이미지 등록 시 이미지마다 한 번만 크기, 형식, 바이트 수, SHA-256,
+저해상도 미리보기(LQIP), 대표 색상을 추출하여 image_metadata 테이블에 저장합니다.
+/cards/list, /cards/search, /cards/{card_sn}/generated-images 응답에 URL별로 함께 내려주므로
+클라이언트는 원본을 받기 전에 그리드 배치와 미리보기를 그릴 수 있습니다.
+
+- 디코딩은 파생본 엔진의 프로세스 풀에서 실행 (이벤트 루프·GIL 비차단)
+- 바이트 수와 SHA-256은 스트리밍 저장 중 계산한 값(StoredUpload)을 그대로 사용
+- 행 저장은 쓰기 큐(write_queue)에서 합성이미지 INSERT와 같은 트랜잭션으로 커밋
+- 파일이 재배치·레이아웃 이전으로 새 URL을 받으면 행을 복사하고, 파일이 회수·격리되면 행을 삭제
+"""
+import asyncio
+import base64
+import io
+from typing import Iterable, Optional
+from sqlalchemy import delete, literal, select, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.database import AsyncReadSessionLocal
+from app.database.models import Card, CardGeneratedImage, ImageMetadata
+from app.services.derivative_service import derivative_engine
+from app.utils.file_utils import StoredUpload
+
+
+# IN 목록 1회당 최대 값 수 (SQLite 바인드 변수 한도 이내)
+_IN_CHUNK_SIZE = 500
+
+# EXIF Orientation 태그 값 중 가로·세로가 바뀌는 회전
+_EXIF_ORIENTATION = 0x0112
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+# 미리보기 WebP 품질 (수십 px 크기라 낮아도 충분)
+_PLACEHOLDER_QUALITY = 40
+
+# 행에 저장하는 메타데이터 컬럼 (url 제외)
+_COPY_COLUMNS = (
+    ImageMetadata.sha256,
+    ImageMetadata.format,
+    ImageMetadata.width,
+    ImageMetadata.height,
+    ImageMetadata.bytes,
+    ImageMetadata.placeholder,
+    ImageMetadata.dominant_color,
+)
+
+
+def extract_image_metadata(source: str, placeholder_size: int) -> dict:
+    """
+    이미지 크기, 형식, 미리보기, 대표 색상 추출 (프로세스 풀 워커에서 실행)
+
+    크기는 EXIF 회전을 반영한 표시 크기입니다. 움직이는 GIF/WebP는 첫 프레임 기준입니다.
+
+    Args:
+        source: 이미지 파일 경로
+        placeholder_size: 미리보기 최대 너비/높이 (px, 0이면 미리보기·대표 색상 생략)
+
+    Returns:
+        dict: format, width, height, placeholder(data URI), dominant_color(#rrggbb)
+
+    Raises:
+        Exception: Pillow로 열 수 없는 파일인 경우 (SVG 등)
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image_format = image.format.lower() if image.format else None
+        width, height = image.size
+        if image.getexif().get(_EXIF_ORIENTATION) in _TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        result = {
+            "format": image_format,
+            "width": width,
+            "height": height,
+            "placeholder": None,
+            "dominant_color": None,
+        }
+        if placeholder_size <= 0:
+            return result
+
+        # JPEG는 디코딩 단계에서 축소하여 큰 원본도 빠르게 처리
+        image.draft("RGB", (placeholder_size, placeholder_size))
+        small = ImageOps.exif_transpose(image)
+        has_alpha = small.mode in ("RGBA", "LA", "PA") or "transparency" in small.info
+        small = small.convert("RGBA" if has_alpha else "RGB")
+        small.thumbnail((placeholder_size, placeholder_size), Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        small.save(buffer, format="WEBP", quality=_PLACEHOLDER_QUALITY, method=6)
+        result["placeholder"] = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+        red, green, blue = small.convert("RGB").resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+        result["dominant_color"] = f"#{red:02x}{green:02x}{blue:02x}"
+        return result
+
+
+class ImageMetadataService:
+    """
+    이미지 메타데이터 서비스
+
+    extract / exists는 비동기로, upsert / copy / forget은 호출자의 트랜잭션 안에서
+    (run_sync 또는 쓰기 큐) 실행되며 커밋하지 않습니다.
+    """
+
+    @staticmethod
+    async def extract(url: str, stored: StoredUpload, skip_existing: bool = True) -> Optional[dict]:
+        """
+        저장한 이미지의 메타데이터 행 값 추출
+
+        판독할 수 없는 이미지(SVG 등)도 형식, 바이트 수, SHA-256만으로 행을 만듭니다.
+
+        Args:
+            url: 저장된 파일 URL
+            stored: 스트리밍 저장 결과 (경로, 크기, SHA-256, 판별된 형식)
+            skip_existing: 기존 블롭을 재사용한 경우 이미 행이 있으면 추출하지 않음
+
+        Returns:
+            Optional[dict]: ImageMetadata 행 값, 추출이 꺼져 있거나 이미 있으면 None
+        """
+        if not settings.IMAGE_METADATA_ENABLED:
+            return None
+        if skip_existing and not stored.created and await ImageMetadataService.exists(url):
+            return None
+
+        values = {
+            "url": url,
+            "sha256": stored.sha256,
+            "format": stored.image_format,
+            "width": None,
+            "height": None,
+            "bytes": stored.size,
+            "placeholder": None,
+            "dominant_color": None,
+        }
+        if stored.image_format == "svg":
+            return values
+        try:
+            extracted = await derivative_engine.run(
+                extract_image_metadata, str(stored.file_path), settings.IMAGE_PLACEHOLDER_SIZE
+            )
+        except Exception as e:
+            print(f"이미지 메타데이터 추출 실패 ({url}): {type(e).__name__}: {e}")
+            return values
+        values.update(extracted)
+        return values
+
+    @staticmethod
+    async def extract_many(items: Iterable[tuple[str, StoredUpload]]) -> list[dict]:
+        """
+        여러 이미지의 메타데이터를 동시에 추출 (프로세스 풀 동시 실행 수 제한 내)
+
+        Returns:
+            list[dict]: 추출한 행 값 목록 (건너뛴 이미지 제외)
+        """
+        results = await asyncio.gather(*(ImageMetadataService.extract(url, stored) for url, stored in items))
+        return [values for values in results if values is not None]
+
+    @staticmethod
+    async def ingest(items: Iterable[tuple[str, StoredUpload]]) -> int:
+        """
+        업로드한 이미지의 메타데이터 추출 후 쓰기 큐로 저장 (커밋까지 대기)
+
+        메타데이터는 부가 정보이므로 실패해도 예외를 올리지 않고 업로드 결과를 유지합니다.
+
+        Args:
+            items: (저장된 파일 URL, 스트리밍 저장 결과) 목록
+
+        Returns:
+            int: 저장한 메타데이터 행 수
+        """
+        from app.services.write_queue import write_queue
+
+        try:
+            rows = await ImageMetadataService.extract_many(items)
+            await write_queue.add_image_metadata(rows)
+        except Exception as e:
+            print(f"이미지 메타데이터 저장 실패: {type(e).__name__}: {e}")
+            return 0
+        return len(rows)
+
+    @staticmethod
+    async def exists(url: str) -> bool:
+        """URL의 메타데이터 행이 있는지 확인"""
+        async with AsyncReadSessionLocal() as db:
+            row = (await db.execute(
+                select(ImageMetadata.url).where(ImageMetadata.url == url)
+            )).scalar_one_or_none()
+        return row is not None
+
+    @staticmethod
+    async def get_many(db: AsyncSession, urls: Iterable[Optional[str]]) -> dict[str, ImageMetadata]:
+        """
+        여러 URL의 메타데이터 조회 (기본 키 IN 조회)
+
+        Args:
+            db: 비동기 데이터베이스 세션
+            urls: 이미지 URL 목록 (None·중복 허용)
+
+        Returns:
+            dict[str, ImageMetadata]: URL → 메타데이터 (행이 없는 URL은 제외)
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        found: dict[str, ImageMetadata] = {}
+        for start in range(0, len(unique_urls), _IN_CHUNK_SIZE):
+            rows = (await db.execute(
+                select(ImageMetadata).where(ImageMetadata.url.in_(unique_urls[start:start + _IN_CHUNK_SIZE]))
+            )).scalars().all()
+            found.update((row.url, row) for row in rows)
+        return found
+
+    @staticmethod
+    def upsert(db: Session, rows: Iterable[dict]) -> int:
+        """
+        메타데이터 행 저장 (같은 URL이 있으면 새 값으로 갱신)
+
+        Args:
+            db: 데이터베이스 세션
+            rows: extract가 반환한 행 값 목록
+
+        Returns:
+            int: 저장한 행 수
+        """
+        count = 0
+        for values in rows:
+            stmt = sqlite_insert(ImageMetadata).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ImageMetadata.url],
+                set_={key: stmt.excluded[key] for key in values if key != "url"},
+            )
+            db.execute(stmt)
+            count += 1
+        return count
+
+    @staticmethod
+    def any_referenced(db: Session, urls: Iterable[str]) -> bool:
+        """
+        카드나 합성이미지가 참조하는 URL이 하나라도 있는지 확인 (URL 컬럼 인덱스 사용)
+
+        Args:
+            db: 데이터베이스 세션
+            urls: 파일 URL 목록
+
+        Returns:
+            bool: 참조되는 URL이 있으면 True
+        """
+        urls = list(dict.fromkeys(urls))
+        for start in range(0, len(urls), _IN_CHUNK_SIZE):
+            chunk = urls[start:start + _IN_CHUNK_SIZE]
+            referenced = db.execute(union_all(
+                select(Card.character_image_url.label("url")).where(Card.character_image_url.in_(chunk)),
+                select(Card.background_image_url).where(Card.background_image_url.in_(chunk)),
+                select(Card.generated_image_url).where(Card.generated_image_url.in_(chunk)),
+                select(CardGeneratedImage.image_url).where(CardGeneratedImage.image_url.in_(chunk)),
+            ).limit(1)).first()
+            if referenced is not None:
+                return True
+        return False
+
+    @staticmethod
+    def copy(db: Session, pairs: Iterable[tuple[str, str]], move: bool = False) -> None:
+        """
+        파일이 새 URL을 받았을 때 메타데이터 행 복사 (재배치, 레이아웃 이전)
+
+        Args:
+            db: 데이터베이스 세션
+            pairs: (예전 URL, 새 URL) 목록
+            move: 예전 URL 행 삭제 여부 (예전 파일이 바로 삭제되는 경우)
+        """
+        pairs = list(pairs)
+        for old_url, new_url in pairs:
+            db.execute(
+                sqlite_insert(ImageMetadata)
+                .from_select(
+                    [ImageMetadata.url, *_COPY_COLUMNS],
+                    select(literal(new_url), *_COPY_COLUMNS).where(ImageMetadata.url == old_url),
+                )
+                .on_conflict_do_nothing(index_elements=[ImageMetadata.url])
+            )
+        if move:
+            ImageMetadataService.forget(db, [old_url for old_url, _ in pairs])
+
+    @staticmethod
+    def forget(db: Session, urls: Iterable[str]) -> None:
+        """
+        삭제·격리된 파일의 메타데이터 행 삭제
+
+        Args:
+            db: 데이터베이스 세션
+            urls: 파일 URL 목록
+        """
+        urls = list(dict.fromkeys(urls))
+        for start in range(0, len(urls), _IN_CHUNK_SIZE):
+            db.execute(delete(ImageMetadata).where(ImageMetadata.url.in_(urls[start:start + _IN_CHUNK_SIZE])))
@@ -0,0 +1,216 @@
+"""
+백그라운드 업로드 레이아웃 이전기 (legacy → sharded)
+
+UPLOAD_LAYOUT=sharded이면 서버 시작 시 업로드 디렉토리의 legacy 파일(업로드 루트, 서브디렉토리, 카드 디렉토리)을
+UPLOAD_LAYOUT_MIGRATION_BATCH_SIZE개씩 shards/ab/cd/ 아래로 옮깁니다. 새 위치는 예전 상대 경로의 해시로 정해지므로
+(legacy_shard_path) 이전이 끝난 뒤에도 예전 URL은 get_file_path_from_url / 정적 파일 서빙에서 그대로 찾아집니다.
+
+이전 순서 (어느 시점에 중단되어도 예전·새 URL 모두 존재하는 파일을 가리킴):
+1. 새 위치에 하드 링크 생성 (지원하지 않으면 임시 파일로 복사 후 이름 변경)
+2. 한 트랜잭션에서 cards / card_generated_images / 재배치 아웃박스 / 이미지 메타데이터의 예전 URL을 새 URL로 갱신
+3. 예전 파일 삭제
+
+이전한 파일은 예전 위치에서 사라지므로 다음 시작 시 남은 파일만 다시 처리합니다.
+블롭 디렉토리, 샤드 디렉토리, 숨김 파일은 대상이 아닙니다.
+"""
+import asyncio
+import errno
+import filecmp
+import time
+from dataclasses import dataclass
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, or_, update
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
+from app.database.models import Card, CardGeneratedImage, FileRelocationTask
+from app.services.image_metadata_service import ImageMetadataService
+from app.services.orphan_collector import ScannedFile, list_files_after
+from app.utils.blob_store import blob_root
+from app.utils.file_utils import build_file_url, legacy_shard_path, link_or_copy, shard_root, upload_path_resolver
+
+
+# 카드에서 갱신할 이미지 URL 컬럼
+_IMAGE_COLUMNS = (Card.character_image_url, Card.background_image_url, Card.generated_image_url)
+
+
+@dataclass
+class _MigratorStats:
+    scanned: int = 0
+    migrated: int = 0
+    updated_references: int = 0
+    failed: int = 0
+    last_error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class LayoutMigrator:
+    """legacy 레이아웃 파일을 샤드 디렉토리로 옮기는 백그라운드 이전기"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._stats = _MigratorStats()
+
+    async def start(self) -> None:
+        """이전기 태스크 시작 (UPLOAD_LAYOUT=sharded이고 이전이 켜져 있을 때만)"""
+        if (
+            self._task is not None
+            or settings.UPLOAD_LAYOUT != "sharded"
+            or not settings.UPLOAD_LAYOUT_MIGRATION_ENABLED
+        ):
+            return
+        self._closing = False
+        self._task = asyncio.create_task(self._run(), name="layout-migrator")
+
+    async def shutdown(self) -> None:
+        """진행 중인 배치를 마친 뒤 종료 (남은 파일은 다음 시작 시 처리)"""
+        if self._task is None:
+            return
+        self._closing = True
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        self._stats.started_at = time.time()
+        try:
+            await self.migrate()
+            self._stats.finished_at = time.time()
+            print(
+                f"📦 업로드 레이아웃 이전 완료: {self._stats.migrated}개 이전, "
+                f"참조 {self._stats.updated_references}건 갱신, 실패 {self._stats.failed}개"
+            )
+        except Exception as e:
+            self._stats.last_error = f"{type(e).__name__}: {e}"
+            print(f"업로드 레이아웃 이전 중 오류 발생: {self._stats.last_error}")
+
+    async def migrate(self) -> int:
+        """
+        남은 legacy 파일을 모두 이전
+
+        Returns:
+            int: 이전한 파일 수
+        """
+        batch_size = max(1, settings.UPLOAD_LAYOUT_MIGRATION_BATCH_SIZE)
+        excluded = (blob_root(), shard_root(), settings.orphan_quarantine_path)
+        cursor: Optional[str] = None
+        migrated = 0
+        while not self._closing:
+            files = await run_in_threadpool(list_files_after, settings.upload_path, cursor, batch_size, excluded)
+            if not files:
+                break
+            self._stats.scanned += len(files)
+
+            placed = await run_in_threadpool(self._place_batch, files)
+            if placed:
+                await self._update_references(placed)
+                await run_in_threadpool(self._remove_sources, placed)
+                migrated += len(placed)
+                self._stats.migrated += len(placed)
+
+            if len(files) < batch_size:
+                break
+            cursor = files[-1].relative_path
+            await asyncio.sleep(max(0.0, settings.UPLOAD_LAYOUT_MIGRATION_DELAY_SECONDS))
+        return migrated
+
+    def _place_batch(self, files: list[ScannedFile]) -> list[tuple[str, str, str]]:
+        """
+        새 위치에 파일 배치 (블로킹, 스레드풀에서 실행)
+
+        Returns:
+            list: 배치에 성공한 파일별 (상대 경로, 예전 URL, 새 URL)
+        """
+        placed = []
+        for scanned in files:
+            source = settings.upload_path / scanned.relative_path
+            target = legacy_shard_path(scanned.relative_path)
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    link_or_copy(source, target)
+                except FileExistsError:
+                    # 이전 실행에서 이미 링크·복사했으면 그대로 사용, 내용이 다르면 덮어쓰지 않고 실패 처리
+                    if not source.samefile(target) and not filecmp.cmp(source, target, shallow=False):
+                        raise FileExistsError(errno.EEXIST, "샤드 위치에 다른 파일이 있습니다", str(target))
+            except OSError as e:
+                self._stats.failed += 1
+                self._stats.last_error = f"{scanned.relative_path}: {type(e).__name__}: {e}"
+                continue
+            placed.append((scanned.relative_path, build_file_url(source), build_file_url(target)))
+        return placed
+
+    async def _update_references(self, placed: list[tuple[str, str, str]]) -> None:
+        """예전 URL을 참조하는 행을 새 URL로 갱신 (한 트랜잭션)"""
+        updated = 0
+        async with AsyncSessionLocal() as db:
+            for _, old_url, new_url in placed:
+                result = await db.execute(
+                    update(Card)
+                    .where(or_(*(column == old_url for column in _IMAGE_COLUMNS)))
+                    .values({
+                        **{column: case((column == old_url, new_url), else_=column) for column in _IMAGE_COLUMNS},
+                        # 파일 위치 변경은 카드 수정으로 보지 않음
+                        Card.updated_at: Card.updated_at,
+                    })
+                    .execution_options(synchronize_session=False)
+                )
+                updated += result.rowcount
+                result = await db.execute(
+                    update(CardGeneratedImage)
+                    .where(CardGeneratedImage.image_url == old_url)
+                    .values(image_url=new_url)
+                    .execution_options(synchronize_session=False)
+                )
+                updated += result.rowcount
+                await db.execute(
+                    update(FileRelocationTask)
+                    .where(FileRelocationTask.source_url == old_url)
+                    .values(source_url=new_url)
+                    .execution_options(synchronize_session=False)
+                )
+            # 예전 파일은 커밋 직후 삭제되므로 메타데이터 행을 새 URL로 옮김
+            await db.run_sync(ImageMetadataService.copy, [(old_url, new_url) for _, old_url, new_url in placed], True)
+            await db.commit()
+
+        self._stats.updated_references += updated
+
+    def _remove_sources(self, placed: list[tuple[str, str, str]]) -> None:
+        """참조 갱신이 커밋된 뒤 예전 파일 삭제 (블로킹, 스레드풀에서 실행)"""
+        for relative_path, _, _ in placed:
+            source = settings.upload_path / relative_path
+            try:
+                source.unlink(missing_ok=True)
+            except OSError as e:
+                self._stats.failed += 1
+                self._stats.last_error = f"{relative_path}: {type(e).__name__}: {e}"
+            finally:
+                # 예전 URL은 이후 조회부터 샤드 위치로 변환
+                upload_path_resolver.invalidate(source)
+
+    def stats(self) -> dict:
+        """
+        이전 지표 (서버 시작 이후 누적)
+
+        - scanned: 검사한 legacy 파일 수, migrated: 이전한 파일 수
+        - updatedReferences: 새 URL로 갱신한 카드·합성이미지 행 수
+        """
+        def _iso(timestamp: Optional[float]) -> Optional[str]:
+            return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp)) if timestamp else None
+
+        return {
+            "layout": settings.UPLOAD_LAYOUT,
+            "running": self._task is not None and not self._task.done(),
+            "scanned": self._stats.scanned,
+            "migrated": self._stats.migrated,
+            "updatedReferences": self._stats.updated_references,
+            "failed": self._stats.failed,
+            "lastError": self._stats.last_error,
+            "startedAt": _iso(self._stats.started_at),
+            "finishedAt": _iso(self._stats.finished_at),
+        }
+
+
+# 전역 업로드 레이아웃 이전기 인스턴스
+layout_migrator = LayoutMigrator()
@@ -0,0 +1,406 @@
+"""
+백그라운드 고아 파일 수집기 (업로드 디렉토리에서 참조되지 않는 파일 탐지)
+
+업로드만 되고 카드에 저장되지 않은 파일, 이동·삭제 실패로 남은 파일처럼 어떤 행도 가리키지 않는 파일을
+찾아 보고(report)하거나 격리(quarantine)합니다.
+
+- 업로드 디렉토리를 경로 순으로 ORPHAN_GC_CHUNK_SIZE개씩 검사하고, 청크마다 마지막 경로를 orphan_scan_state에
+  저장합니다. 서버가 재시작되어도 그 다음 파일부터 이어서 검사합니다.
+- 디렉토리 목록은 청크 크기만큼만 메모리에 올립니다 (heapq.nsmallest로 커서 다음 이름만 선택).
+- 참조 여부는 청크의 URL 목록으로 cards / card_generated_images URL 인덱스와 image_blobs를 조회하여 판단합니다.
+- 최근 ORPHAN_GC_GRACE_SECONDS 이내에 생성·변경된 파일은 건너뜁니다. 하드 링크 생성도 inode 변경 시각(ctime)을
+  갱신하므로 재배치기가 막 만든 링크는 보호됩니다.
+- quarantine 모드에서는 고아 파일을 ORPHAN_GC_QUARANTINE_DIR/pass-{회차}/{상대 경로}로 옮깁니다 (삭제하지 않음).
+- 발견한 고아 파일은 orphan_files에 기록하며, 회차가 끝나면 이번 회차에 다시 확인되지 않은 보고 항목을 지웁니다.
+"""
+import asyncio
+import heapq
+import os
+import stat
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, delete, func, select, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.core.config import settings
+from app.database.database import AsyncReadSessionLocal, AsyncSessionLocal
+from app.database.models import Card, CardGeneratedImage, ImageBlob, OrphanFile, OrphanScanState
+from app.services.image_metadata_service import ImageMetadataService
+from app.utils.blob_store import parse_blob_url
+from app.utils.file_utils import build_file_url, upload_path_resolver
+
+
+# IN 목록 1회당 최대 값 수 (SQLite 바인드 변수 한도 이내)
+_IN_CHUNK_SIZE = 500
+
+# orphan_scan_state의 유일한 행
+_STATE_ID = 1
+
+# 검사 중 오류가 나면 다시 시도하기까지 대기 시간 (초)
+_ERROR_RETRY_SECONDS = 60
+
+
+class ScannedFile(NamedTuple):
+    """검사한 파일 1개"""
+    relative_path: str
+    size: int
+    # max(mtime, ctime): 내용 변경·하드 링크 생성 중 늦은 시각
+    changed_at: float
+
+
+def list_files_after(root: Path, cursor: Optional[str], limit: int, exclude: Iterable[Path] = ()) -> list[ScannedFile]:
+    """
+    root 하위 파일을 경로 순으로 cursor 다음부터 최대 limit개 반환 (블로킹, 스레드풀에서 호출)
+
+    각 디렉토리에서 커서 다음 이름 중 가장 작은 limit개만 골라 내려가므로,
+    디렉토리 크기와 관계없이 메모리에는 최대 limit개 항목만 유지됩니다.
+    심볼릭 링크는 따라가지 않으며 exclude 디렉토리와 숨김 파일(임시 파일 *.part 제외)은 건너뜁니다.
+
+    Args:
+        root: 검사할 루트 디렉토리
+        cursor: 마지막으로 반환한 파일의 상대 경로 (posix, None이면 처음부터)
+        limit: 최대 파일 수
+        exclude: 건너뛸 디렉토리 목록 (예: 업로드 디렉토리 안의 격리 디렉토리)
+
+    Returns:
+        list[ScannedFile]: 상대 경로 순 파일 목록 (limit개 미만이면 검사 끝)
+    """
+    results: list[ScannedFile] = []
+    excluded = {path.resolve() for path in exclude}
+    _collect(root, "", cursor.split("/") if cursor else [], limit, results, excluded)
+    return results
+
+
+def _collect(
+    directory: Path,
+    prefix: str,
+    after: list[str],
+    limit: int,
+    results: list[ScannedFile],
+    excluded: set[Path],
+) -> None:
+    """directory 안에서 after(커서 경로 성분) 다음 파일을 results에 추가"""
+    start, rest = (after[0], after[1:]) if after else (None, [])
+    last: Optional[str] = None
+
+    while len(results) < limit:
+        wanted = limit - len(results)
+        try:
+            with os.scandir(directory) as entries:
+                if last is not None:
+                    candidates = heapq.nsmallest(wanted, (e for e in entries if e.name > last), key=lambda e: e.name)
+                elif start is not None:
+                    candidates = heapq.nsmallest(wanted, (e for e in entries if e.name >= start), key=lambda e: e.name)
+                else:
+                    candidates = heapq.nsmallest(wanted, entries, key=lambda e: e.name)
+        except FileNotFoundError:
+            return
+
+        for entry in candidates:
+            last = entry.name
+            relative_path = f"{prefix}{entry.name}"
+            try:
+                info = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            if stat.S_ISDIR(info.st_mode):
+                if excluded and Path(entry.path).resolve() in excluded:
+                    continue
+                # 커서가 이 디렉토리 안이면 커서 다음부터, 아니면 처음부터
+                _collect(
+                    Path(entry.path),
+                    f"{relative_path}/",
+                    rest if entry.name == start else [],
+                    limit,
+                    results,
+                    excluded,
+                )
+                if len(results) >= limit:
+                    return
+            elif stat.S_ISREG(info.st_mode):
+                # 커서 파일 자신은 이미 검사함
+                if entry.name == start and not rest:
+                    continue
+                # 숨김 파일(.gitkeep 등)은 제외하되, 중단된 쓰기가 남긴 임시 파일(.part)은 검사
+                if entry.name.startswith(".") and not entry.name.endswith(".part"):
+                    continue
+                results.append(ScannedFile(relative_path, info.st_size, max(info.st_mtime, info.st_ctime)))
+                if len(results) >= limit:
+                    return
+
+        if len(candidates) < wanted:
+            return
+
+
+class OrphanCollector:
+    """업로드 디렉토리를 청크 단위로 검사하는 백그라운드 고아 파일 수집기"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closing = False
+        self._last_error: Optional[str] = None
+
+    async def start(self) -> None:
+        """수집기 태스크 시작 (ORPHAN_GC_MODE=off면 시작하지 않음)"""
+        if self._task is not None or settings.ORPHAN_GC_MODE == "off":
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="orphan-collector")
+
+    async def shutdown(self) -> None:
+        """진행 중인 청크를 마친 뒤 종료 (다음 시작 시 저장된 위치부터 이어서 검사)"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        self._wakeup = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def notify(self) -> None:
+        """회차 사이 대기 중이면 바로 다음 회차 시작"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        delay = await self._initial_delay()
+        while not self._closing:
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                if self._closing:
+                    break
+            try:
+                finished = await self.scan_chunk()
+                delay = settings.ORPHAN_GC_PASS_INTERVAL_SECONDS if finished else settings.ORPHAN_GC_CHUNK_DELAY_SECONDS
+            except Exception as e:
+                self._last_error = f"{type(e).__name__}: {e}"
+                print(f"고아 파일 검사 중 오류 발생: {self._last_error}")
+                delay = _ERROR_RETRY_SECONDS
+
+    async def _initial_delay(self) -> float:
+        """회차 사이에 재시작한 경우 남은 대기 시간 (회차 진행 중이었으면 0)"""
+        async with AsyncReadSessionLocal() as db:
+            row = (await db.execute(
+                select(
+                    OrphanScanState.cursor,
+                    (func.julianday("now") - func.julianday(OrphanScanState.finished_at)) * 86400,
+                ).where(OrphanScanState.id == _STATE_ID)
+            )).first()
+        if row is None or row[0] is not None or row[1] is None:
+            return 0
+        return max(0.0, settings.ORPHAN_GC_PASS_INTERVAL_SECONDS - row[1])
+
+    async def scan_chunk(self) -> bool:
+        """
+        다음 청크 1개 검사
+
+        Returns:
+            bool: 이번 청크로 회차가 끝났으면 True
+        """
+        chunk_size = max(1, settings.ORPHAN_GC_CHUNK_SIZE)
+        pass_no, cursor = await self._load_state()
+
+        files = await run_in_threadpool(
+            list_files_after, settings.upload_path, cursor, chunk_size, (settings.orphan_quarantine_path,)
+        )
+        grace_deadline = time.time() - settings.ORPHAN_GC_GRACE_SECONDS
+        candidates = [f for f in files if f.changed_at <= grace_deadline]
+        orphans = await self._unreferenced(candidates) if candidates else []
+
+        quarantined: dict[str, str] = {}
+        if orphans and settings.ORPHAN_GC_MODE == "quarantine":
+            quarantined = await run_in_threadpool(self._quarantine, orphans, pass_no)
+
+        finished = len(files) < chunk_size
+        await self._record(pass_no, files, orphans, quarantined, finished)
+        return finished
+
+    async def _load_state(self) -> tuple[int, Optional[str]]:
+        """현재 회차와 커서 (상태 행이 없으면 생성)"""
+        async with AsyncSessionLocal() as db:
+            state = await db.get(OrphanScanState, _STATE_ID)
+            if state is None:
+                state = OrphanScanState(id=_STATE_ID, pass_no=1, cursor=None, scanned=0, orphans=0, orphan_bytes=0)
+                db.add(state)
+                await db.commit()
+            return state.pass_no, state.cursor
+
+    @staticmethod
+    async def _unreferenced(files: list[ScannedFile]) -> list[ScannedFile]:
+        """어떤 카드·합성이미지·블롭 행도 참조하지 않는 파일만 반환"""
+        urls = {f.relative_path: build_file_url(settings.upload_path / f.relative_path) for f in files}
+        hashes = {path: parsed[0] for path, url in urls.items() if (parsed := parse_blob_url(url))}
+        plain_urls = [url for path, url in urls.items() if path not in hashes]
+        blob_hashes = list(set(hashes.values()))
+
+        referenced: set[str] = set()
+        live_hashes: set[str] = set()
+        async with AsyncReadSessionLocal() as db:
+            for start in range(0, len(plain_urls), _IN_CHUNK_SIZE):
+                chunk = plain_urls[start:start + _IN_CHUNK_SIZE]
+                referenced.update((await db.execute(union_all(
+                    select(Card.character_image_url.label("url")).where(Card.character_image_url.in_(chunk)),
+                    select(Card.background_image_url).where(Card.background_image_url.in_(chunk)),
+                    select(Card.generated_image_url).where(Card.generated_image_url.in_(chunk)),
+                    select(CardGeneratedImage.image_url).where(CardGeneratedImage.image_url.in_(chunk)),
+                ))).scalars().all())
+            for start in range(0, len(blob_hashes), _IN_CHUNK_SIZE):
+                live_hashes.update((await db.execute(
+                    select(ImageBlob.sha256).where(ImageBlob.sha256.in_(blob_hashes[start:start + _IN_CHUNK_SIZE]))
+                )).scalars().all())
+
+        return [
+            f for f in files
+            if (hashes[f.relative_path] not in live_hashes if f.relative_path in hashes else urls[f.relative_path] not in referenced)
+        ]
+
+    @staticmethod
+    def _quarantine(orphans: list[ScannedFile], pass_no: int) -> dict[str, str]:
+        """
+        고아 파일을 격리 디렉토리로 이동 (블로킹, 스레드풀에서 실행)
+
+        Returns:
+            dict[str, str]: 상대 경로 → 격리 위치 (격리 디렉토리 기준, 실패한 파일은 제외)
+        """
+        moved: dict[str, str] = {}
+        for orphan in orphans:
+            destination = f"pass-{pass_no}/{orphan.relative_path}"
+            target = settings.orphan_quarantine_path / destination
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                source = settings.upload_path / orphan.relative_path
+                os.replace(source, target)
+                upload_path_resolver.invalidate(source)
+                moved[orphan.relative_path] = destination
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                # 다른 파일 시스템이면 이동 불가, 보고만 함
+                print(f"고아 파일 격리 실패 ({orphan.relative_path}): {str(e)}")
+        return moved
+
+    async def _record(
+        self,
+        pass_no: int,
+        files: list[ScannedFile],
+        orphans: list[ScannedFile],
+        quarantined: dict[str, str],
+        finished: bool,
+    ) -> None:
+        """청크 결과 반영 (보고서 갱신 + 커서 저장, 한 트랜잭션)"""
+        async with AsyncSessionLocal() as db:
+            if orphans:
+                rows = [
+                    {
+                        "url": build_file_url(settings.upload_path / orphan.relative_path),
+                        "size": orphan.size,
+                        "modified_at": datetime.fromtimestamp(orphan.changed_at, timezone.utc),
+                        "pass_no": pass_no,
+                        "quarantine_path": quarantined.get(orphan.relative_path),
+                    }
+                    for orphan in orphans
+                ]
+                stmt = sqlite_insert(OrphanFile)
+                await db.execute(stmt.on_conflict_do_update(
+                    index_elements=[OrphanFile.url],
+                    set_={
+                        "size": stmt.excluded.size,
+                        "modified_at": stmt.excluded.modified_at,
+                        "pass_no": stmt.excluded.pass_no,
+                        "quarantine_path": stmt.excluded.quarantine_path,
+                    },
+                ), rows)
+                # 격리된 파일은 더 이상 그 URL로 서빙되지 않으므로 메타데이터도 정리
+                quarantined_urls = [row["url"] for row in rows if row["quarantine_path"]]
+                if quarantined_urls:
+                    await db.run_sync(ImageMetadataService.forget, quarantined_urls)
+
+            values = {
+                "scanned": OrphanScanState.scanned + len(files),
+                "orphans": OrphanScanState.orphans + len(orphans),
+                "orphan_bytes": OrphanScanState.orphan_bytes + sum(orphan.size for orphan in orphans),
+                "started_at": func.coalesce(OrphanScanState.started_at, func.now()),
+            }
+            if files:
+                values["cursor"] = files[-1].relative_path
+            await db.execute(update(OrphanScanState).where(OrphanScanState.id == _STATE_ID).values(**values))
+
+            if finished:
+                # 이번 회차에 다시 확인되지 않은 보고 항목 제거 (격리 기록은 복구용으로 유지)
+                await db.execute(delete(OrphanFile).where(
+                    and_(OrphanFile.pass_no < pass_no, OrphanFile.quarantine_path.is_(None))
+                ))
+                summary = (await db.execute(
+                    select(OrphanScanState.scanned, OrphanScanState.orphans, OrphanScanState.orphan_bytes)
+                    .where(OrphanScanState.id == _STATE_ID)
+                )).one()
+                await db.execute(update(OrphanScanState).where(OrphanScanState.id == _STATE_ID).values(
+                    pass_no=pass_no + 1,
+                    cursor=None,
+                    scanned=0,
+                    orphans=0,
+                    orphan_bytes=0,
+                    started_at=None,
+                    finished_at=func.now(),
+                ))
+            await db.commit()
+
+        if finished:
+            print(
+                f"🧹 고아 파일 검사 {pass_no}회차 완료: {summary[0]}개 검사, "
+                f"고아 {summary[1]}개 ({summary[2]} bytes, 모드: {settings.ORPHAN_GC_MODE})"
+            )
+
+    async def stats(self) -> dict:
+        """
+        수집기 상태
+
+        - passNo / cursor / scanned / orphans / orphanBytes: 진행 중인 회차
+        - reported / quarantined: orphan_files의 보고·격리 항목 수
+        """
+        async with AsyncReadSessionLocal() as db:
+            state = (await db.execute(
+                select(
+                    OrphanScanState.pass_no,
+                    OrphanScanState.cursor,
+                    OrphanScanState.scanned,
+                    OrphanScanState.orphans,
+                    OrphanScanState.orphan_bytes,
+                    OrphanScanState.started_at,
+                    OrphanScanState.finished_at,
+                ).where(OrphanScanState.id == _STATE_ID)
+            )).first()
+            reported, quarantined = (await db.execute(
+                select(func.count(), func.count(OrphanFile.quarantine_path)).select_from(OrphanFile)
+            )).one()
+        pass_no, cursor, scanned, orphans, orphan_bytes, started_at, finished_at = state or (1, None, 0, 0, 0, None, None)
+        return {
+            "mode": settings.ORPHAN_GC_MODE,
+            "running": self.running,
+            "passNo": pass_no,
+            "cursor": cursor,
+            "scanned": scanned,
+            "orphans": orphans,
+            "orphanBytes": orphan_bytes,
+            "startedAt": started_at.isoformat() if started_at else None,
+            "lastFinishedAt": finished_at.isoformat() if finished_at else None,
+            "reported": reported - quarantined,
+            "quarantined": quarantined,
+            "lastError": self._last_error,
+        }
+
+
+# 전역 고아 파일 수집기 인스턴스
+orphan_collector = OrphanCollector()
@@ -0,0 +1,150 @@
+"""
+카드 조회 응답 캐시 (프로세스 내 LRU + DB 데이터 버전 기반 ETag)
+
+/cards/list, /cards/{card_sn}/generated-images 응답을 직렬화된 JSON 그대로 보관합니다.
+데이터 버전은 DB의 table_counters 행(DATA_VERSION_COUNTER)으로, cards·card_generated_images를
+변경하는 모든 트랜잭션에서 트리거가 함께 올립니다. 트리거가 없는 변경(이미지 메타데이터 등)은 bump로 올립니다.
+
+- ETag는 "v{데이터 버전}" 형식입니다. 버전이 DB에 있으므로 여러 워커 프로세스·관리 스크립트의 변경도
+  즉시 반영되고, 같은 버전의 ETag는 어느 프로세스에서 받았든 일치합니다.
+- 조회는 목록 쿼리 전에 버전 행 1건을 읽어, If-None-Match가 일치하면 캐시 조회·목록 쿼리 없이 304를 반환합니다.
+- 캐시 항목은 저장할 때의 버전과 현재 버전이 같을 때만 사용합니다 (TTL은 메모리 회수용).
+- 버전을 읽은 뒤 목록 쿼리 전에 변경이 커밋되면 본문이 버전보다 새로울 수 있으나,
+  그때는 현재 버전이 이미 올라가 있으므로 그 ETag로는 304가 나가지 않습니다.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.models import DATA_VERSION_COUNTER, TableCounter
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """캐시된 응답 1건"""
+    body: bytes
+    etag: str
+    version: int
+    expires_at: float
+
+
+class ResponseCache:
+    """크기·TTL 제한이 있는 응답 LRU 캐시"""
+
+    def __init__(self):
+        # 키 → 응답 (앞쪽일수록 오래 사용되지 않음)
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+
+    @staticmethod
+    async def current_version(db: AsyncSession) -> int:
+        """
+        현재 데이터 버전 (목록 쿼리 전에 읽어 ETag 비교와 put에 사용)
+
+        Args:
+            db: 비동기 데이터베이스 세션 (읽기 전용 가능)
+
+        Returns:
+            int: 데이터 버전 (카운터 행이 없으면 0)
+        """
+        counter = await db.get(TableCounter, DATA_VERSION_COUNTER)
+        return counter.value if counter is not None else 0
+
+    @staticmethod
+    def bump(db: Session) -> None:
+        """
+        트리거가 없는 변경(이미지 메타데이터 등)으로 응답이 바뀔 때 데이터 버전 증가
+
+        호출자의 트랜잭션 안에서(run_sync 또는 쓰기 큐) 실행되며 커밋하지 않습니다.
+        """
+        db.execute(
+            update(TableCounter)
+            .where(TableCounter.name == DATA_VERSION_COUNTER)
+            .values(value=TableCounter.value + 1)
+        )
+
+    @staticmethod
+    def etag(version: int) -> str:
+        """데이터 버전의 ETag"""
+        return f'"v{version:x}"'
+
+    def get(self, key: Hashable, version: int) -> Optional[CachedResponse]:
+        """
+        현재 버전이고 만료되지 않은 응답 조회
+
+        Args:
+            key: 캐시 키 (경로·쿼리 파라미터)
+            version: current_version으로 읽은 현재 데이터 버전
+
+        Returns:
+            Optional[CachedResponse]: 캐시된 응답, 없으면 None
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._discard(key)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry
+
+    def put(self, key: Hashable, version: int, body: bytes) -> CachedResponse:
+        """
+        응답 저장 (한도를 넘는 크기면 저장하지 않음)
+
+        Args:
+            key: 캐시 키 (경로·쿼리 파라미터)
+            version: 목록 쿼리 전에 읽은 데이터 버전
+            body: 직렬화된 응답 본문
+
+        Returns:
+            CachedResponse: 응답 (저장 여부와 무관하게 ETag 포함)
+        """
+        entry = CachedResponse(
+            body=body,
+            etag=self.etag(version),
+            version=version,
+            expires_at=time.monotonic() + max(0, settings.RESPONSE_CACHE_TTL_SECONDS),
+        )
+        max_bytes = settings.RESPONSE_CACHE_MAX_BYTES
+        if settings.RESPONSE_CACHE_MAX_ENTRIES <= 0 or len(body) > max_bytes:
+            return entry
+
+        self._discard(key)
+        self._entries[key] = entry
+        self._total_bytes += len(body)
+        while len(self._entries) > settings.RESPONSE_CACHE_MAX_ENTRIES or self._total_bytes > max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= len(evicted.body)
+        return entry
+
+    def record_not_modified(self) -> None:
+        """304 응답 집계"""
+        self._not_modified += 1
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= len(entry.body)
+
+    def stats(self) -> dict:
+        """캐시 상태 (항목 수, 총 용량, 적중/미적중/304 수)"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "notModified": self._not_modified,
+        }
+
+
+# 전역 응답 캐시 인스턴스
+response_cache = ResponseCache()
@@ -0,0 +1,211 @@
+"""
+업로드 이미지 정규화 (메타데이터 제거, 크기 제한, 재인코딩)
+
+업로드된 캐릭터·배경 이미지는 EXIF가 그대로 남고 카드 레이아웃보다 훨씬 큰 해상도로 저장되는 경우가 많습니다.
+정규화를 켜면(UPLOAD_NORMALIZE_ENABLED 또는 요청의 normalize=true) 저장 직후 이미지를
+- EXIF 회전을 픽셀에 반영한 뒤 EXIF·XMP·텍스트 청크를 제거하고 (ICC 색 프로필은 색 보존을 위해 유지)
+- 긴 변이 UPLOAD_NORMALIZE_MAX_DIMENSION을 넘으면 비율을 유지하며 축소하고
+- UPLOAD_NORMALIZE_FORMAT(webp 또는 최적화 PNG)으로 다시 인코딩하여 새 파일로 저장합니다.
+
+- 디코딩·인코딩은 파생본 엔진의 프로세스 풀에서 실행 (이벤트 루프·GIL 비차단)
+- 저장 위치 규칙은 store_image_bytes를 따름 (블롭 저장소 / 서브디렉토리 / sharded 레이아웃)
+- 원본은 keep_original을 요청한 경우에만 남김. 블롭 원본은 같은 내용을 동시에 업로드한 요청과 공유되므로
+  직접 지우지 않고 파일 회수 대기열에 넘겨 참조·유예 시간(BLOB_RECLAIM_GRACE_SECONDS)을 다시 확인한 뒤 삭제
+- 제거할 메타데이터도 없고 축소도 없는데 결과가 원본보다 크면 원본을 그대로 사용
+- 움직이는 이미지(GIF, 애니메이션 WebP)와 SVG는 정규화하지 않음
+"""
+import io
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
+from app.services.derivative_service import derivative_engine
+from app.services.file_reclaimer import FileReclaimer, file_reclaimer
+from app.utils.blob_store import is_blob_url
+from app.utils.file_utils import StoredUpload, delete_file, store_image_bytes
+
+
+# 정규화 출력 형식 → Pillow 포맷명
+_NORMALIZE_FORMATS = {"webp": "WEBP", "png": "PNG"}
+
+# 정규화하지 않는 원본 형식 (벡터, 애니메이션 보존)
+_SKIP_FORMATS = {"svg", "gif"}
+
+# 제거 대상 메타데이터 (Image.info 키, PNG 텍스트 청크 제외)
+_METADATA_KEYS = ("exif", "xmp", "XML:com.adobe.xmp", "comment", "photoshop")
+
+
+def normalize_image(source: str, max_dimension: int, pil_format: str, quality: int) -> Optional[tuple[bytes, dict]]:
+    """
+    이미지를 메타데이터 없이 최대 크기 안으로 다시 인코딩 (프로세스 풀 워커에서 실행)
+
+    Args:
+        source: 원본 파일 경로
+        max_dimension: 최대 너비/높이 (px)
+        pil_format: Pillow 저장 포맷 (WEBP, PNG)
+        quality: WebP 품질 (1-100)
+
+    Returns:
+        Optional[tuple[bytes, dict]]: (인코딩 결과, width/height/resized/stripped), 움직이는 이미지면 None
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        if getattr(image, "n_frames", 1) > 1:
+            return None
+
+        stripped = any(image.info.get(key) for key in _METADATA_KEYS) or bool(getattr(image, "text", None))
+        icc_profile = image.info.get("icc_profile")
+        resized = max(image.size) > max_dimension
+        if resized:
+            # JPEG는 디코딩 단계에서 축소하여 메모리/시간 절약
+            image.draft("RGB", (max_dimension, max_dimension))
+        image = ImageOps.exif_transpose(image)
+
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        keep_mode = pil_format == "PNG" and not resized and image.mode in ("1", "L", "P", "RGB", "RGBA")
+        if not keep_mode:
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        if resized:
+            image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+        save_options: dict = {"icc_profile": icc_profile} if icc_profile else {}
+        if pil_format == "WEBP":
+            save_options.update(quality=quality, method=6)
+        else:
+            save_options.update(optimize=True)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format=pil_format, **save_options)
+        return buffer.getvalue(), {
+            "width": image.width,
+            "height": image.height,
+            "resized": resized,
+            "stripped": stripped,
+        }
+
+
+class NormalizedUpload(NamedTuple):
+    """정규화 결과"""
+    file_url: str
+    stored: StoredUpload
+    # keep_original 요청 시 남겨 둔 원본 URL
+    original_url: Optional[str] = None
+    # 정규화 결과로 교체되었는지 (건너뛰었거나 원본이 더 나으면 False)
+    normalized: bool = False
+
+
+@dataclass
+class _NormalizerStats:
+    normalized: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    last_error: Optional[str] = None
+
+
+class UploadNormalizer:
+    """업로드 이미지 정규화기"""
+
+    def __init__(self):
+        self._stats = _NormalizerStats()
+
+    @staticmethod
+    def enabled(requested: Optional[bool] = None) -> bool:
+        """요청 값이 있으면 그 값, 없으면 UPLOAD_NORMALIZE_ENABLED"""
+        return settings.UPLOAD_NORMALIZE_ENABLED if requested is None else requested
+
+    async def normalize(
+        self,
+        file_url: str,
+        stored: StoredUpload,
+        subdirectory: Optional[str] = None,
+        keep_original: bool = False,
+    ) -> NormalizedUpload:
+        """
+        저장된 업로드 이미지를 정규화하여 새 파일로 저장
+
+        실패하면 원본을 그대로 반환합니다 (업로드 자체는 실패시키지 않음).
+
+        Args:
+            file_url: 저장된 원본 URL
+            stored: 원본 스트리밍 저장 결과
+            subdirectory: 정규화 결과를 저장할 서브디렉토리 (블롭 저장소·sharded 레이아웃 사용 시 무시)
+            keep_original: 원본 파일을 삭제하지 않고 original_url로 반환
+
+        Returns:
+            NormalizedUpload: 정규화 결과 (교체하지 않았으면 원본)
+        """
+        original = NormalizedUpload(file_url, stored)
+        if stored.image_format in _SKIP_FORMATS:
+            self._stats.skipped += 1
+            return original
+
+        pil_format = _NORMALIZE_FORMATS[settings.UPLOAD_NORMALIZE_FORMAT]
+        try:
+            rendered = await derivative_engine.run(
+                normalize_image,
+                str(stored.file_path),
+                max(1, settings.UPLOAD_NORMALIZE_MAX_DIMENSION),
+                pil_format,
+                settings.UPLOAD_NORMALIZE_QUALITY,
+            )
+            if rendered is None:
+                self._stats.skipped += 1
+                return original
+            data, info = rendered
+            if not info["resized"] and not info["stripped"] and len(data) >= stored.size:
+                self._stats.skipped += 1
+                return original
+            new_url, new_stored = await run_in_threadpool(store_image_bytes, data, subdirectory)
+        except Exception as e:
+            self._stats.failed += 1
+            self._stats.last_error = f"{file_url}: {type(e).__name__}: {e}"
+            print(f"업로드 이미지 정규화 실패 ({file_url}): {type(e).__name__}: {e}")
+            return original
+
+        self._stats.normalized += 1
+        self._stats.bytes_before += stored.size
+        self._stats.bytes_after += new_stored.size
+
+        if keep_original or new_stored.file_path == stored.file_path:
+            return NormalizedUpload(new_url, new_stored, original_url=file_url if keep_original else None, normalized=True)
+        if is_blob_url(file_url):
+            # 같은 내용을 동시에 업로드한 요청도 이 블롭 URL을 받았을 수 있으므로 회수기가 참조를 다시 확인한 뒤 삭제
+            await self._reclaim(file_url)
+        elif stored.created:
+            # 일반 파일은 요청마다 고유한 이름이므로 바로 삭제
+            await run_in_threadpool(delete_file, stored.file_path)
+        return NormalizedUpload(new_url, new_stored, normalized=True)
+
+    @staticmethod
+    async def _reclaim(file_url: str) -> None:
+        """정규화로 대체된 블롭 원본을 파일 회수 대기열에 등록"""
+        async with AsyncSessionLocal() as db:
+            await db.run_sync(FileReclaimer.enqueue, [file_url])
+            await db.commit()
+        file_reclaimer.notify()
+
+    def stats(self) -> dict:
+        """
+        정규화 지표 (서버 시작 이후 누적)
+
+        - bytesBefore / bytesAfter: 정규화한 파일의 원본 / 결과 크기 합계
+        """
+        return {
+            "enabled": settings.UPLOAD_NORMALIZE_ENABLED,
+            "format": settings.UPLOAD_NORMALIZE_FORMAT,
+            "maxDimension": settings.UPLOAD_NORMALIZE_MAX_DIMENSION,
+            "normalized": self._stats.normalized,
+            "skipped": self._stats.skipped,
+            "failed": self._stats.failed,
+            "bytesBefore": self._stats.bytes_before,
+            "bytesAfter": self._stats.bytes_after,
+            "lastError": self._stats.last_error,
+        }
+
+
+# 전역 업로드 정규화기 인스턴스
+upload_normalizer = UploadNormalizer()
@@ -0,0 +1,264 @@
+"""
+그룹 커밋 쓰기 큐 (합성이미지·생성 이력 INSERT, 이미지 메타데이터 UPSERT)
+
+합성이미지(CardGeneratedImage)와 생성 이력(CardGenerationHistory) 행을 요청마다 커밋하면
+이미지 수만큼 트랜잭션(WAL 기록·fsync)이 발생합니다.
+백그라운드 writer가 대기 중인 INSERT를 최대 WRITE_QUEUE_MAX_BATCH개 또는
+WRITE_QUEUE_MAX_DELAY_MS 동안 모아 한 트랜잭션으로 커밋하고, 커밋이 끝난 뒤 각 호출자에게
+생성된 행 ID를 돌려줍니다.
+
+- 한 번의 write 호출에 넘긴 행들은 항상 같은 트랜잭션에 들어갑니다 (원자성 유지).
+- 그룹 커밋이 실패하면 write 호출 단위로 다시 커밋하여, 실패한 호출만 예외를 받습니다.
+- 업로드 시 추출한 이미지 메타데이터(image_metadata)도 같은 방식으로 모아 커밋합니다.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Optional, Union
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
+from app.database.models import CardGeneratedImage, CardGenerationHistory
+from app.services.blob_service import BlobService
+from app.services.image_metadata_service import ImageMetadataService
+from app.services.response_cache import ResponseCache
+
+
+# 쓰기 큐로 저장할 수 있는 행 타입
+QueuedRecord = Union[CardGeneratedImage, CardGenerationHistory]
+
+
+@dataclass
+class _PendingWrite:
+    """커밋을 기다리는 write 호출 1건"""
+    records: list[QueuedRecord]
+    blob_urls: list[str]
+    image_metadata: list[dict]
+    future: asyncio.Future
+    enqueued_at: float = 0.0
+
+
+@dataclass
+class _WriterStats:
+    commits: int = 0
+    writes: int = 0
+    rows: int = 0
+    fallback_commits: int = 0
+    failed_writes: int = 0
+    size_histogram: dict[int, int] = field(default_factory=dict)
+
+
+class GroupCommitWriter:
+    """INSERT를 모아 한 트랜잭션으로 커밋하는 백그라운드 writer"""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._stats = _WriterStats()
+        self._wait_total = 0.0
+        self._dequeued = 0
+
+    async def start(self) -> None:
+        """writer 태스크 시작 (서버 시작 시 호출)"""
+        if self._task is not None:
+            return
+        self._closing = False
+        self._queue = asyncio.Queue(maxsize=max(1, settings.WRITE_QUEUE_SIZE))
+        self._task = asyncio.create_task(self._run(), name="group-commit-writer")
+
+    async def shutdown(self) -> None:
+        """대기 중인 INSERT를 모두 커밋한 뒤 writer 종료 (서버 종료 시 호출)"""
+        if self._task is None:
+            return
+        self._closing = True
+        # 종료 표시는 이미 들어온 write 뒤에 놓이므로 그 앞의 요청은 모두 커밋됨
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    async def write(
+        self,
+        records: list[QueuedRecord],
+        blob_urls: Optional[list[str]] = None,
+        image_metadata: Optional[list[dict]] = None,
+    ) -> list[int]:
+        """
+        행 INSERT를 큐에 넣고 커밋될 때까지 대기
+
+        Args:
+            records: 저장할 CardGeneratedImage / CardGenerationHistory 인스턴스 목록
+            blob_urls: 같은 트랜잭션에서 참조 카운트를 증가시킬 이미지 URL 목록
+            image_metadata: 같은 트랜잭션에서 저장할 이미지 메타데이터 행 값 목록 (ImageMetadataService.extract 결과)
+
+        Returns:
+            list[int]: 커밋된 행 ID (records 순서)
+
+        Raises:
+            TypeError: 지원하지 않는 행 타입인 경우
+            RuntimeError: writer가 시작되지 않았거나 종료 중인 경우
+            Exception: 커밋 중 발생한 예외
+        """
+        for record in records:
+            if not isinstance(record, (CardGeneratedImage, CardGenerationHistory)):
+                raise TypeError(f"쓰기 큐에서 지원하지 않는 행 타입입니다: {type(record).__name__}")
+        if self._queue is None or self._closing:
+            raise RuntimeError("쓰기 큐가 실행 중이 아닙니다.")
+
+        loop = asyncio.get_running_loop()
+        pending = _PendingWrite(
+            records=list(records),
+            blob_urls=list(blob_urls or []),
+            image_metadata=list(image_metadata or []),
+            future=loop.create_future(),
+            enqueued_at=loop.time(),
+        )
+        await self._queue.put(pending)
+        # 호출자가 취소되어도 이미 큐에 들어간 INSERT는 커밋됨
+        return await asyncio.shield(pending.future)
+
+    async def add_generated_image(self, card_sn: int, image_url: str, image_metadata: Optional[dict] = None) -> int:
+        """
+        합성이미지 행 저장 (블롭 URL이면 참조 카운트도 같은 트랜잭션에서 증가)
+
+        Args:
+            card_sn: 카드 일련번호
+            image_url: 합성이미지 URL
+            image_metadata: 같은 트랜잭션에서 저장할 이미지 메타데이터 행 값
+
+        Returns:
+            int: 생성된 CardGeneratedImage ID
+        """
+        ids = await self.write(
+            [CardGeneratedImage(card_sn=card_sn, image_url=image_url)],
+            blob_urls=[image_url],
+            image_metadata=[image_metadata] if image_metadata else None,
+        )
+        return ids[0]
+
+    async def add_image_metadata(self, image_metadata: list[dict]) -> None:
+        """업로드 이미지의 메타데이터 행 저장 (비어 있으면 큐에 넣지 않음)"""
+        if image_metadata:
+            await self.write([], image_metadata=image_metadata)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        max_batch = max(1, settings.WRITE_QUEUE_MAX_BATCH)
+        max_delay = max(0, settings.WRITE_QUEUE_MAX_DELAY_MS) / 1000
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = loop.time() + max_delay
+            while len(batch) < max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._commit(batch)
+
+    async def _commit(self, batch: list[_PendingWrite]) -> None:
+        """배치를 한 트랜잭션으로 커밋, 실패하면 write 호출 단위로 재시도"""
+        now = asyncio.get_running_loop().time()
+        self._wait_total += sum(now - item.enqueued_at for item in batch)
+        self._dequeued += len(batch)
+        try:
+            results = await self._write_transaction(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                self._fail(batch[0], e)
+                return
+            for item in batch:
+                try:
+                    results = await self._write_transaction([item])
+                except Exception as item_error:
+                    self._fail(item, item_error)
+                    continue
+                self._stats.fallback_commits += 1
+                self._resolve(item, results[0])
+            return
+
+        for item, ids in zip(batch, results):
+            self._resolve(item, ids)
+
+    async def _write_transaction(self, batch: list[_PendingWrite]) -> list[list[int]]:
+        async with AsyncSessionLocal() as db:
+            try:
+                results = await db.run_sync(self._apply, batch)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        self._stats.commits += 1
+        self._stats.writes += len(batch)
+        self._stats.rows += sum(len(item.records) for item in batch)
+        self._stats.size_histogram[len(batch)] = self._stats.size_histogram.get(len(batch), 0) + 1
+        return results
+
+    @staticmethod
+    def _apply(db: Session, batch: list[_PendingWrite]) -> list[list[int]]:
+        """INSERT, 블롭 참조 획득, 메타데이터 UPSERT 후 flush하여 행 ID 확보 (run_sync 안에서 실행)"""
+        metadata_urls = []
+        for item in batch:
+            db.add_all(item.records)
+            for url in item.blob_urls:
+                BlobService.acquire(db, url)
+            ImageMetadataService.upsert(db, item.image_metadata)
+            metadata_urls.extend(values["url"] for values in item.image_metadata)
+        db.flush()
+        # 합성이미지 INSERT는 트리거가 데이터 버전을 올리고, 메타데이터 변경은 카드 조회 응답에
+        # 실리는 URL(카드·합성이미지가 참조)일 때만 직접 올림 (아직 저장 전인 업로드는 캐시 유지)
+        if metadata_urls and ImageMetadataService.any_referenced(db, metadata_urls):
+            ResponseCache.bump(db)
+        return [[record.id for record in item.records] for item in batch]
+
+    def _resolve(self, item: _PendingWrite, ids: list[int]) -> None:
+        if not item.future.done():
+            item.future.set_result(ids)
+
+    def _fail(self, item: _PendingWrite, error: Exception) -> None:
+        self._stats.failed_writes += 1
+        if not item.future.done():
+            item.future.set_exception(error)
+            # 취소된 호출자의 future는 조회되지 않으므로 미조회 경고 방지
+            item.future.exception()
+
+    def stats(self) -> dict:
+        """
+        그룹 커밋 지표
+
+        - averageGroupSize: 커밋 1회당 평균 write 호출 수
+        - averageWaitMs: write 호출이 큐에 들어가서 커밋이 시작되기까지의 평균 대기 시간
+        """
+        commits = self._stats.commits
+        return {
+            "maxBatch": max(1, settings.WRITE_QUEUE_MAX_BATCH),
+            "maxDelayMs": settings.WRITE_QUEUE_MAX_DELAY_MS,
+            "commits": commits,
+            "writes": self._stats.writes,
+            "rows": self._stats.rows,
+            "averageGroupSize": round(self._stats.writes / commits, 3) if commits else 0.0,
+            "averageWaitMs": round(self._wait_total / self._dequeued * 1000, 3) if self._dequeued else 0.0,
+            "fallbackCommits": self._stats.fallback_commits,
+            "failedWrites": self._stats.failed_writes,
+            "pending": self._queue.qsize() if self._queue else 0,
+            "groupSizeHistogram": dict(sorted(self._stats.size_histogram.items())),
+        }
+
+
+# 전역 쓰기 큐 인스턴스
+write_queue = GroupCommitWriter()
@@ -6,17 +6,38 @@ from app.utils.file_utils import (
     get_file_extension,
     is_allowed_file,
     generate_unique_filename,
+    sniff_image_format,
+    stream_upload_to_temp,
+    stream_upload_to_file,
+    build_file_url,
+    store_uploaded_file,
+    store_image_bytes,
     save_uploaded_file,
     delete_file,
     get_file_path_from_url,
+    UploadPathResolver,
+    upload_path_resolver,
+    StoredUpload,
 )
+from app.utils.pagination import encode_cursor, decode_cursor
 
 __all__ = [
     "ensure_upload_dir",
     "get_file_extension",
     "is_allowed_file",
     "generate_unique_filename",
+    "sniff_image_format",
+    "stream_upload_to_temp",
+    "stream_upload_to_file",
+    "build_file_url",
+    "store_uploaded_file",
+    "store_image_bytes",
     "save_uploaded_file",
     "delete_file",
     "get_file_path_from_url",
+    "UploadPathResolver",
+    "upload_path_resolver",
+    "StoredUpload",
+    "encode_cursor",
+    "decode_cursor",
 ]
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+콘텐츠 주소 기반(SHA-256) 이미지 블롭 저장소 (디스크 레이어)
+
+동일한 내용의 이미지는 한 번만 저장됩니다.
+경로 형식: upload/blobs/{sha256[:2]}/{sha256}.{ext}
+참조 카운트는 app.services.blob_service.BlobService가 DB에서 관리합니다.
+"""
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.utils.file_utils import StoredUpload, build_file_url, sniff_image_format, stream_upload_to_temp
+
+
+# 업로드 디렉토리 하위 블롭 디렉토리명
+BLOB_DIRNAME = "blobs"
+
+# 판별된 이미지 형식 → 저장 확장자
+_FORMAT_EXTENSIONS = {"jpeg": "jpg"}
+
+# /data/upload/blobs/ab/<sha256>.<ext>
+_BLOB_URL_PATTERN = re.compile(
+    rf"^/data/upload/{BLOB_DIRNAME}/([0-9a-f]{{2}})/([0-9a-f]{{64}})\.([a-z0-9]+)$"
+)
+
+
+def blob_root() -> Path:
+    """
+    블롭 저장소 루트 디렉토리
+
+    Returns:
+        Path: upload/blobs 경로
+    """
+    return settings.upload_path / BLOB_DIRNAME
+
+
+def blob_path(sha256: str, extension: str) -> Path:
+    """
+    해시와 확장자로 블롭 파일 경로 생성
+
+    Args:
+        sha256: 내용 해시 (16진수 64자)
+        extension: 확장자 (점 제외)
+
+    Returns:
+        Path: upload/blobs/{sha256[:2]}/{sha256}.{ext}
+    """
+    return blob_root() / sha256[:2] / f"{sha256}.{extension}"
+
+
+def parse_blob_url(url: Optional[str]) -> Optional[tuple[str, str]]:
+    """
+    블롭 URL에서 (해시, 확장자) 추출
+
+    Args:
+        url: 이미지 URL (/data/upload/blobs/... 또는 http(s)://host/data/upload/blobs/...)
+
+    Returns:
+        Optional[tuple[str, str]]: (sha256, 확장자), 블롭 URL이 아니면 None
+    """
+    if not url:
+        return None
+    if url.startswith("http://") or url.startswith("https://"):
+        url = urlparse(url).path
+    match = _BLOB_URL_PATTERN.match(url)
+    if not match or match.group(2)[:2] != match.group(1):
+        return None
+    return match.group(2), match.group(3)
+
+
+def is_blob_url(url: Optional[str]) -> bool:
+    """블롭 저장소를 가리키는 URL인지 확인"""
+    return parse_blob_url(url) is not None
+
+
+def _commit_blob(stored: StoredUpload, final_path: Path) -> bool:
+    """
+    임시 파일을 블롭 경로로 이동 (이미 같은 내용이 있으면 임시 파일만 삭제)
+
+    기존 블롭을 재사용할 때는 mtime을 갱신하여, 방금 참조가 0이 된 블롭이
+    재업로드 직후 회수되지 않도록 합니다 (BLOB_RECLAIM_GRACE_SECONDS 참고).
+
+    Returns:
+        bool: 새 블롭 파일이 생성되었으면 True
+    """
+    final_path.parent.mkdir(parents=True, exist_ok=True)
+    if final_path.exists():
+        stored.file_path.unlink(missing_ok=True)
+        os.utime(final_path)
+        return False
+    os.replace(stored.file_path, final_path)
+    return True
+
+
+async def store_blob(file: UploadFile) -> tuple[str, Path, StoredUpload]:
+    """
+    업로드 파일을 블롭 저장소에 저장 (동일 내용이면 기존 파일 재사용)
+
+    Args:
+        file: 업로드된 파일 객체
+
+    Returns:
+        tuple[str, Path, StoredUpload]: (블롭 URL, 블롭 경로, 스트리밍 저장 결과)
+
+    Raises:
+        HTTPException: 크기 제한 초과 또는 이미지가 아닌 내용인 경우
+    """
+    root = blob_root()
+    await run_in_threadpool(root.mkdir, parents=True, exist_ok=True)
+
+    stored = await stream_upload_to_temp(file, root)
+    extension = _FORMAT_EXTENSIONS.get(stored.image_format, stored.image_format)
+    final_path = blob_path(stored.sha256, extension)
+    try:
+        created = await run_in_threadpool(_commit_blob, stored, final_path)
+    except BaseException:
+        await run_in_threadpool(stored.file_path.unlink, missing_ok=True)
+        raise
+
+    return build_file_url(final_path), final_path, stored._replace(file_path=final_path, created=created)
+
+
+def store_blob_bytes(data: bytes) -> tuple[str, Path, StoredUpload]:
+    """
+    메모리의 이미지 바이트를 블롭 저장소에 저장 (동기, 스레드풀/워커에서 호출)
+
+    AI 생성 결과처럼 서버에서 만들어진 이미지를 저장할 때 사용합니다.
+
+    Args:
+        data: 이미지 바이트
+
+    Returns:
+        tuple[str, Path, StoredUpload]: (블롭 URL, 블롭 경로, 저장 결과)
+
+    Raises:
+        ValueError: 이미지 형식을 판별할 수 없는 경우
+    """
+    image_format = sniff_image_format(data[:512])
+    if image_format is None:
+        raise ValueError("이미지 형식을 판별할 수 없습니다.")
+
+    sha256 = hashlib.sha256(data).hexdigest()
+    extension = _FORMAT_EXTENSIONS.get(image_format, image_format)
+    final_path = blob_path(sha256, extension)
+
+    root = blob_root()
+    root.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=root, prefix=".upload-", suffix=".part")
+    stored = StoredUpload(
+        file_path=Path(tmp_name),
+        size=len(data),
+        sha256=sha256,
+        image_format=image_format,
+    )
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        created = _commit_blob(stored, final_path)
+    except BaseException:
+        stored.file_path.unlink(missing_ok=True)
+        raise
+
+    return build_file_url(final_path), final_path, stored._replace(file_path=final_path, created=created)
@@ -0,0 +1,173 @@
+"""
+정적 파일 응답 유틸리티 (스트리밍, Range, 조건부 GET)
+"""
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Mapping, Optional
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from starlette.background import BackgroundTask
+
+
+# /data 정적 파일 응답에 공통으로 붙는 CORS 헤더
+STATIC_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, OPTIONS",
+    "Access-Control-Allow-Headers": "*",
+}
+
+# 정적 파일 캐시 정책
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+class _FinallyBackgroundMixin:
+    """전송이 중간에 끊겨도 background 작업을 실행 (파생본 고정 해제 누락 방지)"""
+
+    async def __call__(self, scope, receive, send) -> None:
+        background, self.background = self.background, None
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if background is not None:
+                await background()
+
+
+class _Response(_FinallyBackgroundMixin, Response):
+    pass
+
+
+class _FileResponse(_FinallyBackgroundMixin, FileResponse):
+    pass
+
+
+def guess_media_type(file_path: Path) -> str:
+    """
+    파일 경로로부터 MIME 타입 추정
+
+    Args:
+        file_path: 파일 경로
+
+    Returns:
+        str: MIME 타입 (알 수 없으면 application/octet-stream)
+    """
+    mime_type, _ = mimetypes.guess_type(str(file_path))
+    if mime_type:
+        return mime_type
+
+    # 이미지 파일인 경우 기본값 설정
+    suffix = file_path.suffix.lower()
+    if suffix in (".png", ".jpg", ".jpeg", ".gif", ".webp"):
+        return "image/jpeg" if suffix == ".jpg" else f"image/{suffix[1:]}"
+    return "application/octet-stream"
+
+
+def build_validators(stat_result: os.stat_result) -> tuple[str, str]:
+    """
+    stat 정보로 ETag / Last-Modified 검증자 생성 (파일 내용을 읽지 않음)
+
+    Args:
+        stat_result: 파일 stat 결과
+
+    Returns:
+        tuple[str, str]: (ETag, Last-Modified)
+    """
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+    return etag, last_modified
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match 헤더 값이 ETag와 일치하는지 확인 (약한 비교, "*"는 항상 일치)
+
+    Args:
+        if_none_match: If-None-Match 헤더 값
+        etag: 현재 리소스의 ETag
+
+    Returns:
+        bool: 일치하면 True
+    """
+    if if_none_match.strip() == "*":
+        return True
+    # 약한 비교: W/ 접두어는 무시
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def is_not_modified(request_headers: Mapping[str, str], etag: str, mtime: float) -> bool:
+    """
+    조건부 요청(If-None-Match / If-Modified-Since) 평가
+
+    If-None-Match가 있으면 If-Modified-Since는 무시합니다 (RFC 9110).
+
+    Args:
+        request_headers: 요청 헤더
+        etag: 현재 리소스의 ETag
+        mtime: 현재 리소스의 수정 시각 (epoch 초)
+
+    Returns:
+        bool: 304 Not Modified로 응답해도 되면 True
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        # HTTP 날짜는 초 단위 정밀도
+        return int(mtime) <= int(since)
+
+    return False
+
+
+def create_file_response(
+    request: Request,
+    file_path: Path,
+    stat_result: os.stat_result,
+    media_type: Optional[str] = None,
+    extra_headers: Optional[Mapping[str, str]] = None,
+    background: Optional[BackgroundTask] = None,
+) -> Response:
+    """
+    파일을 메모리에 올리지 않고 응답 생성
+
+    - 검증자가 일치하면 본문 없이 304 응답
+    - 그 외에는 FileResponse로 청크 스트리밍 (서버가 지원하면 pathsend 사용,
+      Range / If-Range 요청은 206 부분 응답으로 처리)
+
+    Args:
+        request: 요청 객체
+        file_path: 응답할 파일 경로
+        stat_result: 파일 stat 결과 (한 번만 stat 하기 위해 호출자가 전달)
+        media_type: MIME 타입 (없으면 확장자로 추정)
+        extra_headers: 추가 응답 헤더 (예: CORS)
+        background: 응답 전송이 끝나거나 중단된 뒤 실행할 작업
+
+    Returns:
+        Response: 304 응답 또는 FileResponse
+    """
+    etag, last_modified = build_validators(stat_result)
+    headers = {
+        **(extra_headers or {}),
+        "Cache-Control": STATIC_CACHE_CONTROL,
+        "ETag": etag,
+        "Last-Modified": last_modified,
+    }
+
+    if is_not_modified(request.headers, etag, stat_result.st_mtime):
+        return _Response(status_code=304, headers=headers, background=background)
+
+    return _FileResponse(
+        path=file_path,
+        media_type=media_type or guess_media_type(file_path),
+        headers=headers,
+        stat_result=stat_result,
+        background=background,
+    )
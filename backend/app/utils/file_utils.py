@@ -1,13 +1,33 @@
 """
 파일 관련 유틸리티 함수
 """
+import errno
+import hashlib
+import logging
+import os
+import posixpath
+import shutil
+import tempfile
+import threading
 import uuid
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from urllib.parse import urlparse
+from typing import NamedTuple, Optional
 from fastapi import UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from app.core.config import settings
 
 
+logger = logging.getLogger(__name__)
+
+# 하드 링크를 만들 수 없어 복사로 대체하는 오류
+_LINK_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+# 샤딩 레이아웃 디렉토리명 (업로드 디렉토리 하위, UPLOAD_LAYOUT=sharded)
+SHARD_DIRNAME = "shards"
+
+
 def ensure_upload_dir() -> Path:
     """
     업로드 디렉토리가 존재하는지 확인하고 없으면 생성
@@ -63,21 +83,292 @@ def generate_unique_filename(original_filename: str, prefix: Optional[str] = Non
     return f"{prefix}{base}" if prefix else base
 
 
-async def save_uploaded_file(
+def shard_root() -> Path:
+    """
+    샤딩 레이아웃 루트 디렉토리
+
+    Returns:
+        Path: upload/shards 경로
+    """
+    return settings.upload_path / SHARD_DIRNAME
+
+
+def sharded_upload_dir(file_id: str) -> Path:
+    """
+    파일 ID(16진수)의 샤드 디렉토리
+
+    Args:
+        file_id: 16진수 파일 ID (앞 4자로 분산)
+
+    Returns:
+        Path: upload/shards/{id[:2]}/{id[2:4]}
+    """
+    return shard_root() / file_id[:2] / file_id[2:4]
+
+
+def legacy_shard_path(relative_path: str) -> Path:
+    """
+    legacy 레이아웃 파일이 샤드 디렉토리로 이전될 위치
+
+    위치는 업로드 디렉토리 기준 상대 경로의 해시로 정해지므로,
+    이전 후에도 예전 URL만으로 새 위치를 찾을 수 있습니다.
+
+    Args:
+        relative_path: 업로드 디렉토리 기준 상대 경로 (예: "My_Series/001/image.png")
+
+    Returns:
+        Path: upload/shards/{h[:2]}/{h[2:4]}/{h}.{ext} (h: 상대 경로 SHA-256 앞 32자)
+    """
+    digest = hashlib.sha256(relative_path.encode("utf-8")).hexdigest()[:32]
+    return sharded_upload_dir(digest) / f"{digest}{Path(relative_path).suffix.lower()}"
+
+
+def new_upload_path(
+    original_filename: str,
+    subdirectory: Optional[str] = None,
+    filename_prefix: Optional[str] = None,
+) -> Path:
+    """
+    새로 저장할 (블롭 외) 파일 경로 생성 (UPLOAD_LAYOUT에 따름, 디렉토리는 만들지 않음)
+
+    - legacy: upload/{subdirectory}/{접두어}{UUID}.{ext}
+    - sharded: upload/shards/ab/cd/{접두어}{UUID}.{ext} (subdirectory 무시)
+
+    Args:
+        original_filename: 원본 파일명 (확장자 추출용)
+        subdirectory: 서브디렉토리 (legacy 레이아웃에서만 사용)
+        filename_prefix: 파일명 접두어 (예: "gen_")
+
+    Returns:
+        Path: 저장할 파일 경로
+    """
+    if settings.UPLOAD_LAYOUT == "sharded":
+        file_id = uuid.uuid4().hex
+        extension = get_file_extension(original_filename)
+        filename = f"{filename_prefix or ''}{file_id}" + (f".{extension}" if extension else "")
+        return sharded_upload_dir(file_id) / filename
+    upload_dir = settings.upload_path / subdirectory if subdirectory else settings.upload_path
+    return upload_dir / generate_unique_filename(original_filename, prefix=filename_prefix)
+
+
+class StoredUpload(NamedTuple):
+    """스트리밍 저장 결과"""
+    file_path: Path
+    size: int
+    sha256: str
+    image_format: Optional[str]
+    # 이번 저장으로 새 파일이 생겼는지 (블롭 재사용 시 False)
+    created: bool = True
+
+
+# 파일 시그니처(매직 넘버) → 이미지 형식
+_IMAGE_SIGNATURES: tuple[tuple[bytes, str], ...] = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+# 형식 판별에 필요한 최소 선두 바이트 수
+_SNIFF_SIZE = 512
+
+
+def sniff_image_format(head: bytes) -> Optional[str]:
+    """
+    파일 선두 바이트로 이미지 형식 판별
+
+    Args:
+        head: 파일 선두 바이트 (최대 512바이트면 충분)
+
+    Returns:
+        Optional[str]: png, jpeg, gif, webp, svg 중 하나, 판별 불가 시 None
+    """
+    for signature, image_format in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return image_format
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    text = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if text.startswith(b"<svg") or (text.startswith(b"<?xml") and b"<svg" in text):
+        return "svg"
+    return None
+
+
+async def stream_upload_to_temp(file: UploadFile, target_dir: Path) -> StoredUpload:
+    """
+    업로드 파일을 고정 크기 청크로 임시 파일(.part)에 기록
+
+    - 크기 제한(MAX_UPLOAD_SIZE)을 넘는 순간 즉시 중단
+    - 바이트가 도착하는 대로 SHA-256 해시 계산
+    - 앞부분(_SNIFF_SIZE 바이트)이 모이는 즉시 형식 판별, 이미지가 아니면 나머지를 읽지 않고 거부
+    - 디스크 I/O는 모두 스레드풀에서 실행 (이벤트 루프 비차단)
+    - 실패 시 임시 파일은 삭제됨
+
+    Args:
+        file: 업로드된 파일 객체
+        target_dir: 임시 파일을 만들 디렉토리 (최종 위치와 같은 파일시스템, 존재해야 함)
+
+    Returns:
+        StoredUpload: 임시 파일 경로, 크기, SHA-256, 판별된 이미지 형식
+
+    Raises:
+        HTTPException: 크기 제한 초과 또는 이미지가 아닌 내용인 경우
+    """
+    max_size = settings.MAX_UPLOAD_SIZE
+    too_large = HTTPException(
+        status_code=400,
+        detail=f"파일 크기가 너무 큽니다. 최대 크기: {max_size / 1024 / 1024}MB"
+    )
+
+    # 멀티파트 파서가 이미 크기를 알고 있으면 읽기 전에 거부
+    if file.size is not None and file.size > max_size:
+        raise too_large
+
+    fd, tmp_name = await run_in_threadpool(
+        tempfile.mkstemp, dir=target_dir, prefix=".upload-", suffix=".part"
+    )
+    tmp_path = Path(tmp_name)
+    not_image = HTTPException(
+        status_code=400,
+        detail="파일 내용이 허용된 이미지 형식이 아닙니다."
+    )
+    hasher = hashlib.sha256()
+    head = b""
+    image_format: Optional[str] = None
+    size = 0
+
+    try:
+        out = os.fdopen(fd, "wb")
+        try:
+            while True:
+                chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise too_large
+                if image_format is None:
+                    # 판별에 필요한 앞부분이 모이는 즉시 판별하여 이미지가 아니면 나머지를 읽지 않고 거부
+                    head += chunk[:_SNIFF_SIZE - len(head)]
+                    if len(head) >= _SNIFF_SIZE:
+                        image_format = sniff_image_format(head)
+                        if image_format is None:
+                            raise not_image
+                hasher.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+        finally:
+            await run_in_threadpool(out.close)
+
+        # 판별 크기보다 짧은 파일은 끝까지 읽은 뒤 판별
+        if image_format is None:
+            image_format = sniff_image_format(head)
+            if image_format is None:
+                raise not_image
+    except BaseException:
+        await run_in_threadpool(tmp_path.unlink, missing_ok=True)
+        raise
+
+    return StoredUpload(
+        file_path=tmp_path,
+        size=size,
+        sha256=hasher.hexdigest(),
+        image_format=image_format,
+    )
+
+
+async def stream_upload_to_file(file: UploadFile, target_dir: Path, filename: str) -> StoredUpload:
+    """
+    업로드 파일을 임시 파일로 스트리밍 저장한 뒤 최종 파일명으로 원자적 이름 변경
+
+    Args:
+        file: 업로드된 파일 객체
+        target_dir: 저장 디렉토리 (존재해야 함)
+        filename: 최종 파일명
+
+    Returns:
+        StoredUpload: 최종 저장 경로, 크기, SHA-256, 판별된 이미지 형식
+
+    Raises:
+        HTTPException: 크기 제한 초과 또는 이미지가 아닌 내용인 경우
+    """
+    stored = await stream_upload_to_temp(file, target_dir)
+    final_path = target_dir / filename
+    try:
+        await run_in_threadpool(os.replace, stored.file_path, final_path)
+    except BaseException:
+        await run_in_threadpool(stored.file_path.unlink, missing_ok=True)
+        raise
+    return stored._replace(file_path=final_path)
+
+
+def link_or_copy(source: Path, target: Path) -> None:
+    """
+    원본을 남겨 둔 채 target에 같은 파일 생성 (블로킹, 스레드풀에서 호출)
+
+    하드 링크로 만들고, 하드 링크를 지원하지 않으면 임시 파일(.part)로 복사한 뒤 이름을 바꿉니다.
+    어느 경우에도 기존 파일을 덮어쓰지 않으며, 완성되기 전의 파일이 target 이름으로 보이지 않습니다.
+
+    Args:
+        source: 원본 파일 경로
+        target: 만들 파일 경로 (디렉토리는 존재해야 함)
+
+    Raises:
+        FileExistsError: target이 이미 있는 경우
+        OSError: 링크·복사 실패
+    """
+    try:
+        os.link(source, target)
+        return
+    except FileExistsError:
+        raise
+    except OSError as e:
+        if e.errno not in _LINK_UNSUPPORTED_ERRNOS:
+            raise
+
+    temp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.part")
+    try:
+        shutil.copy2(source, temp)
+        if target.exists():
+            raise FileExistsError(errno.EEXIST, "대상 파일이 이미 있습니다", str(target))
+        os.replace(temp, target)
+    finally:
+        temp.unlink(missing_ok=True)
+
+
+def build_file_url(file_path: Path) -> str:
+    """
+    저장된 파일 경로를 API URL로 변환
+
+    Args:
+        file_path: 업로드 디렉토리 하위 파일 경로
+
+    Returns:
+        str: /data/upload/... 형식 URL
+    """
+    relative_path = file_path.relative_to(settings.upload_path.parent)
+    return f"/data/{relative_path.as_posix()}"
+
+
+async def store_uploaded_file(
     file: UploadFile,
     subdirectory: Optional[str] = None,
     filename_prefix: Optional[str] = None
-) -> tuple[str, Path]:
+) -> tuple[str, StoredUpload]:
     """
-    업로드된 파일을 저장
+    업로드된 파일을 저장하고 저장 결과 상세를 반환
+    
+    파일 전체를 메모리에 읽지 않고 청크 단위로 스트리밍 저장합니다.
+    BLOB_STORE_ENABLED이면 내용 해시 기반 블롭 저장소에 저장하며,
+    이 경우 subdirectory / filename_prefix는 사용되지 않습니다.
+    블롭 저장소를 쓰지 않으면 UPLOAD_LAYOUT에 따라 저장 위치가 정해집니다 (new_upload_path).
     
     Args:
         file: 업로드된 파일 객체
-        subdirectory: 서브디렉토리 (선택)
+        subdirectory: 서브디렉토리 (선택, sharded 레이아웃 사용 시 무시)
         filename_prefix: 파일명 접두어 (선택, 예: "gen_")
         
     Returns:
-        tuple[str, Path]: (저장된 파일 URL, 파일 경로)
+        tuple[str, StoredUpload]: (저장된 파일 URL, 저장 결과)
         
     Raises:
         HTTPException: 파일이 허용되지 않거나 크기 제한을 초과한 경우
@@ -89,38 +380,98 @@ async def save_uploaded_file(
             detail=f"허용되지 않는 파일 형식입니다. 허용된 형식: {', '.join(settings.allowed_extensions_list)}"
         )
     
-    # 업로드 디렉토리 확인 및 생성
-    upload_dir = ensure_upload_dir()
+    # 블롭 저장소 사용 시 동일 내용은 기존 파일을 재사용
+    if settings.BLOB_STORE_ENABLED:
+        from app.utils.blob_store import store_blob
+        file_url, _, stored = await store_blob(file)
+        return file_url, stored
     
-    # 서브디렉토리가 있으면 생성
-    if subdirectory:
-        upload_dir = upload_dir / subdirectory
-        upload_dir.mkdir(parents=True, exist_ok=True)
+    # 고유한 파일 경로 생성 (접두어 적용 시 예: gen_xxxxxxxx.png) 및 디렉토리 생성
+    file_path = new_upload_path(file.filename, subdirectory, filename_prefix)
+    await run_in_threadpool(file_path.parent.mkdir, parents=True, exist_ok=True)
     
-    # 고유한 파일명 생성 (접두어 적용 시 예: gen_xxxxxxxx.png)
-    unique_filename = generate_unique_filename(file.filename, prefix=filename_prefix)
-    file_path = upload_dir / unique_filename
+    # 청크 단위 저장 (크기 초과 시 즉시 중단, 임시 파일 → 원자적 이름 변경)
+    stored = await stream_upload_to_file(file, file_path.parent, file_path.name)
     
-    # 파일 내용 읽기 및 크기 확인
-    content = await file.read()
-    file_size = len(content)
+    # 상대 경로 반환 (API에서 사용할 URL 경로)
+    # /data/upload/... 형식으로 반환
+    return build_file_url(stored.file_path), stored
+
+
+def store_image_bytes(
+    data: bytes,
+    subdirectory: Optional[str] = None,
+    filename_prefix: Optional[str] = None
+) -> tuple[str, StoredUpload]:
+    """
+    서버에서 생성한 이미지 바이트를 저장 (동기, 스레드풀/워커에서 호출)
     
-    if file_size > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"파일 크기가 너무 큽니다. 최대 크기: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
-        )
+    store_uploaded_file과 동일한 저장 규칙(블롭 저장소 / 서브디렉토리)을 따릅니다.
     
-    # 파일 저장
-    with open(file_path, "wb") as f:
-        f.write(content)
+    Args:
+        data: 이미지 바이트
+        subdirectory: 서브디렉토리 (선택, 블롭 저장소·sharded 레이아웃 사용 시 무시)
+        filename_prefix: 파일명 접두어 (선택, 블롭 저장소 사용 시 무시)
+        
+    Returns:
+        tuple[str, StoredUpload]: (저장된 파일 URL, 저장 결과)
+        
+    Raises:
+        ValueError: 이미지 형식을 판별할 수 없는 경우
+    """
+    if settings.BLOB_STORE_ENABLED:
+        from app.utils.blob_store import store_blob_bytes
+        file_url, _, stored = store_blob_bytes(data)
+        return file_url, stored
     
-    # 상대 경로 반환 (API에서 사용할 URL 경로)
-    # /data/upload/... 형식으로 반환
-    relative_path = file_path.relative_to(settings.upload_path.parent)
-    file_url = f"/data/{relative_path.as_posix()}"
+    image_format = sniff_image_format(data[:_SNIFF_SIZE])
+    if image_format is None:
+        raise ValueError("이미지 형식을 판별할 수 없습니다.")
+    
+    extension = "jpg" if image_format == "jpeg" else image_format
+    file_path = new_upload_path(f"image.{extension}", subdirectory, filename_prefix)
+    upload_dir = file_path.parent
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    
+    fd, tmp_name = tempfile.mkstemp(dir=upload_dir, prefix=".upload-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
     
-    return file_url, file_path
+    stored = StoredUpload(
+        file_path=file_path,
+        size=len(data),
+        sha256=hashlib.sha256(data).hexdigest(),
+        image_format=image_format,
+    )
+    return build_file_url(file_path), stored
+
+
+async def save_uploaded_file(
+    file: UploadFile,
+    subdirectory: Optional[str] = None,
+    filename_prefix: Optional[str] = None
+) -> tuple[str, Path]:
+    """
+    업로드된 파일을 저장
+    
+    Args:
+        file: 업로드된 파일 객체
+        subdirectory: 서브디렉토리 (선택, 블롭 저장소·sharded 레이아웃 사용 시 무시)
+        filename_prefix: 파일명 접두어 (선택, 예: "gen_", 블롭 저장소 사용 시 무시)
+        
+    Returns:
+        tuple[str, Path]: (저장된 파일 URL, 파일 경로)
+        
+    Raises:
+        HTTPException: 파일이 허용되지 않거나 크기 제한을 초과한 경우
+    """
+    file_url, stored = await store_uploaded_file(file, subdirectory, filename_prefix)
+    return file_url, stored.file_path
 
 
 def delete_file(file_path: Path) -> bool:
@@ -134,70 +485,230 @@ def delete_file(file_path: Path) -> bool:
         bool: 삭제 성공 여부
     """
     try:
-        if file_path.exists():
-            file_path.unlink()
-            return True
-        return False
-    except Exception:
+        file_path.unlink()
+        return True
+    except OSError:
         return False
+    finally:
+        upload_path_resolver.invalidate(file_path)
 
 
-def get_file_path_from_url(url: str) -> Optional[Path]:
+def current_file_url(url: Optional[str]) -> Optional[str]:
     """
-    URL에서 파일 경로 추출
+    샤드 디렉토리로 이전된 legacy 파일의 예전 URL이면 새 URL로 변환 (블로킹, 스레드풀에서 호출)
     
     Args:
-        url: 파일 URL (예: /data/upload/image.jpg 또는 http://localhost:8000/data/upload/image.jpg)
+        url: 파일 URL
         
     Returns:
-        Optional[Path]: 파일 경로, 없으면 None
+        Optional[str]: 이전된 파일이면 새 URL, 아니면 입력 그대로
     """
-    try:
+    if not url or url.startswith(f"/data/upload/{SHARD_DIRNAME}/"):
+        return url
+    file_path = get_file_path_from_url(url)
+    if file_path is None or not file_path.is_relative_to(shard_root()):
+        return url
+    return build_file_url(file_path)
+
+
+class UploadPathResolver:
+    """
+    업로드 파일 URL → 경로 변환기 (get_file_path_from_url, 정적 파일 서빙, 업로드 API 공용)
+    
+    - URL 정규화와 ..·절대 경로 차단은 문자열 처리로 먼저 수행합니다.
+    - 캐시 미스 시 후보 경로를 resolve()하여, 심볼릭 링크로 업로드 디렉토리(resolved_root) 밖을 가리키는 파일은 거부합니다.
+    - 존재를 확인한 조회 결과는 LRU(UPLOAD_PATH_CACHE_SIZE)에 보관하여 다음 조회는 파일 시스템에 접근하지 않습니다.
+      파일을 삭제·이동하는 코드는 invalidate()로 항목을 무효화합니다. 없는 파일은 캐시하지 않습니다.
+    - 조회 실패는 print 대신 app.utils.file_utils 로거의 DEBUG 레벨로 기록합니다.
+    - 스레드풀 여러 스레드에서 동시에 호출해도 안전합니다.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 상대 경로 → 확인된 파일 경로 (앞쪽일수록 오래 사용되지 않음)
+        self._entries: "OrderedDict[str, Path]" = OrderedDict()
+        # 파일 경로 → 그 경로로 변환된 상대 경로들 (샤드로 이전된 예전 경로 포함, 무효화용)
+        self._aliases: dict[Path, set[str]] = {}
+        self._root: Optional[Path] = None
+        self._resolved_root: Optional[Path] = None
+        self._hits = 0
+        self._misses = 0
+    
+    @property
+    def root(self) -> Path:
+        """업로드 디렉토리 경로 (반환 경로의 기준, 최초 사용 시 1회 계산)"""
+        if self._root is None:
+            self._root = Path(os.path.abspath(settings.upload_path))
+        return self._root
+    
+    @property
+    def resolved_root(self) -> Path:
+        """심볼릭 링크를 해석한 업로드 디렉토리 경로 (최초 사용 시 1회 계산)"""
+        if self._resolved_root is None:
+            self._resolved_root = self.root.resolve()
+        return self._resolved_root
+    
+    @staticmethod
+    def relative_path(url: Optional[str]) -> Optional[str]:
+        """
+        URL을 업로드 디렉토리 기준 상대 경로로 정규화 (파일 시스템 접근 없음)
+        
+        Args:
+            url: 파일 URL (/data/upload/a.png, http://host/data/upload/a.png, upload/a.png, a.png 등)
+            
+        Returns:
+            Optional[str]: posix 상대 경로, 비어 있거나 업로드 디렉토리 밖을 가리키면 None
+        """
         if not url:
             return None
-            
-        # 전체 URL에서 경로 부분만 추출
         if url.startswith("http://") or url.startswith("https://"):
-            # http://localhost:8000/data/upload/image.jpg 형식
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            url = parsed.path
-        
-        # URL에서 /data/upload/ 또는 /data/upload 부분 제거
-        if url.startswith("/data/upload/"):
-            url = url[13:]  # "/data/upload/" 제거
-        elif url.startswith("/data/upload"):
-            url = url[13:]  # "/data/upload" 제거
+            url = urlparse(url).path
+        
+        # /data/upload/, /data/, / 접두어 제거
+        if url.startswith("/data/upload"):
+            url = url[13:]
         elif url.startswith("/data/"):
-            url = url[6:]  # "/data/" 제거
+            url = url[6:]
         elif url.startswith("/"):
             url = url[1:]
-        
-        # upload/... 형식으로 시작하면 제거
         if url.startswith("upload/"):
-            url = url[7:]  # "upload/" 제거
+            url = url[7:]
+        return UploadPathResolver.normalize_relative(url)
+    
+    @staticmethod
+    def normalize_relative(path: str) -> Optional[str]:
+        """
+        업로드 디렉토리 기준 상대 경로 정규화 (파일 시스템 접근 없음)
         
-        # 빈 문자열이면 None 반환
-        if not url:
+        Returns:
+            Optional[str]: posix 상대 경로, 비어 있거나 절대 경로이거나 ..로 디렉토리 밖을 가리키면 None
+        """
+        if not path or "\x00" in path or "\\" in path:
+            return None
+        normalized = posixpath.normpath(path)
+        if normalized in (".", "..") or normalized.startswith(("../", "/")):
+            return None
+        return normalized
+    
+    def resolve(self, url: Optional[str]) -> Optional[Path]:
+        """
+        URL에 해당하는 파일 경로 (블로킹, 캐시 미스 시 resolve 최대 2회)
+        
+        Returns:
+            Optional[Path]: 존재하는 파일 경로, 없거나 잘못된 URL이면 None
+        """
+        relative = self.relative_path(url)
+        if relative is None:
+            logger.debug("upload path rejected url=%r", url)
             return None
+        return self.resolve_relative(relative, url)
+    
+    def resolve_relative(self, relative: str, url: Optional[str] = None) -> Optional[Path]:
+        """
+        정규화된 상대 경로의 파일 경로 (legacy 경로가 없으면 샤드로 이전된 위치 확인)
         
-        file_path = settings.upload_path / url
+        Args:
+            relative: relative_path()로 정규화한 상대 경로
+            url: 로그용 원본 URL
+            
+        Returns:
+            Optional[Path]: 존재하는 파일 경로, 없거나 실제 위치가 업로드 디렉토리 밖이면 None
+        """
+        with self._lock:
+            cached = self._entries.get(relative)
+            if cached is not None:
+                self._entries.move_to_end(relative)
+                self._hits += 1
+                return cached
+            self._misses += 1
         
-        # 보안: 업로드 디렉토리 밖의 파일 접근 방지
-        resolved_path = file_path.resolve()
-        resolved_upload_path = settings.upload_path.resolve()
+        file_path = self.root / relative
+        resolved = self._resolve_existing(file_path)
+        if resolved is None:
+            # 샤딩 레이아웃으로 이전된 legacy 파일은 예전 URL로도 찾음
+            file_path = legacy_shard_path(relative)
+            resolved = self._resolve_existing(file_path)
+            if resolved is None:
+                logger.debug("upload path miss url=%r relative=%r", url or relative, relative)
+                return None
         
-        if not str(resolved_path).startswith(str(resolved_upload_path)):
-            print(f"보안 검사 실패: {resolved_path}가 {resolved_upload_path} 밖에 있음")
+        # 심볼릭 링크가 업로드 디렉토리 밖을 가리키면 거부 (캐시하지 않음)
+        if not resolved.is_relative_to(self.resolved_root):
+            logger.debug("upload path escapes root url=%r relative=%r target=%r", url or relative, relative, str(resolved))
             return None
         
-        if file_path.exists():
-            return file_path
-        else:
-            print(f"파일이 존재하지 않음: {file_path}")
+        self._store(relative, file_path)
+        return file_path
+    
+    @staticmethod
+    def _resolve_existing(file_path: Path) -> Optional[Path]:
+        """심볼릭 링크를 해석한 실제 경로, 없으면 None"""
+        try:
+            return file_path.resolve(strict=True)
+        except (OSError, RuntimeError):
+            # 없는 파일, 순환 링크 등
             return None
-    except Exception as e:
-        print(f"get_file_path_from_url 오류: {url} - {str(e)}")
-        import traceback
-        print(traceback.format_exc())
-        return None
+    
+    def _store(self, relative: str, file_path: Path) -> None:
+        max_entries = settings.UPLOAD_PATH_CACHE_SIZE
+        if max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[relative] = file_path
+            self._entries.move_to_end(relative)
+            self._aliases.setdefault(file_path, set()).add(relative)
+            while len(self._entries) > max_entries:
+                evicted_relative, evicted_path = self._entries.popitem(last=False)
+                self._discard_alias(evicted_path, evicted_relative)
+    
+    def _discard_alias(self, file_path: Path, relative: str) -> None:
+        aliases = self._aliases.get(file_path)
+        if aliases is not None:
+            aliases.discard(relative)
+            if not aliases:
+                del self._aliases[file_path]
+    
+    def invalidate(self, file_path: Path) -> None:
+        """
+        삭제·이동한 파일의 캐시 항목 제거 (그 파일로 변환되던 모든 URL 포함)
+        
+        Args:
+            file_path: 삭제·이동한 파일 경로 (업로드 디렉토리 하위)
+        """
+        file_path = Path(os.path.abspath(file_path))
+        with self._lock:
+            for relative in self._aliases.pop(file_path, set()):
+                self._entries.pop(relative, None)
+            if file_path.is_relative_to(self.root):
+                relative = file_path.relative_to(self.root).as_posix()
+                cached = self._entries.pop(relative, None)
+                if cached is not None:
+                    self._discard_alias(cached, relative)
+    
+    def clear(self) -> None:
+        """캐시 전체 비우기"""
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+    
+    def stats(self) -> dict:
+        """캐시 상태 (항목 수, 적중/미적중 수)"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+
+# 전역 업로드 경로 변환기 인스턴스
+upload_path_resolver = UploadPathResolver()
+
+
+def get_file_path_from_url(url: str) -> Optional[Path]:
+    """
+    URL에서 파일 경로 추출 (upload_path_resolver 사용, 확인된 결과는 캐시)
+    
+    Args:
+        url: 파일 URL (예: /data/upload/image.jpg 또는 http://localhost:8000/data/upload/image.jpg)
+        
+    Returns:
+        Optional[Path]: 파일 경로, 없으면 None
+    """
+    return upload_path_resolver.resolve(url)
@@ -0,0 +1,45 @@
+"""
+커서(keyset) 페이지네이션 유틸리티
+
+커서는 마지막으로 반환한 행의 정렬 키를 담은 불투명 문자열(base64url JSON)입니다.
+클라이언트는 내용을 해석하지 않고 응답의 nextCursor를 다음 요청의 cursor로 그대로 전달합니다.
+"""
+import base64
+import json
+
+
+def encode_cursor(position: dict) -> str:
+    """
+    정렬 키를 불투명 커서 문자열로 인코딩
+
+    Args:
+        position: 마지막 행의 정렬 키 (예: {"sn": 123})
+
+    Returns:
+        str: base64url 커서 (패딩 제외)
+    """
+    raw = json.dumps(position, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    커서 문자열을 정렬 키로 디코딩
+
+    Args:
+        cursor: encode_cursor로 만든 커서
+
+    Returns:
+        dict: 정렬 키
+
+    Raises:
+        ValueError: 형식이 잘못된 커서인 경우
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("잘못된 커서입니다.") from e
+    if not isinstance(position, dict):
+        raise ValueError("잘못된 커서입니다.")
+    return position
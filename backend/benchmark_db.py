@@ -0,0 +1,204 @@
+"""
+데이터베이스 모드 벤치마크 스크립트 (동기 세션 vs 비동기 세션 vs production 프로필)
+사용법: uv run python benchmark_db.py [요청 수] [동시 요청 수]
+
+임시 데이터베이스에 카드를 채운 뒤, async 라우트와 같은 방식으로 요청을 동시에 실행합니다.
+- sync: async 함수 안에서 동기 Session으로 조회/커밋 (기존 라우트 방식, 이벤트 루프 차단)
+- async: AsyncSession(aiosqlite)으로 조회/커밋 (DB 대기 중 다른 요청 진행)
+- profile: async + production 프로필 (WAL·PRAGMA, 단일 쓰기 연결 + 읽기 전용 연결 풀)
+
+요청 10개 중 1개는 합성이미지 행 추가 + 커밋, 나머지는 목록 1페이지 조회입니다.
+이벤트 루프 지연(loop lag)은 5ms 주기 하트비트가 실제로 깨어난 시각의 지연으로 측정하며,
+정적 파일 서빙 등 다른 요청이 얼마나 밀리는지를 나타냅니다.
+"""
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.database.database import Base, _apply_sqlite_pragmas
+from app.database.models import Card, CardGeneratedImage
+
+SEED_CARDS = 5000
+PAGE_SIZE = 20
+WRITE_EVERY = 10
+HEARTBEAT_INTERVAL = 0.005
+
+
+def _page_statement():
+    """목록 1페이지 + 카드별 최신 합성이미지 조회 (/cards/list와 같은 쿼리)"""
+    latest_url = (
+        select(CardGeneratedImage.image_url)
+        .where(CardGeneratedImage.card_sn == Card.card_sn)
+        .order_by(CardGeneratedImage.created_at.desc(), CardGeneratedImage.id.desc())
+        .limit(1)
+        .correlate(Card)
+        .scalar_subquery()
+    )
+    return select(Card, latest_url).order_by(Card.card_sn.desc()).limit(PAGE_SIZE)
+
+
+def seed_database(db_file: Path) -> None:
+    """임시 데이터베이스 생성 및 카드/합성이미지 채우기"""
+    engine = create_engine(f"sqlite:///{db_file}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(
+            Card(card_name=f"카드 {i}", type="타입", attribute="속성", rarity="등급", series="벤치마크")
+            for i in range(SEED_CARDS)
+        )
+        db.flush()
+        db.add_all(
+            CardGeneratedImage(card_sn=sn, image_url=f"/data/upload/gen/{sn}.png")
+            for sn in range(1, SEED_CARDS + 1, 3)
+        )
+        db.commit()
+    engine.dispose()
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list[float]) -> None:
+    """주기적으로 깨어나며 예정 시각 대비 지연 기록"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_sync_mode(db_file: Path, total: int, concurrency: int) -> list[float]:
+    """동기 Session을 async 함수 안에서 직접 사용 (기존 라우트 방식)"""
+    engine = create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False})
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def request(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            with session_factory() as db:
+                if index % WRITE_EVERY == 0:
+                    db.add(CardGeneratedImage(card_sn=index % SEED_CARDS + 1, image_url=f"/bench/{index}.png"))
+                    db.commit()
+                else:
+                    db.execute(_page_statement()).all()
+            latencies.append(time.perf_counter() - started)
+            # 라우트가 응답을 돌려주는 지점 (다른 태스크로 양보)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(request(i) for i in range(total)))
+    engine.dispose()
+    return latencies
+
+
+async def run_async_mode(db_file: Path, total: int, concurrency: int) -> list[float]:
+    """AsyncSession(aiosqlite) 사용 (현재 라우트 방식)"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}")
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def request(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            async with session_factory() as db:
+                if index % WRITE_EVERY == 0:
+                    db.add(CardGeneratedImage(card_sn=index % SEED_CARDS + 1, image_url=f"/bench/{index}.png"))
+                    await db.commit()
+                else:
+                    (await db.execute(_page_statement())).all()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(request(i) for i in range(total)))
+    await engine.dispose()
+    return latencies
+
+
+async def run_profile_mode(db_file: Path, total: int, concurrency: int) -> list[float]:
+    """AsyncSession + production 프로필 (쓰기는 단일 연결, 읽기는 query_only 연결 풀)"""
+    engines = {}
+    for read_only, pool_options in ((False, {"pool_size": 1, "max_overflow": 0}),
+                                    (True, {"pool_size": 4, "max_overflow": 0})):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}", **pool_options)
+        event.listen(
+            engine.sync_engine,
+            "connect",
+            lambda dbapi_connection, record, read_only=read_only: _apply_sqlite_pragmas(dbapi_connection, read_only),
+        )
+        engines[read_only] = engine
+    # 읽기 연결보다 먼저 쓰기 연결을 열어 journal_mode를 WAL로 전환
+    async with engines[False].connect():
+        pass
+    write_factory = async_sessionmaker(bind=engines[False], autoflush=False, expire_on_commit=False)
+    read_factory = async_sessionmaker(bind=engines[True], autoflush=False, expire_on_commit=False)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def request(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            if index % WRITE_EVERY == 0:
+                async with write_factory() as db:
+                    db.add(CardGeneratedImage(card_sn=index % SEED_CARDS + 1, image_url=f"/bench/{index}.png"))
+                    await db.commit()
+            else:
+                async with read_factory() as db:
+                    (await db.execute(_page_statement())).all()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(request(i) for i in range(total)))
+    for engine in engines.values():
+        await engine.dispose()
+    return latencies
+
+
+async def benchmark(mode: str, db_file: Path, total: int, concurrency: int) -> dict:
+    """한 모드 실행 후 처리량·지연 통계 반환"""
+    runner = {"sync": run_sync_mode, "async": run_async_mode, "profile": run_profile_mode}[mode]
+    stop = asyncio.Event()
+    lags: list[float] = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+
+    started = time.perf_counter()
+    latencies = await runner(db_file, total, concurrency)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await heartbeat
+    latencies.sort()
+    return {
+        "mode": mode,
+        "elapsed": elapsed,
+        "throughput": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_lag": max(lags, default=0.0) * 1000,
+        "heartbeats": len(lags),
+    }
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+
+    with tempfile.TemporaryDirectory(prefix="card-bench-") as tmp_dir:
+        db_file = Path(tmp_dir) / "bench.db"
+        print(f"📁 임시 데이터베이스: {db_file} (카드 {SEED_CARDS}개)")
+        seed_database(db_file)
+
+        print(f"🚀 요청 {total}개, 동시 {concurrency}개 (쓰기 비율 1/{WRITE_EVERY})\n")
+        print(f"{'모드':<7} {'소요(s)':>8} {'req/s':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'루프 최대 지연(ms)':>18} {'하트비트':>8}")
+        print("-" * 73)
+        for mode in ("sync", "async", "profile"):
+            result = asyncio.run(benchmark(mode, db_file, total, concurrency))
+            print(
+                f"{result['mode']:<7} {result['elapsed']:>8.2f} {result['throughput']:>8.0f} "
+                f"{result['p50']:>8.2f} {result['p95']:>8.2f} {result['max_lag']:>18.2f} {result['heartbeats']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
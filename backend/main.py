@@ -7,12 +7,25 @@ from app.core.config import settings
 from app.core.cors import setup_cors
 from app.api import api_router
 from app.schemas.card import HealthCheckSchema, RootResponseSchema
-from app.database import init_db
-from app.utils.file_utils import ensure_upload_dir
+from app.database import init_db, dispose_engines
+from app.utils.file_utils import ensure_upload_dir, upload_path_resolver
+from app.utils.file_response import create_file_response, STATIC_CORS_HEADERS
+from app.services.derivative_service import derivative_engine, UnreadableImageError
+from app.services.generation_service import generation_manager
+from app.services.write_queue import write_queue
+from app.services.file_reclaimer import file_reclaimer
+from app.services.file_relocator import file_relocator
+from app.services.orphan_collector import orphan_collector
+from app.services.layout_migrator import layout_migrator
+from fastapi import HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import Response
+from starlette.background import BackgroundTask
 from pathlib import Path
-import mimetypes
+from typing import Optional
+import os
+import stat
 
 
 @asynccontextmanager
@@ -23,13 +36,30 @@ async def lifespan(app: FastAPI):
     """
     # 서버 시작 시 실행
     print("🚀 서버 시작 중...")
-    # DEBUG 모드일 때는 테이블 구조 변경 시 자동 재생성
+    # 스키마 버전 확인 (최신이 아니면 데이터를 유지한 채 마이그레이션)
     init_db(force_recreate=False)
     ensure_upload_dir()
     print(f"📁 업로드 디렉토리 준비 완료: {settings.upload_path}")
+    await derivative_engine.start()
+    await write_queue.start()
+    await file_reclaimer.start()
+    await file_relocator.start()
+    await orphan_collector.start()
+    await layout_migrator.start()
+    await generation_manager.start()
     yield
     # 서버 종료 시 실행
     print("🛑 서버 종료 중...")
+    await generation_manager.shutdown()
+    # 생성 워커가 남긴 INSERT까지 커밋한 뒤 엔진 정리
+    await layout_migrator.shutdown()
+    await orphan_collector.shutdown()
+    await write_queue.shutdown()
+    # 재배치기가 회수 대기열에 넣은 항목까지 회수기가 이어받도록 먼저 종료
+    await file_relocator.shutdown()
+    await file_reclaimer.shutdown()
+    await derivative_engine.shutdown()
+    await dispose_engines()
 
 
 # FastAPI 애플리케이션 생성
@@ -46,96 +76,94 @@ setup_cors(app)
 # 정적 파일 서빙은 커스텀 엔드포인트로 처리 (CORS 헤더 포함)
 # app.mount("/data", StaticFiles(directory=str(settings.upload_path.parent)), name="data")
 
+def _stat_upload_file(relative_path: str) -> tuple[Optional[Path], Optional[os.stat_result]]:
+    """업로드 파일 경로와 stat 정보 (블로킹, 캐시된 경로의 파일이 사라졌으면 무효화)"""
+    full_path = upload_path_resolver.resolve_relative(relative_path)
+    if full_path is None:
+        return None, None
+    try:
+        return full_path, os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        upload_path_resolver.invalidate(full_path)
+        return full_path, None
+
+
 # /data 경로로 정적 파일 서빙 (CORS 헤더 포함)
 @app.get("/data/{file_path:path}")
-async def serve_static_file(file_path: str):
+async def serve_static_file(
+    file_path: str,
+    request: Request,
+    w: Optional[int] = Query(None, description="파생본 최대 너비 (px)"),
+    h: Optional[int] = Query(None, description="파생본 최대 높이 (px)"),
+    fmt: Optional[str] = Query(None, description="파생본 형식 (webp, jpeg, png)"),
+):
     """
     정적 파일 서빙 (CORS 헤더 포함)
     
     - **file_path**: 파일 경로 (예: upload/cards/image.jpg 또는 upload/image.jpg)
+    - **w**, **h**, **fmt**: 지정 시 리사이즈/재인코딩된 파생본을 반환 (예: ?w=256&fmt=webp)
+    
+    파일은 메모리에 읽지 않고 스트리밍합니다.
+    stat 정보 기반 ETag / Last-Modified를 내려주고, If-None-Match / If-Modified-Since
+    조건부 요청에는 304, Range 요청에는 206 부분 응답으로 처리합니다.
     """
     try:
-        from fastapi import HTTPException
-        
-        # file_path에서 앞의 슬래시 제거 및 정규화
         # "/upload/xxx.png" 또는 "upload/xxx.png" 모두 처리
         file_path = file_path.lstrip('/')
         
-        # 전체 경로 구성
-        # file_path는 "upload/cards/xxx.png" 또는 "upload/xxx.png" 형식
-        full_path = settings.upload_path.parent / file_path
-        
         # 디버깅 로그 (개발 환경에서만)
         if settings.DEBUG:
             print(f"📁 파일 요청: {file_path}")
-            print(f"📂 전체 경로: {full_path}")
-            print(f"📂 절대 경로: {full_path.resolve()}")
-            print(f"✅ 파일 존재: {full_path.exists()}")
-            if full_path.exists():
-                print(f"📏 파일 크기: {full_path.stat().st_size} bytes")
         
-        # 보안: upload_path.parent 밖의 파일 접근 방지
-        upload_parent_resolved = str(settings.upload_path.parent.resolve())
-        full_path_resolved = str(full_path.resolve())
-        
-        if settings.DEBUG:
-            print(f"🔒 보안 검증:")
-            print(f"   upload_parent: {upload_parent_resolved}")
-            print(f"   full_path: {full_path_resolved}")
-            print(f"   시작 확인: {full_path_resolved.startswith(upload_parent_resolved)}")
+        # 업로드 디렉토리 밖(데이터베이스 등)의 파일은 서빙하지 않음
+        upload_prefix = f"{settings.upload_path.name}/"
+        if not file_path.startswith(upload_prefix):
+            raise HTTPException(status_code=404, detail=f"파일을 찾을 수 없습니다: {file_path}")
         
-        if not full_path_resolved.startswith(upload_parent_resolved):
-            if settings.DEBUG:
-                print(f"❌ 보안 검증 실패: 경로가 허용된 디렉토리 밖입니다")
+        # 보안: 업로드 디렉토리 밖을 가리키는 경로(../ 등)는 문자열 정규화 단계에서 거부
+        relative_path = upload_path_resolver.normalize_relative(file_path[len(upload_prefix):])
+        if relative_path is None:
             raise HTTPException(status_code=403, detail="접근이 거부되었습니다.")
         
-        if not full_path.exists():
+        # 확인된 경로는 캐시에서 바로 찾고 (샤딩 레이아웃으로 이전된 legacy 파일 포함),
+        # stat 한 번으로 크기, 수정 시각을 확인 (이벤트 루프 밖에서 실행)
+        full_path, stat_result = await run_in_threadpool(_stat_upload_file, relative_path)
+        
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
             # 디버깅 정보 포함
             error_detail = f"파일을 찾을 수 없습니다: {file_path}"
-            if settings.DEBUG:
+            if settings.DEBUG and full_path is not None:
                 error_detail += f" (전체 경로: {full_path})"
             raise HTTPException(status_code=404, detail=error_detail)
         
-        # MIME 타입 감지
-        mime_type, _ = mimetypes.guess_type(str(full_path))
-        if not mime_type:
-            # 이미지 파일인 경우 기본값 설정
-            if str(full_path).lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
-                mime_type = f"image/{full_path.suffix[1:].lower()}"
-                if mime_type == "image/jpg":
-                    mime_type = "image/jpeg"
-            else:
-                mime_type = "application/octet-stream"
-        
-        # 파일 읽기
-        with open(full_path, "rb") as f:
-            content = f.read()
-        
-        if settings.DEBUG:
-            print(f"✅ 파일 읽기 완료: {len(content)} bytes")
-            print(f"📄 MIME 타입: {mime_type}")
+        # 파생본 요청이면 디스크 캐시에서 조회 (없으면 프로세스 풀에서 렌더링)
+        # 파생본은 응답 전송이 끝날 때까지 고정되어 다른 요청의 LRU 제거로 지워지지 않음
+        media_type = None
+        background = None
+        if w is not None or h is not None or fmt is not None:
+            try:
+                full_path, media_type, stat_result = await derivative_engine.get(
+                    full_path, stat_result, w, h, fmt
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except UnreadableImageError as e:
+                raise HTTPException(status_code=e.status_code, detail=str(e))
+            background = BackgroundTask(derivative_engine.release, full_path)
         
-        # CORS 헤더 포함하여 응답
-        response = Response(
-            content=content,
-            media_type=mime_type,
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, OPTIONS",
-                "Access-Control-Allow-Headers": "*",
-                "Cache-Control": "public, max-age=3600",
-            }
+        # CORS 헤더 포함하여 스트리밍 응답 (304 / 206 처리 포함)
+        return create_file_response(
+            request,
+            full_path,
+            stat_result,
+            media_type=media_type,
+            extra_headers=STATIC_CORS_HEADERS,
+            background=background,
         )
-        
-        if settings.DEBUG:
-            print(f"✅ 응답 생성 완료")
-        
-        return response
     
     except HTTPException:
         raise
     except Exception as e:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=500,
             detail=f"파일 조회 중 오류가 발생했습니다: {str(e)}"
@@ -145,13 +173,7 @@ async def serve_static_file(file_path: str):
 @app.options("/data/{file_path:path}")
 async def options_static_file(file_path: str):
     """CORS preflight 요청 처리"""
-    return Response(
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, OPTIONS",
-            "Access-Control-Allow-Headers": "*",
-        }
-    )
+    return Response(headers=STATIC_CORS_HEADERS)
 
 # API 라우터 등록
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
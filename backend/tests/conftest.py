@@ -0,0 +1,110 @@
+"""
+테스트 공통 설정
+
+앱 모듈을 import하기 전에 데이터베이스·업로드·캐시 디렉토리를 세션마다 새 임시 디렉토리로 바꾸고,
+테스트 결과에 영향을 주는 백그라운드 작업(고아 파일 수집기, 블롭 회수 유예)을 끕니다.
+"""
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+_TEST_ROOT = Path(tempfile.mkdtemp(prefix="card-backend-test-"))
+
+os.environ.update({
+    "DEBUG": "false",
+    "DATABASE_DIR": str(_TEST_ROOT / "database"),
+    "UPLOAD_DIR": str(_TEST_ROOT / "upload"),
+    "DERIVATIVE_CACHE_DIR": str(_TEST_ROOT / "cache" / "derivatives"),
+    "ORPHAN_GC_MODE": "off",
+    "ORPHAN_GC_QUARANTINE_DIR": str(_TEST_ROOT / "quarantine"),
+    "BLOB_RECLAIM_GRACE_SECONDS": "0",
+    "GENERATION_WORKERS": "1",
+    "DERIVATIVE_WORKERS": "1",
+})
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+# 테스트 사이에 비우는 테이블 (카운터·패싯·검색 인덱스는 트리거가 함께 갱신)
+_DATA_TABLES = (
+    "cards",
+    "card_generated_images",
+    "card_generation_history",
+    "image_blobs",
+    "image_metadata",
+    "file_reclaim_queue",
+    "file_relocation_outbox",
+)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_TEST_ROOT, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def app():
+    from main import app as fastapi_app
+
+    return fastapi_app
+
+
+@pytest.fixture(scope="session")
+def session_client(app):
+    """서버 생명주기(마이그레이션, 백그라운드 작업)를 세션 동안 한 번만 실행하는 클라이언트"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def client(session_client):
+    """테이블을 비운 상태의 클라이언트"""
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    try:
+        with conn:
+            for table in _DATA_TABLES:
+                conn.execute(f"DELETE FROM {table}")
+    finally:
+        conn.close()
+    yield session_client
+
+
+def card_payload(name: str, **fields) -> dict:
+    """카드 저장 요청 본문"""
+    card_data = {
+        "cardName": name,
+        "type": fields.pop("type", "캐릭터"),
+        "attribute": fields.pop("attribute", "불"),
+        "rarity": fields.pop("rarity", "일반"),
+        **fields,
+    }
+    return {"cardData": card_data}
+
+
+@pytest.fixture
+def save_card(client):
+    """카드를 저장하고 card_sn을 반환하는 함수"""
+    def _save(name: str, image_urls: dict | None = None, **fields) -> int:
+        payload = card_payload(name, **fields)
+        payload.update(image_urls or {})
+        response = client.post("/api/v1/cards/save", json=payload)
+        assert response.status_code == 200, response.text
+        return response.json()["cardSn"]
+
+    return _save
+
+
+@pytest.fixture
+def png_bytes():
+    """단색 PNG 바이트를 만드는 함수 (색이 다르면 내용 해시도 다름)"""
+    from PIL import Image
+
+    def _png(color: str = "red", size: tuple[int, int] = (32, 32)) -> bytes:
+        buffer = io.BytesIO()
+        Image.new("RGB", size, color).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    return _png
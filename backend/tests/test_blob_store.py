@@ -0,0 +1,110 @@
+"""
+블롭 저장소·참조 카운트 (user-003)
+"""
+import sqlite3
+from app.core.config import settings
+from app.services.file_reclaimer import file_reclaimer
+from app.utils.file_utils import get_file_path_from_url
+
+
+def _upload(client, data: bytes) -> str:
+    response = client.post("/api/v1/upload/single", files={"file": ("image.png", data, "image/png")})
+    assert response.status_code == 200, response.text
+    return response.json()["file_url"]
+
+
+def _delete_path(url: str) -> str:
+    """/data/upload/... URL → DELETE /upload/file/{경로}"""
+    return "/api/v1/upload/file/" + url.split(f"/{settings.upload_path.name}/", 1)[1]
+
+
+def test_referenced_blob_cannot_be_deleted_directly(client, save_card, png_bytes):
+    url = _upload(client, png_bytes("red"))
+    save_card("불꽃 기사", {"characterImageUrl": url})
+
+    response = client.delete(_delete_path(url))
+    assert response.status_code == 409
+    assert get_file_path_from_url(url).exists()
+
+
+def test_unreferenced_blob_delete_goes_through_reclaim_queue(client, png_bytes):
+    url = _upload(client, png_bytes("blue"))
+
+    response = client.delete(_delete_path(url))
+    assert response.status_code == 200, response.text
+    client.portal.call(file_reclaimer.drain)
+    assert get_file_path_from_url(url) is None
+
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM file_reclaim_queue").fetchone() == (0,)
+    finally:
+        conn.close()
+
+
+def _ref_counts() -> dict:
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    try:
+        return dict(conn.execute("SELECT sha256, ref_count FROM image_blobs"))
+    finally:
+        conn.close()
+
+
+def test_identical_uploads_share_one_blob(client, png_bytes):
+    data = png_bytes("red")
+    first = _upload(client, data)
+    files = sorted(settings.upload_path.rglob("*.*"))
+    second = _upload(client, data)
+
+    assert first == second
+    assert get_file_path_from_url(first).read_bytes() == data
+    # 두 번째 업로드는 기존 파일을 재사용 (새 파일 없음)
+    assert sorted(settings.upload_path.rglob("*.*")) == files
+    # 카드에 저장되기 전에는 참조가 없음
+    assert _ref_counts() == {}
+
+
+def test_ref_count_follows_card_save_and_delete(client, save_card, png_bytes):
+    url = _upload(client, png_bytes("blue"))
+    sha256 = get_file_path_from_url(url).stem
+
+    first = save_card("불꽃 기사", {"characterImageUrl": url, "backgroundImageUrl": url})
+    assert _ref_counts() == {sha256: 2}
+    second = save_card("얼음 마법사", {"characterImageUrl": url})
+    assert _ref_counts() == {sha256: 3}
+
+    assert client.delete(f"/api/v1/cards/{first}").status_code == 200
+    assert _ref_counts() == {sha256: 1}
+    client.portal.call(file_reclaimer.drain)
+    assert get_file_path_from_url(url).exists()
+
+    assert client.delete(f"/api/v1/cards/{second}").status_code == 200
+    assert _ref_counts() == {}
+    client.portal.call(file_reclaimer.drain)
+    assert get_file_path_from_url(url) is None
+
+
+def test_released_generated_blob_waits_for_grace_period(client, save_card, png_bytes, monkeypatch):
+    """참조가 0이 된 합성이미지 블롭도 유예 기간 안에는 삭제되지 않고 유예 후 회수"""
+    card_sn = save_card("불꽃 기사")
+    upload = client.post(
+        f"/api/v1/cards/{card_sn}/generated-image",
+        files={"file": ("gen.png", png_bytes("lime"), "image/png")},
+    )
+    assert upload.status_code == 200, upload.text
+    url = upload.json()["imageUrl"]
+    assert list(_ref_counts().values()) == [1]
+    monkeypatch.setattr(settings, "BLOB_RECLAIM_GRACE_SECONDS", 3600)
+
+    assert client.delete(f"/api/v1/cards/{card_sn}/generated-image").status_code == 200
+    assert _ref_counts() == {}
+    client.portal.call(file_reclaimer.drain)
+    assert get_file_path_from_url(url).exists()
+
+    monkeypatch.setattr(settings, "BLOB_RECLAIM_GRACE_SECONDS", 0)
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    with conn:
+        conn.execute("UPDATE file_reclaim_queue SET next_attempt_at = datetime('now', '-1 seconds')")
+    conn.close()
+    client.portal.call(file_reclaimer.drain)
+    assert get_file_path_from_url(url) is None
@@ -0,0 +1,107 @@
+"""
+카드 일괄 삭제·블롭 참조 카운트·파일 회수 (user-018)
+"""
+import sqlite3
+from app.core.config import settings
+from app.services.file_reclaimer import file_reclaimer
+from app.utils.file_utils import build_file_url, get_file_path_from_url
+
+
+def _upload(client, data: bytes) -> str:
+    response = client.post("/api/v1/upload/single", files={"file": ("image.png", data, "image/png")})
+    assert response.status_code == 200, response.text
+    return response.json()["file_url"]
+
+
+def _query(sql: str, *params):
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def _ref_counts() -> dict:
+    return dict(_query("SELECT sha256, ref_count FROM image_blobs"))
+
+
+def _bulk_delete(client, card_sns: list[int]) -> dict:
+    response = client.post("/api/v1/cards/bulk-delete", json={"cardSns": card_sns})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_bulk_delete_releases_refs_and_reclaims_unshared_blobs(client, save_card, png_bytes):
+    shared = _upload(client, png_bytes("red"))
+    only_deleted = _upload(client, png_bytes("blue"))
+    first = save_card("불꽃 기사", {"characterImageUrl": shared, "backgroundImageUrl": only_deleted})
+    second = save_card("얼음 마법사", {"characterImageUrl": shared, "generatedImageUrl": shared})
+    survivor = save_card("바람 궁수", {"characterImageUrl": shared})
+    assert sorted(_ref_counts().values()) == [1, 4]
+
+    body = _bulk_delete(client, [first, second])
+    assert body["deleted"] == 2
+    # 참조가 남은 블롭은 대기열에 넣지 않음
+    assert body["queuedFiles"] == 1
+    assert list(_ref_counts().values()) == [1]
+
+    client.portal.call(file_reclaimer.drain)
+    assert get_file_path_from_url(shared).exists()
+    assert get_file_path_from_url(only_deleted) is None
+    assert _query("SELECT COUNT(*) FROM file_reclaim_queue") == [(0,)]
+
+    _bulk_delete(client, [survivor])
+    client.portal.call(file_reclaimer.drain)
+    assert _ref_counts() == {}
+    assert get_file_path_from_url(shared) is None
+
+
+def test_blob_within_grace_is_rescheduled(client, save_card, png_bytes, monkeypatch):
+    """유예 기간 안의 블롭은 대기열에서 빠지지 않고 유예가 끝나는 시각으로 다시 예약됨"""
+    url = _upload(client, png_bytes("green"))
+    card_sn = save_card("불꽃 기사", {"characterImageUrl": url})
+    monkeypatch.setattr(settings, "BLOB_RECLAIM_GRACE_SECONDS", 3600)
+
+    deferred = client.portal.call(file_reclaimer.stats)["deferred"]
+    _bulk_delete(client, [card_sn])
+    assert client.portal.call(file_reclaimer.drain) == 0
+    assert get_file_path_from_url(url).exists()
+    # 커밋 알림으로 깨어난 백그라운드 회수기가 먼저 처리했을 수 있음
+    assert client.portal.call(file_reclaimer.stats)["deferred"] > deferred
+    rows = _query("SELECT attempts, next_attempt_at > datetime('now', '+3000 seconds') FROM file_reclaim_queue")
+    assert rows == [(0, 1)]
+
+    # 유예가 끝난 뒤에는 회수
+    monkeypatch.setattr(settings, "BLOB_RECLAIM_GRACE_SECONDS", 0)
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    with conn:
+        conn.execute("UPDATE file_reclaim_queue SET next_attempt_at = datetime('now', '-1 seconds')")
+    conn.close()
+    assert client.portal.call(file_reclaimer.drain) == 1
+    assert get_file_path_from_url(url) is None
+
+
+def test_latest_generated_non_blob_file_goes_through_reclaim_queue(client, save_card, png_bytes):
+    """블롭이 아닌 합성이미지 파일은 다른 카드가 참조하는 동안 남고, 참조가 없으면 회수기가 삭제"""
+    path = settings.upload_path / "gen" / "gen_legacy.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(png_bytes("navy"))
+    url = build_file_url(path)
+    card_sn = save_card("불꽃 기사")
+    other = save_card("얼음 마법사")
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    with conn:
+        conn.executemany(
+            "INSERT INTO card_generated_images (card_sn, image_url) VALUES (?, ?)",
+            [(other, url), (card_sn, url)],
+        )
+    conn.close()
+
+    assert client.delete(f"/api/v1/cards/{card_sn}/generated-image").status_code == 200
+    assert _query("SELECT card_sn FROM card_generated_images") == [(other,)]
+    client.portal.call(file_reclaimer.drain)
+    assert path.exists()
+
+    _bulk_delete(client, [other])
+    client.portal.call(file_reclaimer.drain)
+    assert not path.exists()
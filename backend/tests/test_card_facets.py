@@ -0,0 +1,71 @@
+"""
+목록 패싯 필터·패싯 카운트 (user-015)
+"""
+import sqlite3
+from app.core.config import settings
+
+
+LIST_URL = "/api/v1/cards/list"
+
+
+def _connect() -> sqlite3.Connection:
+    return sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+
+
+def _facet_counts(facet: str) -> dict:
+    conn = _connect()
+    try:
+        return dict(conn.execute("SELECT value, count FROM card_facet_counts WHERE facet = ?", (facet,)))
+    finally:
+        conn.close()
+
+
+def test_empty_filter_matches_cards_without_value(client, save_card):
+    save_card("불꽃 기사", series="전설")
+    no_series = {save_card("얼음 마법사"), save_card("바람 궁수")}
+
+    response = client.get(LIST_URL, params={"series": ""})
+    assert response.status_code == 200
+    body = response.json()
+    assert {card["cardSn"] for card in body["cards"]} == no_series
+    # 단일 필터의 total은 패싯 카운트에서 읽으므로 목록과 같은 집합이어야 함
+    assert body["total"] == 2
+
+    facets = client.get("/api/v1/cards/facets").json()["facets"]
+    assert {"value": None, "count": 2} in facets["series"]
+
+
+def test_empty_filter_combined_with_other_facet(client, save_card):
+    save_card("불꽃 기사", series="전설", attribute="불")
+    fire_without_series = save_card("불꽃 궁수", attribute="불")
+    save_card("얼음 마법사", attribute="물")
+
+    body = client.get(LIST_URL, params={"series": "", "attribute": "불"}).json()
+    assert [card["cardSn"] for card in body["cards"]] == [fire_without_series]
+    assert body["total"] == 1
+
+
+def test_counts_follow_updates_and_deletes(client, save_card):
+    card_sn = save_card("불꽃 기사", series="전설")
+    save_card("얼음 마법사", series="전설")
+
+    conn = _connect()
+    with conn:
+        conn.execute("UPDATE cards SET series = NULL WHERE card_sn = ?", (card_sn,))
+    conn.close()
+    assert _facet_counts("series") == {"전설": 1, "": 1}
+
+    assert client.delete(f"/api/v1/cards/{card_sn}").status_code == 200
+    assert _facet_counts("series") == {"전설": 1}
+
+
+def test_trigger_removes_only_decremented_key(client, save_card):
+    """0이 된 행 정리는 감소시킨 키만 대상으로 함 (다른 키의 행은 건드리지 않음)"""
+    card_sn = save_card("불꽃 기사", series="전설")
+    conn = _connect()
+    with conn:
+        conn.execute("INSERT INTO card_facet_counts (facet, value, count) VALUES ('series', '다른 시리즈', 0)")
+    conn.close()
+
+    assert client.delete(f"/api/v1/cards/{card_sn}").status_code == 200
+    assert _facet_counts("series") == {"다른 시리즈": 0}
@@ -0,0 +1,75 @@
+"""
+카드 목록 커서 페이지네이션 (user-009)
+"""
+LIST_URL = "/api/v1/cards/list"
+
+
+def _page(client, limit: int, cursor=None, **filters) -> dict:
+    params = {"limit": limit, **filters}
+    if cursor:
+        params["cursor"] = cursor
+    response = client.get(LIST_URL, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _collect(client, limit: int, between_pages=None, **filters) -> list[int]:
+    """nextCursor를 따라 끝까지 조회한 card_sn 목록 (between_pages: 페이지 사이에 실행할 함수)"""
+    seen, cursor = [], None
+    while True:
+        body = _page(client, limit, cursor, **filters)
+        seen.extend(card["cardSn"] for card in body["cards"])
+        cursor = body["nextCursor"]
+        if cursor is None:
+            return seen
+        if between_pages:
+            between_pages()
+
+
+def test_cursor_walks_all_cards_newest_first(client, save_card):
+    card_sns = [save_card(f"카드 {i}") for i in range(7)]
+
+    assert _collect(client, 3) == sorted(card_sns, reverse=True)
+
+
+def test_cursor_is_stable_across_inserts(client, save_card):
+    """페이지 사이에 카드가 추가되어도 기존 카드가 중복·누락되지 않음 (오프셋과 달리 밀리지 않음)"""
+    card_sns = [save_card(f"카드 {i}") for i in range(7)]
+    inserted = []
+
+    seen = _collect(client, 3, lambda: inserted.append(save_card(f"새 카드 {len(inserted)}")))
+    assert inserted
+    # 새 카드는 이미 지나간 앞쪽(더 큰 card_sn)에 추가되므로 이번 순회에는 나오지 않음
+    assert seen == sorted(card_sns, reverse=True)
+
+
+def test_cursor_is_stable_across_deletes(client, save_card):
+    """이미 조회한 카드가 삭제되어도 다음 페이지의 카드를 건너뛰지 않음"""
+    card_sns = sorted((save_card(f"카드 {i}") for i in range(7)), reverse=True)
+    deleted = []
+
+    def delete_newest():
+        target = max(sn for sn in card_sns if sn not in deleted)
+        assert client.delete(f"/api/v1/cards/{target}").status_code == 200
+        deleted.append(target)
+
+    seen = _collect(client, 3, delete_newest)
+    assert deleted
+    assert seen == card_sns
+
+
+def test_cursor_with_filter(client, save_card):
+    fire = [save_card(f"불 {i}", attribute="불") for i in range(5)]
+    for i in range(3):
+        save_card(f"물 {i}", attribute="물")
+
+    first = _page(client, 2, attribute="불")
+    assert first["total"] == 5
+    assert _collect(client, 2, attribute="불") == sorted(fire, reverse=True)
+
+
+def test_invalid_cursor_is_rejected(client, save_card):
+    save_card("불꽃 기사")
+
+    response = client.get(LIST_URL, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
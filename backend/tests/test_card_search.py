@@ -0,0 +1,80 @@
+"""
+카드 전문 검색 (user-014)
+"""
+import sqlite3
+from app.core.config import settings
+
+
+SEARCH_URL = "/api/v1/cards/search"
+
+
+def _search(client, q: str, **params) -> dict:
+    response = client.get(SEARCH_URL, params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _card_sns(body: dict) -> list[int]:
+    return [card["cardSn"] for card in body["cards"]]
+
+
+def _execute(sql: str, *params) -> None:
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    with conn:
+        conn.execute(sql, params)
+    conn.close()
+
+
+def test_prefix_match_and_name_ranked_first(client, save_card):
+    in_flavor = save_card("얼음 마법사", flavorText="불꽃을 두려워한다")
+    in_name = save_card("불꽃 기사")
+
+    body = _search(client, "불꽃")
+    assert _card_sns(body) == [in_name, in_flavor]
+    assert body["total"] == 2
+
+
+def test_results_follow_updates(client, save_card):
+    card_sn = save_card("불꽃 기사")
+    assert _card_sns(_search(client, "불꽃")) == [card_sn]
+
+    _execute("UPDATE cards SET card_name = ? WHERE card_sn = ?", "바람 궁수", card_sn)
+
+    assert _search(client, "불꽃")["cards"] == []
+    assert _card_sns(_search(client, "바람")) == [card_sn]
+
+
+def test_results_follow_deletes(client, save_card):
+    deleted = save_card("불꽃 기사")
+    kept = save_card("불꽃 마법사")
+
+    assert client.delete(f"/api/v1/cards/{deleted}").status_code == 200
+    body = _search(client, "불꽃")
+    assert _card_sns(body) == [kept]
+    assert body["total"] == 1
+
+    response = client.post("/api/v1/cards/bulk-delete", json={"cardSns": [kept]})
+    assert response.status_code == 200
+    assert _search(client, "불꽃")["cards"] == []
+
+
+def test_all_terms_must_match(client, save_card):
+    both = save_card("불꽃 기사", series="전설")
+    save_card("불꽃 마법사")
+
+    assert _card_sns(_search(client, "불꽃 전설")) == [both]
+
+
+def test_cursor_pages_through_results(client, save_card):
+    card_sns = {save_card(f"불꽃 기사 {i}") for i in range(5)}
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = _search(client, "불꽃", **params)
+        seen.extend(_card_sns(body))
+        cursor = body["nextCursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(card_sns)
+    assert set(seen) == card_sns
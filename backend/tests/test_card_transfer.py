@@ -0,0 +1,57 @@
+"""
+카드 일괄 내보내기·가져오기 (user-017)
+"""
+import json
+import sqlite3
+from app.core.config import settings
+
+# card_sn, 생성·수정 시각을 제외한 cards 컬럼
+_COLUMNS = (
+    "card_name, card_number, type, attribute, rarity, attack, health, skill1_name, skill1_description, "
+    "skill2_name, skill2_description, flavor_text, series, character_image_url, background_image_url, "
+    "generated_prompt, generated_image_url"
+)
+
+
+def _rows(card_sns=None) -> list[tuple]:
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    try:
+        rows = conn.execute(f"SELECT card_sn, {_COLUMNS} FROM cards ORDER BY card_sn").fetchall()
+    finally:
+        conn.close()
+    return [row[1:] for row in rows if card_sns is None or row[0] in card_sns]
+
+
+def _import(client, body: bytes, fmt: str) -> dict:
+    response = client.post("/api/v1/cards/import", params={"format": fmt}, content=body)
+    assert response.status_code == 200, response.text
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[-1]["event"] == "done", events
+    return events[-1]
+
+
+def test_csv_round_trip_keeps_nulls(client, save_card):
+    save_card("불꽃 기사")
+    save_card(
+        "얼음 마법사",
+        {"characterImageUrl": "/data/upload/ice.png", "generatedPrompt": "ice mage"},
+        cardNumber="A-01", attack="3", health="5", skill1Name="빙결", series="S1",
+    )
+    exported = _rows()
+    assert exported[0][1] is None and exported[0][-1] is None
+
+    body = client.get("/api/v1/cards/export", params={"format": "csv"}).content
+    done = _import(client, body, "csv")
+    assert (done["imported"], done["failed"]) == (2, 0)
+
+    assert _rows()[2:] == exported
+
+
+def test_csv_empty_required_field_is_rejected(client):
+    header = "cardName,type,attribute,rarity,series\n"
+    done = _import(client, (header + ",캐릭터,불,일반,\n불꽃 기사,캐릭터,불,일반,\n").encode("utf-8"), "csv")
+
+    assert (done["imported"], done["failed"]) == (1, 1)
+    assert done["errors"][0]["line"] == 2
+    assert _rows()[0][12] is None
+
@@ -0,0 +1,77 @@
+"""
+이미지 파생본 엔진 (user-004)
+"""
+import os
+from app.core.config import settings
+from app.services.derivative_service import derivative_engine
+
+
+def _write_source(name: str, data: bytes):
+    path = settings.upload_path / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def _get(client, source, width: int):
+    return client.portal.call(derivative_engine.get, source, os.stat(source), width, None, "png")
+
+
+def test_pinned_derivative_survives_eviction(client, png_bytes, monkeypatch):
+    monkeypatch.setattr(settings, "DERIVATIVE_CACHE_MAX_BYTES", 1)
+    source = _write_source("pin-source.png", png_bytes("teal", (64, 64)))
+
+    pinned, _, _ = _get(client, source, 8)
+    other, _, _ = _get(client, source, 9)
+    # 다른 요청의 렌더링으로 용량을 넘어도 응답 중인 파생본은 지워지지 않음
+    assert pinned.exists()
+    derivative_engine.release(other)
+
+    derivative_engine.release(pinned)
+    latest, _, _ = _get(client, source, 10)
+    derivative_engine.release(latest)
+    assert not pinned.exists()
+    assert latest.exists()
+
+
+def test_response_releases_pin(client, png_bytes):
+    _write_source("release-source.png", png_bytes("olive", (64, 64)))
+
+    response = client.get("/data/upload/release-source.png", params={"w": 16})
+    assert response.status_code == 200
+    assert derivative_engine.stats()["pinned"] == 0
+
+
+def test_missing_cache_file_is_rendered_again(client, png_bytes):
+    source = _write_source("missing-source.png", png_bytes("maroon", (64, 64)))
+
+    target, _, _ = _get(client, source, 12)
+    derivative_engine.release(target)
+    target.unlink()
+
+    response = client.get("/data/upload/missing-source.png", params={"w": 12, "fmt": "png"})
+    assert response.status_code == 200
+    assert target.exists()
+
+
+def test_unidentified_source_returns_415(client):
+    _write_source("not-an-image.png", b"definitely not an image")
+
+    response = client.get("/data/upload/not-an-image.png", params={"w": 16})
+    assert response.status_code == 415
+
+
+def test_truncated_source_returns_422(client, png_bytes):
+    data = png_bytes("navy", (256, 256))
+    _write_source("truncated.png", data[: len(data) // 2])
+
+    response = client.get("/data/upload/truncated.png", params={"w": 16})
+    assert response.status_code == 422
+    assert derivative_engine.stats()["pinned"] == 0
+
+
+def test_worker_pool_does_not_fork_the_server(client, png_bytes):
+    source = _write_source("pool.png", png_bytes("teal", (64, 64)))
+    _get(client, source, 16)
+
+    assert derivative_engine._get_executor()._mp_context.get_start_method() in ("forkserver", "spawn")
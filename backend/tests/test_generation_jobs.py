@@ -0,0 +1,77 @@
+"""
+이미지 생성 작업 재시도 (user-006)
+"""
+import sqlite3
+from app.core.config import settings
+from app.database.models import CardGeneratedImage
+from app.services.generation_service import generation_manager
+from app.services.write_queue import write_queue
+
+JOBS_URL = "/api/v1/cards/generate/jobs"
+
+
+def _run_job(client, card_sn: int) -> dict:
+    response = client.post(JOBS_URL, json={"cardSn": card_sn, "backend": "fake", "width": 64, "height": 64})
+    assert response.status_code == 202, response.text
+    job = client.get(f"{JOBS_URL}/{response.json()['jobId']}", params={"wait": 10}).json()
+    assert job["status"] in ("succeeded", "failed"), job
+    return job
+
+
+def _count_generate_calls(monkeypatch) -> list:
+    calls = []
+    generate = generation_manager.batcher.generate
+
+    async def _generate(backend, request):
+        calls.append(request)
+        return await generate(backend, request)
+
+    monkeypatch.setattr(generation_manager.batcher, "generate", _generate)
+    return calls
+
+
+def test_failed_commit_retries_without_regenerating(client, save_card, monkeypatch):
+    """결과 저장 후 커밋만 실패하면 백엔드를 다시 호출하지 않고 커밋만 다시 시도"""
+    monkeypatch.setattr(settings, "GENERATION_MAX_ATTEMPTS", 3)
+    card_sn = save_card("불꽃 기사")
+    calls = _count_generate_calls(monkeypatch)
+    write = write_queue.write
+    failures = []
+
+    async def _write(records, *args, **kwargs):
+        if not failures and any(isinstance(record, CardGeneratedImage) for record in records):
+            failures.append(records)
+            raise RuntimeError("database is locked")
+        return await write(records, *args, **kwargs)
+
+    monkeypatch.setattr(write_queue, "write", _write)
+    job = _run_job(client, card_sn)
+
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 2
+    assert len(calls) == 1
+    images = client.get(f"/api/v1/cards/{card_sn}/generated-images").json()["images"]
+    assert images == job["imageUrls"]
+
+
+def test_card_deleted_during_generation_is_not_retried(client, save_card, monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_MAX_ATTEMPTS", 3)
+    card_sn = save_card("불꽃 기사")
+    generate = generation_manager.batcher.generate
+    calls = []
+
+    async def _generate(backend, request):
+        calls.append(request)
+        outputs = await generate(backend, request)
+        conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+        with conn:
+            conn.execute("DELETE FROM cards WHERE card_sn = ?", (card_sn,))
+        conn.close()
+        return outputs
+
+    monkeypatch.setattr(generation_manager.batcher, "generate", _generate)
+    job = _run_job(client, card_sn)
+
+    assert job["status"] == "failed"
+    assert "GenerationCardDeletedError" in job["error"]
+    assert (job["attempts"], len(calls)) == (1, 1)
@@ -0,0 +1,133 @@
+"""
+스키마 마이그레이션 (user-016)
+"""
+import sqlite3
+import pytest
+from sqlalchemy import create_engine
+from app.core.config import settings
+from app.database import migrations, models
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """빈 임시 데이터베이스 파일 경로 (마이그레이션 대상)"""
+    monkeypatch.setattr(settings, "DATABASE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "DATABASE_NAME", "migration.db")
+    return tmp_path / "migration.db"
+
+
+def _indexes(path, table: str) -> set[str]:
+    conn = sqlite3.connect(path)
+    try:
+        return {
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,),
+            )
+        }
+    finally:
+        conn.close()
+
+
+def _differences() -> list[str]:
+    conn = migrations.connect()
+    try:
+        return migrations.schema_differences(conn)
+    finally:
+        conn.close()
+
+
+def test_fresh_database_matches_models(database):
+    assert migrations.migrate() == (0, migrations.LATEST_VERSION)
+    assert _differences() == []
+    # 최신이면 아무 작업도 하지 않음
+    assert migrations.migrate() == (migrations.LATEST_VERSION, migrations.LATEST_VERSION)
+
+
+def test_schema_differences_detects_drift(database):
+    migrations.migrate()
+    conn = sqlite3.connect(database)
+    with conn:
+        conn.execute("DROP INDEX ix_cards_card_name")
+        conn.execute("ALTER TABLE cards ADD COLUMN extra TEXT")
+    conn.close()
+
+    assert set(_differences()) == {
+        "cards: 인덱스 ix_cards_card_name 없음",
+        "cards.extra: 모델에 없는 컬럼",
+    }
+
+
+def test_create_all_database_is_adopted(database):
+    """마이그레이션 도입 이전 create_all로 만든 데이터베이스는 데이터를 유지한 채 채택"""
+    engine = create_engine(f"sqlite:///{database}")
+    models.Base.metadata.create_all(engine)
+    engine.dispose()
+    conn = sqlite3.connect(database)
+    with conn:
+        conn.execute(
+            "INSERT INTO cards (card_name, type, attribute, rarity, series) VALUES ('불꽃 기사', '캐릭터', '불', 'SR', NULL)"
+        )
+    conn.close()
+
+    assert migrations.migrate() == (0, migrations.LATEST_VERSION)
+    assert _differences() == []
+
+    conn = sqlite3.connect(database)
+    try:
+        assert conn.execute("SELECT value FROM table_counters WHERE name = 'cards'").fetchone() == (1,)
+        assert conn.execute(
+            "SELECT count FROM card_facet_counts WHERE facet = 'series' AND value = ''"
+        ).fetchone() == (1,)
+    finally:
+        conn.close()
+
+
+def test_legacy_cards_table_is_preserved_with_new_indexes(database):
+    """card_sn 없는 구 cards 테이블은 cards_legacy로 보존되고, 인덱스는 새 cards 테이블에 생성"""
+    conn = sqlite3.connect(database)
+    with conn:
+        conn.execute("CREATE TABLE cards (id INTEGER PRIMARY KEY, card_name VARCHAR(100) NOT NULL)")
+        conn.execute("CREATE INDEX ix_cards_card_name ON cards (card_name)")
+        conn.execute("CREATE INDEX ix_cards_id ON cards (id)")
+        conn.execute("INSERT INTO cards (card_name) VALUES ('옛 카드')")
+    conn.close()
+
+    assert migrations.migrate() == (0, migrations.LATEST_VERSION)
+    assert _differences() == []
+    assert _indexes(database, "cards_legacy") == set()
+    assert {"ix_cards_card_name", "ix_cards_card_sn"} <= _indexes(database, "cards")
+
+    conn = sqlite3.connect(database)
+    try:
+        assert conn.execute("SELECT card_name FROM cards_legacy").fetchall() == [("옛 카드",)]
+    finally:
+        conn.close()
+
+
+def test_indexes_left_on_legacy_table_are_repaired(database):
+    """v1이 인덱스를 cards_legacy에 남긴 채 적용된 데이터베이스는 v11이 복구"""
+    migrations.migrate()
+    conn = sqlite3.connect(database)
+    with conn:
+        conn.execute("CREATE TABLE cards_legacy (id INTEGER PRIMARY KEY, card_name VARCHAR(100) NOT NULL)")
+        conn.execute("DROP INDEX ix_cards_card_name")
+        conn.execute("CREATE INDEX ix_cards_card_name ON cards_legacy (card_name)")
+        conn.execute("DELETE FROM schema_migrations WHERE version >= 11")
+    conn.close()
+    assert "cards: 인덱스 ix_cards_card_name 없음" in _differences()
+
+    assert migrations.migrate() == (10, migrations.LATEST_VERSION)
+    assert _differences() == []
+    assert _indexes(database, "cards_legacy") == set()
+
+
+def test_newer_database_is_rejected(database):
+    migrations.migrate()
+    conn = sqlite3.connect(database)
+    with conn:
+        conn.execute("INSERT INTO schema_migrations (version, name) VALUES (?, 'future')", (migrations.LATEST_VERSION + 1,))
+    conn.close()
+
+    with pytest.raises(RuntimeError):
+        migrations.migrate()
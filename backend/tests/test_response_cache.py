@@ -0,0 +1,130 @@
+"""
+카드 조회 응답 캐시·ETag (user-019)
+"""
+import sqlite3
+from app.core.config import settings
+from app.services.file_reclaimer import file_reclaimer
+from app.services.response_cache import response_cache
+from app.services.write_queue import write_queue
+
+
+LIST_URL = "/api/v1/cards/list"
+
+
+def test_matching_etag_returns_304(client, save_card):
+    save_card("불꽃 기사")
+    first = client.get(LIST_URL)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = client.get(LIST_URL, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+
+
+def test_write_changes_etag(client, save_card):
+    save_card("불꽃 기사")
+    etag = client.get(LIST_URL).headers["etag"]
+
+    save_card("얼음 마법사")
+    response = client.get(LIST_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["total"] == 2
+
+
+def test_write_from_another_connection_changes_etag(client, save_card):
+    """다른 프로세스(관리 스크립트 등)의 변경도 트리거가 데이터 버전을 올려 반영됨"""
+    card_sn = save_card("불꽃 기사")
+    etag = client.get(LIST_URL).headers["etag"]
+
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    with conn:
+        conn.execute("UPDATE cards SET card_name = ? WHERE card_sn = ?", ("바람 궁수", card_sn))
+    conn.close()
+
+    response = client.get(LIST_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["cards"][0]["cardName"] == "바람 궁수"
+
+
+def test_304_without_cached_entry(client, save_card):
+    """캐시 항목이 없어도 버전이 같으면 목록 조회 없이 304"""
+    save_card("불꽃 기사")
+    etag = client.get(LIST_URL).headers["etag"]
+    response_cache._entries.clear()
+    response_cache._total_bytes = 0
+    misses = response_cache.stats()["misses"]
+
+    response = client.get(LIST_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response_cache.stats()["misses"] == misses
+
+
+def test_generated_images_etag_changes_after_upload(client, save_card, png_bytes):
+    card_sn = save_card("불꽃 기사")
+    url = f"/api/v1/cards/{card_sn}/generated-images"
+    first = client.get(url)
+    assert first.json()["images"] == []
+    etag = first.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    upload = client.post(
+        f"/api/v1/cards/{card_sn}/generated-image",
+        files={"file": ("gen.png", png_bytes(), "image/png")},
+    )
+    assert upload.status_code == 200, upload.text
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["images"]) == 1
+
+
+def _upload(client, data: bytes) -> str:
+    response = client.post("/api/v1/upload/single", files={"file": ("image.png", data, "image/png")})
+    assert response.status_code == 200, response.text
+    return response.json()["file_url"]
+
+
+def test_unreferenced_upload_keeps_etag(client, save_card, png_bytes):
+    """아직 카드에 저장되지 않은 업로드의 메타데이터 저장은 조회 응답 캐시를 무효화하지 않음"""
+    save_card("불꽃 기사")
+    etag = client.get(LIST_URL).headers["etag"]
+
+    _upload(client, png_bytes("orange"))
+    assert client.get(LIST_URL, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_referenced_metadata_update_changes_etag(client, save_card, png_bytes):
+    data = png_bytes("purple")
+    url = _upload(client, data)
+    save_card("불꽃 기사", {"characterImageUrl": url})
+    etag = client.get(LIST_URL).headers["etag"]
+
+    # 카드가 참조하는 URL의 메타데이터 갱신 (레이아웃 이전·재추출 등)
+    client.portal.call(write_queue.add_image_metadata, [
+        {"url": url, "sha256": "0" * 64, "format": "png", "bytes": len(data), "width": 1, "height": 1},
+    ])
+    assert client.get(LIST_URL, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_reclaimed_generated_blob_forgets_metadata(client, save_card, png_bytes):
+    card_sn = save_card("불꽃 기사")
+    upload = client.post(
+        f"/api/v1/cards/{card_sn}/generated-image",
+        files={"file": ("gen.png", png_bytes("lime"), "image/png")},
+    )
+    assert upload.status_code == 200, upload.text
+    image_url = upload.json()["imageUrl"]
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    assert conn.execute("SELECT COUNT(*) FROM image_metadata WHERE url = ?", (image_url,)).fetchone()[0] == 1
+    conn.close()
+
+    assert client.delete(f"/api/v1/cards/{card_sn}/generated-image").status_code == 200
+    client.portal.call(file_reclaimer.drain)
+
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    rows = conn.execute("SELECT COUNT(*) FROM image_metadata WHERE url = ?", (image_url,)).fetchone()[0]
+    conn.close()
+    assert rows == 0
@@ -0,0 +1,53 @@
+"""
+다중 업로드 원자적 모드 (user-005)
+"""
+import hashlib
+import sqlite3
+from app.core.config import settings
+from app.services.file_reclaimer import file_reclaimer
+from app.utils.blob_store import blob_path
+
+
+def _queued_urls() -> list[str]:
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    try:
+        return [row[0] for row in conn.execute("SELECT image_url FROM file_reclaim_queue")]
+    finally:
+        conn.close()
+
+
+def _upload_atomic(client, *files: tuple[str, bytes]):
+    return client.post(
+        "/api/v1/upload/multiple",
+        params={"atomic": "true"},
+        files=[("files", (name, data, "image/png")) for name, data in files],
+    )
+
+
+def test_atomic_upload_succeeds_in_order(client, png_bytes):
+    response = _upload_atomic(client, ("a.png", png_bytes("red")), ("b.png", png_bytes("blue")))
+    assert response.status_code == 200, response.text
+    assert [item["filename"] for item in response.json()["files"]] == ["a.png", "b.png"]
+
+
+def test_atomic_rollback_sends_new_blobs_through_reclaim_queue(client, png_bytes, monkeypatch):
+    """롤백한 새 블롭은 동시 업로드가 재사용했을 수 있으므로 유예 기간 동안 남겨 둠"""
+    monkeypatch.setattr(settings, "BLOB_RECLAIM_GRACE_SECONDS", 3600)
+    data = png_bytes("green")
+    path = blob_path(hashlib.sha256(data).hexdigest(), "png")
+
+    response = _upload_atomic(client, ("ok.png", data), ("bad.png", b"not an image at all"))
+    assert response.status_code == 400
+    assert path.exists()
+    assert len(_queued_urls()) == 1
+
+    client.portal.call(file_reclaimer.drain)
+    assert path.exists()
+
+    monkeypatch.setattr(settings, "BLOB_RECLAIM_GRACE_SECONDS", 0)
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    with conn:
+        conn.execute("UPDATE file_reclaim_queue SET next_attempt_at = datetime('now', '-1 seconds')")
+    conn.close()
+    client.portal.call(file_reclaimer.drain)
+    assert not path.exists()
@@ -0,0 +1,149 @@
+"""
+업로드 이미지 정규화 (user-025)
+"""
+import io
+import pytest
+from PIL import Image, PngImagePlugin
+from app.core.config import settings
+from app.services.file_reclaimer import file_reclaimer
+from app.services.upload_normalizer import upload_normalizer
+from app.utils.file_utils import get_file_path_from_url, store_image_bytes
+
+
+@pytest.fixture(autouse=True)
+def small_normalize_dimension(monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_NORMALIZE_MAX_DIMENSION", 64)
+    monkeypatch.setattr(settings, "UPLOAD_NORMALIZE_FORMAT", "webp")
+
+
+def _png_with_text(color: str = "navy", size: tuple[int, int] = (300, 200)) -> bytes:
+    info = PngImagePlugin.PngInfo()
+    info.add_text("Author", "someone")
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG", pnginfo=info)
+    return buffer.getvalue()
+
+
+def _upload(client, data: bytes, **params) -> dict:
+    response = client.post(
+        "/api/v1/upload/single",
+        params={"normalize": "true", **params},
+        files={"file": ("image.png", data, "image/png")},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _drain_reclaimer(client) -> None:
+    client.portal.call(file_reclaimer.drain)
+
+
+def _exists(url: str) -> bool:
+    path = get_file_path_from_url(url)
+    return path is not None and path.is_file()
+
+
+def test_normalize_strips_metadata_and_caps_size(client):
+    result = _upload(client, _png_with_text())
+    assert result["file_url"].endswith(".webp")
+    assert result["original_url"] is None
+
+    response = client.get(result["file_url"])
+    assert response.status_code == 200
+    with Image.open(io.BytesIO(response.content)) as image:
+        assert image.format == "WEBP"
+        assert max(image.size) == 64
+        assert image.size == (64, 43)
+        assert "exif" not in image.info and "Author" not in image.info
+
+
+def test_normalize_removes_original(client):
+    data = _png_with_text("olive")
+    stored = client.post("/api/v1/upload/single", files={"file": ("image.png", data, "image/png")}).json()
+    assert _exists(stored["file_url"])
+
+    result = _upload(client, data)
+    assert result["file_url"] != stored["file_url"]
+    _drain_reclaimer(client)
+    assert not _exists(stored["file_url"])
+    assert _exists(result["file_url"])
+
+
+def test_keep_original(client):
+    result = _upload(client, _png_with_text("teal"), keep_original="true")
+    assert result["original_url"] is not None
+    assert result["original_url"] != result["file_url"]
+    _drain_reclaimer(client)
+
+    assert client.get(result["original_url"]).status_code == 200
+    with Image.open(io.BytesIO(client.get(result["file_url"]).content)) as image:
+        assert image.format == "WEBP"
+
+
+def test_shared_blob_original_is_kept_while_referenced(client, save_card):
+    """같은 내용을 먼저 업로드해 카드에 저장한 블롭은 정규화 후에도 삭제되지 않음"""
+    data = _png_with_text("maroon")
+    other = client.post("/api/v1/upload/single", files={"file": ("image.png", data, "image/png")}).json()
+    save_card("공유 이미지 카드", {"characterImageUrl": other["file_url"]})
+
+    result = _upload(client, data)
+    assert result["file_url"] != other["file_url"]
+    _drain_reclaimer(client)
+    assert client.get(other["file_url"]).status_code == 200
+
+
+def test_concurrent_upload_of_same_blob_survives_normalize(client, monkeypatch):
+    """정규화 전에 같은 내용을 업로드한 요청이 받은 블롭 URL은 정규화 후에도 유효함"""
+    monkeypatch.setattr(settings, "BLOB_RECLAIM_GRACE_SECONDS", 300)
+    data = _png_with_text("brown")
+    url, first = store_image_bytes(data)
+    same_url, second = store_image_bytes(data)
+    assert same_url == url and first.created and not second.created
+
+    result = client.portal.call(upload_normalizer.normalize, url, first)
+    assert result.normalized
+    _drain_reclaimer(client)
+    assert client.get(same_url).status_code == 200
+
+
+def test_duplicate_files_in_batch(client):
+    data = _png_with_text("purple")
+    response = client.post(
+        "/api/v1/upload/multiple",
+        params={"normalize": "true"},
+        files=[("files", ("a.png", data, "image/png")), ("files", ("b.png", data, "image/png"))],
+    )
+    assert response.status_code == 200, response.text
+    first, second = response.json()["files"]
+    assert first["success"] and second["success"]
+    assert first["file_url"] == second["file_url"]
+    assert first["file_url"].endswith(".webp")
+    _drain_reclaimer(client)
+    assert client.get(first["file_url"]).status_code == 200
+
+
+def test_normalize_without_blob_store(client, monkeypatch):
+    monkeypatch.setattr(settings, "BLOB_STORE_ENABLED", False)
+    data = _png_with_text("gray")
+
+    kept = _upload(client, data, keep_original="true")
+    assert _exists(kept["original_url"])
+
+    replaced = _upload(client, data)
+    assert "/blobs/" not in replaced["file_url"]
+    assert _exists(replaced["file_url"])
+    normalize_stats = client.get("/api/v1/upload/normalize/stats").json()
+    assert normalize_stats["normalized"] >= 2
+
+
+def test_animated_and_vector_images_are_skipped(client):
+    buffer = io.BytesIO()
+    frames = [Image.new("P", (80, 80), color) for color in (1, 2)]
+    frames[0].save(buffer, format="GIF", save_all=True, append_images=frames[1:])
+    response = client.post(
+        "/api/v1/upload/single",
+        params={"normalize": "true"},
+        files={"file": ("anim.gif", buffer.getvalue(), "image/gif")},
+    )
+    assert response.status_code == 200
+    assert response.json()["file_url"].endswith(".gif")
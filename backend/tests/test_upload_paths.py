@@ -0,0 +1,61 @@
+"""
+업로드 경로 변환기와 파일 조회 경로 보안 (user-023)
+"""
+import pytest
+from app.core.config import settings
+from app.services.file_reclaimer import file_reclaimer
+from app.utils.file_utils import upload_path_resolver
+
+
+@pytest.fixture
+def outside_file(tmp_path):
+    secret = tmp_path / "secret.png"
+    secret.write_bytes(b"\x89PNG\r\n\x1a\nsecret")
+    return secret
+
+
+def test_symlink_outside_upload_dir_is_not_served(client, outside_file):
+    link = settings.upload_path / "escape.png"
+    link.symlink_to(outside_file)
+    try:
+        assert upload_path_resolver.resolve("/data/upload/escape.png") is None
+        assert client.get("/data/upload/escape.png").status_code == 404
+        assert client.get("/api/v1/upload/file/escape.png").status_code == 404
+        assert "escape.png" not in upload_path_resolver._entries
+    finally:
+        link.unlink()
+
+
+def test_symlink_inside_upload_dir_is_served(client, png_bytes):
+    target = settings.upload_path / "inside-target.png"
+    target.write_bytes(png_bytes("green"))
+    link = settings.upload_path / "inside-link.png"
+    link.symlink_to(target)
+    try:
+        response = client.get("/data/upload/inside-link.png")
+        assert response.status_code == 200
+        assert response.content == target.read_bytes()
+    finally:
+        link.unlink()
+        target.unlink()
+        upload_path_resolver.clear()
+
+
+def test_parent_directory_traversal_is_rejected(client):
+    assert upload_path_resolver.relative_path("/data/upload/../database/cards.db") is None
+    assert client.get("/data/upload/..%2Fdatabase%2Fcards.db").status_code in (403, 404)
+    assert client.get("/data/database/cards.db").status_code == 404
+
+
+def test_deleted_file_is_invalidated(client, png_bytes):
+    uploaded = client.post(
+        "/api/v1/upload/single",
+        files={"file": ("image.png", png_bytes("yellow"), "image/png")},
+    ).json()
+    relative = uploaded["file_url"][len("/data/upload/"):]
+    assert client.get(uploaded["file_url"]).status_code == 200
+
+    assert client.delete(f"/api/v1/upload/file/{relative}").status_code == 200
+    # 블롭은 회수 대기열을 거쳐 삭제됨
+    client.portal.call(file_reclaimer.drain)
+    assert client.get(uploaded["file_url"]).status_code == 404
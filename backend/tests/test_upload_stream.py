@@ -0,0 +1,50 @@
+"""
+업로드 스트리밍 저장과 내용 기반 형식 판별 (user-002)
+"""
+import io
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+from app.core.config import settings
+from app.utils.file_utils import stream_upload_to_temp
+
+
+def _temp_files() -> list:
+    return list(settings.upload_path.glob(".upload-*.part"))
+
+
+def test_non_image_is_rejected_before_reading_the_rest(client, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 256)
+    body = io.BytesIO(b"MZ" + b"\0" * (1024 * 1024))
+    upload = UploadFile(body, filename="image.png")
+
+    with pytest.raises(HTTPException) as error:
+        client.portal.call(stream_upload_to_temp, upload, settings.upload_path)
+    assert error.value.status_code == 400
+    # 판별에 필요한 앞부분(2청크)만 읽고 중단
+    assert body.tell() == 512
+    assert _temp_files() == []
+
+
+def test_short_file_is_sniffed_at_eof(client, png_bytes):
+    data = png_bytes("red", (1, 1))
+    assert len(data) < 512
+
+    stored = client.portal.call(stream_upload_to_temp, UploadFile(io.BytesIO(data), filename="a.png"), settings.upload_path)
+    try:
+        assert (stored.image_format, stored.size) == ("png", len(data))
+    finally:
+        stored.file_path.unlink()
+
+    with pytest.raises(HTTPException) as error:
+        client.portal.call(stream_upload_to_temp, UploadFile(io.BytesIO(b"hello"), filename="a.png"), settings.upload_path)
+    assert error.value.status_code == 400
+    assert _temp_files() == []
+
+
+def test_non_image_upload_returns_400(client):
+    response = client.post(
+        "/api/v1/upload/single",
+        files={"file": ("image.png", b"not an image" * 100, "image/png")},
+    )
+    assert response.status_code == 400
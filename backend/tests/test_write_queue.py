@@ -0,0 +1,83 @@
+"""
+그룹 커밋 쓰기 큐 (user-013)
+"""
+import asyncio
+import sqlite3
+from app.core.config import settings
+from app.database.models import CardGeneratedImage
+from app.services.write_queue import GroupCommitWriter, _PendingWrite
+
+
+async def _commit_batch(writer: GroupCommitWriter, batch_records: list[list[CardGeneratedImage]]) -> list:
+    """write 호출 여러 건을 한 배치로 커밋하고, 호출별 결과(행 ID 또는 예외)를 반환"""
+    loop = asyncio.get_running_loop()
+    batch = [
+        _PendingWrite(records=records, blob_urls=[], image_metadata=[], future=loop.create_future())
+        for records in batch_records
+    ]
+    await writer._commit(batch)
+    return [item.future.exception() or item.future.result() for item in batch]
+
+
+def _image_urls() -> list[str]:
+    conn = sqlite3.connect(settings.database_path / settings.DATABASE_NAME)
+    try:
+        return [row[0] for row in conn.execute("SELECT image_url FROM card_generated_images ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def test_group_commit_resolves_every_write(client, save_card):
+    card_sn = save_card("불꽃 기사")
+    writer = GroupCommitWriter()
+
+    results = client.portal.call(_commit_batch, writer, [
+        [CardGeneratedImage(card_sn=card_sn, image_url="/data/upload/gen/a.png")],
+        [
+            CardGeneratedImage(card_sn=card_sn, image_url="/data/upload/gen/b.png"),
+            CardGeneratedImage(card_sn=card_sn, image_url="/data/upload/gen/c.png"),
+        ],
+    ])
+
+    assert [len(ids) for ids in results] == [1, 2]
+    stats = writer.stats()
+    assert (stats["commits"], stats["writes"], stats["rows"]) == (1, 2, 3)
+    assert stats["fallbackCommits"] == 0
+    assert _image_urls() == ["/data/upload/gen/a.png", "/data/upload/gen/b.png", "/data/upload/gen/c.png"]
+
+
+def test_failed_group_commit_falls_back_to_per_write_commits(client, save_card):
+    """배치 안의 한 write가 실패하면 write 단위로 다시 커밋하여 그 호출만 예외를 받음"""
+    card_sn = save_card("불꽃 기사")
+    writer = GroupCommitWriter()
+
+    results = client.portal.call(_commit_batch, writer, [
+        [CardGeneratedImage(card_sn=card_sn, image_url="/data/upload/gen/a.png")],
+        # card_sn NOT NULL 위반 → 같은 write의 다른 행도 함께 롤백
+        [
+            CardGeneratedImage(card_sn=card_sn, image_url="/data/upload/gen/b.png"),
+            CardGeneratedImage(card_sn=None, image_url="/data/upload/gen/c.png"),
+        ],
+        [CardGeneratedImage(card_sn=card_sn, image_url="/data/upload/gen/d.png")],
+    ])
+
+    assert isinstance(results[0], list) and len(results[0]) == 1
+    assert isinstance(results[1], Exception)
+    assert isinstance(results[2], list) and len(results[2]) == 1
+    stats = writer.stats()
+    assert stats["fallbackCommits"] == 2
+    assert stats["failedWrites"] == 1
+    assert _image_urls() == ["/data/upload/gen/a.png", "/data/upload/gen/d.png"]
+
+
+def test_single_failed_write_is_not_retried(client):
+    writer = GroupCommitWriter()
+
+    results = client.portal.call(_commit_batch, writer, [
+        [CardGeneratedImage(card_sn=None, image_url="/data/upload/gen/a.png")],
+    ])
+
+    assert isinstance(results[0], Exception)
+    stats = writer.stats()
+    assert (stats["commits"], stats["fallbackCommits"], stats["failedWrites"]) == (0, 0, 1)
+    assert _image_urls() == []